@@ -0,0 +1,270 @@
+"""Suite de benchmarks de generation/dungeon_generator.py con baselines JSON.
+
+Mide generate_advanced_main_path, add_connected_additional_rooms,
+generate_dungeon_layout y cada estrategia de maze_algorithms barriendo tamaños
+de rejilla y semillas. Para cada caso informa p50/p95 de tiempo, pico de memoria
+(tracemalloc) y desviación de la longitud del camino principal respecto a
+target_length.
+
+Uso:
+    python benchmarks/bench_generation.py                    # solo informe
+    python benchmarks/bench_generation.py --save-baseline    # guarda la baseline
+    python benchmarks/bench_generation.py --check            # falla si hay regresión
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from aimaze.generation.dungeon_generator import (  # noqa: E402
+    add_connected_additional_rooms,
+    calculate_smart_path_length,
+    generate_advanced_main_path,
+    generate_dungeon_layout,
+    generate_random_start_exit_points,
+)
+from aimaze.generation.layout_cache import LayoutCache  # noqa: E402
+from aimaze.generation.maze_algorithms import MAZE_ALGORITHMS  # noqa: E402
+
+DEFAULT_SIZES = [5, 30, 100, 200]
+DEFAULT_SEEDS = list(range(1, 6))
+DEFAULT_BASELINE = os.path.join(
+    os.path.dirname(__file__), "baselines", "generation.json"
+)
+
+# Umbrales de regresión: un caso falla si supera la baseline en estos factores.
+# Los tiempos son ruidosos, así que el margen es amplio y hay un mínimo absoluto
+# por debajo del cual no se compara.
+DEFAULT_THRESHOLDS = {
+    "time_ratio": 1.5,
+    "time_floor_ms": 1.0,
+    "memory_ratio": 1.25,
+    "memory_floor_kb": 64.0,
+    "deviation_slack": 2,
+}
+
+
+def _prepare_path(size: int, seed: int):
+    rng = random.Random(seed)
+    start, end = generate_random_start_exit_points(size, size, rng)
+    target = calculate_smart_path_length(start, end, size, size, rng)
+    return rng, start, end, target
+
+
+# Cada caso devuelve (función a medir, target_length o None si no aplica)
+def case_main_path(size: int, seed: int):
+    rng, start, end, target = _prepare_path(size, seed)
+    return (
+        lambda: generate_advanced_main_path(start, end, size, size, target, rng)
+    ), target
+
+
+def case_additional_rooms(size: int, seed: int):
+    rng, start, end, target = _prepare_path(size, seed)
+    path = generate_advanced_main_path(start, end, size, size, target, rng)
+    return (lambda: add_connected_additional_rooms(path, size, size, rng=rng)), None
+
+
+def case_dungeon_layout(size: int, seed: int):
+    # Caché propia y vacía: se mide la generación, no el acierto de caché
+    cache = LayoutCache(max_entries=1)
+    return (lambda: generate_dungeon_layout(seed, size, size, cache=cache)), None
+
+
+def _maze_case(name: str) -> Callable:
+    def case(size: int, seed: int):
+        cache = LayoutCache(max_entries=1)
+        return (
+            lambda: generate_dungeon_layout(seed, size, size, cache, algorithm=name)
+        ), None
+    return case
+
+
+CASES: Dict[str, Callable] = {
+    "generate_advanced_main_path": case_main_path,
+    "add_connected_additional_rooms": case_additional_rooms,
+    "generate_dungeon_layout": case_dungeon_layout,
+}
+# Estrategias de maze_algorithms, para elegir la más rápida por tamaño
+CASES.update({f"maze:{name}": _maze_case(name) for name in MAZE_ALGORITHMS})
+
+
+def _percentile(values: List[float], percent: int) -> float:
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[percent - 1]
+
+
+def bench_case(name: str, size: int, seeds: List[int]) -> dict:
+    """
+    Ejecuta un caso para todas las semillas y resume tiempo, memoria y desviación.
+
+    tracemalloc ralentiza mucho la ejecución, así que el pico de memoria se mide
+    en una segunda pasada con las mismas semillas y no contamina los tiempos.
+    """
+    build = CASES[name]
+    timings = []
+    peaks = []
+    deviations = []
+    for seed in seeds:
+        run, target = build(size, seed)
+        t0 = time.perf_counter()
+        result = run()
+        timings.append((time.perf_counter() - t0) * 1000)
+        if target is not None:
+            deviations.append(abs(len(result) - target))
+    for seed in seeds:
+        run, _ = build(size, seed)
+        tracemalloc.start()
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        peaks.append(peak / 1024)
+    return {
+        "function": name,
+        "size": size,
+        "runs": len(seeds),
+        "p50_ms": round(_percentile(timings, 50), 3),
+        "p95_ms": round(_percentile(timings, 95), 3),
+        "peak_kb": round(max(peaks), 1),
+        "max_deviation": max(deviations) if deviations else None,
+    }
+
+
+def run_suite(
+    sizes: List[int] = DEFAULT_SIZES,
+    seeds: List[int] = DEFAULT_SEEDS,
+    functions: Optional[List[str]] = None,
+) -> List[dict]:
+    """Ejecuta todos los casos y devuelve una lista de resultados."""
+    results = []
+    for name in functions or list(CASES):
+        for size in sizes:
+            results.append(bench_case(name, size, seeds))
+    return results
+
+
+def _result_key(result: dict) -> str:
+    return f"{result['function']}@{result['size']}"
+
+
+def save_baseline(
+    results: List[dict], path: str, thresholds: Optional[dict] = None
+) -> None:
+    """Guarda los resultados como baseline JSON junto con sus umbrales."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    payload = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "thresholds": dict(thresholds or DEFAULT_THRESHOLDS),
+        "results": {_result_key(result): result for result in results},
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def load_baseline(path: str) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare_to_baseline(results: List[dict], baseline: dict) -> List[str]:
+    """
+    Compara resultados con una baseline y devuelve la lista de regresiones.
+
+    Los casos que no aparecen en la baseline se ignoran.
+    """
+    thresholds = dict(DEFAULT_THRESHOLDS, **baseline.get("thresholds", {}))
+    reference = baseline.get("results", {})
+    regressions = []
+    for result in results:
+        key = _result_key(result)
+        base = reference.get(key)
+        if base is None:
+            continue
+        for metric in ("p50_ms", "p95_ms"):
+            limit = max(
+                base[metric] * thresholds["time_ratio"], thresholds["time_floor_ms"]
+            )
+            if result[metric] > limit:
+                regressions.append(
+                    f"{key}: {metric} {result[metric]:.2f} > {limit:.2f} "
+                    f"(baseline {base[metric]:.2f})"
+                )
+        limit = max(
+            base["peak_kb"] * thresholds["memory_ratio"], thresholds["memory_floor_kb"]
+        )
+        if result["peak_kb"] > limit:
+            regressions.append(
+                f"{key}: peak_kb {result['peak_kb']:.1f} > {limit:.1f} "
+                f"(baseline {base['peak_kb']:.1f})"
+            )
+        if result["max_deviation"] is not None and base["max_deviation"] is not None:
+            limit = base["max_deviation"] + thresholds["deviation_slack"]
+            if result["max_deviation"] > limit:
+                regressions.append(
+                    f"{key}: max_deviation {result['max_deviation']} > {limit}"
+                )
+    return regressions
+
+
+def print_report(results: List[dict]) -> None:
+    print(
+        f"{'función':<32} {'rejilla':>9} {'p50 (ms)':>10} {'p95 (ms)':>10} "
+        f"{'pico (KB)':>10} {'desv. máx':>10}"
+    )
+    for result in results:
+        deviation = result["max_deviation"]
+        size = result["size"]
+        print(
+            f"{result['function']:<32} {size:>4}x{size:<4} "
+            f"{result['p50_ms']:>10.2f} {result['p95_ms']:>10.2f} "
+            f"{result['peak_kb']:>10.1f} "
+            f"{'-' if deviation is None else deviation:>10}"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--seeds", type=int, default=len(DEFAULT_SEEDS),
+                        help="Número de semillas (1..N) por caso")
+    parser.add_argument("--functions", nargs="+", choices=list(CASES))
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Compara con la baseline y sale con código 1 si hay regresión",
+    )
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.sizes, list(range(1, args.seeds + 1)), args.functions)
+    print_report(results)
+
+    if args.save_baseline:
+        save_baseline(results, args.baseline)
+        print(f"\nBaseline guardada en {args.baseline}")
+    if args.check:
+        regressions = compare_to_baseline(results, load_baseline(args.baseline))
+        if regressions:
+            print("\nRegresiones detectadas:")
+            for regression in regressions:
+                print(f"  - {regression}")
+            return 1
+        print("\nSin regresiones respecto a la baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
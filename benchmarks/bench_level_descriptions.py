@@ -0,0 +1,103 @@
+"""Benchmark de la descripción por lotes de un nivel frente a sala a sala.
+
+Describe todas las salas de un nivel contra un servidor local que imita la API
+de OpenAI (con latencia simulada por petición) de dos formas:
+
+- sala a sala: una llamada a generate_location_description por sala
+- por lotes: generate_level_descriptions (una llamada por batch_size salas)
+
+Para cada una muestra las peticiones, los caracteres de prompt enviados y el
+tiempo total.
+
+Uso:
+    python benchmarks/bench_level_descriptions.py [--size 5] [--latency-ms 200]
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from bench_llm_client import FakeOpenAIServer  # noqa: E402
+
+from aimaze.ai.client import LLMRegistry, LLMSettings  # noqa: E402
+from aimaze.ai.descriptions import generate_location_description  # noqa: E402
+from aimaze.ai.level_descriptions import generate_level_descriptions  # noqa: E402
+from aimaze.generation.dungeon_generator import generate_dungeon_layout  # noqa: E402
+
+_ROOM_LINE = re.compile(r"^- \((\d+),(\d+)\):", re.MULTILINE)
+
+
+class PromptMeter:
+    """Responde como el LLM y suma los caracteres de prompt recibidos."""
+
+    def __init__(self):
+        self.prompt_chars = 0
+
+    def __call__(self, prompt: str) -> str:
+        self.prompt_chars += len(prompt)
+        rooms = _ROOM_LINE.findall(prompt)
+        if not rooms:
+            return json.dumps({"description": "Una sala húmeda y silenciosa."})
+        return json.dumps({"rooms": [
+            {"x": int(x), "y": int(y), "description": "Una sala húmeda y silenciosa."}
+            for x, y in rooms
+        ]})
+
+
+def _run(name, size, latency_ms, describe):
+    meter = PromptMeter()
+    server = FakeOpenAIServer(latency_ms, responder=meter)
+    registry = LLMRegistry(LLMSettings(base_url=server.base_url))
+    level = generate_dungeon_layout(seed=1, width=size, height=size).levels[1]
+    try:
+        with patch("aimaze.ai.descriptions.get_llm_registry", return_value=registry), \
+                patch("aimaze.ai.level_descriptions.get_llm_registry",
+                      return_value=registry), \
+                patch("aimaze.ai.client._create_callbacks", return_value=[]):
+            t0 = time.perf_counter()
+            described = describe(level)
+            elapsed = time.perf_counter() - t0
+    finally:
+        registry.close()
+        server.close()
+    print(
+        f"{name:<12} {described:>6} {server.requests:>10} "
+        f"{meter.prompt_chars:>14} {elapsed * 1000:>10.0f}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=5,
+                        help="Lado del nivel (size x size)")
+    parser.add_argument("--latency-ms", type=float, default=200.0,
+                        help="Latencia simulada del servidor por petición")
+    parser.add_argument("--batch-size", type=int, default=25)
+    args = parser.parse_args()
+    os.environ.setdefault("OPENAI_API_KEY", "bench")
+
+    def per_room(level):
+        for room in level.rooms.values():
+            x, y = room.coordinates
+            generate_location_description(f"Level {level.id} at ({x},{y})")
+        return len(level.rooms)
+
+    def batched(level):
+        result = generate_level_descriptions(level, batch_size=args.batch_size)
+        return len(result.descriptions)
+
+    print(f"{'ruta':<12} {'salas':>6} {'peticiones':>10} "
+          f"{'chars prompt':>14} {'total (ms)':>10}")
+    _run("sala a sala", args.size, args.latency_ms, per_room)
+    _run("por lotes", args.size, args.latency_ms, batched)
+
+
+if __name__ == "__main__":
+    main()
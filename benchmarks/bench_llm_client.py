@@ -0,0 +1,265 @@
+"""Benchmark del coste por llamada de generate_location_description.
+
+Compara la ruta antigua, que creaba ChatOpenAI, los parsers, el prompt y el
+handler de Langfuse en cada llamada, con la ruta actual (aimaze.ai.client,
+objetos compartidos y pool httpx). Mide:
+
+- preparación: solo construir/obtener los objetos, sin petición HTTP
+- llamada completa contra un servidor local que imita la API de OpenAI, con
+  el número de conexiones TCP que abre cada ruta
+
+Uso:
+    python benchmarks/bench_llm_client.py [--calls 200] [--latency-ms 0]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, List, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from langchain.output_parsers import (  # noqa: E402
+    OutputFixingParser,
+    PydanticOutputParser,
+)
+from langchain.prompts import PromptTemplate  # noqa: E402
+from langchain_openai import ChatOpenAI  # noqa: E402
+
+from aimaze.ai.client import LLMRegistry, LLMSettings  # noqa: E402
+from aimaze.ai.descriptions import (  # noqa: E402
+    LOCATION_DESCRIPTION_PROMPT,
+    LocationDescription,
+)
+
+_COMPLETION = {
+    "id": "chatcmpl-bench",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "gpt-4o-mini",
+    "choices": [{
+        "index": 0,
+        "finish_reason": "stop",
+        "message": {
+            "role": "assistant",
+            "content": json.dumps({"description": "Una sala húmeda y silenciosa."}),
+        },
+    }],
+    "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+}
+
+
+def _stream_events(body: bytes, chunk_chars: int) -> List[bytes]:
+    """Eventos SSE (chat.completion.chunk) con el contenido de una respuesta."""
+    content = json.loads(body)["choices"][0]["message"]["content"]
+    pieces = [
+        content[i:i + chunk_chars]
+        for i in range(0, len(content), chunk_chars)
+    ]
+    deltas = [{"role": "assistant", "content": ""}]
+    deltas += [{"content": piece} for piece in pieces]
+    events = []
+    for n, delta in enumerate(deltas + [{}]):
+        chunk = {
+            "id": "chatcmpl-bench",
+            "object": "chat.completion.chunk",
+            "created": 0,
+            "model": "gpt-4o-mini",
+            "choices": [{
+                "index": 0,
+                "delta": delta,
+                "finish_reason": None if n < len(deltas) else "stop",
+            }],
+        }
+        events.append(f"data: {json.dumps(chunk)}\n\n".encode())
+    events.append(b"data: [DONE]\n\n")
+    return events
+
+
+def _write_chunked(wfile, events: List[bytes], delay_ms: float) -> None:
+    """Envía cada evento como un trozo HTTP, esperando delay_ms entre ellos."""
+    for n, event in enumerate(events):
+        if n and delay_ms:
+            time.sleep(delay_ms / 1000)
+        wfile.write(b"%x\r\n%s\r\n" % (len(event), event))
+        wfile.flush()
+    wfile.write(b"0\r\n\r\n")
+    wfile.flush()
+
+
+class FakeOpenAIServer:
+    """
+    Servidor HTTP/1.1 local con keep-alive que cuenta conexiones y peticiones.
+
+    responder, si se indica, recibe el texto del último mensaje de cada petición
+    y devuelve el contenido de la respuesta del asistente. Las peticiones con
+    "stream": true se responden como la API (eventos SSE chat.completion.chunk),
+    partiendo el contenido en trozos de chunk_chars caracteres separados por
+    chunk_delay_ms; sin streaming, la respuesta se envía tras el mismo tiempo
+    total.
+    """
+
+    def __init__(
+        self,
+        latency_ms: float = 0.0,
+        responder: Optional[Callable[[str], str]] = None,
+        chunk_chars: int = 8,
+        chunk_delay_ms: float = 0.0,
+    ):
+        server = self
+        self.connections = 0
+        self.requests = 0
+        # Cuerpo JSON de la última petición recibida
+        self.last_request: Optional[dict] = None
+        fixed_body = json.dumps(_COMPLETION).encode()
+
+        def response_body(request: bytes) -> bytes:
+            if responder is None:
+                return fixed_body
+            prompt = json.loads(request)["messages"][-1]["content"]
+            completion = json.loads(fixed_body)
+            completion["choices"][0]["message"]["content"] = responder(prompt)
+            return json.dumps(completion).encode()
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Cabeceras y cuerpo en un solo envío (sin esperas de Nagle)
+            wbufsize = -1
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                super().setup()
+                server.connections += 1
+
+            def do_POST(self):
+                request = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                server.requests += 1
+                server.last_request = json.loads(request)
+                body = response_body(request)
+                if latency_ms:
+                    time.sleep(latency_ms / 1000)
+                events = _stream_events(body, chunk_chars)
+                if json.loads(request).get("stream"):
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/event-stream")
+                    self.send_header("Transfer-Encoding", "chunked")
+                    self.end_headers()
+                    _write_chunked(self.wfile, events, chunk_delay_ms)
+                    return
+                # Sin streaming, la respuesta llega cuando se "generó" entera
+                time.sleep(chunk_delay_ms * (len(events) - 1) / 1000)
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_address[1]}/v1"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.httpd.shutdown()
+
+
+def legacy_call(context: str, base_url: str, invoke: bool = True):
+    """Réplica de la implementación anterior: todo se crea en cada llamada."""
+    llm = ChatOpenAI(
+        model="gpt-4o-mini", temperature=0.7,
+        openai_api_key=os.getenv("OPENAI_API_KEY"), base_url=base_url,
+    )
+    parser = PydanticOutputParser(pydantic_object=LocationDescription)
+    fixing_parser = OutputFixingParser.from_llm(parser=parser, llm=llm)
+    prompt = PromptTemplate(
+        template=LOCATION_DESCRIPTION_PROMPT,
+        input_variables=["location_context"],
+        partial_variables={"format_instructions": parser.get_format_instructions()},
+    )
+    formatted = prompt.format(location_context=context)
+    if invoke:
+        return fixing_parser.parse(llm.invoke(formatted).content)
+    return formatted
+
+
+def shared_call(registry: LLMRegistry, context: str, invoke: bool = True):
+    """Ruta actual de generate_location_description con un registro dado."""
+    llm = registry.llm(temperature=0.7)
+    parsers = registry.parsers(LocationDescription, llm)
+    prompt = registry.prompt(
+        "location_description", LOCATION_DESCRIPTION_PROMPT,
+        input_variables=["location_context"],
+        format_instructions=parsers.format_instructions,
+    )
+    formatted = prompt.format(location_context=context)
+    if invoke:
+        return parsers.fixing_parser.parse(llm.invoke(formatted).content)
+    return formatted
+
+
+def _timings(fn: Callable[[int], object], calls: int) -> List[float]:
+    fn(-1)  # calentamiento (imports perezosos, primera conexión)
+    timings = []
+    for i in range(calls):
+        t0 = time.perf_counter()
+        fn(i)
+        timings.append((time.perf_counter() - t0) * 1000)
+    return timings
+
+
+def _report(name: str, timings: List[float], extra: str = "") -> None:
+    timings = sorted(timings)
+    p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+    print(
+        f"{name:<28} {statistics.median(timings):>9.3f} {p95:>9.3f}  {extra}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=0.0,
+                        help="Latencia simulada del servidor por petición")
+    args = parser.parse_args()
+    os.environ.setdefault("OPENAI_API_KEY", "bench")
+
+    server = FakeOpenAIServer(args.latency_ms)
+    registry = LLMRegistry(LLMSettings(base_url=server.base_url))
+    print(f"{'ruta':<28} {'p50 (ms)':>9} {'p95 (ms)':>9}")
+    try:
+        _report("preparación (antes)", _timings(
+            lambda i: legacy_call(f"Level 1 at ({i},0)", server.base_url, False),
+            args.calls,
+        ))
+        _report("preparación (compartida)", _timings(
+            lambda i: shared_call(registry, f"Level 1 at ({i},0)", False),
+            args.calls,
+        ))
+
+        before = server.connections
+        timings = _timings(
+            lambda i: legacy_call(f"Level 1 at ({i},0)", server.base_url), args.calls
+        )
+        _report("llamada (antes)", timings,
+                f"{server.connections - before} conexiones")
+
+        before = server.connections
+        timings = _timings(
+            lambda i: shared_call(registry, f"Level 1 at ({i},0)"), args.calls
+        )
+        _report("llamada (compartida)", timings,
+                f"{server.connections - before} conexiones")
+    finally:
+        registry.close()
+        server.close()
+
+
+if __name__ == "__main__":
+    main()
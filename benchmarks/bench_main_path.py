@@ -0,0 +1,60 @@
+"""Benchmark de generate_advanced_main_path por tamaño de rejilla.
+
+Uso:
+    python benchmarks/bench_main_path.py [--sizes 5 30 100 200 400] [--runs 5]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from aimaze.generation.dungeon_generator import (  # noqa: E402
+    calculate_smart_path_length,
+    generate_advanced_main_path,
+    generate_random_start_exit_points,
+)
+
+
+def bench_size(size: int, runs: int, seed: int) -> dict:
+    """Mide el tiempo medio y la fidelidad de longitud para una rejilla size x size."""
+    random.seed(seed)
+    timings = []
+    deviations = []
+    for _ in range(runs):
+        start, end = generate_random_start_exit_points(size, size)
+        target = calculate_smart_path_length(start, end, size, size)
+        t0 = time.perf_counter()
+        path = generate_advanced_main_path(start, end, size, size, target)
+        timings.append(time.perf_counter() - t0)
+        deviations.append(abs(len(path) - target))
+    return {
+        "size": size,
+        "mean_ms": statistics.mean(timings) * 1000,
+        "max_ms": max(timings) * 1000,
+        "max_deviation": max(deviations),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5, 30, 100, 200, 400])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=1234)
+    args = parser.parse_args()
+
+    print(f"{'rejilla':>10} {'media (ms)':>12} {'máx (ms)':>10} {'desv. máx':>10}")
+    for size in args.sizes:
+        result = bench_size(size, args.runs, args.seed)
+        print(
+            f"{size:>4}x{size:<5} {result['mean_ms']:>12.2f} "
+            f"{result['max_ms']:>10.2f} {result['max_deviation']:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""Benchmark de los tipos de ejecución (dataclasses con __slots__) frente a pydantic.
+
+Compara, para las salas y la ubicación del jugador, el coste de las dataclasses
+de ejecución con el de sus esquemas pydantic de aimaze.schemas (que tienen los
+mismos campos que los antiguos modelos de ejecución):
+
+- memoria por sala y tiempo de creación de N salas
+- tiempo de mutar PlayerLocation (cada movimiento del jugador)
+- tiempo de generate_dungeon_layout y de la conversión a/desde el esquema
+
+Uso:
+    python benchmarks/bench_models.py [--rooms 100000] [--sizes 30 100 200]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Callable, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from aimaze.dungeon import Dungeon, PlayerLocation, Room  # noqa: E402
+from aimaze.generation.dungeon_generator import generate_dungeon_layout  # noqa: E402
+from aimaze.generation.layout_cache import LayoutCache  # noqa: E402
+from aimaze.schemas import (  # noqa: E402
+    PlayerLocationSchema,
+    RoomSchema,
+    dump_model,
+    load_model,
+)
+
+
+def _rooms(factory: Callable, count: int) -> list:
+    return [
+        factory(
+            id=f"additional_{i}",
+            coordinates=(i % 1000, i // 1000),
+            connections={"east": (i % 1000 + 1, i // 1000)},
+        )
+        for i in range(count)
+    ]
+
+
+def measure_rooms(factory: Callable, count: int) -> dict:
+    """Tiempo de creación y memoria retenida por sala."""
+    t0 = time.perf_counter()
+    _rooms(factory, count)
+    elapsed = time.perf_counter() - t0
+
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    rooms = _rooms(factory, count)
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del rooms
+    return {
+        "us_per_room": elapsed / count * 1e6,
+        "bytes_per_room": (after - before) / count,
+    }
+
+
+def measure_moves(location, steps: int) -> float:
+    """Nanosegundos por movimiento (dos asignaciones de coordenadas)."""
+    t0 = time.perf_counter()
+    for i in range(steps):
+        location.x = i
+        location.y = i
+    return (time.perf_counter() - t0) / steps * 1e9
+
+
+def measure_generation(size: int, runs: int) -> dict:
+    timings: List[float] = []
+    dumps: List[float] = []
+    loads: List[float] = []
+    for seed in range(1, runs + 1):
+        t0 = time.perf_counter()
+        dungeon = generate_dungeon_layout(seed, size, size, LayoutCache(max_entries=1))
+        timings.append(time.perf_counter() - t0)
+        t0 = time.perf_counter()
+        data = dump_model(dungeon)
+        dumps.append(time.perf_counter() - t0)
+        t0 = time.perf_counter()
+        load_model(Dungeon, data)
+        loads.append(time.perf_counter() - t0)
+    return {
+        "generate_ms": statistics.median(timings) * 1000,
+        "dump_ms": statistics.median(dumps) * 1000,
+        "load_ms": statistics.median(loads) * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rooms", type=int, default=100_000)
+    parser.add_argument("--moves", type=int, default=500_000)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[30, 100, 200])
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"Salas ({args.rooms}):")
+    print(f"{'tipo':<22} {'µs/sala':>10} {'bytes/sala':>12}")
+    factories = (("Room (slots)", Room), ("RoomSchema (pydantic)", RoomSchema))
+    for name, factory in factories:
+        result = measure_rooms(factory, args.rooms)
+        print(
+            f"{name:<22} {result['us_per_room']:>10.2f} "
+            f"{result['bytes_per_room']:>12.0f}"
+        )
+
+    print(f"\nMovimientos ({args.moves}):")
+    for name, location in (
+        ("PlayerLocation", PlayerLocation(level=1, x=0, y=0)),
+        ("PlayerLocationSchema", PlayerLocationSchema(level=1, x=0, y=0)),
+    ):
+        print(f"{name:<22} {measure_moves(location, args.moves):>10.1f} ns/mov.")
+
+    print("\nGeneración y conversión en la frontera:")
+    print(
+        f"{'rejilla':>9} {'generar (ms)':>13} {'volcar (ms)':>12} "
+        f"{'cargar (ms)':>12}"
+    )
+    for size in args.sizes:
+        result = measure_generation(size, args.runs)
+        print(
+            f"{size:>4}x{size:<4} {result['generate_ms']:>13.2f} "
+            f"{result['dump_ms']:>12.2f} {result['load_ms']:>12.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
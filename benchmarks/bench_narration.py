@@ -0,0 +1,68 @@
+"""Benchmark del coste por descripción de cada proveedor de narración.
+
+- procedural: ProceduralNarrationProvider, sin red
+- llm: LLMNarrationProvider contra un servidor local que imita la API de
+  OpenAI (con --latency-ms de latencia simulada por petición)
+
+Uso:
+    python benchmarks/bench_narration.py [--calls 2000] [--latency-ms 0]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from bench_llm_client import FakeOpenAIServer  # noqa: E402
+
+from aimaze.ai.client import LLMRegistry, LLMSettings  # noqa: E402
+from aimaze.ai.narration import (  # noqa: E402
+    LLMNarrationProvider,
+    ProceduralNarrationProvider,
+)
+
+
+def _measure(provider, calls):
+    provider.describe_location("Level 1 at (0,0)")  # calentamiento
+    timings = []
+    texts = set()
+    for i in range(calls):
+        t0 = time.perf_counter()
+        texts.add(provider.describe_location(
+            f"Level 1 at ({i % 50},{i // 50})").description)
+        timings.append((time.perf_counter() - t0) * 1_000_000)
+    return statistics.median(timings), len(texts)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--llm-calls", type=int, default=100)
+    parser.add_argument("--latency-ms", type=float, default=0.0,
+                        help="Latencia simulada del servidor por petición")
+    args = parser.parse_args()
+    os.environ.setdefault("OPENAI_API_KEY", "bench")
+
+    print(f"{'proveedor':<12} {'p50 (µs)':>10} {'distintas':>10}")
+    median, distinct = _measure(ProceduralNarrationProvider(), args.calls)
+    print(f"{'procedural':<12} {median:>10.1f} {distinct:>10}")
+
+    server = FakeOpenAIServer(args.latency_ms)
+    registry = LLMRegistry(LLMSettings(base_url=server.base_url))
+    try:
+        with patch("aimaze.ai.descriptions.get_llm_registry", return_value=registry), \
+                patch("aimaze.ai.client._create_callbacks", return_value=[]):
+            median, distinct = _measure(LLMNarrationProvider(), args.llm_calls)
+    finally:
+        registry.close()
+        server.close()
+    print(f"{'llm (local)':<12} {median:>10.1f} {distinct:>10}")
+
+
+if __name__ == "__main__":
+    main()
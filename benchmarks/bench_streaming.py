@@ -0,0 +1,92 @@
+"""Benchmark de la latencia percibida de una descripción con y sin streaming.
+
+Pide descripciones contra un servidor local que imita la API de OpenAI, que
+envía la respuesta en trozos de --chunk-chars caracteres separados por
+--chunk-delay-ms (como un modelo que genera tokens), y mide:
+
+- completa: generate_location_description; el jugador no ve nada hasta que
+  termina la respuesta
+- streaming: stream_location_description; tiempo hasta el primer texto
+  mostrado y hasta el resultado final ya validado
+
+Uso:
+    python benchmarks/bench_streaming.py [--calls 10] [--chunk-delay-ms 20]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from bench_llm_client import FakeOpenAIServer  # noqa: E402
+
+from aimaze.ai.client import LLMRegistry, LLMSettings  # noqa: E402
+from aimaze.ai.descriptions import (  # noqa: E402
+    generate_location_description,
+    stream_location_description,
+)
+
+_DESCRIPTION = (
+    "Una sala húmeda de piedra negra donde el agua gotea desde grietas del "
+    "techo. Un olor a moho y a cera quemada flota en el aire, y algo "
+    "arrastra los pies al otro lado del muro, riéndose en voz baja."
+)
+
+
+def _median_ms(values):
+    return statistics.median(values) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=10)
+    parser.add_argument("--chunk-chars", type=int, default=8)
+    parser.add_argument("--chunk-delay-ms", type=float, default=20.0,
+                        help="Espera entre trozos de la respuesta")
+    args = parser.parse_args()
+    os.environ.setdefault("OPENAI_API_KEY", "bench")
+
+    server = FakeOpenAIServer(
+        responder=lambda prompt: json.dumps({"description": _DESCRIPTION}),
+        chunk_chars=args.chunk_chars,
+        chunk_delay_ms=args.chunk_delay_ms,
+    )
+    registry = LLMRegistry(LLMSettings(base_url=server.base_url))
+    full, first_text, streamed = [], [], []
+    try:
+        with patch("aimaze.ai.descriptions.get_llm_registry", return_value=registry), \
+                patch("aimaze.ai.client._create_callbacks", return_value=[]):
+            # Calentamiento (imports perezosos, primera conexión)
+            generate_location_description("Level 1 at (0,0)")
+            for i in range(args.calls):
+                context = f"Level 1 at ({i},0)"
+                t0 = time.perf_counter()
+                generate_location_description(context)
+                full.append(time.perf_counter() - t0)
+
+                first = []
+                t0 = time.perf_counter()
+                stream_location_description(
+                    context,
+                    lambda text: first or first.append(time.perf_counter() - t0),
+                )
+                streamed.append(time.perf_counter() - t0)
+                first_text.extend(first[:1])
+    finally:
+        registry.close()
+        server.close()
+
+    print(f"{'ruta':<28} {'p50 (ms)':>9}")
+    print(f"{'completa':<28} {_median_ms(full):>9.0f}")
+    print(f"{'streaming: primer texto':<28} {_median_ms(first_text):>9.0f}")
+    print(f"{'streaming: resultado final':<28} {_median_ms(streamed):>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
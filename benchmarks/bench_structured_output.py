@@ -0,0 +1,90 @@
+"""Benchmark de la corrección de respuestas mal formadas.
+
+Pide descripciones a un servidor local que imita la API de OpenAI y que
+devuelve, en una fracción --malformed de las peticiones, JSON ligeramente
+incorrecto (vallas de código con coma final). Compara:
+
+- antes: OutputFixingParser directo; cada respuesta mal formada cuesta una
+  segunda llamada al LLM
+- ahora: parse_structured (validación y reparación local; el LLM solo como
+  último recurso)
+
+Uso:
+    python benchmarks/bench_structured_output.py [--calls 50] [--latency-ms 100]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from itertools import count
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from bench_llm_client import FakeOpenAIServer  # noqa: E402
+
+from aimaze.ai.client import LLMRegistry, LLMSettings  # noqa: E402
+from aimaze.ai.descriptions import LocationDescription  # noqa: E402
+from aimaze.ai.structured_output import (  # noqa: E402
+    StructuredOutputStats,
+    parse_structured,
+)
+
+_VALID = json.dumps({"description": "Una sala húmeda y silenciosa."})
+_MALFORMED = '```json\n{"description": "Una sala húmeda y silenciosa.",}\n```'
+
+
+def _responder(malformed: float):
+    calls = count()
+    period = round(1 / malformed) if malformed else 0
+
+    def respond(prompt: str) -> str:
+        # Las peticiones de corrección del OutputFixingParser reciben JSON válido
+        if "Instructions:" in prompt or not period:
+            return _VALID
+        return _MALFORMED if next(calls) % period == 0 else _VALID
+    return respond
+
+
+def _run(name, calls, latency_ms, malformed, parse):
+    server = FakeOpenAIServer(latency_ms, responder=_responder(malformed))
+    registry = LLMRegistry(LLMSettings(base_url=server.base_url))
+    try:
+        with patch("aimaze.ai.client._create_callbacks", return_value=[]):
+            llm = registry.structured_llm(LocationDescription)
+            parsers = registry.parsers(LocationDescription, registry.llm())
+            t0 = time.perf_counter()
+            for i in range(calls):
+                parse(llm.invoke(f"Level 1 at ({i},0)").content, parsers.fixing_parser)
+            elapsed = time.perf_counter() - t0
+    finally:
+        registry.close()
+        server.close()
+    print(f"{name:<8} {server.requests:>10} {elapsed * 1000:>10.0f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=100.0,
+                        help="Latencia simulada del servidor por petición")
+    parser.add_argument("--malformed", type=float, default=0.2,
+                        help="Fracción de respuestas mal formadas")
+    args = parser.parse_args()
+    os.environ.setdefault("OPENAI_API_KEY", "bench")
+
+    stats = StructuredOutputStats()
+    print(f"{'ruta':<8} {'peticiones':>10} {'total (ms)':>10}")
+    _run("antes", args.calls, args.latency_ms, args.malformed,
+         lambda content, fixer: fixer.parse(content))
+    _run("ahora", args.calls, args.latency_ms, args.malformed,
+         lambda content, fixer: parse_structured(
+             content, LocationDescription, fixer, stats))
+    print(stats.stats())
+
+
+if __name__ == "__main__":
+    main()
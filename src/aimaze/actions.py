@@ -1,27 +1,42 @@
 # src/aimaze/actions.py
 
-from aimaze.dungeon import get_room_at_coords
-from aimaze.game_state import check_game_over
+import re
+
+from aimaze.game_state import (
+    check_game_over,
+    is_event_resolved,
+    is_location_visited,
+    mark_event_resolved,
+    mark_location_visited,
+)
+from aimaze.pathfinding import find_path
+from aimaze.room_options import direction_name, get_room_options
 from aimaze.save_load import save_game
 from aimaze.ai_connector import generate_random_event
 from aimaze.events import resolve_event, GameEvent
 
+# Comandos de texto para viajar varias salas en un solo turno
+TRAVEL_TO_PATTERN = re.compile(r"^ir a \(?\s*(\d+)\s*,\s*(\d+)\s*\)?$")
+RETURN_TO_EXIT_COMMANDS = {"volver a la salida", "ir a la salida"}
+
 
 def process_player_action(game_state, raw_input):
     """
     Processes the player's action using the coordinate-based system.
     Validates movement through room connections and manages game state.
+    Moves are checked against the room's cached option table
+    (aimaze.room_options), so a turn is a couple of dict lookups.
     """
     valid_options = game_state.get("current_options_map", {})
     player_location = game_state["player_location"]
     dungeon = game_state["dungeon"]
     current_level = dungeon.levels[player_location.level]
 
-    # Obtener la habitación actual usando get_room_at_coords()
-    current_room = get_room_at_coords(
+    # Tabla de opciones precalculada de la habitación actual
+    room_options = get_room_options(
         current_level, player_location.x, player_location.y)
 
-    if not current_room:
+    if room_options is None:
         print("\nError: No se puede determinar la habitación actual.")
         game_state["game_over"] = True
         return game_state
@@ -34,7 +49,7 @@ def process_player_action(game_state, raw_input):
 
             if action_type == "exit":
                 # El jugador intenta salir del nivel
-                if (player_location.x, player_location.y) == current_level.exit_coords:
+                if room_options.is_exit:
                     game_state["objective_achieved"] = True
                     print("\n¡Felicidades! Has encontrado la salida y has escapado de la mazmorra.")
                 else:
@@ -49,81 +64,16 @@ def process_player_action(game_state, raw_input):
                     print(f"\nError al guardar la partida: {e}")
 
             else:
-                # Validar que la dirección elegida existe en room.connections
-                direction = action_type
-                if direction not in current_room.connections:
-                    print(
-                        f"\nError: No puedes ir hacia el {direction} desde esta habitación.")
-                    return game_state
-
-                # Obtener las coordenadas objetivo desde room.connections
-                new_x, new_y = current_room.connections[direction]
-
-                # Validación de límites (coordenadas dentro de level.width y level.height)
-                if not (0 <= new_x < current_level.width and 0 <= new_y < current_level.height):
-                    print(
-                        f"\nError: Coordenadas ({new_x}, {new_y}) fuera de los límites del nivel ({current_level.width}x{current_level.height}).")
-                    return game_state
-
-                # Verificar que existe una habitación en las coordenadas objetivo
-                target_room = get_room_at_coords(current_level, new_x, new_y)
-                if not target_room:
-                    print(
-                        f"\nError: No hay habitación en las coordenadas ({new_x}, {new_y}).")
-                    return game_state
-
-                # Al moverse, actualizar game_state['player_location'] con las nuevas coordenadas
-                player_location.x = new_x
-                player_location.y = new_y
-
-                # Traducir dirección a texto amigable
-                direction_text = {
-                    'north': 'Norte',
-                    'south': 'Sur',
-                    'east': 'Este',
-                    'west': 'Oeste'
-                }.get(direction, direction.capitalize())
-
-                print(f"\nTe mueves hacia el {direction_text}.")
-                print(f"Ahora estás en la posición ({new_x}, {new_y}).")
-
-                # Verificar si las nuevas coordenadas son exit_coords del nivel actual para establecer objective_achieved = True
-                if (new_x, new_y) == current_level.exit_coords:
-                    print("¡Has encontrado la salida del nivel!")
-                    # No establecer objective_achieved aquí, el jugador debe elegir explícitamente "INTENTAR SALIR"
-
-                # Generación de eventos aleatorios (30% prob) al entrar en nueva habitación
-                # Evitar repetir evento si ya se resolvió en esta ubicación
-                location_key = f"event_resolved_{player_location.level}:{new_x}:{new_y}"
-                if game_state.get("enable_events", False) and not game_state.get(location_key):
-                    event = generate_random_event(
-                        f"Level {player_location.level} at ({new_x},{new_y})"
-                    )
-                    if isinstance(event, GameEvent):
-                        print("\nUn evento tiene lugar...")
-                        if event.ascii_art:
-                            print(event.ascii_art)
-
-                        player_input = None
-                        if event.puzzle_solution:
-                            # Para MVP en CLI: pedir respuesta libre del jugador
-                            try:
-                                player_input = input("Responde al reto: ").strip()
-                            except Exception:
-                                player_input = ""
-
-                        success, narrative = resolve_event(
-                            game_state, event, player_input
-                        )
-                        print(narrative)
-
-                        # Marcar evento como resuelto para esta ubicación
-                        game_state[location_key] = True
+                _move_in_direction(game_state, current_level, room_options, action_type)
 
         else:
             print(f"\nAcción no reconocida: {chosen_action}")
     else:
-        print("Opción inválida. Por favor ingresa el número de una de las opciones disponibles.")
+        travel_target = parse_travel_command(raw_input, current_level)
+        if travel_target is not None:
+            travel_to(game_state, current_level, travel_target)
+        else:
+            print("Opción inválida. Por favor ingresa el número de una de las opciones disponibles.")
 
     # Verificar condiciones de fin de juego
     if check_game_over(game_state):
@@ -135,6 +85,138 @@ def process_player_action(game_state, raw_input):
     return game_state
 
 
+def _move_in_direction(game_state, current_level, room_options, direction):
+    """
+    Mueve al jugador una sala en la dirección indicada.
+
+    Las conexiones se validaron (límites del nivel y sala de destino) al
+    construir room_options, así que aquí solo se consulta el resultado.
+    """
+    target = room_options.targets.get(direction)
+    if target is None:
+        reason = room_options.move_errors.get(
+            direction, f"No puedes ir hacia el {direction} desde esta habitación.")
+        print(f"\nError: {reason}")
+        return
+    new_x, new_y = target
+
+    # Al moverse, actualizar game_state['player_location'] con las nuevas coordenadas
+    player_location = game_state["player_location"]
+    player_location.x = new_x
+    player_location.y = new_y
+    mark_location_visited(game_state, player_location)
+
+    print(f"\nTe mueves hacia el {direction_name(direction)}.")
+    print(f"Ahora estás en la posición ({new_x}, {new_y}).")
+
+    # Verificar si las nuevas coordenadas son exit_coords del nivel actual para establecer objective_achieved = True
+    if (new_x, new_y) == current_level.exit_coords:
+        print("¡Has encontrado la salida del nivel!")
+        # No establecer objective_achieved aquí, el jugador debe elegir explícitamente "INTENTAR SALIR"
+
+    _trigger_room_event(game_state, player_location)
+
+
+def _trigger_room_event(game_state, player_location):
+    """
+    Generación de eventos aleatorios (30% prob) al entrar en nueva habitación.
+    Devuelve True si ha tenido lugar un evento.
+    """
+    # Evitar repetir evento si ya se resolvió en esta ubicación
+    if not game_state.get("enable_events", False) or is_event_resolved(
+        game_state, player_location
+    ):
+        return False
+
+    event = generate_random_event(
+        f"Level {player_location.level} at ({player_location.x},{player_location.y})"
+    )
+    if not isinstance(event, GameEvent):
+        return False
+
+    print("\nUn evento tiene lugar...")
+    if event.ascii_art:
+        print(event.ascii_art)
+
+    player_input = None
+    if event.puzzle_solution:
+        # Para MVP en CLI: pedir respuesta libre del jugador
+        try:
+            player_input = input("Responde al reto: ").strip()
+        except Exception:
+            player_input = ""
+
+    success, narrative = resolve_event(game_state, event, player_input)
+    print(narrative)
+
+    # Marcar evento como resuelto para esta ubicación
+    mark_event_resolved(game_state, player_location)
+    return True
+
+
+def parse_travel_command(raw_input, current_level):
+    """
+    Interpreta los comandos de viaje 'ir a (x,y)' y 'volver a la salida'.
+
+    Returns:
+        Coordenadas (x, y) de destino, o None si raw_input no es un comando de viaje
+    """
+    command = " ".join(raw_input.strip().lower().split())
+    if command in RETURN_TO_EXIT_COMMANDS:
+        return tuple(current_level.exit_coords)
+    match = TRAVEL_TO_PATTERN.match(command)
+    if match:
+        return int(match.group(1)), int(match.group(2))
+    return None
+
+
+def travel_to(game_state, current_level, target):
+    """
+    Recorre en un solo turno el camino más corto hasta una sala ya visitada,
+    pasando solo por salas visitadas (no se atajan zonas sin explorar).
+
+    Cada sala del recorrido se marca como visitada y puede disparar su evento;
+    el viaje se interrumpe si ocurre un evento o el jugador cae. La escena solo
+    se vuelve a mostrar al final, en el siguiente display_scenario.
+    """
+    player_location = game_state["player_location"]
+    origin = (player_location.x, player_location.y)
+    target = tuple(target)
+
+    if target == origin:
+        print(f"\nYa estás en la posición {target}.")
+        return
+    if not is_location_visited(game_state, player_location.level, *target):
+        if target == tuple(current_level.exit_coords):
+            print("\nAún no has encontrado la salida de este nivel.")
+        else:
+            print(f"\nSolo puedes viajar a salas que ya has visitado; {target} no lo está.")
+        return
+
+    level_id = player_location.level
+    route = find_path(
+        current_level, origin, target,
+        allowed=lambda x, y: is_location_visited(game_state, level_id, x, y),
+    )
+    if route is None:
+        print(f"\nNo hay camino conocido hasta la posición {target}.")
+        return
+
+    steps = 0
+    for x, y in route[1:]:
+        player_location.x = x
+        player_location.y = y
+        mark_location_visited(game_state, player_location)
+        steps += 1
+        if _trigger_room_event(game_state, player_location) or check_game_over(game_state):
+            print(f"El viaje se interrumpe en la posición ({x}, {y}).")
+            break
+
+    print(f"\nViajas {steps} salas hasta la posición ({player_location.x}, {player_location.y}).")
+    if (player_location.x, player_location.y) == tuple(current_level.exit_coords):
+        print("¡Has llegado a la salida del nivel!")
+
+
 def validate_player_input(raw_input, valid_options):
     """
     Validates that the player input corresponds to a valid option.
@@ -161,12 +243,7 @@ def get_action_description(action_type, target_coords=None):
         str: Human-readable description of the action
     """
     if action_type in ['north', 'south', 'east', 'west']:
-        direction_text = {
-            'north': 'Norte',
-            'south': 'Sur',
-            'east': 'Este',
-            'west': 'Oeste'
-        }.get(action_type, action_type.capitalize())
+        direction_text = direction_name(action_type)
 
         if target_coords:
             return f"Moverse hacia el {direction_text} a las coordenadas {target_coords}"
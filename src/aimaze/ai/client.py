@@ -0,0 +1,298 @@
+"""Cliente LLM compartido por todo el proceso.
+
+Crear ChatOpenAI, los parsers, la plantilla del prompt y el CallbackHandler de
+Langfuse en cada llamada tiene un coste fijo apreciable y, sobre todo, impide
+reutilizar las conexiones HTTP. LLMRegistry crea cada objeto una sola vez, de
+forma perezosa y segura entre hilos, sobre un httpx.Client (y un
+httpx.AsyncClient para ainvoke) con pool de conexiones y keep-alive
+configurables:
+
+- AIMAZE_LLM_MODEL: modelo por defecto (gpt-4o-mini)
+- AIMAZE_LLM_BASE_URL: URL base alternativa de la API (proxy, servidor local)
+- AIMAZE_LLM_TIMEOUT: timeout de cada petición en segundos (30)
+- AIMAZE_LLM_MAX_CONNECTIONS: conexiones simultáneas del pool (10)
+- AIMAZE_LLM_MAX_KEEPALIVE: conexiones ociosas que se conservan (5)
+- AIMAZE_LLM_KEEPALIVE_EXPIRY: segundos que se conserva una conexión ociosa (30)
+- AIMAZE_LLM_STRUCTURED_OUTPUT: 0 desactiva el modo de salida estructurada de
+  la API (para servidores compatibles que no admiten response_format)
+"""
+
+import os
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+import httpx
+from langchain.output_parsers import OutputFixingParser, PydanticOutputParser
+from langchain.prompts import PromptTemplate
+from langchain_core.runnables import Runnable
+from langchain_openai import ChatOpenAI
+from langfuse.langchain import CallbackHandler
+from pydantic import BaseModel
+
+from aimaze.ai.structured_output import json_schema_response_format
+
+DEFAULT_MODEL = "gpt-4o-mini"
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    return default if value in (None, "") else float(value)
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return default if value in (None, "") else int(value)
+
+
+@dataclass(frozen=True)
+class LLMSettings:
+    """Configuración del cliente y del pool de conexiones HTTP."""
+    model: str = DEFAULT_MODEL
+    base_url: Optional[str] = None
+    timeout: float = 30.0
+    max_connections: int = 10
+    max_keepalive_connections: int = 5
+    keepalive_expiry: float = 30.0
+    structured_output: bool = True
+
+    @classmethod
+    def from_env(cls) -> "LLMSettings":
+        return cls(
+            model=os.getenv("AIMAZE_LLM_MODEL") or DEFAULT_MODEL,
+            base_url=os.getenv("AIMAZE_LLM_BASE_URL") or None,
+            timeout=_env_float("AIMAZE_LLM_TIMEOUT", 30.0),
+            max_connections=_env_int("AIMAZE_LLM_MAX_CONNECTIONS", 10),
+            max_keepalive_connections=_env_int("AIMAZE_LLM_MAX_KEEPALIVE", 5),
+            keepalive_expiry=_env_float("AIMAZE_LLM_KEEPALIVE_EXPIRY", 30.0),
+            structured_output=os.getenv("AIMAZE_LLM_STRUCTURED_OUTPUT") != "0",
+        )
+
+
+@dataclass(frozen=True)
+class ParserBundle:
+    """Parser de un modelo pydantic, su versión con corrección y sus instrucciones."""
+    parser: PydanticOutputParser
+    fixing_parser: OutputFixingParser
+    format_instructions: str
+
+
+class LLMRegistry:
+    """
+    Objetos LLM compartidos: cliente HTTP, modelos, parsers, prompts y callbacks.
+
+    Todos se crean la primera vez que se piden y se reutilizan después; son
+    seguros para usarse desde varios hilos a la vez (httpx.Client, ChatOpenAI y
+    los parsers no guardan estado por llamada). Si la creación falla (p. ej.
+    falta OPENAI_API_KEY) no se cachea nada y el error llega al llamador.
+    """
+
+    def __init__(self, settings: Optional[LLMSettings] = None):
+        self.settings = LLMSettings.from_env() if settings is None else settings
+        self._lock = threading.RLock()
+        self._http_client: Optional[httpx.Client] = None
+        self._async_http_client: Optional[httpx.AsyncClient] = None
+        self._llms: Dict[Tuple[str, float], ChatOpenAI] = {}
+        self._structured_llms: Dict[Tuple[Type[BaseModel], float], Runnable] = {}
+        self._parsers: Dict[Tuple[Type[BaseModel], int], ParserBundle] = {}
+        self._prompts: Dict[str, PromptTemplate] = {}
+        self._callbacks: Optional[List[Any]] = None
+
+    def _limits(self) -> httpx.Limits:
+        settings = self.settings
+        return httpx.Limits(
+            max_connections=settings.max_connections,
+            max_keepalive_connections=settings.max_keepalive_connections,
+            keepalive_expiry=settings.keepalive_expiry,
+        )
+
+    def http_client(self) -> httpx.Client:
+        """httpx.Client con pool de conexiones y keep-alive compartido."""
+        client = self._http_client
+        if client is not None:
+            return client
+        with self._lock:
+            if self._http_client is None:
+                self._http_client = httpx.Client(
+                    timeout=self.settings.timeout, limits=self._limits()
+                )
+            return self._http_client
+
+    def async_http_client(self) -> httpx.AsyncClient:
+        """
+        httpx.AsyncClient con el mismo pool, para las llamadas con ainvoke.
+
+        Sus conexiones quedan ligadas al bucle de eventos que las abre: el
+        registro global está pensado para un único asyncio.run (el del bucle de
+        juego); en otros casos conviene un LLMRegistry propio.
+        """
+        client = self._async_http_client
+        if client is not None:
+            return client
+        with self._lock:
+            if self._async_http_client is None:
+                self._async_http_client = httpx.AsyncClient(
+                    timeout=self.settings.timeout, limits=self._limits()
+                )
+            return self._async_http_client
+
+    def llm(self, temperature: float = 0.7, model: Optional[str] = None) -> ChatOpenAI:
+        """ChatOpenAI compartido para (modelo, temperatura)."""
+        key = (model or self.settings.model, temperature)
+        llm = self._llms.get(key)
+        if llm is not None:
+            return llm
+        with self._lock:
+            llm = self._llms.get(key)
+            if llm is None:
+                llm = ChatOpenAI(
+                    model=key[0],
+                    temperature=temperature,
+                    openai_api_key=os.getenv("OPENAI_API_KEY"),
+                    base_url=self.settings.base_url,
+                    timeout=self.settings.timeout,
+                    http_client=self.http_client(),
+                    http_async_client=self.async_http_client(),
+                )
+                self._llms[key] = llm
+            return llm
+
+    def structured_llm(
+        self, model_cls: Type[BaseModel], temperature: float = 0.7
+    ) -> Runnable:
+        """
+        llm(temperature) con la salida restringida al esquema JSON de model_cls.
+
+        La respuesta sigue siendo un mensaje con el JSON en content (se valida
+        con aimaze.ai.structured_output). Si settings.structured_output es
+        False devuelve el modelo sin restricción.
+        """
+        llm = self.llm(temperature)
+        if not self.settings.structured_output:
+            return llm
+        key = (model_cls, temperature)
+        structured = self._structured_llms.get(key)
+        if structured is not None:
+            return structured
+        with self._lock:
+            structured = self._structured_llms.get(key)
+            if structured is None:
+                structured = llm.bind(
+                    response_format=json_schema_response_format(model_cls))
+                self._structured_llms[key] = structured
+            return structured
+
+    def parsers(self, model_cls: Type[BaseModel], llm: ChatOpenAI) -> ParserBundle:
+        """
+        Parsers de model_cls; el de corrección usa llm para reparar la salida.
+
+        Se cachean por (model_cls, llm): cada modelo o temperatura repara con
+        su propio cliente. El fixing_parser guarda una referencia a llm, así
+        que su id no se reutiliza mientras la entrada siga en la caché.
+        """
+        key = (model_cls, id(llm))
+        bundle = self._parsers.get(key)
+        if bundle is not None:
+            return bundle
+        with self._lock:
+            bundle = self._parsers.get(key)
+            if bundle is None:
+                parser = PydanticOutputParser(pydantic_object=model_cls)
+                bundle = ParserBundle(
+                    parser=parser,
+                    fixing_parser=OutputFixingParser.from_llm(parser=parser, llm=llm),
+                    format_instructions=parser.get_format_instructions(),
+                )
+                self._parsers[key] = bundle
+            return bundle
+
+    def prompt(
+        self, name: str, template: str, input_variables: List[str],
+        format_instructions: str = "",
+    ) -> PromptTemplate:
+        """PromptTemplate registrado con ese nombre (instrucciones ya fijadas)."""
+        prompt = self._prompts.get(name)
+        if prompt is not None:
+            return prompt
+        with self._lock:
+            prompt = self._prompts.get(name)
+            if prompt is None:
+                prompt = PromptTemplate(
+                    template=template,
+                    input_variables=input_variables,
+                    partial_variables={"format_instructions": format_instructions},
+                )
+                self._prompts[name] = prompt
+            return prompt
+
+    def callbacks(self) -> List[Any]:
+        """Callbacks de Langfuse (lista vacía si no está configurado)."""
+        callbacks = self._callbacks
+        if callbacks is not None:
+            return callbacks
+        with self._lock:
+            if self._callbacks is None:
+                self._callbacks = _create_callbacks()
+            return self._callbacks
+
+    def close(self) -> None:
+        """
+        Cierra el pool HTTP y olvida los objetos creados.
+
+        El pool asíncrono solo se puede cerrar desde su bucle de eventos (ver
+        aclose()); aquí únicamente se olvida.
+        """
+        with self._lock:
+            if self._http_client is not None:
+                self._http_client.close()
+            self._http_client = None
+            self._async_http_client = None
+            self._llms.clear()
+            self._structured_llms.clear()
+            self._parsers.clear()
+            self._prompts.clear()
+            self._callbacks = None
+
+    async def aclose(self) -> None:
+        """Cierra también el pool asíncrono; llamar desde su bucle de eventos."""
+        client = self._async_http_client
+        self.close()
+        if client is not None:
+            await client.aclose()
+
+
+def _create_callbacks() -> List[Any]:
+    try:
+        if os.getenv("LANGFUSE_PUBLIC_KEY") and os.getenv("LANGFUSE_SECRET_KEY"):
+            return [CallbackHandler()]
+    except Exception as e:
+        print(f"Warning: No se pudo configurar Langfuse: {e}")
+    return []
+
+
+_llm_registry: Optional[LLMRegistry] = None
+_llm_registry_lock = threading.Lock()
+
+
+def get_llm_registry() -> LLMRegistry:
+    """
+    Registro LLM global del proceso.
+
+    Se crea la primera vez que se usa, con la configuración de las variables
+    AIMAZE_LLM_* vigente en ese momento.
+    """
+    global _llm_registry
+    with _llm_registry_lock:
+        if _llm_registry is None:
+            _llm_registry = LLMRegistry()
+        return _llm_registry
+
+
+def reset_llm_registry() -> None:
+    """Cierra el registro global; el siguiente uso lo recrea con la configuración
+    vigente."""
+    global _llm_registry
+    with _llm_registry_lock:
+        if _llm_registry is not None:
+            _llm_registry.close()
+        _llm_registry = None
@@ -0,0 +1,269 @@
+"""Caché persistente de descripciones de salas en SQLite (Paso 3.1).
+
+Las descripciones generadas se guardan con la clave (semilla de la mazmorra,
+nivel, x, y, versión del prompt, modelo), de modo que una semilla ya jugada no
+vuelve a llamar al LLM aunque se reinicie el proceso. Cambiar el prompt (su
+versión) o el modelo invalida las entradas de forma natural.
+
+- Expulsión LRU por número de entradas (max_entries)
+- Caducidad opcional por antigüedad (ttl_seconds)
+- Contadores de aciertos, fallos, expulsiones, caducadas y errores; un error
+  de SQLite (fichero bloqueado, disco lleno) cuenta como fallo y no interrumpe
+  la partida
+
+Variables de entorno de la caché global (get_description_cache):
+
+- AIMAZE_DESCRIPTION_CACHE: ruta del fichero SQLite; "off" la desactiva
+  (por defecto ~/.cache/aimaze/descriptions.sqlite3)
+- AIMAZE_DESCRIPTION_CACHE_MAX_ENTRIES: máximo de entradas (50000)
+- AIMAZE_DESCRIPTION_CACHE_TTL: segundos de vida de cada entrada (30 días);
+  0 desactiva la caducidad
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, NamedTuple, Optional
+
+DEFAULT_MAX_ENTRIES = 50_000
+DEFAULT_TTL_SECONDS = 30 * 24 * 3600
+DISABLED = "off"
+
+# Versión del esquema (PRAGMA user_version). Un fichero con otra versión se
+# descarta entero: es una caché y se vuelve a llenar jugando.
+SCHEMA_VERSION = 2
+
+# La semilla se guarda como texto: las semillas de Python no tienen límite y
+# SQLite solo admite enteros de 64 bits con signo.
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS descriptions (
+    seed TEXT NOT NULL,
+    level INTEGER NOT NULL,
+    x INTEGER NOT NULL,
+    y INTEGER NOT NULL,
+    prompt_version TEXT NOT NULL,
+    model TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (seed, level, x, y, prompt_version, model)
+);
+CREATE INDEX IF NOT EXISTS descriptions_last_used ON descriptions (last_used);
+"""
+
+_KEY_WHERE = (
+    "seed = ? AND level = ? AND x = ? AND y = ? AND prompt_version = ? AND model = ?"
+)
+
+
+class DescriptionKey(NamedTuple):
+    """Clave de una descripción en la caché."""
+    seed: int
+    level: int
+    x: int
+    y: int
+    prompt_version: str
+    model: str
+
+
+class DescriptionCache:
+    """
+    Caché LRU de descripciones (texto JSON) sobre una base de datos SQLite.
+
+    Es segura entre hilos: una sola conexión protegida por un lock. path=None o
+    ":memory:" crea una caché en memoria (útil en tests). clock se puede
+    sustituir para probar la caducidad.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl_seconds: Optional[float] = DEFAULT_TTL_SECONDS,
+        clock: Callable[[], float] = time.time,
+    ):
+        if max_entries < 1:
+            raise ValueError("max_entries debe ser positivo")
+        self.path = path or ":memory:"
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds or None
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.errors = 0
+
+        if self.path != ":memory:":
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(
+            self.path, check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._migrate()
+
+    def _migrate(self) -> None:
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != SCHEMA_VERSION:
+            self._conn.execute("DROP TABLE IF EXISTS descriptions")
+        self._conn.executescript(_SCHEMA)
+        self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def get(self, key: DescriptionKey) -> Optional[str]:
+        """Devuelve el payload guardado para key (y lo marca como reciente)."""
+        now = self._clock()
+        with self._lock:
+            try:
+                return self._get(key, now)
+            except (sqlite3.Error, OverflowError) as e:
+                self.errors += 1
+                self.misses += 1
+                print(f"Warning: Error leyendo la caché de descripciones: {e}")
+                return None
+
+    def _get(self, key: DescriptionKey, now: float) -> Optional[str]:
+        key = _params(key)
+        row = self._conn.execute(
+            f"SELECT payload, created_at FROM descriptions WHERE {_KEY_WHERE}",
+            key,
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        payload, created_at = row
+        if self.ttl_seconds is not None and now - created_at > self.ttl_seconds:
+            self._conn.execute(f"DELETE FROM descriptions WHERE {_KEY_WHERE}", key)
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._conn.execute(
+            f"UPDATE descriptions SET last_used = ? WHERE {_KEY_WHERE}",
+            (now, *key),
+        )
+        self.hits += 1
+        return payload
+
+    def put(self, key: DescriptionKey, payload: str) -> None:
+        """Guarda payload para key, expulsando las entradas menos usadas si sobran."""
+        now = self._clock()
+        with self._lock:
+            try:
+                self._put(key, payload, now)
+            except (sqlite3.Error, OverflowError) as e:
+                self.errors += 1
+                print(f"Warning: Error escribiendo en la caché de descripciones: {e}")
+
+    def _put(self, key: DescriptionKey, payload: str, now: float) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO descriptions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (*_params(key), payload, now, now),
+        )
+        excess = self._count() - self.max_entries
+        if excess > 0:
+            self._conn.execute(
+                "DELETE FROM descriptions WHERE rowid IN ("
+                "SELECT rowid FROM descriptions ORDER BY last_used LIMIT ?)",
+                (excess,),
+            )
+            self.evictions += excess
+
+    def purge_expired(self) -> int:
+        """Borra todas las entradas caducadas y devuelve cuántas eran."""
+        if self.ttl_seconds is None:
+            return 0
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM descriptions WHERE created_at < ?",
+                (self._clock() - self.ttl_seconds,),
+            )
+            self.expirations += cursor.rowcount
+            return cursor.rowcount
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM descriptions")
+
+    def stats(self) -> Dict[str, int]:
+        """Contadores desde que se abrió la caché y entradas actuales."""
+        with self._lock:
+            return {
+                "entries": self._count(),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "errors": self.errors,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._count()
+
+    def _count(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM descriptions").fetchone()[0]
+
+
+def _params(key: DescriptionKey) -> tuple:
+    """Parámetros SQL de key, con la semilla como texto."""
+    return (str(key.seed), *key[1:])
+
+
+def default_cache_path() -> str:
+    return os.path.join(
+        os.path.expanduser("~"), ".cache", "aimaze", "descriptions.sqlite3"
+    )
+
+
+_description_cache: Optional[DescriptionCache] = None
+_description_cache_lock = threading.Lock()
+_description_cache_disabled = False
+
+
+def get_description_cache() -> Optional[DescriptionCache]:
+    """
+    Caché de descripciones global del proceso, o None si está desactivada.
+
+    Se crea la primera vez que se usa, con las variables AIMAZE_DESCRIPTION_CACHE*
+    vigentes en ese momento. Si el fichero no se puede abrir se avisa y el juego
+    sigue sin caché persistente.
+    """
+    global _description_cache, _description_cache_disabled
+    with _description_cache_lock:
+        if _description_cache is None and not _description_cache_disabled:
+            path = os.getenv("AIMAZE_DESCRIPTION_CACHE") or default_cache_path()
+            if path.lower() == DISABLED:
+                _description_cache_disabled = True
+                return None
+            try:
+                _description_cache = DescriptionCache(
+                    path,
+                    max_entries=int(
+                        os.getenv("AIMAZE_DESCRIPTION_CACHE_MAX_ENTRIES")
+                        or DEFAULT_MAX_ENTRIES
+                    ),
+                    ttl_seconds=float(
+                        os.getenv("AIMAZE_DESCRIPTION_CACHE_TTL") or DEFAULT_TTL_SECONDS
+                    ),
+                )
+            except (OSError, sqlite3.Error, ValueError) as e:
+                print(f"Warning: Caché de descripciones desactivada: {e}")
+                _description_cache_disabled = True
+        return _description_cache
+
+
+def reset_description_cache() -> None:
+    """Cierra la caché global; el siguiente uso la recrea."""
+    global _description_cache, _description_cache_disabled
+    with _description_cache_lock:
+        if _description_cache is not None:
+            _description_cache.close()
+        _description_cache = None
+        _description_cache_disabled = False
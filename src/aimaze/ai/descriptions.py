@@ -1,9 +1,15 @@
-import os
-from langchain_openai import ChatOpenAI
-from langchain.prompts import PromptTemplate
-from langchain.output_parsers import PydanticOutputParser, OutputFixingParser
+from typing import Callable, Optional, Tuple
+
 from pydantic import BaseModel, Field
-from langfuse.langchain import CallbackHandler
+
+from aimaze.ai.client import get_llm_registry
+from aimaze.ai.description_cache import DescriptionKey, get_description_cache
+from aimaze.ai.streaming import JsonStringFieldExtractor
+from aimaze.ai.structured_output import (
+    CACHEABLE_OUTCOMES,
+    aparse_structured,
+    parse_structured,
+)
 
 
 class LocationDescription(BaseModel):
@@ -18,39 +24,12 @@ class LocationDescription(BaseModel):
     )
 
 
-def generate_location_description(location_context: str) -> LocationDescription:
-    """
-    Genera una descripción detallada textual para una ubicación específica.
-
-    Args:
-        location_context: Contexto de la ubicación (ID, estado del juego, etc.)
-
-    Returns:
-        LocationDescription: Objeto con descripción textual detallada
-    """
-    # Configurar el modelo de IA
-    llm = ChatOpenAI(
-        model="gpt-4o-mini",
-        temperature=0.7,
-        openai_api_key=os.getenv("OPENAI_API_KEY"),
-    )
-
-    # Configurar el parser de salida
-    parser = PydanticOutputParser(pydantic_object=LocationDescription)
-    fixing_parser = OutputFixingParser.from_llm(parser=parser, llm=llm)
-
-    # Configurar Langfuse callback para monitoreo
-    langfuse_handler = None
-    try:
-        if os.getenv("LANGFUSE_PUBLIC_KEY") and os.getenv("LANGFUSE_SECRET_KEY"):
-            langfuse_handler = CallbackHandler()
-    except Exception as e:
-        print(f"Warning: No se pudo configurar Langfuse: {e}")
+# Versión del prompt de descripciones: cambiarla al editar la plantilla invalida
+# las descripciones guardadas en la caché persistente
+LOCATION_DESCRIPTION_PROMPT_VERSION = "1"
 
-    # Crear el prompt
-    prompt_template = PromptTemplate(
-        template=(
-            """Eres un maestro de mazmorras experto en crear descripciones inmersivas para ubicaciones.
+# Plantilla del prompt de descripciones (se registra una vez en el LLMRegistry)
+LOCATION_DESCRIPTION_PROMPT = """Eres un maestro de mazmorras experto en crear descripciones inmersivas para ubicaciones.
 
 Contexto de la ubicación: {location_context}
 
@@ -66,35 +45,207 @@ REQUISITOS IMPORTANTES:
 - Utiliza 3 frases como máximo.
 
 {format_instructions}"""
-        ),
-        input_variables=["location_context"],
-        partial_variables={"format_instructions": parser.get_format_instructions()},
-    )
 
-    # Ejecutar la cadena
-    callbacks = [langfuse_handler] if langfuse_handler else []
 
+def generate_location_description(
+    location_context: str,
+    cache_location: Optional[Tuple[int, int, int, int]] = None,
+) -> LocationDescription:
+    """
+    Genera una descripción detallada textual para una ubicación específica.
+
+    El modelo, los parsers, el prompt y los callbacks se comparten entre
+    llamadas a través de aimaze.ai.client.get_llm_registry(). Con
+    cache_location, la descripción se busca antes en la caché persistente
+    (aimaze.ai.description_cache) y las generadas con éxito se guardan en ella
+    (salvo las reconstruidas de una respuesta incompleta).
+
+    Args:
+        location_context: Contexto de la ubicación (ID, estado del juego, etc.)
+        cache_location: (semilla, nivel, x, y) de la sala, si la mazmorra tiene
+            semilla y la descripción puede reutilizarse entre partidas
+
+    Returns:
+        LocationDescription: Objeto con descripción textual detallada
+    """
+    registry = get_llm_registry()
+    cache, cache_key, cached = _lookup_cached(registry, cache_location)
+    if cached is not None:
+        return cached
+
+    llm, parsers, prompt_template, config = _prepare_call(registry)
     try:
         # Formatear el prompt
         formatted_prompt = prompt_template.format(location_context=location_context)
 
         # Generar respuesta (sin callbacks para evitar conflictos)
-        if callbacks:
-            config = {"callbacks": callbacks}
-            response = llm.invoke(formatted_prompt, config=config)
-        else:
-            response = llm.invoke(formatted_prompt)
+        response = llm.invoke(formatted_prompt, **config)
+
+        # Validar la respuesta (en local; el LLM solo corrige como último recurso)
+        result, outcome = parse_structured(
+            response.content, LocationDescription, parsers.fixing_parser)
+
+    except Exception as e:
+        print(f"Error generando descripción de ubicación: {e}")
+        return _fallback_description(location_context)
+
+    _store_cached(cache, cache_key, result, outcome)
+    return result
+
+
+async def agenerate_location_description(
+    location_context: str,
+    cache_location: Optional[Tuple[int, int, int, int]] = None,
+) -> LocationDescription:
+    """
+    Versión asíncrona de generate_location_description (llm.ainvoke).
+
+    Mismo prompt, caché persistente y fallback; la espera de la respuesta del
+    LLM no bloquea el bucle de eventos.
+    """
+    registry = get_llm_registry()
+    cache, cache_key, cached = _lookup_cached(registry, cache_location)
+    if cached is not None:
+        return cached
+
+    llm, parsers, prompt_template, config = _prepare_call(registry)
+    try:
+        formatted_prompt = prompt_template.format(location_context=location_context)
+        response = await llm.ainvoke(formatted_prompt, **config)
+        result, outcome = await aparse_structured(
+            response.content, LocationDescription, parsers.fixing_parser)
+    except Exception as e:
+        print(f"Error generando descripción de ubicación: {e}")
+        return _fallback_description(location_context)
+
+    _store_cached(cache, cache_key, result, outcome)
+    return result
 
-        # Parsear la respuesta
-        result = fixing_parser.parse(response.content)
-        return result
 
+def stream_location_description(
+    location_context: str,
+    on_text: Callable[[str], None],
+    cache_location: Optional[Tuple[int, int, int, int]] = None,
+) -> LocationDescription:
+    """
+    Como generate_location_description, pero entregando el texto según llega.
+
+    La respuesta se pide en streaming (llm.stream) y on_text recibe cada trozo
+    nuevo del campo description en cuanto se puede decodificar, de modo que se
+    puede mostrar desde el primer token. Al terminar, la respuesta completa se
+    valida como en generate_location_description (corrección por LLM como
+    último recurso) y se guarda en la caché persistente. Si la descripción sale de la caché,
+    on_text la recibe entera de una vez.
+
+    El texto entregado por on_text puede no coincidir con el resultado si el
+    parser tuvo que corregir la respuesta o se usó el fallback: el llamador
+    decide si mostrar entonces el resultado final.
+    """
+    registry = get_llm_registry()
+    cache, cache_key, cached = _lookup_cached(registry, cache_location)
+    if cached is not None:
+        on_text(cached.description)
+        return cached
+
+    llm, parsers, prompt_template, config = _prepare_call(registry)
+    extractor = JsonStringFieldExtractor("description")
+    try:
+        formatted_prompt = prompt_template.format(location_context=location_context)
+        content = []
+        for chunk in llm.stream(formatted_prompt, **config):
+            content.append(chunk.content)
+            delta = extractor.feed(chunk.content)
+            if delta:
+                on_text(delta)
+        result, outcome = parse_structured(
+            "".join(content), LocationDescription, parsers.fixing_parser)
     except Exception as e:
         print(f"Error generando descripción de ubicación: {e}")
-        # Fallback en caso de error
-        return LocationDescription(
-            description=(
-                f"Te encuentras en {location_context}. La atmósfera es misteriosa, con "
-                f"piedras húmedas y ecos lejanos que resuenan en la oscuridad."
-            )
-        )
\ No newline at end of file
+        return _fallback_description(location_context)
+
+    _store_cached(cache, cache_key, result, outcome)
+    return result
+
+
+async def astream_location_description(
+    location_context: str,
+    on_text: Callable[[str], None],
+    cache_location: Optional[Tuple[int, int, int, int]] = None,
+) -> LocationDescription:
+    """Versión asíncrona de stream_location_description (llm.astream)."""
+    registry = get_llm_registry()
+    cache, cache_key, cached = _lookup_cached(registry, cache_location)
+    if cached is not None:
+        on_text(cached.description)
+        return cached
+
+    llm, parsers, prompt_template, config = _prepare_call(registry)
+    extractor = JsonStringFieldExtractor("description")
+    try:
+        formatted_prompt = prompt_template.format(location_context=location_context)
+        content = []
+        async for chunk in llm.astream(formatted_prompt, **config):
+            content.append(chunk.content)
+            delta = extractor.feed(chunk.content)
+            if delta:
+                on_text(delta)
+        result, outcome = await aparse_structured(
+            "".join(content), LocationDescription, parsers.fixing_parser)
+    except Exception as e:
+        print(f"Error generando descripción de ubicación: {e}")
+        return _fallback_description(location_context)
+
+    _store_cached(cache, cache_key, result, outcome)
+    return result
+
+
+def _lookup_cached(registry, cache_location):
+    """(caché, clave, descripción guardada o None) para cache_location."""
+    cache = None if cache_location is None else get_description_cache()
+    if cache is None:
+        return None, None, None
+    cache_key = DescriptionKey(
+        *cache_location, LOCATION_DESCRIPTION_PROMPT_VERSION, registry.settings.model
+    )
+    payload = cache.get(cache_key)
+    if payload is None:
+        return cache, cache_key, None
+    return cache, cache_key, LocationDescription.model_validate_json(payload)
+
+
+def _store_cached(cache, cache_key, result, outcome) -> None:
+    """
+    Guarda result en la caché, salvo si se reconstruyó de una respuesta
+    incompleta (PARTIAL): se muestra, pero persistiría durante todo el TTL.
+    """
+    if cache is not None and outcome in CACHEABLE_OUTCOMES:
+        cache.put(cache_key, result.model_dump_json())
+
+
+def _prepare_call(registry):
+    """
+    Modelo con salida estructurada, parsers, prompt y argumentos de invoke
+    compartidos (el parser de corrección usa el modelo sin restricción).
+    """
+    llm = registry.llm(temperature=0.7)
+    parsers = registry.parsers(LocationDescription, llm)
+    prompt_template = registry.prompt(
+        "location_description",
+        LOCATION_DESCRIPTION_PROMPT,
+        input_variables=["location_context"],
+        format_instructions=parsers.format_instructions,
+    )
+    callbacks = registry.callbacks()
+    config = {"config": {"callbacks": callbacks}} if callbacks else {}
+    structured_llm = registry.structured_llm(LocationDescription, temperature=0.7)
+    return structured_llm, parsers, prompt_template, config
+
+
+def _fallback_description(location_context: str) -> LocationDescription:
+    # Fallback en caso de error
+    return LocationDescription(
+        description=(
+            f"Te encuentras en {location_context}. La atmósfera es misteriosa, con "
+            f"piedras húmedas y ecos lejanos que resuenan en la oscuridad."
+        )
+    )
@@ -0,0 +1,398 @@
+"""Generación por lotes de las descripciones de un nivel.
+
+En lugar de una petición por sala, con las mismas instrucciones y el mismo
+formato repetidos en cada una, generate_level_descriptions pide en una sola
+llamada una lista estructurada de descripciones para hasta batch_size salas,
+dando como contexto sus conexiones y si son la entrada o la salida del nivel.
+
+- Los elementos que faltan, sobran o no validan se piden después sala a sala
+  con generate_location_description (que tiene su propio fallback)
+- Con semilla, se consultan y rellenan las entradas de la caché persistente
+  (aimaze.ai.description_cache) que usa generate_location_description, de
+  modo que la partida encuentra ya descritas las salas del lote
+
+Variable de entorno (configured_batch_size, usada por el bucle de juego):
+
+- AIMAZE_LEVEL_BATCH_SIZE: salas por llamada (25); 0 desactiva los lotes
+"""
+
+import asyncio
+import os
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from pydantic import BaseModel, Field, ValidationError
+
+from aimaze.ai.client import get_llm_registry
+from aimaze.ai.description_cache import DescriptionKey, get_description_cache
+from aimaze.ai.descriptions import (
+    LOCATION_DESCRIPTION_PROMPT_VERSION,
+    LocationDescription,
+    agenerate_location_description,
+    generate_location_description,
+)
+from aimaze.ai.structured_output import (
+    FAILED,
+    REPAIRED,
+    VALID,
+    get_structured_output_stats,
+    load_json,
+)
+from aimaze.dungeon import Level, get_room_at_coords
+from aimaze.room_options import direction_name
+
+# 25 salas (un nivel 5x5) caben con holgura en una respuesta
+DEFAULT_BATCH_SIZE = 25
+# Llamadas simultáneas al LLM (lotes o fallbacks) de agenerate_level_descriptions
+DEFAULT_MAX_CONCURRENCY = 4
+
+Coords = Tuple[int, int]
+
+
+class RoomDescriptionItem(BaseModel):
+    """Descripción de una sala dentro de un lote"""
+
+    x: int = Field(description="X coordinate of the room, as given in the list")
+    y: int = Field(description="Y coordinate of the room, as given in the list")
+    description: str = Field(
+        min_length=1,
+        description=(
+            "Detailed textual description of the room, describing the environment "
+            "and any general atmospheric elements. DO NOT include ASCII art or "
+            "specific event details in this description."
+        ),
+    )
+
+
+class LevelDescriptions(BaseModel):
+    """Lista de descripciones de un lote de salas"""
+
+    rooms: List[RoomDescriptionItem] = Field(
+        description="One entry per requested room, in any order"
+    )
+
+
+# Comparte requisitos con LOCATION_DESCRIPTION_PROMPT y sus descripciones se
+# guardan con LOCATION_DESCRIPTION_PROMPT_VERSION: al cambiar una plantilla hay
+# que revisar la otra y subir esa versión
+LEVEL_DESCRIPTIONS_PROMPT = """Eres un maestro de mazmorras experto en crear descripciones inmersivas para ubicaciones.
+
+Nivel {level} de la mazmorra. Salas a describir, con sus salidas:
+{rooms}
+
+Tu tarea es generar una descripción detallada y atmosférica de CADA una de estas salas.
+
+REQUISITOS IMPORTANTES:
+- Devuelve exactamente una entrada por sala, con sus coordenadas x e y
+- Genera SOLO una descripción textual detallada por sala
+- NO incluyas ASCII art en las descripciones
+- NO incluyas detalles específicos de eventos, monstruos o trampas
+- Enfócate en el ambiente general, la atmósfera y elementos visuales permanentes
+- Las descripciones deben ser apropiadas para una mazmorra misteriosa, centrate en el terror y el humor.
+- Salas conectadas deben sentirse parte del mismo lugar, pero cada una distinta.
+- Describe el entorno, la iluminación, los sonidos ambiente, olores, o sensaciones generales.
+- Utiliza 3 frases como máximo por sala.
+
+{format_instructions}"""
+
+
+@dataclass(slots=True)
+class LevelDescriptionBatch:
+    """
+    Resultado de generate_level_descriptions.
+
+    - descriptions: (x, y) -> LocationDescription de todas las salas pedidas
+    - cached / batched / fallback: cuántas salieron de la caché, de los lotes y
+      de las llamadas sala a sala
+    - batch_requests: llamadas por lotes realizadas
+    """
+    descriptions: Dict[Coords, LocationDescription] = field(default_factory=dict)
+    cached: int = 0
+    batched: int = 0
+    fallback: int = 0
+    batch_requests: int = 0
+
+
+def configured_batch_size() -> int:
+    """Tamaño de lote de AIMAZE_LEVEL_BATCH_SIZE (0 si los lotes están desactivados)."""
+    value = os.getenv("AIMAZE_LEVEL_BATCH_SIZE")
+    return DEFAULT_BATCH_SIZE if value in (None, "") else max(0, int(value))
+
+
+def generate_level_descriptions(
+    level: Level,
+    rooms: Optional[Iterable[Coords]] = None,
+    seed: Optional[int] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> LevelDescriptionBatch:
+    """
+    Genera las descripciones de las salas de un nivel con una llamada por lote.
+
+    Args:
+        level: Nivel cuyas salas se describen
+        rooms: Coordenadas a describir (por defecto, todas las salas del nivel)
+        seed: Semilla de la mazmorra, para usar la caché persistente
+        batch_size: Máximo de salas por llamada al LLM
+
+    Returns:
+        LevelDescriptionBatch con una descripción por sala pedida
+    """
+    result, pending = _start_batch(level, rooms, seed)
+    for chunk in _chunks(pending, batch_size):
+        result.batch_requests += 1
+        items = _request_batch(level, chunk)
+        for coords in chunk:
+            description = items.get(coords)
+            if description is not None:
+                _store(result, level, seed, coords, description)
+            else:
+                result.fallback += 1
+                result.descriptions[coords] = generate_location_description(
+                    _context(level, coords), _cache_location(level, seed, coords)
+                )
+    return result
+
+
+async def agenerate_level_descriptions(
+    level: Level,
+    rooms: Optional[Iterable[Coords]] = None,
+    seed: Optional[int] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+) -> LevelDescriptionBatch:
+    """
+    Versión asíncrona de generate_level_descriptions.
+
+    Los lotes se piden a la vez, y después los fallbacks sala a sala, con como
+    mucho max_concurrency llamadas en vuelo. Las consultas y escrituras en la
+    caché persistente (SQLite) se hacen en un hilo para no bloquear el bucle de
+    eventos.
+    """
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency debe ser positivo")
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def limited(coro):
+        async with semaphore:
+            return await coro
+
+    result, pending = await asyncio.to_thread(_start_batch, level, rooms, seed)
+    chunks = list(_chunks(pending, batch_size))
+    result.batch_requests = len(chunks)
+    batches = await asyncio.gather(*(
+        limited(_arequest_batch(level, chunk)) for chunk in chunks
+    ))
+
+    missing = await asyncio.to_thread(
+        _store_batches, result, level, seed, chunks, batches)
+    fallbacks = await asyncio.gather(*(
+        limited(agenerate_location_description(
+            _context(level, coords), _cache_location(level, seed, coords)
+        ))
+        for coords in missing
+    ))
+    result.fallback = len(missing)
+    result.descriptions.update(zip(missing, fallbacks))
+    return result
+
+
+def _start_batch(
+    level: Level, rooms: Optional[Iterable[Coords]], seed: Optional[int]
+) -> Tuple[LevelDescriptionBatch, List[Coords]]:
+    """Resultado con las salas ya en la caché persistente y lista de pendientes."""
+    if rooms is None:
+        rooms = [tuple(room.coordinates) for room in level.rooms.values()]
+    result = LevelDescriptionBatch()
+    cache = None if seed is None else get_description_cache()
+    model = get_llm_registry().settings.model
+    pending = []
+    for x, y in dict.fromkeys(rooms):
+        if get_room_at_coords(level, x, y) is None:
+            continue
+        payload = None
+        if cache is not None:
+            payload = cache.get(DescriptionKey(
+                seed, level.id, x, y, LOCATION_DESCRIPTION_PROMPT_VERSION, model
+            ))
+        if payload is None:
+            pending.append((x, y))
+        else:
+            result.cached += 1
+            result.descriptions[(x, y)] = LocationDescription.model_validate_json(
+                payload)
+    return result, pending
+
+
+def _chunks(items: List[Coords], size: int) -> Iterable[List[Coords]]:
+    if size < 1:
+        raise ValueError("batch_size debe ser positivo")
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _prepare_call(level: Level, chunk: List[Coords]):
+    """Modelo con salida estructurada, prompt formateado y argumentos de invoke."""
+    registry = get_llm_registry()
+    llm = registry.structured_llm(LevelDescriptions, temperature=0.7)
+    parsers = registry.parsers(LevelDescriptions, registry.llm(temperature=0.7))
+    prompt = registry.prompt(
+        "level_descriptions",
+        LEVEL_DESCRIPTIONS_PROMPT,
+        input_variables=["level", "rooms"],
+        format_instructions=parsers.format_instructions,
+    )
+    callbacks = registry.callbacks()
+    config = {"config": {"callbacks": callbacks}} if callbacks else {}
+    formatted = prompt.format(level=level.id, rooms=_rooms_context(level, chunk))
+    return llm, formatted, config
+
+
+def _request_batch(level: Level, chunk: List[Coords]) -> Dict[Coords, str]:
+    try:
+        llm, formatted, config = _prepare_call(level, chunk)
+        response = llm.invoke(formatted, **config)
+    except Exception as e:
+        print(f"Error generando descripciones del nivel {level.id}: {e}")
+        return {}
+    return _parse_items(response.content, chunk)
+
+
+async def _arequest_batch(level: Level, chunk: List[Coords]) -> Dict[Coords, str]:
+    try:
+        llm, formatted, config = _prepare_call(level, chunk)
+        response = await llm.ainvoke(formatted, **config)
+    except Exception as e:
+        print(f"Error generando descripciones del nivel {level.id}: {e}")
+        return {}
+    return _parse_items(response.content, chunk)
+
+
+def _parse_items(content: str, chunk: List[Coords]) -> Dict[Coords, str]:
+    """
+    Descripciones válidas de la respuesta, por coordenadas.
+
+    Se validan elemento a elemento: uno mal formado, repetido o de una sala no
+    pedida no invalida el resto del lote (no se pide corrección al LLM: las
+    salas que falten se describen sueltas). Si la respuesta llegó truncada se
+    descarta su último elemento, que puede estar cortado. El resultado se anota
+    en las métricas de aimaze.ai.structured_output.
+    """
+    stats = get_structured_output_stats()
+    try:
+        data, complete = load_json(content)
+    except Exception as e:
+        print(f"Warning: Respuesta por lotes ilegible: {e}")
+        stats.record(LevelDescriptions.__name__, FAILED)
+        return {}
+    raw_items = data.get("rooms") if isinstance(data, dict) else data
+    if not isinstance(raw_items, list):
+        stats.record(LevelDescriptions.__name__, FAILED)
+        return {}
+    received = len(raw_items)
+    if not complete:
+        raw_items = raw_items[:-1]
+
+    wanted = set(chunk)
+    items = _valid_items(raw_items, wanted)
+    stats.record(
+        LevelDescriptions.__name__, _batch_outcome(items, received, wanted, complete))
+    return items
+
+
+def _valid_items(raw_items: List[Any], wanted: set) -> Dict[Coords, str]:
+    """Descripciones no vacías de las salas pedidas, sin las repetidas."""
+    items: Dict[Coords, str] = {}
+    repeated = set()
+    for raw in raw_items:
+        try:
+            item = RoomDescriptionItem.model_validate(raw)
+        except ValidationError:
+            continue
+        coords = (item.x, item.y)
+        if coords not in wanted:
+            continue
+        if coords in items:
+            repeated.add(coords)
+        items[coords] = item.description.strip()
+    for coords in repeated:
+        del items[coords]
+    return {coords: text for coords, text in items.items() if text}
+
+
+def _batch_outcome(
+    items: Dict[Coords, str], received: int, wanted: set, complete: bool
+) -> str:
+    """VALID si llegó entero y con una descripción válida por sala, FAILED si ninguna."""
+    if not items:
+        return FAILED
+    if complete and len(items) == len(wanted) == received:
+        return VALID
+    return REPAIRED
+
+
+def _store(
+    result: LevelDescriptionBatch,
+    level: Level,
+    seed: Optional[int],
+    coords: Coords,
+    text: str,
+) -> None:
+    description = LocationDescription(description=text)
+    result.descriptions[coords] = description
+    result.batched += 1
+    cache = None if seed is None else get_description_cache()
+    if cache is not None:
+        cache.put(
+            DescriptionKey(
+                seed, level.id, *coords, LOCATION_DESCRIPTION_PROMPT_VERSION,
+                get_llm_registry().settings.model,
+            ),
+            description.model_dump_json(),
+        )
+
+
+def _store_batches(
+    result: LevelDescriptionBatch,
+    level: Level,
+    seed: Optional[int],
+    chunks: List[List[Coords]],
+    batches: List[Dict[Coords, str]],
+) -> List[Coords]:
+    """Guarda las descripciones recibidas y devuelve las salas que faltan."""
+    missing = []
+    for chunk, items in zip(chunks, batches):
+        for coords in chunk:
+            description = items.get(coords)
+            if description is not None:
+                _store(result, level, seed, coords, description)
+            else:
+                missing.append(coords)
+    return missing
+
+
+def _rooms_context(level: Level, chunk: List[Coords]) -> str:
+    lines = []
+    for x, y in chunk:
+        room = get_room_at_coords(level, x, y)
+        exits = ", ".join(
+            f"{direction_name(direction)} -> ({tx},{ty})"
+            for direction, (tx, ty) in room.connections.items()
+        )
+        line = f"- ({x},{y}): {exits or 'sin salidas'}"
+        if (x, y) == tuple(level.start_coords):
+            line += " [entrada del nivel]"
+        if (x, y) == tuple(level.exit_coords):
+            line += " [SALIDA del nivel]"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def _context(level: Level, coords: Coords) -> str:
+    # Mismo contexto que usa display_scenario para una sala suelta
+    return f"Level {level.id} at ({coords[0]},{coords[1]})"
+
+
+def _cache_location(
+    level: Level, seed: Optional[int], coords: Coords
+) -> Optional[Tuple[int, int, int, int]]:
+    return None if seed is None else (seed, level.id, *coords)
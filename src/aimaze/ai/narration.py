@@ -0,0 +1,276 @@
+"""Proveedores de narración: quién escribe las descripciones y los eventos.
+
+Las funciones de aimaze.ai_connector (generate_location_description y sus
+variantes async/streaming, generate_random_event) delegan en el proveedor
+global de get_narration_provider(), elegido por configuración:
+
+- "llm" (LLMNarrationProvider, por defecto): descripciones generadas por el
+  LLM (aimaze.ai.descriptions) con su caché persistente y su fallback
+- "procedural" (ProceduralNarrationProvider): descripciones en español
+  compuestas con una gramática de plantillas, deterministas por semilla y
+  coordenadas, sin red ni coste y en microsegundos. Pensado para pruebas de
+  carga, CI y como modo degradado cuando el LLM no está disponible
+
+La descripción de niveles por lotes y el prefetch de salas vecinas solo
+compensan con proveedores remotos (atributo remote); el bucle de juego los
+desactiva con el resto.
+
+Variable de entorno:
+
+- AIMAZE_NARRATION_PROVIDER: "llm" (por defecto) o "procedural"
+"""
+
+import os
+import random
+import re
+import threading
+from typing import Callable, Dict, Optional, Tuple, Type, Union
+
+from aimaze.ai.descriptions import (
+    LocationDescription,
+    agenerate_location_description,
+    astream_location_description,
+    generate_location_description,
+    stream_location_description,
+)
+from aimaze.events import GameEvent
+from aimaze.events_generator import agenerate_random_event, generate_random_event
+
+DEFAULT_PROVIDER = "llm"
+
+CacheLocation = Tuple[int, int, int, int]
+
+
+class NarrationProvider:
+    """
+    Fuente de las descripciones de salas y de los eventos aleatorios.
+
+    Las subclases implementan describe_location() y random_event(); las
+    variantes asíncronas y en streaming usan por defecto la versión síncrona
+    (el streaming entrega el texto completo de una vez).
+    """
+
+    name = "base"
+    # True si cada llamada va a un servicio remoto (lenta y con coste)
+    remote = False
+
+    def describe_location(
+        self, location_context: str, cache_location: Optional[CacheLocation] = None
+    ) -> LocationDescription:
+        raise NotImplementedError
+
+    async def adescribe_location(
+        self, location_context: str, cache_location: Optional[CacheLocation] = None
+    ) -> LocationDescription:
+        return self.describe_location(location_context, cache_location)
+
+    def stream_location(
+        self,
+        location_context: str,
+        on_text: Callable[[str], None],
+        cache_location: Optional[CacheLocation] = None,
+    ) -> LocationDescription:
+        result = self.describe_location(location_context, cache_location)
+        on_text(result.description)
+        return result
+
+    async def astream_location(
+        self,
+        location_context: str,
+        on_text: Callable[[str], None],
+        cache_location: Optional[CacheLocation] = None,
+    ) -> LocationDescription:
+        return self.stream_location(location_context, on_text, cache_location)
+
+    def random_event(self, location_context: str) -> Optional[GameEvent]:
+        raise NotImplementedError
+
+    async def arandom_event(self, location_context: str) -> Optional[GameEvent]:
+        return self.random_event(location_context)
+
+
+class LLMNarrationProvider(NarrationProvider):
+    """Descripciones del LLM (aimaze.ai.descriptions) y eventos del generador local."""
+
+    name = "llm"
+    remote = True
+
+    def describe_location(self, location_context, cache_location=None):
+        return generate_location_description(location_context, cache_location)
+
+    async def adescribe_location(self, location_context, cache_location=None):
+        return await agenerate_location_description(location_context, cache_location)
+
+    def stream_location(self, location_context, on_text, cache_location=None):
+        return stream_location_description(location_context, on_text, cache_location)
+
+    async def astream_location(self, location_context, on_text, cache_location=None):
+        return await astream_location_description(
+            location_context, on_text, cache_location)
+
+    def random_event(self, location_context):
+        return generate_random_event(location_context)
+
+    async def arandom_event(self, location_context):
+        return await agenerate_random_event(location_context)
+
+
+# Gramática de la narración procedural. Los lugares llevan artículo y género
+# para concordar los adjetivos; el resto de piezas son neutras.
+_OPENINGS = ("Entras en", "Llegas a", "Te adentras en", "Te encuentras en")
+_PLACES = (
+    ("una", "sala", "f"), ("una", "cámara", "f"), ("una", "galería", "f"),
+    ("una", "cripta", "f"), ("una", "bóveda", "f"), ("un", "pasadizo", "m"),
+    ("un", "salón", "m"), ("un", "corredor", "m"),
+)
+_ADJECTIVES = (
+    ("abovedado", "abovedada"), ("estrecho", "estrecha"), ("húmedo", "húmeda"),
+    ("alargado", "alargada"), ("polvoriento", "polvorienta"),
+    ("angosto", "angosta"), ("ruinoso", "ruinosa"), ("silencioso", "silenciosa"),
+    ("circular", "circular"), ("helado", "helada"),
+)
+_FEATURES = (
+    "de muros de piedra negra",
+    "de paredes cubiertas de musgo",
+    "con el techo sostenido por vigas podridas",
+    "con columnas agrietadas a ambos lados",
+    "con el suelo de losas desiguales",
+    "de muros tallados con runas medio borradas",
+    "con nichos vacíos excavados en la roca",
+)
+_LIGHTS = (
+    "Una antorcha moribunda proyecta sombras que bailan sin ganas",
+    "La única luz procede de unos hongos que brillan con un verde enfermizo",
+    "Un hilo de luz gris se cuela por una grieta del techo",
+    "La oscuridad es tan espesa que casi podrías cortarla con la espada",
+    "Unas velas a medio consumir arden sin que nadie parezca haberlas encendido",
+    "Un resplandor rojizo, sin origen visible, tiñe las paredes",
+)
+_SMELLS = (
+    "a moho y tierra mojada",
+    "a cera quemada",
+    "a algo que murió hace mucho tiempo",
+    "a queso rancio, inexplicablemente",
+    "a humedad y óxido",
+    "a azufre y a calcetín viejo",
+)
+_SOUNDS = (
+    "el goteo constante del agua",
+    "un viento que silba entre las piedras",
+    "el correteo de algo pequeño y con demasiadas patas",
+    "un lamento lejano que no sabes si es humano",
+    "el crujido de la madera vieja",
+    "tu propia respiración, demasiado fuerte",
+)
+_TWISTS = (
+    "alguien dejó una nota que dice «vuelvo enseguida», fechada hace siglos",
+    "un esqueleto sentado en un rincón parece esperar su turno con infinita "
+    "paciencia",
+    "tienes la incómoda sensación de que las paredes te observan",
+    "un cartel torcido advierte: «Prohibido alimentar al limo»",
+    "unas huellas en el polvo dan vueltas en círculo hasta desaparecer",
+    "una calavera sobre una repisa parece sonreír por algo que tú no sabes",
+)
+
+_CONTEXT_COORDS = re.compile(r"Level (-?\d+) at \((-?\d+),\s*(-?\d+)\)")
+
+
+class ProceduralNarrationProvider(NarrationProvider):
+    """
+    Narración local por plantillas, sin llamadas al LLM.
+
+    Cada sala obtiene su propio random.Random a partir de (seed del proveedor,
+    semilla de la mazmorra, nivel, x, y): la misma sala recibe siempre la misma
+    descripción y, si toca, el mismo evento. Sin cache_location las
+    coordenadas se leen del contexto ('Level {nivel} at ({x},{y})').
+    """
+
+    name = "procedural"
+
+    def __init__(self, seed: int = 0):
+        self.seed = seed
+
+    def describe_location(self, location_context, cache_location=None):
+        rng = self._rng(location_context, cache_location)
+        article, noun, gender = rng.choice(_PLACES)
+        adjective = rng.choice(_ADJECTIVES)[gender == "f"]
+        return LocationDescription(description=(
+            f"{rng.choice(_OPENINGS)} {article} {noun} {adjective} "
+            f"{rng.choice(_FEATURES)}. "
+            f"{rng.choice(_LIGHTS)}, y el aire huele {rng.choice(_SMELLS)}. "
+            f"Solo se oye {rng.choice(_SOUNDS)}; {rng.choice(_TWISTS)}."
+        ))
+
+    def random_event(self, location_context):
+        # Flujo aleatorio distinto del de la descripción de la misma sala
+        return generate_random_event(
+            location_context, rng=self._rng(location_context, None, salt=1))
+
+    def _rng(
+        self,
+        location_context: str,
+        cache_location: Optional[CacheLocation],
+        salt: int = 0,
+    ) -> random.Random:
+        if cache_location is not None:
+            parts = tuple(cache_location)
+        else:
+            match = _CONTEXT_COORDS.search(location_context)
+            parts = tuple(map(int, match.groups())) if match else (location_context,)
+        return random.Random(repr((self.seed, salt) + parts))
+
+
+NARRATION_PROVIDERS: Dict[str, Type[NarrationProvider]] = {
+    provider.name: provider
+    for provider in (LLMNarrationProvider, ProceduralNarrationProvider)
+}
+
+
+def create_narration_provider(
+    provider: Union[str, NarrationProvider]
+) -> NarrationProvider:
+    """Crea el proveedor registrado con ese nombre (o devuelve la propia instancia)."""
+    if isinstance(provider, NarrationProvider):
+        return provider
+    try:
+        return NARRATION_PROVIDERS[provider]()
+    except KeyError:
+        available = ", ".join(sorted(NARRATION_PROVIDERS))
+        raise ValueError(
+            f"Proveedor de narración desconocido: {provider} "
+            f"(disponibles: {available})"
+        ) from None
+
+
+_narration_provider: Optional[NarrationProvider] = None
+_narration_provider_lock = threading.Lock()
+
+
+def get_narration_provider() -> NarrationProvider:
+    """
+    Proveedor de narración global del proceso.
+
+    Se crea la primera vez que se usa, con AIMAZE_NARRATION_PROVIDER vigente en
+    ese momento. Un nombre desconocido se avisa y se usa el proveedor LLM.
+    """
+    global _narration_provider
+    with _narration_provider_lock:
+        if _narration_provider is None:
+            name = os.getenv("AIMAZE_NARRATION_PROVIDER") or DEFAULT_PROVIDER
+            try:
+                _narration_provider = create_narration_provider(name.strip().lower())
+            except ValueError as e:
+                print(f"Warning: {e}; se usa '{DEFAULT_PROVIDER}'")
+                _narration_provider = create_narration_provider(DEFAULT_PROVIDER)
+        return _narration_provider
+
+
+def set_narration_provider(
+    provider: Union[str, NarrationProvider, None]
+) -> None:
+    """Fija el proveedor global; None lo vuelve a leer de la configuración."""
+    global _narration_provider
+    with _narration_provider_lock:
+        _narration_provider = (
+            None if provider is None else create_narration_provider(provider)
+        )
@@ -0,0 +1,418 @@
+"""Generación especulativa de descripciones de las salas vecinas.
+
+Mientras el jugador lee la sala actual y escribe su orden, DescriptionPrefetcher
+genera en segundo plano las descripciones de las salas a las que puede moverse,
+de modo que al llegar a ellas la descripción ya suele estar lista.
+
+- Concurrencia acotada: max_workers hilos consumen una cola con prioridad
+- Cancelable: cada nueva ronda de prefetch() descarta las peticiones pendientes
+  que ya no interesan, y cancel()/stop() las descartan todas; una petición ya
+  en curso no se interrumpe, pero su resultado se conserva por si se visita
+- take() entrega un resultado terminado o espera al que está en curso, en lugar
+  de lanzar una segunda llamada al LLM para la misma sala
+
+AsyncDescriptionPrefetcher hace lo mismo con tareas asyncio sobre
+agenerate_location_description, para el bucle de juego asíncrono
+(aimaze.main.async_game_loop).
+
+Variable de entorno de create_description_prefetcher() y
+create_async_description_prefetcher():
+
+- AIMAZE_PREFETCH_WORKERS: hilos de generación (2); 0 desactiva el prefetch
+"""
+
+import asyncio
+import heapq
+import itertools
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from aimaze.ai.descriptions import (
+    LocationDescription,
+    agenerate_location_description,
+    generate_location_description,
+)
+
+DEFAULT_WORKERS = 2
+DEFAULT_MAX_RESULTS = 32
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+CANCELLED = "cancelled"
+
+
+@dataclass(frozen=True)
+class PrefetchRequest:
+    """
+    Descripción que se quiere tener preparada.
+
+    key identifica la sala (p. ej. (nivel, x, y)); priority más baja se genera
+    antes; context y cache_location son los argumentos de
+    generate_location_description.
+    """
+    key: Hashable
+    priority: Tuple
+    context: str
+    cache_location: Optional[Tuple[int, int, int, int]] = None
+
+
+@dataclass(slots=True, eq=False)
+class _Task:
+    request: PrefetchRequest
+    state: str = PENDING
+    result: Optional[LocationDescription] = None
+    done: threading.Event = field(default_factory=threading.Event)
+
+
+class DescriptionPrefetcher:
+    """
+    Cola con prioridad de descripciones que se generan en hilos de fondo.
+
+    Los hilos se arrancan con la primera llamada a prefetch(). generator recibe
+    (context, cache_location) y por defecto es generate_location_description,
+    que ya comparte cliente LLM y caché persistente entre hilos.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_WORKERS,
+        max_results: int = DEFAULT_MAX_RESULTS,
+        generator: Callable[..., LocationDescription] = generate_location_description,
+    ):
+        if max_workers < 1:
+            raise ValueError("max_workers debe ser positivo")
+        self.max_workers = max_workers
+        self.max_results = max_results
+        self._generator = generator
+        self._condition = threading.Condition()
+        self._stopped = False
+        self._threads: List[threading.Thread] = []
+        self._heap: List[Tuple[Tuple, int, _Task]] = []
+        self._sequence = itertools.count()
+        # Tareas pendientes, en curso o terminadas y aún no recogidas, por clave
+        self._tasks: Dict[Hashable, _Task] = {}
+        self.scheduled = 0
+        self.completed = 0
+        self.cancelled = 0
+        self.hits = 0
+        self.waits = 0
+
+    def prefetch(self, requests: Iterable[PrefetchRequest]) -> None:
+        """
+        Empieza una ronda de prefetch con estas peticiones.
+
+        Las peticiones pendientes de rondas anteriores que no aparecen en esta
+        se cancelan; las que ya están en curso o terminadas se conservan.
+        """
+        requests = list(requests)
+        wanted = {request.key for request in requests}
+        with self._condition:
+            if self._stopped:
+                return
+            for key, task in list(self._tasks.items()):
+                if task.state == PENDING and key not in wanted:
+                    self._cancel_task(key, task)
+            for request in requests:
+                task = self._tasks.get(request.key)
+                if task is None:
+                    self.scheduled += 1
+                elif task.state != PENDING or task.request.priority == request.priority:
+                    continue
+                else:
+                    # Reordenar: la entrada vieja del heap se descarta al salir
+                    task.state = CANCELLED
+                task = _Task(request)
+                self._tasks[request.key] = task
+                heapq.heappush(
+                    self._heap, (request.priority, next(self._sequence), task)
+                )
+            self._start_workers()
+            self._condition.notify_all()
+
+    def take(self, key: Hashable) -> Optional[LocationDescription]:
+        """
+        Devuelve la descripción preparada para key, o None si no la hay.
+
+        Si la generación está en curso espera a que termine. Una petición aún
+        pendiente se cancela y devuelve None: el llamador la genera en el
+        momento sin esperar a los hilos.
+        """
+        with self._condition:
+            task = self._tasks.get(key)
+            if task is None:
+                return None
+            if task.state == PENDING:
+                self._cancel_task(key, task)
+                return None
+            if task.state == RUNNING:
+                self.waits += 1
+        task.done.wait()
+        with self._condition:
+            if self._tasks.get(key) is task:
+                del self._tasks[key]
+            if task.result is not None:
+                self.hits += 1
+            return task.result
+
+    def wait_until_idle(self, timeout: Optional[float] = None) -> bool:
+        """Espera a que no quede nada pendiente ni en curso; False si vence."""
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: all(
+                    task.state in (DONE, CANCELLED) for task in self._tasks.values()
+                ),
+                timeout,
+            )
+
+    def cancel(self) -> None:
+        """Cancela todas las peticiones pendientes."""
+        with self._condition:
+            for key, task in list(self._tasks.items()):
+                if task.state == PENDING:
+                    self._cancel_task(key, task)
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Cancela lo pendiente y espera a que terminen los hilos."""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+        self.cancel()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def stats(self) -> Dict[str, int]:
+        with self._condition:
+            return {
+                "scheduled": self.scheduled,
+                "completed": self.completed,
+                "cancelled": self.cancelled,
+                "hits": self.hits,
+                "waits": self.waits,
+                "pending": sum(
+                    1 for task in self._tasks.values() if task.state == PENDING
+                ),
+            }
+
+    def _cancel_task(self, key: Hashable, task: _Task) -> None:
+        task.state = CANCELLED
+        task.done.set()
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        self.cancelled += 1
+
+    def _start_workers(self) -> None:
+        while len(self._threads) < self.max_workers:
+            thread = threading.Thread(
+                target=self._run,
+                name=f"aimaze-prefetch-{len(self._threads)}",
+                daemon=True,
+            )
+            self._threads.append(thread)
+            thread.start()
+
+    def _next_task(self) -> Optional[_Task]:
+        while self._heap:
+            task = heapq.heappop(self._heap)[2]
+            if task.state == PENDING:
+                return task
+        return None
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                task = self._next_task()
+                while task is None and not self._stopped:
+                    self._condition.wait()
+                    task = self._next_task()
+                if task is None:
+                    return
+                task.state = RUNNING
+
+            request = task.request
+            result: Any = None
+            try:
+                result = self._generator(request.context, request.cache_location)
+            except Exception as e:
+                print(f"Warning: Error generando descripción anticipada: {e}")
+
+            with self._condition:
+                task.state = DONE
+                task.result = result
+                task.done.set()
+                self.completed += 1
+                self._trim_results()
+                self._condition.notify_all()
+
+    def _trim_results(self) -> None:
+        # Acotar los resultados no recogidos (los más antiguos primero)
+        done = [key for key, task in self._tasks.items() if task.state == DONE]
+        for key in done[:max(0, len(done) - self.max_results)]:
+            del self._tasks[key]
+
+
+@dataclass(slots=True, eq=False)
+class _AsyncEntry:
+    task: Optional[asyncio.Task] = None
+    # Pasa a RUNNING cuando la tarea obtiene el semáforo
+    state: str = PENDING
+
+
+class AsyncDescriptionPrefetcher:
+    """
+    Equivalente asyncio de DescriptionPrefetcher.
+
+    Cada petición es una tarea del bucle de eventos; un semáforo limita a
+    max_concurrency las generaciones simultáneas y las tareas se crean en
+    orden de prioridad, que es el orden en que el semáforo las deja pasar.
+    Debe usarse desde el bucle de eventos en el que se creó.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = DEFAULT_WORKERS,
+        max_results: int = DEFAULT_MAX_RESULTS,
+        generator: Optional[Callable[..., Any]] = None,
+    ):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency debe ser positivo")
+        self.max_concurrency = max_concurrency
+        self.max_results = max_results
+        self._generator = generator or agenerate_location_description
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._tasks: Dict[Hashable, _AsyncEntry] = {}
+        self._stopped = False
+        self.scheduled = 0
+        self.completed = 0
+        self.cancelled = 0
+        self.hits = 0
+        self.waits = 0
+
+    def prefetch(self, requests: Iterable[PrefetchRequest]) -> None:
+        """
+        Empieza una ronda de prefetch (ver DescriptionPrefetcher.prefetch).
+
+        Las tareas que aún esperan al semáforo y no aparecen en esta ronda se
+        cancelan; las que ya están generando se conservan.
+        """
+        if self._stopped:
+            return
+        requests = sorted(requests, key=lambda request: request.priority)
+        wanted = {request.key for request in requests}
+        for key, entry in list(self._tasks.items()):
+            if key not in wanted and entry.state == PENDING:
+                self._cancel_entry(key, entry)
+        loop = asyncio.get_running_loop()
+        for request in requests:
+            if request.key in self._tasks:
+                continue
+            entry = _AsyncEntry()
+            entry.task = loop.create_task(
+                self._generate(request, entry),
+                name=f"aimaze-prefetch-{request.key}",
+            )
+            self._tasks[request.key] = entry
+            self.scheduled += 1
+        self._trim_results()
+
+    async def take(self, key: Hashable) -> Optional[LocationDescription]:
+        """
+        Descripción preparada para key, o None (ver DescriptionPrefetcher.take).
+        """
+        entry = self._tasks.pop(key, None)
+        if entry is None:
+            return None
+        if entry.state == PENDING:
+            self._cancel_entry(key, entry)
+            return None
+        task = entry.task
+        if not task.done():
+            self.waits += 1
+        try:
+            result = await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if not task.cancelled():
+                raise
+            return None
+        if result is not None:
+            self.hits += 1
+        return result
+
+    def cancel(self) -> None:
+        """Cancela todas las peticiones que aún no han empezado."""
+        for key, entry in list(self._tasks.items()):
+            if entry.state == PENDING:
+                self._cancel_entry(key, entry)
+
+    async def stop(self) -> None:
+        """Cancela todas las tareas, también las que están generando."""
+        self._stopped = True
+        tasks = [entry.task for entry in self._tasks.values()]
+        self._tasks.clear()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "scheduled": self.scheduled,
+            "completed": self.completed,
+            "cancelled": self.cancelled,
+            "hits": self.hits,
+            "waits": self.waits,
+            "pending": sum(
+                1 for entry in self._tasks.values() if entry.state == PENDING
+            ),
+        }
+
+    async def _generate(
+        self, request: PrefetchRequest, entry: _AsyncEntry
+    ) -> Optional[LocationDescription]:
+        async with self._semaphore:
+            entry.state = RUNNING
+            try:
+                result = await self._generator(
+                    request.context, request.cache_location
+                )
+            except Exception as e:
+                print(f"Warning: Error generando descripción anticipada: {e}")
+                result = None
+            entry.state = DONE
+            self.completed += 1
+            return result
+
+    def _cancel_entry(self, key: Hashable, entry: _AsyncEntry) -> None:
+        entry.task.cancel()
+        entry.state = CANCELLED
+        if self._tasks.get(key) is entry:
+            del self._tasks[key]
+        self.cancelled += 1
+
+    def _trim_results(self) -> None:
+        done = [key for key, entry in self._tasks.items() if entry.state == DONE]
+        for key in done[:max(0, len(done) - self.max_results)]:
+            del self._tasks[key]
+
+
+def _prefetch_workers() -> int:
+    value = os.getenv("AIMAZE_PREFETCH_WORKERS")
+    return DEFAULT_WORKERS if value in (None, "") else int(value)
+
+
+def create_description_prefetcher() -> Optional[DescriptionPrefetcher]:
+    """Prefetcher configurado con AIMAZE_PREFETCH_WORKERS, o None si vale 0."""
+    workers = _prefetch_workers()
+    if workers <= 0:
+        return None
+    return DescriptionPrefetcher(max_workers=workers)
+
+
+def create_async_description_prefetcher() -> Optional[AsyncDescriptionPrefetcher]:
+    """Prefetcher asyncio con AIMAZE_PREFETCH_WORKERS tareas simultáneas, o None."""
+    workers = _prefetch_workers()
+    if workers <= 0:
+        return None
+    return AsyncDescriptionPrefetcher(max_concurrency=workers)
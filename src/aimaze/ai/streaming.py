@@ -0,0 +1,112 @@
+"""Extracción incremental de un campo de texto de una respuesta JSON en streaming.
+
+El LLM responde con un objeto JSON (p. ej. {"description": "..."}) que llega
+token a token. JsonStringFieldExtractor localiza el valor del campo pedido en
+cuanto aparece y devuelve, en cada feed(), el texto ya decodificado (escapes
+JSON incluidos) que se ha completado desde la llamada anterior, de modo que se
+puede mostrar al jugador mientras el resto de la respuesta sigue llegando. El
+resultado final se sigue obteniendo con el parser pydantic sobre el texto
+completo.
+"""
+
+import json
+import re
+from typing import List, Optional
+
+
+class JsonStringFieldExtractor:
+    """
+    Devuelve poco a poco el valor de un campo de texto de un JSON incompleto.
+
+    Tolera texto o vallas de código antes del objeto. Las secuencias de escape
+    cortadas entre dos fragmentos (incluidos los pares suplentes \\uD83D\\uDE00)
+    se retienen hasta que llegan completas. Cada fragmento se examina una sola
+    vez, así que el coste total es lineal en la longitud de la respuesta.
+    """
+
+    def __init__(self, field: str = "description"):
+        self.field = field
+        self._key = re.compile(r'"%s"\s*:\s*"' % re.escape(field))
+        self._buffer = ""
+        # Posición en _buffer hasta la que el valor ya se decodificó
+        self._safe: Optional[int] = None
+        self._parts: List[str] = []
+        self.complete = False
+
+    @property
+    def text(self) -> str:
+        """Texto del campo decodificado hasta ahora."""
+        return "".join(self._parts)
+
+    def feed(self, chunk: str) -> str:
+        """Añade un fragmento de la respuesta y devuelve el texto nuevo del campo."""
+        if self.complete or not chunk:
+            return ""
+        self._buffer += chunk
+        if self._safe is None:
+            # La clave puede llegar partida: buscar en todo lo recibido
+            match = self._key.search(self._buffer)
+            if match is None:
+                return ""
+            self._safe = match.end()
+
+        end = self._scan()
+        delta = _decode(self._buffer[self._safe:end])
+        self._safe = end
+        if self.complete:
+            self._buffer = ""
+        if delta:
+            self._parts.append(delta)
+        return delta
+
+    def _scan(self) -> int:
+        """
+        Avanza desde la última posición segura hasta el final de lo recibido.
+
+        Devuelve dónde termina el tramo decodificable: antes de un escape
+        incompleto, de un suplente alto sin pareja o de la comilla de cierre
+        (en ese caso marca el campo como completo).
+        """
+        raw = self._buffer
+        i = self._safe
+        while i < len(raw):
+            char = raw[i]
+            if char == '"':
+                self.complete = True
+                return i
+            if char != "\\":
+                i += 1
+                continue
+            if i + 1 >= len(raw):
+                return i
+            if raw[i + 1] != "u":
+                i += 2
+                continue
+            if i + 6 > len(raw):
+                return i
+            if 0xD800 <= _hex(raw[i + 2:i + 6]) <= 0xDBFF:
+                # Suplente alto: esperar a su pareja (DC00-DFFF)
+                if i + 12 > len(raw):
+                    return i
+                i += 12
+            else:
+                i += 6
+        return i
+
+
+def _hex(code: str) -> int:
+    try:
+        return int(code, 16)
+    except ValueError:
+        return -1
+
+
+def _decode(raw: str) -> str:
+    if "\\" not in raw:
+        return raw
+    try:
+        # strict=False: algunos modelos emiten saltos de línea sin escapar
+        return json.loads(f'"{raw}"', strict=False)
+    except ValueError:
+        # Escape inválido dentro de la cadena: mostrar el texto tal cual
+        return raw
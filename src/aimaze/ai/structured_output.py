@@ -0,0 +1,282 @@
+"""Salida estructurada del LLM: esquema JSON nativo, reparación local y métricas.
+
+Con PydanticOutputParser + OutputFixingParser, cualquier respuesta con el JSON
+ligeramente mal formado provocaba en silencio una segunda llamada al LLM
+(el doble de latencia y de coste para esa sala). Ahora:
+
+1. La petición usa el modo de salida estructurada de la API: response_format
+   con el esquema JSON estricto del modelo pydantic (LLMRegistry.structured_llm)
+2. La respuesta se valida en local y, si no valida, se intenta reparar sin red
+   (repair_structured_output): vallas de código, texto alrededor del objeto,
+   JSON truncado, comas finales, objetos envueltos y, en modelos de un solo
+   campo de texto, texto plano
+3. Solo si nada de eso funciona se usa el OutputFixingParser (una llamada
+   más al LLM), con aviso y contado
+
+parse_structured devuelve el objeto y cómo se obtuvo. Las reparaciones que
+reconstruyen una respuesta incompleta (JSON truncado por finish_reason=length
+o texto plano) se marcan como PARTIAL: sirven para la partida en curso, pero
+no deben guardarse en cachés persistentes (ver CACHEABLE_OUTCOMES).
+
+Las métricas por modelo pydantic (get_structured_output_stats) indican cuántas
+respuestas fueron válidas, reparadas en local (completas o parciales),
+corregidas por el LLM o fallidas, y la tasa de reintentos (corregidas por el
+LLM / total).
+"""
+
+import json
+import re
+import threading
+from functools import lru_cache, partial
+from typing import Any, Dict, Iterator, Optional, Tuple, Type, TypeVar
+
+from langchain_core.utils.function_calling import convert_to_openai_function
+from langchain_core.utils.json import parse_json_markdown, parse_partial_json
+from pydantic import BaseModel, ValidationError
+
+VALID = "valid"
+REPAIRED = "repaired"
+PARTIAL = "partial"
+LLM_FIXED = "llm_fixed"
+FAILED = "failed"
+OUTCOMES = (VALID, REPAIRED, PARTIAL, LLM_FIXED, FAILED)
+# Resultados que se pueden guardar en cachés persistentes; los PARTIAL
+# quedarían cortados o con texto ajeno durante todo el TTL de la caché
+CACHEABLE_OUTCOMES = frozenset((VALID, REPAIRED, LLM_FIXED))
+
+# Restricciones de pydantic que el modo estricto de la API no admite; se siguen
+# comprobando al validar en local
+_UNSUPPORTED_KEYWORDS = ("minLength", "maxLength")
+
+_TRAILING_COMMA = re.compile(r",\s*([}\]])")
+_CODE_FENCE = re.compile(r"^```[\w-]*\s*|\s*```$")
+# JSON completo, admitiendo saltos de línea sin escapar dentro de las cadenas
+_json_loads = partial(json.loads, strict=False)
+
+Model = TypeVar("Model", bound=BaseModel)
+
+
+class StructuredOutputStats:
+    """Contadores, por modelo pydantic, del resultado de validar cada respuesta."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts: Dict[str, Dict[str, int]] = {}
+
+    def record(self, model_name: str, outcome: str) -> None:
+        with self._lock:
+            counts = self._counts.setdefault(
+                model_name, dict.fromkeys(OUTCOMES, 0))
+            counts[outcome] += 1
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """{modelo: {valid, repaired, partial, llm_fixed, failed, total, retry_rate}}"""
+        with self._lock:
+            result = {}
+            for model_name, counts in self._counts.items():
+                total = sum(counts.values())
+                result[model_name] = {
+                    **counts,
+                    "total": total,
+                    "retry_rate": counts[LLM_FIXED] / total if total else 0.0,
+                }
+            return result
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts.clear()
+
+
+_stats = StructuredOutputStats()
+
+
+def get_structured_output_stats() -> StructuredOutputStats:
+    """Métricas globales de salida estructurada del proceso."""
+    return _stats
+
+
+@lru_cache(maxsize=None)
+def json_schema_response_format(model_cls: Type[BaseModel]) -> Dict[str, Any]:
+    """response_format de la API de OpenAI con el esquema JSON estricto de model_cls."""
+    function = convert_to_openai_function(model_cls, strict=True)
+    schema = _strip_unsupported(function["parameters"])
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": function["name"],
+            "description": function.get("description", ""),
+            "schema": schema,
+            "strict": True,
+        },
+    }
+
+
+def _strip_unsupported(schema: Any) -> Any:
+    if isinstance(schema, dict):
+        return {
+            key: _strip_unsupported(value)
+            for key, value in schema.items()
+            if key not in _UNSUPPORTED_KEYWORDS
+        }
+    if isinstance(schema, list):
+        return [_strip_unsupported(value) for value in schema]
+    return schema
+
+
+def repair_structured_output(content: str, model_cls: Type[Model]) -> Optional[Model]:
+    """
+    Intenta obtener un model_cls válido de una respuesta mal formada, sin red.
+
+    Devuelve None si ninguna reparación produce un objeto que valide.
+    """
+    repaired = _repair(content, model_cls)
+    return None if repaired is None else repaired[0]
+
+
+def load_json(text: str) -> Tuple[Any, bool]:
+    """
+    Lee el valor JSON de text (admite vallas ```json y saltos de línea sin
+    escapar) y devuelve (valor, completo). completo es False si el JSON venía
+    truncado y hubo que cerrar cadenas y llaves pendientes. Lanza ValueError
+    si no se puede leer.
+    """
+    try:
+        return parse_json_markdown(text, parser=_json_loads), True
+    except ValueError:
+        return parse_json_markdown(text), False
+
+
+def _repair(content: str, model_cls: Type[Model]) -> Optional[Tuple[Model, str]]:
+    """(objeto, REPAIRED o PARTIAL) de la primera reparación que valide."""
+    text = content.strip()
+    parsed = False
+    for data, complete in _candidates(text):
+        parsed = True
+        for value in _unwrapped(data):
+            try:
+                result = model_cls.model_validate(value)
+            except ValidationError:
+                continue
+            return result, REPAIRED if complete else PARTIAL
+    field = _single_text_field(model_cls)
+    # Con llaves no es texto plano sino JSON roto (p. ej. 'Claro! {no json')
+    if field is not None and text and not parsed and "{" not in text:
+        # Texto plano donde se esperaba {"campo": "texto"}
+        try:
+            result = model_cls.model_validate({field: _CODE_FENCE.sub("", text)})
+        except ValidationError:
+            return None
+        return result, PARTIAL
+    return None
+
+
+def _candidates(text: str) -> Iterator[Tuple[Any, bool]]:
+    """
+    (valor, completo) de los JSON que se pueden leer de text, de menos a más
+    reparación: primero los completos y después los que cierran JSON truncado.
+    """
+    sources = [text]
+    start, end = text.find("{"), text.rfind("}")
+    if start != -1 and end > start:
+        sources.append(text[start:end + 1])
+    variants = list(dict.fromkeys(
+        variant
+        for source in sources
+        for variant in (source, _TRAILING_COMMA.sub(r"\1", source))
+    ))
+    for parser, complete in ((_json_loads, True), (parse_partial_json, False)):
+        for variant in variants:
+            try:
+                # Admite vallas ```json; parse_partial_json además cierra
+                # cadenas y llaves pendientes
+                yield parse_json_markdown(variant, parser=parser), complete
+            except (ValueError, json.JSONDecodeError):
+                continue
+
+
+def _unwrapped(data: Any) -> Iterator[Any]:
+    """data y, si viene envuelto ({"Modelo": {...}} o [{...}]), su contenido."""
+    yield data
+    if isinstance(data, dict) and len(data) == 1:
+        (inner,) = data.values()
+        if isinstance(inner, dict):
+            yield inner
+    if isinstance(data, list) and len(data) == 1:
+        yield data[0]
+
+
+@lru_cache(maxsize=None)
+def _single_text_field(model_cls: Type[BaseModel]) -> Optional[str]:
+    fields = model_cls.model_fields
+    if len(fields) != 1:
+        return None
+    (name, info), = fields.items()
+    return name if info.annotation is str else None
+
+
+def parse_structured(
+    content: str,
+    model_cls: Type[Model],
+    fixing_parser,
+    stats: Optional[StructuredOutputStats] = None,
+) -> Tuple[Model, str]:
+    """
+    Valida content como model_cls: en local primero y con fixing_parser (una
+    llamada al LLM) como último recurso.
+
+    Devuelve (objeto, resultado), con resultado VALID, REPAIRED, PARTIAL o
+    LLM_FIXED, para que el llamador decida si guardarlo en caché. Lanza la
+    excepción del parser si tampoco así se obtiene un objeto válido.
+    """
+    stats = _stats if stats is None else stats
+    parsed = _parse_locally(content, model_cls, stats)
+    if parsed is not None:
+        return parsed
+    try:
+        result = fixing_parser.parse(content)
+    except Exception:
+        stats.record(model_cls.__name__, FAILED)
+        raise
+    stats.record(model_cls.__name__, LLM_FIXED)
+    return result, LLM_FIXED
+
+
+async def aparse_structured(
+    content: str,
+    model_cls: Type[Model],
+    fixing_parser,
+    stats: Optional[StructuredOutputStats] = None,
+) -> Tuple[Model, str]:
+    """Versión asíncrona de parse_structured (fixing_parser.aparse)."""
+    stats = _stats if stats is None else stats
+    parsed = _parse_locally(content, model_cls, stats)
+    if parsed is not None:
+        return parsed
+    try:
+        result = await fixing_parser.aparse(content)
+    except Exception:
+        stats.record(model_cls.__name__, FAILED)
+        raise
+    stats.record(model_cls.__name__, LLM_FIXED)
+    return result, LLM_FIXED
+
+
+def _parse_locally(
+    content: str, model_cls: Type[Model], stats: StructuredOutputStats
+) -> Optional[Tuple[Model, str]]:
+    try:
+        result = model_cls.model_validate_json(content)
+    except ValidationError:
+        pass
+    else:
+        stats.record(model_cls.__name__, VALID)
+        return result, VALID
+    repaired = _repair(content, model_cls)
+    if repaired is not None:
+        stats.record(model_cls.__name__, repaired[1])
+        return repaired
+    print(
+        f"Warning: Respuesta no válida para {model_cls.__name__}; "
+        f"se pide la corrección al LLM"
+    )
+    return None
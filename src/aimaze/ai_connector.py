@@ -1,16 +1,12 @@
 """Fachada de funciones de IA y generación.
 
 Este módulo re-exporta funciones desde submódulos especializados para mantener
-una interfaz estable y un tamaño manejable.
+una interfaz estable y un tamaño manejable. Las descripciones y los eventos se
+piden al proveedor de narración configurado (aimaze.ai.narration).
 """
 
-from aimaze.ai.descriptions import (
-    LocationDescription as LocationDescription,
-    generate_location_description as _generate_location_description,
-)
-from aimaze.events_generator import (
-    generate_random_event as _generate_random_event,
-)
+from aimaze.ai.descriptions import LocationDescription as LocationDescription
+from aimaze.ai.narration import get_narration_provider
 from aimaze.generation.dungeon_generator import (
     generate_random_start_exit_points as _gen_start_exit,
     generate_advanced_main_path as _gen_main_path,
@@ -23,30 +19,72 @@ from aimaze.generation.dungeon_generator import (
     calculate_smart_path_length as _gen_smart_len,
     generate_dungeon_layout as _gen_dungeon_layout,
 )
+from aimaze.generation.multilevel import (
+    generate_multilevel_dungeon as _gen_multilevel_dungeon,
+)
+
+
+def generate_location_description(
+    location_context: str, cache_location=None
+) -> LocationDescription:
+    return get_narration_provider().describe_location(
+        location_context, cache_location)
+
+
+async def agenerate_location_description(
+    location_context: str, cache_location=None
+) -> LocationDescription:
+    return await get_narration_provider().adescribe_location(
+        location_context, cache_location)
 
 
-def generate_location_description(location_context: str) -> LocationDescription:
-    return _generate_location_description(location_context)
+def stream_location_description(
+    location_context: str, on_text, cache_location=None
+) -> LocationDescription:
+    return get_narration_provider().stream_location(
+        location_context, on_text, cache_location)
+
+
+async def astream_location_description(
+    location_context: str, on_text, cache_location=None
+) -> LocationDescription:
+    return await get_narration_provider().astream_location(
+        location_context, on_text, cache_location)
 
 
 def generate_random_event(location_context: str):
-    return _generate_random_event(location_context)
+    return get_narration_provider().random_event(location_context)
+
 
+async def agenerate_random_event(location_context: str):
+    return await get_narration_provider().arandom_event(location_context)
 
-def generate_random_start_exit_points(width: int, height: int):
-    return _gen_start_exit(width, height)
 
+def generate_random_start_exit_points(width: int, height: int, rng=None):
+    return _gen_start_exit(width, height, rng)
 
-def generate_advanced_main_path(start: tuple, end: tuple, width: int, height: int, target_length: int):
-    return _gen_main_path(start, end, width, height, target_length)
+
+def generate_advanced_main_path(
+    start: tuple, end: tuple, width: int, height: int, target_length: int, rng=None
+):
+    return _gen_main_path(start, end, width, height, target_length, rng)
 
 
 def generate_simple_direct_path(start: tuple, end: tuple):
     return _gen_simple_path(start, end)
 
 
-def add_connected_additional_rooms(path_rooms: list, width: int, height: int):
-    return _gen_add_rooms(path_rooms, width, height)
+def add_connected_additional_rooms(
+    path_rooms: list,
+    width: int,
+    height: int,
+    branching_factor: int = 4,
+    loop_density: float = 1.0,
+    rng=None,
+):
+    return _gen_add_rooms(
+        path_rooms, width, height, branching_factor, loop_density, rng
+    )
 
 
 def get_direction(from_coord: tuple, to_coord: tuple) -> str:
@@ -57,20 +95,51 @@ def get_adjacent_coordinates(coord: tuple, width: int, height: int) -> list:
     return _gen_adjacent(coord, width, height)
 
 
-def create_dungeon_from_rooms(rooms: dict, width: int, height: int, start_coords: tuple, exit_coords: tuple):
-    return _gen_create_dungeon(rooms, width, height, start_coords, exit_coords)
+def create_dungeon_from_rooms(
+    rooms: dict,
+    width: int,
+    height: int,
+    start_coords: tuple,
+    exit_coords: tuple,
+    compact=None,
+):
+    return _gen_create_dungeon(rooms, width, height, start_coords, exit_coords, compact)
 
 
 def calculate_minimum_distance(start: tuple, end: tuple) -> int:
     return _gen_min_dist(start, end)
 
 
-def calculate_smart_path_length(start: tuple, end: tuple, width: int, height: int) -> int:
-    return _gen_smart_len(start, end, width, height)
-
-
-def generate_dungeon_layout():
-    return _gen_dungeon_layout()
+def calculate_smart_path_length(
+    start: tuple, end: tuple, width: int, height: int, rng=None
+) -> int:
+    return _gen_smart_len(start, end, width, height, rng)
+
+
+def generate_dungeon_layout(
+    seed=None, width=None, height=None, cache=None, algorithm=None, deadline_ms=None
+):
+    return _gen_dungeon_layout(
+        seed=seed,
+        width=width,
+        height=height,
+        cache=cache,
+        algorithm=algorithm,
+        deadline_ms=deadline_ms,
+    )
+
+
+def generate_multilevel_dungeon(
+    total_levels: int,
+    seed=None,
+    width=None,
+    height=None,
+    parallel=None,
+    max_workers=None,
+):
+    return _gen_multilevel_dungeon(
+        total_levels, seed, width, height, parallel, max_workers
+    )
 
 
 if __name__ == "__main__":
@@ -1,14 +1,242 @@
 # src/aimaze/display.py
 
-from aimaze.ai_connector import generate_location_description
-from aimaze.dungeon import get_room_at_coords
+from aimaze.ai.prefetch import PrefetchRequest
+from aimaze.ai_connector import (
+    LocationDescription,
+    agenerate_location_description,
+    astream_location_description,
+    generate_location_description,
+    stream_location_description,
+)
+from aimaze.dungeon import PlayerLocation
+from aimaze.game_state import (
+    get_location_description,
+    is_location_visited,
+    mark_location_visited,
+    set_location_description,
+)
+from aimaze.level_analysis import (
+    UNREACHABLE,
+    get_level_analysis,
+    peek_level_analysis,
+    supports_level_analysis,
+)
+from aimaze.level_grid import COMPACT_LEVEL_MIN_CELLS
+from aimaze.room_options import get_room_options
 
 
-def display_scenario(game_state):
+def location_context(level: int, x: int, y: int) -> str:
+    """Contexto del prompt de descripciones: 'Level {nivel} at ({x},{y})'."""
+    return f"Level {level} at ({x},{y})"
+
+
+def display_scenario(game_state, prefetcher=None, stream=False):
     """
     Displays the current location description and available options.
     Uses AI to generate immersive textual descriptions based on coordinates.
-    Options are derived from room connections.
+    Options are derived from room connections and cached per room
+    (aimaze.room_options).
+
+    With a DescriptionPrefetcher (aimaze.ai.prefetch), the description may come
+    from a background generation, and the descriptions of the reachable
+    neighbouring rooms are requested in the background right after the room is
+    shown. With stream=True a new description is printed token by token as
+    the LLM produces it.
+    """
+    room_options = _show_header(game_state)
+    if room_options is None:
+        return
+    player_location = game_state["player_location"]
+    dungeon = game_state["dungeon"]
+
+    # Generar o recuperar descripción de la ubicación usando IA
+    location_desc = get_location_description(game_state, player_location)
+
+    if location_desc is None and prefetcher is not None:
+        location_desc = prefetcher.take(
+            (player_location.level, player_location.x, player_location.y))
+        if location_desc is not None:
+            set_location_description(game_state, player_location, location_desc)
+
+    # Solo se imprime en streaming lo que se genera ahora
+    printer = None
+    if location_desc is None:
+        # El contexto incluye las coordenadas según especificación: 'Level {nivel} at ({x},{y})'
+        context = location_context(
+            player_location.level, player_location.x, player_location.y)
+        print("Generando descripción de la ubicación...")
+        printer = _StreamPrinter() if stream else None
+
+        try:
+            cache_location = _cache_location(dungeon, player_location)
+            if printer is not None:
+                location_desc = stream_location_description(
+                    context, printer, cache_location=cache_location)
+            elif cache_location is None:
+                location_desc = generate_location_description(context)
+            else:
+                # Mazmorra reproducible: la descripción puede venir de la caché
+                # persistente de descripciones (Paso 3.1)
+                location_desc = generate_location_description(
+                    context, cache_location=cache_location)
+        except Exception as e:
+            print(f"Error generando descripción: {e}")
+            # Usar descripción de fallback
+            location_desc = _fallback_description(player_location)
+        set_location_description(game_state, player_location, location_desc)
+
+    # Mostrar descripción detallada
+    _show_description(location_desc, printer)
+    _show_options(game_state, room_options)
+
+    if prefetcher is not None:
+        prefetch_neighbours(game_state, prefetcher)
+
+
+async def adisplay_scenario(game_state, prefetcher=None, stream=False):
+    """
+    Versión asyncio de display_scenario.
+
+    La descripción se obtiene con aprepare_location_description (del
+    AsyncDescriptionPrefetcher o de la API asíncrona, en streaming si
+    stream=True). Pedir el prefetch de las salas vecinas queda a cargo del
+    llamador (prefetch_neighbours).
+    """
+    room_options = _show_header(game_state)
+    if room_options is None:
+        return
+    printer = _StreamPrinter() if stream else None
+    location_desc = await aprepare_location_description(
+        game_state, prefetcher, on_text=printer)
+    _show_description(location_desc, printer)
+    _show_options(game_state, room_options)
+
+
+async def aprepare_location_description(game_state, prefetcher=None, on_text=None):
+    """
+    Deja en game_state la descripción de la ubicación actual (versión asyncio).
+
+    Usa la descripción ya guardada, la de un AsyncDescriptionPrefetcher o la
+    genera con agenerate_location_description sin bloquear el bucle de
+    eventos; con on_text, la genera en streaming (astream_location_description)
+    y on_text recibe el texto según llega. Devuelve la descripción, o None si
+    la ubicación no existe.
+    """
+    player_location = game_state["player_location"]
+    location_desc = get_location_description(game_state, player_location)
+    if location_desc is not None:
+        return location_desc
+    dungeon = game_state["dungeon"]
+    current_level = dungeon.levels[player_location.level]
+    if get_room_options(current_level, player_location.x, player_location.y) is None:
+        # display_scenario informará del error
+        return None
+
+    location_desc = None
+    if prefetcher is not None:
+        location_desc = await prefetcher.take(
+            (player_location.level, player_location.x, player_location.y))
+    if location_desc is None:
+        print("Generando descripción de la ubicación...")
+        context = location_context(
+            player_location.level, player_location.x, player_location.y)
+        cache_location = _cache_location(dungeon, player_location)
+        try:
+            if on_text is not None:
+                location_desc = await astream_location_description(
+                    context, on_text, cache_location=cache_location)
+            else:
+                location_desc = await agenerate_location_description(
+                    context, cache_location=cache_location)
+        except Exception as e:
+            print(f"Error generando descripción: {e}")
+            location_desc = _fallback_description(player_location)
+    set_location_description(game_state, player_location, location_desc)
+    return location_desc
+
+
+def prefetch_neighbours(game_state, prefetcher):
+    """
+    Pide al prefetcher las descripciones de las salas alcanzables desde la actual.
+
+    Se omiten las que ya tienen descripción; el resto se ordena por salas no
+    visitadas primero y, dentro de ellas, por cercanía a la salida si el
+    análisis del nivel sale barato (ver _cheap_level_analysis) o por orden de
+    las opciones si no.
+    """
+    player_location = game_state["player_location"]
+    dungeon = game_state["dungeon"]
+    level_id = player_location.level
+    level = dungeon.levels[level_id]
+    room_options = get_room_options(level, player_location.x, player_location.y)
+    if room_options is None:
+        return
+    analysis = _cheap_level_analysis(level)
+    requests = []
+    for order, (x, y) in enumerate(room_options.targets.values()):
+        location = PlayerLocation(level=level_id, x=x, y=y)
+        if get_location_description(game_state, location) is not None:
+            continue
+        distance = UNREACHABLE
+        if analysis is not None:
+            distance = analysis.distance_to_exit_at(x, y)
+        priority = (
+            is_location_visited(game_state, level_id, x, y),
+            distance if distance != UNREACHABLE else level.width * level.height,
+            order,
+        )
+        requests.append(PrefetchRequest(
+            key=(level_id, x, y),
+            priority=priority,
+            context=location_context(level_id, x, y),
+            cache_location=_cache_location(dungeon, location),
+        ))
+    prefetcher.prefetch(requests)
+
+
+def _cheap_level_analysis(level):
+    """
+    Análisis del nivel solo si ya está cacheado o el nivel es pequeño (con dict).
+
+    Se llama en cada turno: calcularlo en niveles grandes, o en los niveles por
+    chunks (que no se analizan), costaría O(ancho·alto) solo para ordenar
+    cuatro vecinas.
+    """
+    analysis = peek_level_analysis(level)
+    if analysis is not None:
+        return analysis
+    if (
+        supports_level_analysis(level)
+        and level.width * level.height < COMPACT_LEVEL_MIN_CELLS
+    ):
+        return get_level_analysis(level)
+    return None
+
+
+class _StreamPrinter:
+    """Imprime el texto de una descripción según llega del LLM."""
+
+    def __init__(self):
+        self.parts = []
+
+    def __call__(self, text):
+        self.parts.append(text)
+        print(text, end="", flush=True)
+
+    def finish(self, location_desc):
+        """Cierra la línea; si lo recibido no era el resultado final, lo muestra."""
+        streamed = "".join(self.parts)
+        if streamed:
+            print()
+        if streamed.strip() != location_desc.description.strip():
+            print(location_desc.description)
+
+
+def _show_header(game_state):
+    """
+    Comprueba la ubicación, la marca como visitada e imprime la cabecera.
+
+    Devuelve las RoomOptions de la sala, o None (y fin de partida) si no existe.
     """
     # Obtener la ubicación actual del jugador usando coordenadas
     player_location = game_state["player_location"]
@@ -17,78 +245,59 @@ def display_scenario(game_state):
     # Obtener el nivel actual
     current_level = dungeon.levels[player_location.level]
 
-    # Usar get_room_at_coords() para obtener la Room actual
-    current_room = get_room_at_coords(
+    # Tabla de opciones precalculada de la Room actual
+    room_options = get_room_options(
         current_level, player_location.x, player_location.y)
 
-    if not current_room:
+    if room_options is None:
         print("\nERROR: Ubicación desconocida! Algo salió mal.")
         game_state["game_over"] = True
-        return
+        return None
+
+    mark_location_visited(game_state, player_location)
 
     print("\n" + "=" * 50)
     print(
         f"[NIVEL {player_location.level} - POSICIÓN ({player_location.x}, {player_location.y})]")
+    return room_options
 
-    # Generar o recuperar descripción de la ubicación usando IA
-    location_description_key = f"location_description_{player_location.to_string()}"
-
-    if location_description_key not in game_state:
-        # El contexto incluye las coordenadas según especificación: 'Level {nivel} at ({x},{y})'
-        location_context = f"Level {player_location.level} at ({player_location.x},{player_location.y})"
-        print("Generando descripción de la ubicación...")
 
-        try:
-            location_desc = generate_location_description(location_context)
-            game_state[location_description_key] = location_desc
-        except Exception as e:
-            print(f"Error generando descripción: {e}")
-            # Usar descripción de fallback
-            from .ai_connector import LocationDescription
-            location_desc = LocationDescription(
-                description=f"Te encuentras en una habitación de la mazmorra en el nivel {player_location.level}, coordenadas ({player_location.x},{player_location.y}). La atmósfera es misteriosa."
-            )
-            game_state[location_description_key] = location_desc
+def _show_description(location_desc, printer=None):
+    if printer is not None:
+        printer.finish(location_desc)
     else:
-        # Usar descripción ya generada
-        location_desc = game_state[location_description_key]
+        print(location_desc.description)
 
-    # Mostrar descripción detallada
-    print(location_desc.description)
 
+def _show_options(game_state, room_options):
     print("\nOpciones:")
-    options_map = {}  # Mapear número de opción a acción
-    option_num = 1
-
-    # Las opciones se derivan de room.connections (direcciones cardinales disponibles)
-    for direction, target_coords in current_room.connections.items():
-        # Traducir dirección a texto amigable
-        direction_text = {
-            'north': 'Norte',
-            'south': 'Sur',
-            'east': 'Este',
-            'west': 'Oeste'
-        }.get(direction, direction.capitalize())
-
-        print(f"{option_num}) Ir al {direction_text}")
-        options_map[str(option_num)] = (direction, target_coords)
-        option_num += 1
-
-    # Verificar si estamos en las coordenadas de salida del nivel
-    if (player_location.x, player_location.y) == current_level.exit_coords:
-        print(f"{option_num}) ¡INTENTAR SALIR DEL NIVEL!")
-        options_map[str(option_num)] = ("exit", None)
-        option_num += 1
-
-    # Opción para guardar partida
-    print(f"{option_num}) Guardar partida")
-    options_map[str(option_num)] = ("save", None)
+    for line in room_options.lines:
+        print(line)
 
     # Guardar el mapa de opciones para validación en actions.py
-    game_state["current_options_map"] = options_map
+    game_state["current_options_map"] = room_options.options_map
+    print("También puedes escribir 'ir a (x,y)' o 'volver a la salida'.")
     print("=" * 50)
 
 
+def _cache_location(dungeon, player_location):
+    """
+    (semilla, nivel, x, y) para la caché persistente, o None sin semilla.
+
+    Los generadores siempre asignan semilla; None solo llega de mazmorras
+    construidas a mano o de partidas guardadas antes de registrarla.
+    """
+    if dungeon.seed is None:
+        return None
+    return (dungeon.seed, player_location.level, player_location.x, player_location.y)
+
+
+def _fallback_description(player_location):
+    return LocationDescription(
+        description=f"Te encuentras en una habitación de la mazmorra en el nivel {player_location.level}, coordenadas ({player_location.x},{player_location.y}). La atmósfera es misteriosa."
+    )
+
+
 def display_game_over(game_state):
     """
     Displays game over message.
@@ -1,10 +1,41 @@
 # src/aimaze/dungeon.py
 
-from pydantic import BaseModel, Field
-from typing import Dict, Tuple, Optional
+from dataclasses import dataclass, field, replace
+from typing import Any, Dict, Tuple, Optional
 
+# Las claves de Level.rooms empaquetan (x, y) en un entero: y en los bits altos
+ROOM_KEY_SHIFT = 32
+ROOM_KEY_MASK = (1 << ROOM_KEY_SHIFT) - 1
 
-class PlayerLocation(BaseModel):
+
+def room_key(x: int, y: int) -> int:
+    """Clave entera de Level.rooms para las coordenadas (x, y)."""
+    return (y << ROOM_KEY_SHIFT) | x
+
+
+def room_key_coords(key: int) -> Tuple[int, int]:
+    """Coordenadas (x, y) de una clave creada con room_key()."""
+    return key & ROOM_KEY_MASK, key >> ROOM_KEY_SHIFT
+
+
+def parse_legacy_room_key(key: str) -> Optional[int]:
+    """Convierte una clave antigua 'x,y' en room_key(x, y); None si no lo es."""
+    x, sep, y = key.partition(",")
+    if not sep:
+        return None
+    try:
+        return room_key(int(x), int(y))
+    except ValueError:
+        return None
+
+
+# Tipos de ejecución: dataclasses con __slots__, sin validación ni coste por
+# atributo. Los esquemas pydantic equivalentes están en aimaze.schemas y solo se
+# usan al guardar/cargar (y en la futura API).
+
+
+@dataclass(slots=True)
+class PlayerLocation:
     """Represents the player's location in the dungeon using coordinates."""
     level: int
     x: int
@@ -15,34 +46,65 @@ class PlayerLocation(BaseModel):
         return f"{self.level}:{self.x}:{self.y}"
 
 
-class Room(BaseModel):
+@dataclass(slots=True)
+class Room:
     """Represents a single room in the dungeon."""
     id: str
     coordinates: Tuple[int, int]
-    connections: Dict[str, Tuple[int, int]] = Field(
-        default_factory=dict,
-        description="Dictionary where keys are directions ('north', 'south', 'east', 'west') and values are coordinates (x, y) of adjacent rooms within the same level"
-    )
+    # Dirección ('north', 'south', 'east', 'west') -> coordenadas (x, y) de la sala
+    # adyacente dentro del mismo nivel
+    connections: Dict[str, Tuple[int, int]] = field(default_factory=dict)
 
 
-class Level(BaseModel):
+@dataclass(slots=True)
+class Level:
     """Represents a complete level of the dungeon."""
     id: int
     width: int
     height: int
     start_coords: Tuple[int, int]
     exit_coords: Tuple[int, int]
-    rooms: Dict[str, Room] = Field(
-        default_factory=dict,
-        description="Dictionary where key is 'x,y' coordinate string and value is the Room object"
-    )
+    # room_key(x, y) -> Room
+    rooms: Dict[int, Room] = field(default_factory=dict)
+    # LevelGrid compacta opcional (aimaze.level_grid); si existe, rooms es una vista
+    _grid: Any = field(default=None, init=False, repr=False, compare=False)
+    # Caché de aimaze.level_analysis.LevelAnalysis
+    _analysis: Any = field(default=None, init=False, repr=False, compare=False)
+    # Caché de aimaze.room_options (opciones y movimientos validados por sala)
+    _options: Any = field(default=None, init=False, repr=False, compare=False)
 
+    def __post_init__(self) -> None:
+        rooms = self.rooms
+        # Los datos antiguos usan claves 'x,y'; basta con mirar la primera clave
+        if type(rooms) is dict and rooms and isinstance(next(iter(rooms)), str):
+            self.rooms = upgrade_legacy_room_keys(rooms)
 
-class Dungeon(BaseModel):
+
+@dataclass(slots=True)
+class Dungeon:
     """Represents the complete dungeon with multiple levels."""
     total_levels: int
     current_level: int = 1
-    levels: Dict[int, Level] = Field(default_factory=dict)
+    levels: Dict[int, Level] = field(default_factory=dict)
+    # Semilla con la que se generó (None si se usó entropía del sistema); junto
+    # con nivel y coordenadas identifica cada sala entre partidas
+    seed: Optional[int] = None
+    # LayoutQuality de la generación con presupuesto de tiempo (deadline_ms)
+    _quality: Any = field(default=None, init=False, repr=False, compare=False)
+
+
+def upgrade_legacy_room_keys(rooms: Dict[Any, Any]) -> Dict[Any, Any]:
+    """Devuelve rooms con las claves 'x,y' convertidas a room_key(x, y)."""
+    upgraded = {}
+    for key, room in rooms.items():
+        legacy = parse_legacy_room_key(key) if isinstance(key, str) else None
+        upgraded[key if legacy is None else legacy] = room
+    return upgraded
+
+
+def copy_dungeon(dungeon: Dungeon) -> Dungeon:
+    """Copia superficial: niveles compartidos, pero diccionario de niveles propio."""
+    return replace(dungeon, levels=dict(dungeon.levels))
 
 
 def get_room_at_coords(level: Level, x: int, y: int) -> Optional[Room]:
@@ -57,5 +119,8 @@ def get_room_at_coords(level: Level, x: int, y: int) -> Optional[Room]:
     Returns:
         Room object if found, None otherwise
     """
-    coord_key = f"{x},{y}"
-    return level.rooms.get(coord_key)
+    rooms = level.rooms
+    if type(rooms) is dict:
+        return rooms.get((y << ROOM_KEY_SHIFT) | x)
+    # Vista compacta (GridRooms): resolver directamente contra la rejilla
+    return level._grid.room_at(x, y)
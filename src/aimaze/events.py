@@ -1,11 +1,10 @@
 from __future__ import annotations
 
 import random
+from dataclasses import dataclass, field
 from enum import Enum
 from typing import List, Optional, Tuple
 
-from pydantic import BaseModel, Field
-
 
 class EventType(str, Enum):
     PUZZLE_RIDDLE = "PUZZLE_RIDDLE"
@@ -16,34 +15,32 @@ class EventType(str, Enum):
     ENCOUNTER_NPC = "ENCOUNTER_NPC"
 
 
-class GameEvent(BaseModel):
+@dataclass(slots=True)
+class GameEvent:
+    """
+    Evento de juego en tiempo de ejecución (dataclass con __slots__).
+
+    Su esquema pydantic para guardar/cargar es aimaze.schemas.GameEventSchema.
+    """
+
     event_type: EventType
     description: str
-    ascii_art: Optional[str] = Field(
-        default=None,
-        description="Arte ASCII para el evento (onomatopeyas, dibujos, texto misterioso)",
-    )
-    puzzle_solution: Optional[str] = Field(
-        default=None, description="Solución esperada para eventos de rompecabezas"
-    )
-    alternative_solutions: List[str] = Field(
-        default_factory=list, description="Soluciones alternativas válidas"
-    )
     success_text: str
     failure_text: str
+    # Arte ASCII para el evento (onomatopeyas, dibujos, texto misterioso)
+    ascii_art: Optional[str] = None
+    # Solución esperada para eventos de rompecabezas y alternativas válidas
+    puzzle_solution: Optional[str] = None
+    alternative_solutions: List[str] = field(default_factory=list)
     xp_reward: int = 0
-    item_reward: Optional[str] = Field(
-        default=None, description="ID del objeto otorgado en caso de éxito"
-    )
-    clue_reward: Optional[str] = Field(
-        default=None, description="Texto de pista otorgado en caso de éxito"
-    )
+    # ID del objeto y texto de pista otorgados en caso de éxito
+    item_reward: Optional[str] = None
+    clue_reward: Optional[str] = None
     damage_on_failure: int = 0
-    # Campos para futuras fases multi-habitación (placeholders)
-    event_size: int = Field(1, description="Número de habitaciones clave involucradas")
-    related_locations: List[str] = Field(
-        default_factory=list, description="Otras coordenadas de habitaciones involucradas"
-    )
+    # Campos para futuras fases multi-habitación (placeholders): número de
+    # habitaciones clave involucradas y otras coordenadas implicadas
+    event_size: int = 1
+    related_locations: List[str] = field(default_factory=list)
 
 
 def _normalize_answer(value: Optional[str]) -> str:
@@ -2,16 +2,20 @@ import random
 from aimaze.events import EventType, GameEvent
 
 
-def generate_random_event(location_context: str) -> GameEvent | None:
+def generate_random_event(location_context: str, rng=None) -> GameEvent | None:
     """
     Genera un evento aleatorio ligero favoreciendo puzzles (implementación local para MVP).
+
+    rng (random.Random) permite repetir los eventos de una sala; por defecto se
+    usa el generador global del módulo random.
     """
-    if random.random() < 0.30:
+    rng = random if rng is None else rng
+    if rng.random() < 0.30:
         return None
 
-    r = random.random()
+    r = rng.random()
     if r < 0.6:
-        event_type = random.choice(
+        event_type = rng.choice(
             [EventType.PUZZLE_RIDDLE, EventType.PUZZLE_LOGIC, EventType.PUZZLE_OBSERVATION]
         )
         if event_type == EventType.PUZZLE_RIDDLE:
@@ -53,7 +57,7 @@ def generate_random_event(location_context: str) -> GameEvent | None:
             damage_on_failure=0,
         )
 
-    event_type = random.choice([EventType.OBSTACLE_PHYSICAL, EventType.ENCOUNTER_CREATURE])
+    event_type = rng.choice([EventType.OBSTACLE_PHYSICAL, EventType.ENCOUNTER_CREATURE])
     if event_type == EventType.OBSTACLE_PHYSICAL:
         return GameEvent(
             event_type=event_type,
@@ -74,4 +78,14 @@ def generate_random_event(location_context: str) -> GameEvent | None:
         failure_text="El grito lo irrita y rasga tu capa antes de irse.",
         xp_reward=12,
         damage_on_failure=5,
-    )
\ No newline at end of file
+    )
+
+
+async def agenerate_random_event(location_context: str) -> GameEvent | None:
+    """
+    Versión asíncrona de generate_random_event para el bucle de juego asyncio.
+
+    La generación actual es local e inmediata; la firma asíncrona permite pasar
+    a un evento generado por LLM (con ainvoke) sin cambiar a los llamadores.
+    """
+    return generate_random_event(location_context)
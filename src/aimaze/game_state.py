@@ -1,26 +1,262 @@
 # src/aimaze/game_state.py
 
-from aimaze.dungeon import PlayerLocation
-from aimaze.ai_connector import generate_dungeon_layout
+from collections.abc import MutableMapping
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, Optional, Set, Tuple
+
+from aimaze.dungeon import Dungeon, PlayerLocation, room_key, room_key_coords
+from aimaze.ai_connector import LocationDescription, generate_dungeon_layout
 from aimaze.config import load_config
 from aimaze.player import Player
+from aimaze.schemas import dump_model, load_model
+
+# Las claves de ubicación empaquetan el nivel por encima de room_key(x, y)
+LOCATION_LEVEL_SHIFT = 64
+LOCATION_ROOM_MASK = (1 << LOCATION_LEVEL_SHIFT) - 1
+
+# Versión del formato estructurado de GameState.to_dict()
+GAME_STATE_FORMAT = 2
+
+# Campos fijos de GameState accesibles también como game_state["campo"]
+CORE_FIELDS = frozenset({
+    "player_location",
+    "dungeon",
+    "player",
+    "game_over",
+    "objective_achieved",
+    "enable_events",
+    "current_options_map",
+})
+
+# Prefijos de las claves dinámicas del antiguo game_state plano -> almacén
+_LOCATION_PREFIXES = (
+    ("location_description_", "descriptions"),
+    ("event_resolved_", "resolved_events"),
+    ("visited_", "visited"),
+)
+
+
+def location_key(level: int, x: int, y: int) -> int:
+    """Clave entera de los almacenes por ubicación de GameState."""
+    return (level << LOCATION_LEVEL_SHIFT) | room_key(x, y)
+
+
+def location_key_coords(key: int) -> Tuple[int, int, int]:
+    """(level, x, y) de una clave creada con location_key()."""
+    x, y = room_key_coords(key & LOCATION_ROOM_MASK)
+    return key >> LOCATION_LEVEL_SHIFT, x, y
+
+
+def _parse_location_key(key: str) -> Optional[Tuple[str, int]]:
+    """Traduce 'visited_1:2:3' y similares a (almacén, location_key)."""
+    for prefix, store in _LOCATION_PREFIXES:
+        if key.startswith(prefix):
+            parts = key[len(prefix):].split(":")
+            if len(parts) != 3:
+                return None
+            try:
+                level, x, y = (int(part) for part in parts)
+            except ValueError:
+                return None
+            return store, location_key(level, x, y)
+    return None
+
+
+@dataclass(slots=True)
+class GameState(MutableMapping):
+    """
+    Estado de la partida con campos fijos y almacenes indexados por ubicación.
+
+    Las descripciones, los eventos resueltos y las salas visitadas se guardan
+    en almacenes con clave location_key(level, x, y), en lugar de claves de
+    texto sueltas como 'location_description_1:2:3'. Para el código existente,
+    GameState se comporta además como un dict: game_state["player"] y las
+    claves de texto antiguas se traducen a los campos y almacenes, y cualquier
+    otra clave se guarda en extras.
+
+    current_options_map lo recalcula display_scenario en cada turno, así que no
+    se guarda en to_dict().
+    """
+    player_location: Optional[PlayerLocation] = None
+    dungeon: Optional[Dungeon] = None
+    player: Player = field(default_factory=Player)
+    game_over: bool = False
+    objective_achieved: bool = False
+    enable_events: bool = False
+    current_options_map: Dict[str, tuple] = field(default_factory=dict)
+    # location_key -> LocationDescription
+    descriptions: Dict[int, Any] = field(default_factory=dict)
+    resolved_events: Set[int] = field(default_factory=set)
+    visited: Set[int] = field(default_factory=set)
+    # Claves no reconocidas de quienes usan GameState como dict
+    extras: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_mapping(cls, data) -> "GameState":
+        """Crea un GameState a partir de un game_state plano (dict)."""
+        state = cls()
+        for key, value in data.items():
+            state[key] = value
+        return state
+
+    # Protocolo de dict para los llamadores existentes
+
+    def __getitem__(self, key: str) -> Any:
+        if key in CORE_FIELDS:
+            return getattr(self, key)
+        parsed = _parse_location_key(key)
+        if parsed is None:
+            return self.extras[key]
+        store, packed = parsed
+        if store == "descriptions":
+            return self.descriptions[packed]
+        if packed in getattr(self, store):
+            return True
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in CORE_FIELDS:
+            setattr(self, key, value)
+            return
+        parsed = _parse_location_key(key)
+        if parsed is None:
+            self.extras[key] = value
+            return
+        store, packed = parsed
+        if store == "descriptions":
+            self.descriptions[packed] = value
+        elif value:
+            getattr(self, store).add(packed)
+        else:
+            getattr(self, store).discard(packed)
+
+    def __delitem__(self, key: str) -> None:
+        if key in CORE_FIELDS:
+            raise TypeError(f"No se puede borrar el campo '{key}' de GameState")
+        parsed = _parse_location_key(key)
+        if parsed is None:
+            del self.extras[key]
+            return
+        store, packed = parsed
+        if store == "descriptions":
+            del self.descriptions[packed]
+        elif packed in getattr(self, store):
+            getattr(self, store).discard(packed)
+        else:
+            raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        if key in CORE_FIELDS:
+            return True
+        if not isinstance(key, str):
+            return False
+        parsed = _parse_location_key(key)
+        if parsed is None:
+            return key in self.extras
+        store, packed = parsed
+        return packed in getattr(self, store)
+
+    def __iter__(self) -> Iterator[str]:
+        yield from sorted(CORE_FIELDS)
+        for prefix, store in _LOCATION_PREFIXES:
+            for packed in getattr(self, store):
+                level, x, y = location_key_coords(packed)
+                yield f"{prefix}{level}:{x}:{y}"
+        yield from self.extras
+
+    def __len__(self) -> int:
+        return (
+            len(CORE_FIELDS)
+            + len(self.descriptions)
+            + len(self.resolved_events)
+            + len(self.visited)
+            + len(self.extras)
+        )
+
+    # Serialización estructurada
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Vuelca el estado a un dict serializable con json."""
+        return {
+            "format": GAME_STATE_FORMAT,
+            "player_location": (
+                None if self.player_location is None
+                else dump_model(self.player_location)
+            ),
+            "dungeon": None if self.dungeon is None else dump_model(self.dungeon),
+            "player": dump_model(self.player),
+            "game_over": self.game_over,
+            "objective_achieved": self.objective_achieved,
+            "enable_events": self.enable_events,
+            "descriptions": [
+                [*location_key_coords(packed), _dump_description(description)]
+                for packed, description in self.descriptions.items()
+            ],
+            "resolved_events": [
+                list(location_key_coords(packed)) for packed in self.resolved_events
+            ],
+            "visited": [list(location_key_coords(packed)) for packed in self.visited],
+            "extras": self.extras,
+        }
 
-def initialize_game_state():
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "GameState":
+        """Reconstruye un GameState volcado con to_dict()."""
+        player_location = data.get("player_location")
+        dungeon = data.get("dungeon")
+        return cls(
+            player_location=(
+                None if player_location is None
+                else load_model(PlayerLocation, player_location)
+            ),
+            dungeon=None if dungeon is None else load_model(Dungeon, dungeon),
+            player=load_model(Player, data.get("player", {})),
+            game_over=data.get("game_over", False),
+            objective_achieved=data.get("objective_achieved", False),
+            enable_events=data.get("enable_events", False),
+            descriptions={
+                location_key(level, x, y): _load_description(description)
+                for level, x, y, description in data.get("descriptions", [])
+            },
+            resolved_events={
+                location_key(*coords) for coords in data.get("resolved_events", [])
+            },
+            visited={location_key(*coords) for coords in data.get("visited", [])},
+            extras=dict(data.get("extras", {})),
+        )
+
+
+def _dump_description(description: Any) -> Any:
+    if hasattr(description, "model_dump"):
+        return description.model_dump()
+    return description
+
+
+def _load_description(description: Any) -> Any:
+    if isinstance(description, dict):
+        return LocationDescription(**description)
+    return description
+
+
+def initialize_game_state(dungeon_pool=None):
     """
     Initializes the global game state and player data.
     This is where the AI would start preparing the environment.
+
+    Args:
+        dungeon_pool: Optional DungeonPool; if given, the dungeon is taken from
+            its pre-generated stock instead of being generated synchronously.
+
+    Returns:
+        GameState (also usable as a dict by existing callers)
     """
     print("--- INICIALIZANDO JUEGO ---")
     load_config()
 
-    game_state = {
-        "player_location": None,  # Will be initialized with PlayerLocation
-        "game_over": False,
-        "objective_achieved": False,
-        "player": Player(),              # Initialize Player model
-        "enable_events": False          # Enable random events system (1.6) - disabled by default
-    }
+    game_state = GameState(
+        player=Player(),              # Initialize Player model
+        enable_events=False,          # Enable random events system (1.6) - disabled by default
+    )
 
     print("Here the AI will be asked to: ")
     print("  - Generate the initial dungeon and its characteristics (rooms, corridors).")
@@ -30,12 +266,15 @@ def initialize_game_state():
 
     # --- GENERATE DUNGEON USING AI ---
     # Generate dungeon layout using AI
-    game_state["dungeon"] = generate_dungeon_layout()
+    if dungeon_pool is not None:
+        game_state.dungeon = dungeon_pool.take()
+    else:
+        game_state.dungeon = generate_dungeon_layout()
 
     # Initialize player location with start coordinates of level 1
-    level_1 = game_state["dungeon"].levels[1]
+    level_1 = game_state.dungeon.levels[1]
     start_x, start_y = level_1.start_coords
-    game_state["player_location"] = PlayerLocation(level=1, x=start_x, y=start_y)
+    game_state.player_location = PlayerLocation(level=1, x=start_x, y=start_y)
     # --- END AI GENERATION ---
 
     return game_state
@@ -61,3 +300,63 @@ def check_game_over(game_state):
     # Por ejemplo: tiempo límite, condiciones especiales de la mazmorra, etc.
 
     return False
+
+
+# Accesos por ubicación: O(1) con clave entera en GameState y, para los
+# game_state planos (dict), las claves de texto de siempre.
+
+
+def visited_location_key(level: int, x: int, y: int) -> str:
+    """Clave de game_state que marca una ubicación como visitada."""
+    return f"visited_{level}:{x}:{y}"
+
+
+def mark_location_visited(game_state, player_location):
+    """Marca la ubicación actual del jugador como visitada."""
+    level, x, y = player_location.level, player_location.x, player_location.y
+    if type(game_state) is GameState:
+        game_state.visited.add(location_key(level, x, y))
+    else:
+        game_state[visited_location_key(level, x, y)] = True
+
+
+def is_location_visited(game_state, level: int, x: int, y: int) -> bool:
+    """Indica si el jugador ya ha pasado por la ubicación (level, x, y)."""
+    if type(game_state) is GameState:
+        return location_key(level, x, y) in game_state.visited
+    return bool(game_state.get(visited_location_key(level, x, y)))
+
+
+def get_location_description(game_state, player_location):
+    """Descripción ya generada para la ubicación, o None."""
+    if type(game_state) is GameState:
+        return game_state.descriptions.get(location_key(
+            player_location.level, player_location.x, player_location.y
+        ))
+    return game_state.get(f"location_description_{player_location.to_string()}")
+
+
+def set_location_description(game_state, player_location, description) -> None:
+    if type(game_state) is GameState:
+        key = location_key(player_location.level, player_location.x, player_location.y)
+        game_state.descriptions[key] = description
+    else:
+        game_state[f"location_description_{player_location.to_string()}"] = description
+
+
+def is_event_resolved(game_state, player_location) -> bool:
+    """Indica si ya se resolvió el evento de la ubicación."""
+    if type(game_state) is GameState:
+        return location_key(
+            player_location.level, player_location.x, player_location.y
+        ) in game_state.resolved_events
+    return bool(game_state.get(f"event_resolved_{player_location.to_string()}"))
+
+
+def mark_event_resolved(game_state, player_location) -> None:
+    if type(game_state) is GameState:
+        game_state.resolved_events.add(location_key(
+            player_location.level, player_location.x, player_location.y
+        ))
+    else:
+        game_state[f"event_resolved_{player_location.to_string()}"] = True
@@ -0,0 +1,177 @@
+from typing import Iterator, Optional, Tuple
+
+import numpy as np
+
+from aimaze.dungeon import Dungeon
+from aimaze.level_grid import EAST, NORTH, SOUTH, WEST, LevelGrid
+
+# Desplazamientos (dx, dy), bit propio y bit recíproco para north, south, east, west
+_DX = np.array([0, 0, 1, -1])
+_DY = np.array([-1, 1, 0, 0])
+_BITS = np.array([NORTH, SOUTH, EAST, WEST], dtype=np.uint8)
+_REVERSE_BITS = np.array([SOUTH, NORTH, WEST, EAST], dtype=np.uint8)
+
+
+class DungeonBatch:
+    """
+    Lote de K layouts del mismo tamaño guardados como arrays apilados.
+
+    - masks: (K, height, width) uint8 con las máscaras de conexión de level_grid
+    - starts / exits: (K, 2) con las coordenadas (x, y) de inicio y salida
+
+    Los objetos Dungeon solo se construyen al pedirlos con to_dungeon().
+    """
+
+    def __init__(self, masks: np.ndarray, starts: np.ndarray, exits: np.ndarray):
+        self.masks = masks
+        self.starts = starts
+        self.exits = exits
+
+    def __len__(self) -> int:
+        return self.masks.shape[0]
+
+    @property
+    def width(self) -> int:
+        return self.masks.shape[2]
+
+    @property
+    def height(self) -> int:
+        return self.masks.shape[1]
+
+    def connected(self) -> np.ndarray:
+        """Array (K,) de bool: True si todas las celdas se alcanzan desde el inicio."""
+        reached, _ = _flood_fill(self.masks, self.starts, self.exits)
+        return reached.reshape(len(self), -1).all(axis=1)
+
+    def exit_distances(self) -> np.ndarray:
+        """Array (K,) con la distancia más corta inicio-salida (-1 si no hay camino)."""
+        _, distances = _flood_fill(self.masks, self.starts, self.exits)
+        return distances
+
+    def to_dungeon(self, index: int) -> Dungeon:
+        """Convierte el layout index en un Dungeon de un nivel con LevelGrid."""
+        grid = LevelGrid.from_masks(
+            self.masks[index].tobytes(), self.width, self.height
+        )
+        start = tuple(int(v) for v in self.starts[index])
+        exit_coords = tuple(int(v) for v in self.exits[index])
+        level_1 = grid.to_level(1, start, exit_coords)
+        return Dungeon(total_levels=1, current_level=1, levels={1: level_1})
+
+    def iter_dungeons(self) -> Iterator[Dungeon]:
+        for index in range(len(self)):
+            yield self.to_dungeon(index)
+
+
+def generate_dungeon_batch(
+    count: int,
+    width: int,
+    height: int,
+    seed: Optional[int] = None,
+    loop_density: float = 0.0,
+) -> DungeonBatch:
+    """
+    Genera count layouts de width x height a la vez para simulación masiva.
+
+    Cada layout es un árbol de expansión uniforme obtenido con paseos aleatorios
+    de Aldous-Broder ejecutados en paralelo sobre todo el lote con NumPy. Con
+    loop_density > 0 se añaden enlaces extra entre celdas vecinas para crear
+    ciclos. Todas las celdas tienen sala y el nivel siempre es conexo.
+    """
+    if width * height < 2:
+        raise ValueError("Cada layout necesita al menos dos celdas")
+    rng = np.random.default_rng(seed)
+    masks = _carve_spanning_trees(rng, count, width, height)
+    if loop_density > 0:
+        _add_loops(rng, masks, loop_density)
+
+    cells = width * height
+    start_index = rng.integers(0, cells, size=count)
+    exit_index = (start_index + rng.integers(1, cells, size=count)) % cells
+    starts = np.stack([start_index % width, start_index // width], axis=1)
+    exits = np.stack([exit_index % width, exit_index // width], axis=1)
+    return DungeonBatch(masks, starts, exits)
+
+
+def _carve_spanning_trees(
+    rng: np.random.Generator, count: int, width: int, height: int
+) -> np.ndarray:
+    """Paseos de Aldous-Broder vectorizados: un paso por layout en cada iteración."""
+    cells = width * height
+    masks = np.zeros((count, cells), dtype=np.uint8)
+    visited = np.zeros((count, cells), dtype=bool)
+    position = rng.integers(0, cells, size=count)
+    visited[np.arange(count), position] = True
+    remaining = np.full(count, cells - 1)
+    active = np.arange(count)
+
+    while active.size:
+        current = position[active]
+        direction = rng.integers(0, 4, size=active.size)
+        x = current % width + _DX[direction]
+        y = current // width + _DY[direction]
+        inside = (x >= 0) & (x < width) & (y >= 0) & (y < height)
+
+        walkers = active[inside]
+        current = current[inside]
+        direction = direction[inside]
+        target = (y * width + x)[inside]
+
+        fresh = ~visited[walkers, target]
+        carved = walkers[fresh]
+        masks[carved, current[fresh]] |= _BITS[direction[fresh]]
+        masks[carved, target[fresh]] |= _REVERSE_BITS[direction[fresh]]
+        visited[carved, target[fresh]] = True
+        remaining[carved] -= 1
+
+        position[walkers] = target
+        active = active[remaining[active] > 0]
+
+    return masks.reshape(count, height, width)
+
+
+def _add_loops(
+    rng: np.random.Generator, masks: np.ndarray, loop_density: float
+) -> None:
+    """Abre pasos este-oeste y norte-sur adicionales con probabilidad loop_density."""
+    east = rng.random(masks[:, :, :-1].shape) < loop_density
+    masks[:, :, :-1] |= np.where(east, EAST, 0).astype(np.uint8)
+    masks[:, :, 1:] |= np.where(east, WEST, 0).astype(np.uint8)
+    south = rng.random(masks[:, :-1, :].shape) < loop_density
+    masks[:, :-1, :] |= np.where(south, SOUTH, 0).astype(np.uint8)
+    masks[:, 1:, :] |= np.where(south, NORTH, 0).astype(np.uint8)
+
+
+def _flood_fill(
+    masks: np.ndarray, starts: np.ndarray, exits: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    BFS vectorizado desde el inicio de cada layout.
+
+    Devuelve las celdas alcanzadas (K, H, W) y la distancia inicio-salida (K,).
+    """
+    count = masks.shape[0]
+    rows = np.arange(count)
+    reached = np.zeros(masks.shape, dtype=bool)
+    reached[rows, starts[:, 1], starts[:, 0]] = True
+    distances = np.full(count, -1)
+    distances[reached[rows, exits[:, 1], exits[:, 0]]] = 0
+
+    open_north = (masks & NORTH) != 0
+    open_south = (masks & SOUTH) != 0
+    open_east = (masks & EAST) != 0
+    open_west = (masks & WEST) != 0
+
+    step = 0
+    while True:
+        step += 1
+        grown = reached.copy()
+        grown[:, :-1, :] |= reached[:, 1:, :] & open_north[:, 1:, :]
+        grown[:, 1:, :] |= reached[:, :-1, :] & open_south[:, :-1, :]
+        grown[:, :, 1:] |= reached[:, :, :-1] & open_east[:, :, :-1]
+        grown[:, :, :-1] |= reached[:, :, 1:] & open_west[:, :, 1:]
+        if np.array_equal(grown, reached):
+            return reached, distances
+        newly_at_exit = grown[rows, exits[:, 1], exits[:, 0]] & (distances < 0)
+        distances[newly_at_exit] = step
+        reached = grown
@@ -0,0 +1,232 @@
+import hashlib
+import random
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from aimaze.dungeon import Dungeon, Level, Room
+from aimaze.generation.dungeon_generator import (
+    add_connected_additional_rooms,
+    calculate_smart_path_length,
+    generate_advanced_main_path,
+)
+from aimaze.level_grid import (
+    DIRECTION_BITS,
+    DIRECTION_OFFSETS,
+    EAST,
+    NORTH,
+    SOUTH,
+    WEST,
+    GridRooms,
+    LevelGrid,
+)
+
+DEFAULT_CHUNK_SIZE = 32
+
+
+def _derive_seed(seed: int, *parts) -> int:
+    """Semilla de 64 bits derivada de la semilla del nivel y de un identificador."""
+    key = ":".join(str(part) for part in (seed,) + parts)
+    digest = hashlib.sha256(key.encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big")
+
+
+class ChunkedGrid:
+    """
+    Rejilla de nivel dividida en chunks que se generan la primera vez que se tocan.
+
+    Ofrece la misma interfaz de lectura que LevelGrid (room_at, has_room,
+    iter_coords, room_count), así que GridRooms y get_room_at_coords funcionan
+    igual. Cada chunk se genera con su propia semilla derivada y es conexo por
+    dentro; las puertas entre chunks vecinos se derivan de una semilla por
+    costura, de modo que ambos lados coinciden sin importar el orden en que se
+    exploren. El coste en tiempo y memoria es proporcional a los chunks tocados.
+
+    Al guardar partida se guardan la semilla y chunk_size en lugar de las salas
+    (aimaze.schemas); al cargar se crea otra ChunkedGrid que regenera los mismos
+    chunks cuando se vuelven a tocar.
+    """
+
+    def __init__(
+        self, width: int, height: int, seed: int, chunk_size: int = DEFAULT_CHUNK_SIZE
+    ):
+        if chunk_size < 1:
+            raise ValueError("chunk_size debe ser positivo")
+        self.width = width
+        self.height = height
+        self.seed = seed
+        self.chunk_size = chunk_size
+        self.chunks: Dict[Tuple[int, int], LevelGrid] = {}
+
+    @property
+    def room_count(self) -> int:
+        return sum(chunk.room_count for chunk in self.chunks.values())
+
+    @property
+    def version(self) -> int:
+        return sum(chunk.version for chunk in self.chunks.values())
+
+    @property
+    def nbytes(self) -> int:
+        return sum(chunk.nbytes for chunk in self.chunks.values())
+
+    def chunk_of(self, x: int, y: int) -> Tuple[int, int]:
+        return x // self.chunk_size, y // self.chunk_size
+
+    def has_room(self, x: int, y: int) -> bool:
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return False
+        chunk, local_x, local_y = self._locate(x, y)
+        return chunk.has_room(local_x, local_y)
+
+    def room_at(self, x: int, y: int) -> Optional[Room]:
+        """Devuelve la sala en (x, y) globales, generando su chunk si hace falta."""
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return None
+        cx, cy = self.chunk_of(x, y)
+        chunk, local_x, local_y = self._locate(x, y)
+        if not chunk.has_room(local_x, local_y):
+            return None
+        index = chunk.index(local_x, local_y)
+        connections = {}
+        mask = chunk.masks[index]
+        for direction, bit in DIRECTION_BITS.items():
+            if mask & bit:
+                dx, dy = DIRECTION_OFFSETS[direction]
+                connections[direction] = (x + dx, y + dy)
+        return Room(
+            id=f"chunk_{cx}_{cy}_{chunk.room_id(index)}",
+            coordinates=(x, y),
+            connections=connections,
+        )
+
+    def set_room(self, room: Room) -> None:
+        x, y = room.coordinates
+        chunk, local_x, local_y = self._locate(x, y)
+        origin_x, origin_y = x - local_x, y - local_y
+        local_connections = {
+            direction: (target[0] - origin_x, target[1] - origin_y)
+            for direction, target in room.connections.items()
+        }
+        # Las puertas de costura apuntan fuera del chunk: se guardan como bits
+        mask = 0
+        inside = {}
+        for direction, target in local_connections.items():
+            if 0 <= target[0] < chunk.width and 0 <= target[1] < chunk.height:
+                inside[direction] = target
+            else:
+                mask |= DIRECTION_BITS[direction]
+        chunk.set_room(
+            Room(id=room.id, coordinates=(local_x, local_y), connections=inside)
+        )
+        chunk.masks[chunk.index(local_x, local_y)] |= mask
+
+    def iter_coords(self) -> Iterator[Tuple[int, int]]:
+        """Recorre las coordenadas globales de las salas ya generadas."""
+        for (cx, cy), chunk in sorted(self.chunks.items()):
+            origin_x, origin_y = cx * self.chunk_size, cy * self.chunk_size
+            for local_x, local_y in chunk.iter_coords():
+                yield origin_x + local_x, origin_y + local_y
+
+    def ensure_chunk(self, cx: int, cy: int) -> LevelGrid:
+        """Devuelve el chunk (cx, cy), generándolo si todavía no existe."""
+        chunk = self.chunks.get((cx, cy))
+        if chunk is None:
+            chunk = self._generate_chunk(cx, cy)
+            self.chunks[(cx, cy)] = chunk
+        return chunk
+
+    def _locate(self, x: int, y: int) -> Tuple[LevelGrid, int, int]:
+        cx, cy = self.chunk_of(x, y)
+        chunk = self.ensure_chunk(cx, cy)
+        return chunk, x - cx * self.chunk_size, y - cy * self.chunk_size
+
+    def _chunk_size_at(self, cx: int, cy: int) -> Tuple[int, int]:
+        size = self.chunk_size
+        return min(size, self.width - cx * size), min(size, self.height - cy * size)
+
+    def _generate_chunk(self, cx: int, cy: int) -> LevelGrid:
+        width, height = self._chunk_size_at(cx, cy)
+        rng = random.Random(_derive_seed(self.seed, "chunk", cx, cy))
+        cells = [(x, y) for x in range(width) for y in range(height)]
+        if len(cells) == 1:
+            start = end = cells[0]
+        else:
+            start, end = rng.sample(cells, 2)
+        target = calculate_smart_path_length(start, end, width, height, rng)
+        path = generate_advanced_main_path(start, end, width, height, target, rng)
+        rooms = add_connected_additional_rooms(path, width, height, rng=rng)
+        chunk = LevelGrid.from_rooms(rooms, width, height)
+        for (x, y), bit in self._seam_doors(cx, cy, width, height):
+            chunk.masks[chunk.index(x, y)] |= bit
+        return chunk
+
+    def _seam_doors(self, cx: int, cy: int, width: int, height: int) -> List[tuple]:
+        """Puertas locales del chunk hacia sus vecinos existentes."""
+        max_cx = (self.width - 1) // self.chunk_size
+        max_cy = (self.height - 1) // self.chunk_size
+        doors = []
+        if cx > 0:
+            doors.append(((0, self._seam_offset("v", cx - 1, cy, height)), WEST))
+        if cx < max_cx:
+            doors.append(((width - 1, self._seam_offset("v", cx, cy, height)), EAST))
+        if cy > 0:
+            doors.append(((self._seam_offset("h", cx, cy - 1, width), 0), NORTH))
+        if cy < max_cy:
+            doors.append(((self._seam_offset("h", cx, cy, width), height - 1), SOUTH))
+        return doors
+
+    def _seam_offset(self, axis: str, cx: int, cy: int, span: int) -> int:
+        """
+        Posición de la puerta en la costura que sale del chunk (cx, cy) hacia el
+        este ('v') o el sur ('h'). Ambos chunks la calculan igual.
+        """
+        seam_rng = random.Random(_derive_seed(self.seed, "seam", axis, cx, cy))
+        return seam_rng.randrange(span)
+
+
+def create_chunked_level(
+    level_id: int,
+    width: int,
+    height: int,
+    seed: int,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    start_coords: Optional[tuple] = None,
+    exit_coords: Optional[tuple] = None,
+) -> Level:
+    """
+    Crea un Level cuyas salas se generan por chunks bajo demanda.
+
+    Si no se indican, start_coords y exit_coords se derivan de la semilla. No se
+    genera ningún chunk hasta que algo consulta una sala.
+    """
+    if width * height < 2:
+        raise ValueError("El nivel necesita al menos dos celdas")
+    rng = random.Random(_derive_seed(seed, "stairs"))
+    if start_coords is None:
+        start_coords = (rng.randrange(width), rng.randrange(height))
+    while exit_coords is None or exit_coords == start_coords:
+        exit_coords = (rng.randrange(width), rng.randrange(height))
+
+    grid = ChunkedGrid(width, height, seed, chunk_size)
+    level = Level(
+        id=level_id,
+        width=width,
+        height=height,
+        start_coords=start_coords,
+        exit_coords=exit_coords,
+    )
+    level.rooms = GridRooms(grid)
+    level._grid = grid
+    return level
+
+
+def generate_chunked_dungeon(
+    width: int,
+    height: int,
+    seed: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Dungeon:
+    """Genera una mazmorra de un nivel explorable por chunks bajo demanda."""
+    if seed is None:
+        seed = random.SystemRandom().getrandbits(64)
+    level_1 = create_chunked_level(1, width, height, seed, chunk_size)
+    return Dungeon(total_levels=1, current_level=1, levels={1: level_1}, seed=seed)
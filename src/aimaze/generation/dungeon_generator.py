@@ -1,68 +1,163 @@
 import random
-from typing import Dict, Tuple, Optional, List
-
-from aimaze.dungeon import Dungeon, Level, Room
-
-
-def generate_random_start_exit_points(width: int, height: int) -> tuple:
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, Tuple, Optional, Union
+
+from aimaze.dungeon import Dungeon, Level, Room, room_key
+from aimaze.generation.layout_cache import (
+    LayoutCache,
+    get_layout_cache,
+    layout_cache_key,
+)
+from aimaze.generation.maze_algorithms import MazeAlgorithm, get_maze_algorithm
+from aimaze.level_grid import COMPACT_LEVEL_MIN_CELLS, LevelGrid
+
+# Cada cuántas iteraciones se consulta el reloj cuando hay deadline
+DEADLINE_CHECK_INTERVAL = 32
+
+# Fracción del presupuesto de deadline_ms dedicada a refinar el layout; el resto
+# queda para crear el nivel (LevelGrid en niveles grandes), cuyo coste crece
+# con las salas colocadas durante el refinamiento
+REFINE_BUDGET_FRACTION = 0.5
+
+
+def generate_random_start_exit_points(
+    width: int, height: int, rng: Optional[random.Random] = None
+) -> tuple:
     """Genera puntos de inicio y salida aleatorios para la mazmorra."""
-    start_x = random.randint(0, width - 1)
-    start_y = random.randint(0, height - 1)
+    rng = random if rng is None else rng
+    start_x = rng.randint(0, width - 1)
+    start_y = rng.randint(0, height - 1)
     start_coords = (start_x, start_y)
 
     exit_coords = start_coords
     while exit_coords == start_coords:
-        exit_x = random.randint(0, width - 1)
-        exit_y = random.randint(0, height - 1)
+        exit_x = rng.randint(0, width - 1)
+        exit_y = rng.randint(0, height - 1)
         exit_coords = (exit_x, exit_y)
 
     return start_coords, exit_coords
 
 
-def generate_advanced_main_path(start: tuple, end: tuple, width: int, height: int, target_length: int) -> list:
-    """Genera un camino principal de longitud específica desde start hasta end."""
+def generate_advanced_main_path(
+    start: tuple,
+    end: tuple,
+    width: int,
+    height: int,
+    target_length: int,
+    rng: Optional[random.Random] = None,
+    deadline: Optional[float] = None,
+) -> list:
+    """
+    Genera un camino principal de longitud específica desde start hasta end.
+
+    Parte de un camino mínimo aleatorio y lo alarga iterativamente con desvíos
+    de dos salas: una arista a→b se sustituye por a→a'→b'→b cuando a' y b'
+    (desplazadas en perpendicular) están libres. La ocupación solo crece, así que
+    una arista descartada nunca vuelve a ser válida y el coste total es lineal en
+    la longitud del camino. Si la paridad o la geometría impiden alcanzar
+    target_length, devuelve el camino más largo conseguido sin superarlo.
+
+    Con deadline (instante de time.perf_counter()) el alargamiento se detiene al
+    vencer el plazo y se devuelve el camino válido conseguido hasta entonces.
+    """
+    rng = random if rng is None else rng
+    if start == end:
+        return [start]
+
+    occupied = bytearray(width * height)
+    path = _generate_monotone_path(start, end, rng)
+    next_room: Dict[tuple, tuple] = {}
+    for current, following in zip(path, path[1:]):
+        next_room[current] = following
+    for x, y in path:
+        occupied[y * width + x] = 1
+
+    length = len(path)
+    candidates = list(zip(path, path[1:]))
+    iterations = 0
+    while candidates and length + 2 <= target_length:
+        iterations += 1
+        if _deadline_passed(deadline, iterations):
+            break
+        index = rng.randrange(len(candidates))
+        candidates[index], candidates[-1] = candidates[-1], candidates[index]
+        a, b = candidates.pop()
+        if next_room.get(a) != b:
+            continue
+        detour = _find_detour(a, b, width, height, occupied, rng)
+        if detour is None:
+            continue
+        a_side, b_side = detour
+        next_room[a] = a_side
+        next_room[a_side] = b_side
+        next_room[b_side] = b
+        occupied[a_side[1] * width + a_side[0]] = 1
+        occupied[b_side[1] * width + b_side[0]] = 1
+        candidates.extend([(a, a_side), (a_side, b_side), (b_side, b)])
+        length += 2
+
+    selected_path = [start]
+    while selected_path[-1] != end:
+        selected_path.append(next_room[selected_path[-1]])
+    return selected_path
 
-    def get_neighbors(pos):
-        x, y = pos
-        neighbors = []
-        for dx, dy in [(0, -1), (0, 1), (1, 0), (-1, 0)]:
-            nx, ny = x + dx, y + dy
-            if 0 <= nx < width and 0 <= ny < height:
-                neighbors.append((nx, ny))
-        return neighbors
 
-    def dfs_find_paths(current_path, current_pos, target_pos, max_paths=50):
-        if len(paths_found) >= max_paths:
-            return
-        if current_pos == target_pos:
-            paths_found.append(current_path[:])
-            return
-        if len(current_path) > target_length + 5:
-            return
-        neighbors = get_neighbors(current_pos)
-        random.shuffle(neighbors)
-        for next_pos in neighbors:
-            if next_pos not in current_path:
-                current_path.append(next_pos)
-                dfs_find_paths(current_path, next_pos, target_pos, max_paths)
-                current_path.pop()
+def _deadline_passed(deadline: Optional[float], iterations: int) -> bool:
+    """Comprueba el plazo solo cada DEADLINE_CHECK_INTERVAL iteraciones."""
+    return (
+        deadline is not None
+        and iterations % DEADLINE_CHECK_INTERVAL == 0
+        and time.perf_counter() >= deadline
+    )
 
-    paths_found = []
-    initial_path = [start]
-    dfs_find_paths(initial_path, start, end)
 
-    if not paths_found:
-        return generate_simple_direct_path(start, end)
+def _generate_monotone_path(start: tuple, end: tuple, rng: random.Random) -> list:
+    """Genera un camino mínimo con los pasos horizontales y verticales barajados."""
+    dx = end[0] - start[0]
+    dy = end[1] - start[1]
+    step_x = (1 if dx > 0 else -1, 0)
+    step_y = (0, 1 if dy > 0 else -1)
+    steps = [step_x] * abs(dx) + [step_y] * abs(dy)
+    rng.shuffle(steps)
 
-    target_paths = [path for path in paths_found if len(path) == target_length]
+    path = [start]
+    x, y = start
+    for sx, sy in steps:
+        x, y = x + sx, y + sy
+        path.append((x, y))
+    return path
 
-    if target_paths:
-        selected_path = random.choice(target_paths)
-    else:
-        paths_found.sort(key=len, reverse=True)
-        selected_path = paths_found[0]
 
-    return selected_path
+def _find_detour(
+    a: tuple,
+    b: tuple,
+    width: int,
+    height: int,
+    occupied: bytearray,
+    rng: random.Random,
+) -> Optional[tuple]:
+    """Busca un desvío libre de dos salas en perpendicular a la arista a→b."""
+    if a[0] == b[0]:
+        offsets = [(1, 0), (-1, 0)]
+    else:
+        offsets = [(0, 1), (0, -1)]
+    rng.shuffle(offsets)
+
+    for ox, oy in offsets:
+        a_side = (a[0] + ox, a[1] + oy)
+        b_side = (b[0] + ox, b[1] + oy)
+        if not (0 <= a_side[0] < width and 0 <= a_side[1] < height):
+            continue
+        if not (0 <= b_side[0] < width and 0 <= b_side[1] < height):
+            continue
+        if occupied[a_side[1] * width + a_side[0]]:
+            continue
+        if occupied[b_side[1] * width + b_side[0]]:
+            continue
+        return a_side, b_side
+    return None
 
 
 def generate_simple_direct_path(start: tuple, end: tuple) -> list:
@@ -81,12 +176,82 @@ def generate_simple_direct_path(start: tuple, end: tuple) -> list:
     return path
 
 
-def add_connected_additional_rooms(path_rooms: list, width: int, height: int) -> dict:
-    """Añade habitaciones adicionales garantizando conectividad al camino principal."""
-    rooms: Dict[str, Room] = {}
+MAX_ADDITIONAL_ROOM_LINKS = 2
+
+
+def add_connected_additional_rooms(
+    path_rooms: list,
+    width: int,
+    height: int,
+    branching_factor: int = 4,
+    loop_density: float = 1.0,
+    rng: Optional[random.Random] = None,
+    deadline: Optional[float] = None,
+) -> dict:
+    """
+    Añade habitaciones adicionales garantizando conectividad al camino principal.
+
+    Crece una frontera BFS desde el camino principal: cada celda libre se
+    descubre una sola vez desde una sala ya colocada (su padre), de modo que el
+    coste es O(width * height).
+
+    Args:
+        path_rooms: Coordenadas del camino principal, en orden
+        width: Ancho del nivel
+        height: Alto del nivel
+        branching_factor: Máximo de salas nuevas que puede originar cada sala
+            (1-4). Valores bajos producen pasillos largos y pueden dejar celdas
+            sin habitación.
+        loop_density: Probabilidad (0-1) de enlazar cada sala nueva con vecinas ya
+            colocadas además de su padre, hasta MAX_ADDITIONAL_ROOM_LINKS enlaces.
+            Con 0 las salas adicionales forman un árbol sin ciclos.
+        rng: Generador aleatorio a usar (por defecto el módulo random global)
+        deadline: Instante de time.perf_counter() a partir del cual se deja de
+            crecer; las salas ya colocadas siguen conectadas
+
+    Returns:
+        Diccionario room_key(x, y) -> Room con conexiones bidireccionales
+    """
+    rng = random if rng is None else rng
+    rooms = _build_main_path_rooms(path_rooms)
+
+    placed = bytearray(width * height)
+    children = bytearray(width * height)
+    frontier: deque = deque()
+    for x, y in path_rooms:
+        placed[y * width + x] = 1
+    for coords in path_rooms:
+        _expand_frontier(
+            coords, width, height, placed, children, frontier, branching_factor
+        )
 
+    added_rooms = 0
+    while frontier:
+        if _deadline_passed(deadline, added_rooms + 1):
+            break
+        coords, parent = frontier.popleft()
+        added_rooms += 1
+        room = Room(id=f"additional_{added_rooms}", coordinates=coords, connections={})
+        rooms[room_key(*coords)] = room
+        _link_rooms(rooms, room, parent)
+        for neighbor in get_adjacent_coordinates(coords, width, height):
+            if len(room.connections) >= MAX_ADDITIONAL_ROOM_LINKS:
+                break
+            if neighbor == parent or room_key(*neighbor) not in rooms:
+                continue
+            if loop_density >= 1.0 or rng.random() < loop_density:
+                _link_rooms(rooms, room, neighbor)
+        _expand_frontier(
+            coords, width, height, placed, children, frontier, branching_factor
+        )
+
+    return rooms
+
+
+def _build_main_path_rooms(path_rooms: list) -> Dict[int, Room]:
+    """Crea las salas del camino principal enlazadas en orden."""
+    rooms: Dict[int, Room] = {}
     for i, coords in enumerate(path_rooms):
-        room_id = f"main_path_{i + 1}"
         connections: Dict[str, Tuple[int, int]] = {}
         if i > 0:
             prev_coords = path_rooms[i - 1]
@@ -98,48 +263,44 @@ def add_connected_additional_rooms(path_rooms: list, width: int, height: int) ->
             direction = get_direction(coords, next_coords)
             if direction:
                 connections[direction] = next_coords
-        rooms[f"{coords[0]},{coords[1]}"] = Room(
-            id=room_id, coordinates=coords, connections=connections
+        rooms[room_key(*coords)] = Room(
+            id=f"main_path_{i + 1}", coordinates=coords, connections=connections
         )
+    return rooms
 
-    all_coords = [(x, y) for x in range(width) for y in range(height)]
-    available_coords = [coord for coord in all_coords if coord not in path_rooms]
-
-    connected_coords = set(path_rooms)
-    added_rooms = 0
 
-    max_iterations = len(available_coords)
-    for _ in range(max_iterations):
-        added_in_iteration = False
-        for coords in available_coords[:]:
-            if coords in connected_coords:
-                continue
-            neighbors = get_adjacent_coordinates(coords, width, height)
-            connected_neighbors = [n for n in neighbors if n in connected_coords]
-            if connected_neighbors:
-                room_id = f"additional_{added_rooms + 1}"
-                connections = {}
-                selected_neighbors = connected_neighbors[:2]
-                for neighbor in selected_neighbors:
-                    direction = get_direction(coords, neighbor)
-                    if direction:
-                        connections[direction] = neighbor
-                        neighbor_key = f"{neighbor[0]},{neighbor[1]}"
-                        if neighbor_key in rooms:
-                            reverse_direction = get_direction(neighbor, coords)
-                            if reverse_direction:
-                                rooms[neighbor_key].connections[reverse_direction] = coords
-                rooms[f"{coords[0]},{coords[1]}"] = Room(
-                    id=room_id, coordinates=coords, connections=connections
-                )
-                connected_coords.add(coords)
-                available_coords.remove(coords)
-                added_rooms += 1
-                added_in_iteration = True
-        if not added_in_iteration:
-            break
-
-    return rooms
+def _expand_frontier(
+    coords: tuple,
+    width: int,
+    height: int,
+    placed: bytearray,
+    children: bytearray,
+    frontier: deque,
+    branching_factor: int,
+) -> None:
+    """Añade a la frontera las celdas libres vecinas de coords y las marca."""
+    index = coords[1] * width + coords[0]
+    for neighbor in get_adjacent_coordinates(coords, width, height):
+        if children[index] >= branching_factor:
+            return
+        neighbor_index = neighbor[1] * width + neighbor[0]
+        if placed[neighbor_index]:
+            continue
+        placed[neighbor_index] = 1
+        children[index] += 1
+        frontier.append((neighbor, coords))
+
+
+def _link_rooms(rooms: Dict[int, Room], room: Room, neighbor: tuple) -> None:
+    """Conecta room con la sala en neighbor en ambos sentidos."""
+    coords = room.coordinates
+    direction = get_direction(coords, neighbor)
+    if not direction:
+        return
+    room.connections[direction] = neighbor
+    neighbor_room = rooms.get(room_key(*neighbor))
+    if neighbor_room is not None:
+        neighbor_room.connections[get_direction(neighbor, coords)] = coords
 
 
 def get_direction(from_coord: tuple, to_coord: tuple) -> str:
@@ -170,18 +331,54 @@ def get_adjacent_coordinates(coord: tuple, width: int, height: int) -> list:
     return adjacent
 
 
-def create_dungeon_from_rooms(rooms: dict, width: int, height: int, start_coords: tuple, exit_coords: tuple) -> Dungeon:
-    """Crea un objeto Dungeon a partir de habitaciones generadas."""
-    level_1 = Level(
-        id=1,
+# Incrementar cuando cambie la salida del generador para invalidar layouts cacheados
+GENERATOR_VERSION = "2"
+
+
+def create_dungeon_from_rooms(
+    rooms: dict,
+    width: int,
+    height: int,
+    start_coords: tuple,
+    exit_coords: tuple,
+    compact: Optional[bool] = None,
+) -> Dungeon:
+    """Crea un objeto Dungeon de un nivel a partir de habitaciones generadas."""
+    level_1 = create_level_from_rooms(
+        1, rooms, width, height, start_coords, exit_coords, compact
+    )
+    dungeon = Dungeon(total_levels=1, current_level=1, levels={1: level_1})
+    return dungeon
+
+
+def create_level_from_rooms(
+    level_id: int,
+    rooms: dict,
+    width: int,
+    height: int,
+    start_coords: tuple,
+    exit_coords: tuple,
+    compact: Optional[bool] = None,
+) -> Level:
+    """
+    Crea un Level a partir de habitaciones generadas.
+
+    Con compact=None el nivel se compacta automáticamente si tiene al menos
+    COMPACT_LEVEL_MIN_CELLS celdas.
+    """
+    if compact is None:
+        compact = width * height >= COMPACT_LEVEL_MIN_CELLS
+    if compact:
+        grid = LevelGrid.from_rooms(rooms, width, height)
+        return grid.to_level(level_id, start_coords, exit_coords)
+    return Level(
+        id=level_id,
         width=width,
         height=height,
         start_coords=start_coords,
         exit_coords=exit_coords,
         rooms=rooms,
     )
-    dungeon = Dungeon(total_levels=1, current_level=1, levels={1: level_1})
-    return dungeon
 
 
 def calculate_minimum_distance(start: tuple, end: tuple) -> int:
@@ -190,35 +387,273 @@ def calculate_minimum_distance(start: tuple, end: tuple) -> int:
     return manhattan_distance + 1
 
 
-def calculate_smart_path_length(start: tuple, end: tuple, width: int, height: int) -> int:
+def calculate_smart_path_length(
+    start: tuple,
+    end: tuple,
+    width: int,
+    height: int,
+    rng: Optional[random.Random] = None,
+) -> int:
     """Longitud objetivo usando distribución Beta(2,2) para favorecer valores intermedios."""
+    rng = random if rng is None else rng
     min_length = calculate_minimum_distance(start, end)
     max_length = width * height
     if min_length >= max_length:
         return min_length
-    beta_sample = random.betavariate(2, 2)
+    beta_sample = rng.betavariate(2, 2)
     target_length = int(min_length + beta_sample * (max_length - min_length))
     target_length = max(min_length, min(target_length, max_length))
     return target_length
 
 
-def generate_dungeon_layout() -> Dungeon:
-    """Genera un layout de mazmorra determinista con un solo nivel pequeño."""
-    width = random.randint(3, 5)
-    height = random.randint(3, 5)
-    start_coords, exit_coords = generate_random_start_exit_points(width, height)
-    target_path_length = calculate_smart_path_length(start_coords, exit_coords, width, height)
-    path_rooms = generate_advanced_main_path(start_coords, exit_coords, width, height, target_path_length)
-    all_rooms = add_connected_additional_rooms(path_rooms, width, height)
-    dungeon = create_dungeon_from_rooms(all_rooms, width, height, start_coords, exit_coords)
+@dataclass(slots=True)
+class LayoutQuality:
+    """Calidad alcanzada por una generación con presupuesto de tiempo."""
+
+    # Última fase terminada: "quick", "main_path", "branching" o "complete"
+    phase: str
+    complete: bool
+    elapsed_ms: float
+    target_length: int
+    path_length: int
+    # 1.0 si el camino principal tiene exactamente target_length salas
+    path_fidelity: float
+    room_count: int
+    # Fracción de celdas del nivel con habitación
+    coverage: float
+
+
+def generate_dungeon_layout(
+    seed: Optional[int] = None,
+    width: Optional[int] = None,
+    height: Optional[int] = None,
+    cache: Optional[LayoutCache] = None,
+    algorithm: Union[str, MazeAlgorithm, None] = None,
+    deadline_ms: Optional[float] = None,
+) -> Dungeon:
+    """
+    Genera un layout de mazmorra con un solo nivel.
+
+    Todo el proceso usa un random.Random privado, así que la misma semilla y los
+    mismos parámetros producen siempre el mismo layout. Sin semilla se sortea una
+    con la entropía del sistema y queda en dungeon.seed (la caché de
+    descripciones la necesita). Con semilla explícita, el resultado se guarda en
+    la caché de layouts (por defecto la caché global del proceso) y las llamadas
+    repetidas no vuelven a generar nada.
+
+    Con deadline_ms la generación es "anytime": primero se construye un layout
+    válido inmediato (el camino directo) y después se refina, alargando el camino
+    principal hacia target_length y añadiendo ramas, hasta agotar el
+    presupuesto. La calidad alcanzada queda en dungeon._quality (LayoutQuality).
+    Si el presupuesto alcanza, el layout es idéntico al generado sin deadline;
+    solo los layouts completos se guardan en la caché.
+
+    Args:
+        seed: Semilla del generador; None sortea una y no usa la caché de layouts
+        width: Ancho del nivel (por defecto aleatorio entre 3 y 5)
+        height: Alto del nivel (por defecto aleatorio entre 3 y 5)
+        cache: Caché de layouts a usar en lugar de la global
+        algorithm: Estrategia de maze_algorithms (nombre o instancia); None usa
+            el camino principal con salas adicionales
+        deadline_ms: Presupuesto de tiempo en milisegundos (solo para el
+            pipeline clásico, sin algorithm)
+    """
+    started = time.perf_counter()
+    if deadline_ms is not None and algorithm is not None:
+        raise ValueError("deadline_ms solo se aplica al generador clásico")
+    params = {"width": width, "height": height}
+    if algorithm is not None:
+        algorithm = get_maze_algorithm(algorithm)
+        params["algorithm"] = algorithm.cache_id()
+    # Una semilla sorteada no se repite: guardar su layout solo llenaría la caché
+    cacheable = seed is not None
+    if seed is None:
+        seed = random.SystemRandom().getrandbits(64)
+    if cacheable:
+        cache = get_layout_cache() if cache is None else cache
+        key = layout_cache_key(seed, params, GENERATOR_VERSION)
+        cached = cache.get(key)
+        if cached is not None:
+            cached.seed = seed
+            if deadline_ms is not None:
+                target_length = _replay_target_length(seed, width, height)
+                cached._quality = _measure_quality(
+                    cached.levels[1], target_length, "complete", started
+                )
+            return cached
+
+    rng = random.Random(seed)
+    if deadline_ms is None:
+        dungeon = _generate_layout(rng, width, height, algorithm)
+    else:
+        dungeon = _generate_layout_within(
+            rng, width, height, started + deadline_ms / 1000, started
+        )
+    dungeon.seed = seed
+
+    if cacheable and (dungeon._quality is None or dungeon._quality.complete):
+        cache.put(key, dungeon)
     return dungeon
 
 
+def _generate_layout(
+    rng: random.Random,
+    width: Optional[int],
+    height: Optional[int],
+    algorithm: Union[str, MazeAlgorithm, None] = None,
+) -> Dungeon:
+    """Ejecuta el pipeline de generación completo con el generador rng."""
+    width, height, start_coords, exit_coords = _choose_layout_frame(rng, width, height)
+    level_1 = generate_level(
+        1, width, height, start_coords, exit_coords, rng, algorithm
+    )
+    return Dungeon(total_levels=1, current_level=1, levels={1: level_1})
+
+
+def _choose_layout_frame(
+    rng: random.Random, width: Optional[int], height: Optional[int]
+) -> tuple:
+    """Dimensiones, inicio y salida del nivel, en el orden en que consumen rng."""
+    width = rng.randint(3, 5) if width is None else width
+    height = rng.randint(3, 5) if height is None else height
+    start_coords, exit_coords = generate_random_start_exit_points(width, height, rng)
+    return width, height, start_coords, exit_coords
+
+
+def _replay_target_length(
+    seed: int, width: Optional[int], height: Optional[int]
+) -> int:
+    """Recalcula target_length de un layout cacheado repitiendo los sorteos."""
+    rng = random.Random(seed)
+    width, height, start_coords, exit_coords = _choose_layout_frame(rng, width, height)
+    return calculate_smart_path_length(start_coords, exit_coords, width, height, rng)
+
+
+def _generate_layout_within(
+    rng: random.Random,
+    width: Optional[int],
+    height: Optional[int],
+    deadline: float,
+    started: float,
+) -> Dungeon:
+    """
+    Pipeline clásico con refinamiento progresivo hasta deadline.
+
+    Consume rng en el mismo orden que _generate_layout, de modo que con tiempo
+    suficiente el resultado coincide con el de la generación sin plazo.
+    """
+    width, height, start_coords, exit_coords = _choose_layout_frame(rng, width, height)
+    target_length = calculate_smart_path_length(
+        start_coords, exit_coords, width, height, rng
+    )
+
+    # Refinar solo hasta refine_deadline deja tiempo para crear el nivel
+    refine_deadline = started + (deadline - started) * REFINE_BUDGET_FRACTION
+    # La rejilla de los niveles grandes se reserva ya: su coste, proporcional a
+    # width * height, se descuenta así del tiempo de refinamiento
+    grid = None
+    if width * height >= COMPACT_LEVEL_MIN_CELLS:
+        grid = LevelGrid(width, height)
+
+    # Fase rápida: el camino directo no usa rng y siempre es válido
+    path = generate_simple_direct_path(start_coords, exit_coords)
+    phase = "quick"
+
+    if time.perf_counter() < refine_deadline:
+        path = generate_advanced_main_path(
+            start_coords, exit_coords, width, height, target_length, rng,
+            refine_deadline,
+        )
+        phase = "main_path"
+
+    rooms = None
+    if time.perf_counter() < refine_deadline:
+        rooms = add_connected_additional_rooms(
+            path, width, height, rng=rng, deadline=refine_deadline
+        )
+        phase = "branching"
+        if time.perf_counter() < refine_deadline:
+            phase = "complete"
+    if rooms is None:
+        rooms = _build_main_path_rooms(path)
+
+    if grid is None:
+        level_1 = create_level_from_rooms(
+            1, rooms, width, height, start_coords, exit_coords, compact=False
+        )
+    else:
+        for room in rooms.values():
+            grid.set_room(room)
+        level_1 = grid.to_level(1, start_coords, exit_coords)
+    dungeon = Dungeon(total_levels=1, current_level=1, levels={1: level_1})
+    dungeon._quality = _measure_quality(
+        level_1, target_length, phase, started, path_length=len(path)
+    )
+    return dungeon
+
+
+def _measure_quality(
+    level: Level,
+    target_length: int,
+    phase: str,
+    started: float,
+    path_length: Optional[int] = None,
+) -> LayoutQuality:
+    """Sin path_length se cuentan las salas main_path_ (recorre todo el nivel)."""
+    room_count = len(level.rooms)
+    if path_length is None:
+        path_length = sum(
+            1 for room in level.rooms.values() if room.id.startswith("main_path_")
+        )
+    return LayoutQuality(
+        phase=phase,
+        complete=phase == "complete",
+        elapsed_ms=(time.perf_counter() - started) * 1000,
+        target_length=target_length,
+        path_length=path_length,
+        path_fidelity=max(0.0, 1 - abs(path_length - target_length) / target_length),
+        room_count=room_count,
+        coverage=room_count / (level.width * level.height),
+    )
+
+
+def generate_level(
+    level_id: int,
+    width: int,
+    height: int,
+    start_coords: tuple,
+    exit_coords: tuple,
+    rng: Optional[random.Random] = None,
+    algorithm: Union[str, MazeAlgorithm, None] = None,
+) -> Level:
+    """
+    Genera un nivel completo con inicio y salida ya fijados.
+
+    Sin algorithm se usa el pipeline clásico (camino principal de longitud
+    objetivo más salas adicionales); con él, la estrategia de maze_algorithms
+    indicada rellena toda la rejilla.
+    """
+    if algorithm is not None:
+        return get_maze_algorithm(algorithm).generate_level(
+            level_id, width, height, start_coords, exit_coords, rng
+        )
+    target_path_length = calculate_smart_path_length(
+        start_coords, exit_coords, width, height, rng
+    )
+    path_rooms = generate_advanced_main_path(
+        start_coords, exit_coords, width, height, target_path_length, rng
+    )
+    all_rooms = add_connected_additional_rooms(path_rooms, width, height, rng=rng)
+    return create_level_from_rooms(
+        level_id, all_rooms, width, height, start_coords, exit_coords
+    )
+
+
 def _create_fallback_dungeon() -> Dungeon:
     rooms = {}
-    rooms['0,0'] = Room(id="start_room", coordinates=(0, 0), connections={'east': (1, 0)})
-    rooms['1,0'] = Room(id="middle_room", coordinates=(1, 0), connections={'west': (0, 0), 'east': (2, 0)})
-    rooms['2,0'] = Room(id="exit_room", coordinates=(2, 0), connections={'west': (1, 0)})
+    rooms[room_key(0, 0)] = Room(id="start_room", coordinates=(0, 0), connections={'east': (1, 0)})
+    rooms[room_key(1, 0)] = Room(id="middle_room", coordinates=(1, 0), connections={'west': (0, 0), 'east': (2, 0)})
+    rooms[room_key(2, 0)] = Room(id="exit_room", coordinates=(2, 0), connections={'west': (1, 0)})
     level_1 = Level(id=1, width=3, height=1, start_coords=(0, 0), exit_coords=(2, 0), rooms=rooms)
     dungeon = Dungeon(total_levels=1, current_level=1, levels={1: level_1})
-    return dungeon
\ No newline at end of file
+    return dungeon
@@ -0,0 +1,121 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from aimaze.dungeon import Dungeon, copy_dungeon
+from aimaze.level_grid import compact_large_levels
+from aimaze.schemas import dump_model_json, load_model_json
+
+
+def layout_cache_key(seed: int, params: Dict[str, Any], version: str) -> str:
+    """Clave de contenido (sha256) para semilla + parámetros + versión."""
+    payload = json.dumps(
+        {"seed": seed, "params": params, "version": version}, sort_keys=True
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LayoutCache:
+    """
+    Caché LRU de layouts de mazmorra indexada por layout_cache_key().
+
+    Si se indica directory, cada layout se persiste también como JSON en disco
+    (<directory>/<clave>.json) y se recupera de ahí tras un reinicio. El disco
+    no tiene límite de entradas: solo la memoria aplica la expulsión LRU.
+
+    Los niveles devueltos se comparten entre llamadas y no deben modificarse;
+    cada llamada recibe su propio objeto Dungeon.
+    """
+
+    def __init__(self, max_entries: int = 128, directory: Optional[str] = None):
+        self.max_entries = max_entries
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Dungeon]" = OrderedDict()
+        self._lock = threading.Lock()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Dungeon]:
+        """Devuelve el layout cacheado para key o None si no existe."""
+        with self._lock:
+            dungeon = self._entries.get(key)
+            if dungeon is not None:
+                self._entries.move_to_end(key)
+        if dungeon is None:
+            dungeon = self._load_from_disk(key)
+            if dungeon is None:
+                self.misses += 1
+                return None
+            self._remember(key, dungeon)
+        self.hits += 1
+        return copy_dungeon(dungeon)
+
+    def put(self, key: str, dungeon: Dungeon) -> None:
+        """Guarda un layout en memoria y, si hay directorio, en disco."""
+        self._remember(key, copy_dungeon(dungeon))
+        if self.directory:
+            self._save_to_disk(key, dungeon)
+
+    def clear(self) -> None:
+        """Vacía la caché en memoria (los ficheros en disco se conservan)."""
+        with self._lock:
+            self._entries.clear()
+
+    def _remember(self, key: str, dungeon: Dungeon) -> None:
+        with self._lock:
+            self._entries[key] = dungeon
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _save_to_disk(self, key: str, dungeon: Dungeon) -> None:
+        path = self._path(key)
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(dump_model_json(dungeon))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Warning: No se pudo guardar el layout en caché: {e}")
+
+    def _load_from_disk(self, key: str) -> Optional[Dungeon]:
+        if not self.directory or not os.path.exists(self._path(key)):
+            return None
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                dungeon = load_model_json(Dungeon, f.read())
+        except (OSError, ValueError) as e:
+            print(f"Warning: Layout en caché ilegible, se regenerará: {e}")
+            return None
+        return compact_large_levels(dungeon)
+
+
+_layout_cache: Optional[LayoutCache] = None
+_layout_cache_lock = threading.Lock()
+
+
+def get_layout_cache() -> LayoutCache:
+    """
+    Caché de layouts global del proceso.
+
+    Se crea la primera vez que se usa; si AIMAZE_LAYOUT_CACHE_DIR está definida,
+    los layouts se persisten en ese directorio.
+    """
+    global _layout_cache
+    with _layout_cache_lock:
+        if _layout_cache is None:
+            _layout_cache = LayoutCache(
+                directory=os.getenv("AIMAZE_LAYOUT_CACHE_DIR") or None
+            )
+        return _layout_cache
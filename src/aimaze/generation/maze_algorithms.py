@@ -0,0 +1,247 @@
+import random
+from typing import Dict, List, Optional, Union
+
+from aimaze.dungeon import Level, room_key
+from aimaze.level_grid import (
+    COMPACT_LEVEL_MIN_CELLS,
+    EAST,
+    NORTH,
+    SOUTH,
+    WEST,
+    LevelGrid,
+)
+
+# Bit opuesto de cada dirección, para marcar las dos caras de un pasillo
+_OPPOSITE = {NORTH: SOUTH, SOUTH: NORTH, EAST: WEST, WEST: EAST}
+
+
+class MazeAlgorithm:
+    """
+    Estrategia de generación de laberintos sobre una rejilla completa.
+
+    Cada algoritmo implementa carve(), que devuelve una máscara de conexiones por
+    celda (índice y * width + x, bits de level_grid) en la que todas las celdas
+    tienen sala y forman un único componente conexo. generate_level() convierte
+    esas máscaras en el mismo modelo Level/Room que el generador clásico.
+
+    Todas las implementaciones son iterativas, así que el tamaño de la rejilla no
+    está limitado por la profundidad de recursión.
+    """
+
+    name = "base"
+
+    def carve(self, width: int, height: int, rng: random.Random) -> bytearray:
+        raise NotImplementedError
+
+    def cache_id(self) -> str:
+        """Identificador estable del algoritmo y sus parámetros para la caché."""
+        return self.name
+
+    def generate_level(
+        self,
+        level_id: int,
+        width: int,
+        height: int,
+        start_coords: tuple,
+        exit_coords: tuple,
+        rng: Optional[random.Random] = None,
+    ) -> Level:
+        rng = random if rng is None else rng
+        masks = self.carve(width, height, rng)
+        grid = LevelGrid.from_masks(bytes(masks), width, height)
+        if width * height >= COMPACT_LEVEL_MIN_CELLS:
+            return grid.to_level(level_id, start_coords, exit_coords)
+        rooms = {room_key(x, y): grid.room_at(x, y) for x, y in grid.iter_coords()}
+        return Level(
+            id=level_id,
+            width=width,
+            height=height,
+            start_coords=start_coords,
+            exit_coords=exit_coords,
+            rooms=rooms,
+        )
+
+
+def _neighbors(index: int, width: int, height: int) -> List[tuple]:
+    """Pares (índice vecino, bit de la dirección) de las celdas adyacentes."""
+    x, y = index % width, index // width
+    result = []
+    if y > 0:
+        result.append((index - width, NORTH))
+    if y < height - 1:
+        result.append((index + width, SOUTH))
+    if x < width - 1:
+        result.append((index + 1, EAST))
+    if x > 0:
+        result.append((index - 1, WEST))
+    return result
+
+
+def _carve(masks: bytearray, index: int, neighbor: int, bit: int) -> None:
+    masks[index] |= bit
+    masks[neighbor] |= _OPPOSITE[bit]
+
+
+class BacktrackerMaze(MazeAlgorithm):
+    """Backtracker recursivo implementado con una pila explícita (pasillos largos)."""
+
+    name = "backtracker"
+
+    def carve(self, width: int, height: int, rng: random.Random) -> bytearray:
+        cells = width * height
+        masks = bytearray(cells)
+        visited = bytearray(cells)
+        start = rng.randrange(cells)
+        visited[start] = 1
+        stack = [start]
+        while stack:
+            current = stack[-1]
+            options = [
+                (neighbor, bit)
+                for neighbor, bit in _neighbors(current, width, height)
+                if not visited[neighbor]
+            ]
+            if not options:
+                stack.pop()
+                continue
+            neighbor, bit = rng.choice(options)
+            _carve(masks, current, neighbor, bit)
+            visited[neighbor] = 1
+            stack.append(neighbor)
+        return masks
+
+
+class PrimMaze(MazeAlgorithm):
+    """Prim aleatorizado sobre paredes: muchos ramales cortos y callejones."""
+
+    name = "prim"
+
+    def carve(self, width: int, height: int, rng: random.Random) -> bytearray:
+        cells = width * height
+        masks = bytearray(cells)
+        visited = bytearray(cells)
+        start = rng.randrange(cells)
+        visited[start] = 1
+        walls = [
+            (start, neighbor, bit) for neighbor, bit in _neighbors(start, width, height)
+        ]
+        while walls:
+            # Extracción aleatoria en O(1): intercambiar con el último y sacar
+            pick = rng.randrange(len(walls))
+            walls[pick], walls[-1] = walls[-1], walls[pick]
+            index, neighbor, bit = walls.pop()
+            if visited[neighbor]:
+                continue
+            _carve(masks, index, neighbor, bit)
+            visited[neighbor] = 1
+            walls.extend(
+                (neighbor, target, target_bit)
+                for target, target_bit in _neighbors(neighbor, width, height)
+                if not visited[target]
+            )
+        return masks
+
+
+class WilsonMaze(MazeAlgorithm):
+    """
+    Algoritmo de Wilson: paseos aleatorios con borrado de bucles.
+
+    Produce un árbol de expansión uniforme (sin el sesgo de los otros métodos).
+    El borrado de bucles es implícito: solo se recuerda la última dirección
+    tomada desde cada celda del paseo.
+    """
+
+    name = "wilson"
+
+    def carve(self, width: int, height: int, rng: random.Random) -> bytearray:
+        cells = width * height
+        masks = bytearray(cells)
+        in_tree = bytearray(cells)
+        in_tree[rng.randrange(cells)] = 1
+        next_step = [0] * cells
+        next_bit = bytearray(cells)
+        order = list(range(cells))
+        rng.shuffle(order)
+        for origin in order:
+            if in_tree[origin]:
+                continue
+            current = origin
+            while not in_tree[current]:
+                neighbor, bit = rng.choice(_neighbors(current, width, height))
+                next_step[current] = neighbor
+                next_bit[current] = bit
+                current = neighbor
+            current = origin
+            while not in_tree[current]:
+                neighbor = next_step[current]
+                _carve(masks, current, neighbor, next_bit[current])
+                in_tree[current] = 1
+                current = neighbor
+        return masks
+
+
+class BraidedMaze(MazeAlgorithm):
+    """
+    Laberinto trenzado: elimina callejones sin salida de un laberinto base.
+
+    Cada callejón se une, con probabilidad braid, a una celda vecina con la que
+    no estaba conectado (preferiblemente otro callejón), creando ciclos. Solo se
+    añaden conexiones, así que la conectividad del laberinto base se conserva.
+    """
+
+    name = "braided"
+
+    def __init__(self, braid: float = 1.0, base: Optional[MazeAlgorithm] = None):
+        if not 0.0 <= braid <= 1.0:
+            raise ValueError("braid debe estar entre 0 y 1")
+        self.braid = braid
+        self.base = BacktrackerMaze() if base is None else base
+
+    def cache_id(self) -> str:
+        return f"{self.name}:{self.braid}:{self.base.cache_id()}"
+
+    def carve(self, width: int, height: int, rng: random.Random) -> bytearray:
+        masks = self.base.carve(width, height, rng)
+        dead_ends = [index for index, mask in enumerate(masks) if _is_dead_end(mask)]
+        rng.shuffle(dead_ends)
+        for index in dead_ends:
+            # Puede haber dejado de serlo al unirse antes otro callejón con él
+            if not _is_dead_end(masks[index]) or rng.random() >= self.braid:
+                continue
+            options = [
+                (neighbor, bit)
+                for neighbor, bit in _neighbors(index, width, height)
+                if not masks[index] & bit
+            ]
+            if not options:
+                continue
+            preferred = [
+                option for option in options if _is_dead_end(masks[option[0]])
+            ]
+            neighbor, bit = rng.choice(preferred or options)
+            _carve(masks, index, neighbor, bit)
+        return masks
+
+
+def _is_dead_end(mask: int) -> bool:
+    return mask in (NORTH, SOUTH, EAST, WEST)
+
+
+MAZE_ALGORITHMS: Dict[str, MazeAlgorithm] = {
+    algorithm.name: algorithm
+    for algorithm in (BacktrackerMaze(), PrimMaze(), WilsonMaze(), BraidedMaze())
+}
+
+
+def get_maze_algorithm(algorithm: Union[str, MazeAlgorithm]) -> MazeAlgorithm:
+    """Devuelve la estrategia registrada con ese nombre (o la propia instancia)."""
+    if isinstance(algorithm, MazeAlgorithm):
+        return algorithm
+    try:
+        return MAZE_ALGORITHMS[algorithm]
+    except KeyError:
+        available = ", ".join(sorted(MAZE_ALGORITHMS))
+        raise ValueError(
+            f"Algoritmo de laberinto desconocido: {algorithm} "
+            f"(disponibles: {available})"
+        ) from None
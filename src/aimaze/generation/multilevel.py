@@ -0,0 +1,134 @@
+import hashlib
+import random
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+from aimaze.dungeon import Dungeon, Level
+from aimaze.generation.dungeon_generator import generate_level
+
+# Por debajo de este total de celdas el arranque del pool cuesta más que generar
+PARALLEL_MIN_CELLS = 20000
+
+LevelTask = Tuple[int, int, int, int, tuple, tuple]
+
+
+def derive_level_seed(seed: int, level_id: int) -> int:
+    """Semilla de 64 bits para un nivel, derivada de la semilla de la mazmorra."""
+    digest = hashlib.sha256(f"{seed}:{level_id}".encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big")
+
+
+def generate_multilevel_dungeon(
+    total_levels: int,
+    seed: Optional[int] = None,
+    width: Optional[int] = None,
+    height: Optional[int] = None,
+    parallel: Optional[bool] = None,
+    max_workers: Optional[int] = None,
+) -> Dungeon:
+    """
+    Genera una mazmorra de varios niveles enlazados, en paralelo si compensa.
+
+    Primero se planifican en serie las dimensiones y las escaleras de todos los
+    niveles: la salida del nivel N coincide con el inicio del nivel N+1 siempre
+    que quepa en él. Después cada nivel se genera de forma independiente con su
+    propia semilla derivada, así que el resultado es idéntico en serie o en
+    un ProcessPoolExecutor.
+
+    Args:
+        total_levels: Número de niveles
+        seed: Semilla de la mazmorra (None usa entropía del sistema)
+        width: Ancho de todos los niveles (por defecto aleatorio entre 3 y 5)
+        height: Alto de todos los niveles (por defecto aleatorio entre 3 y 5)
+        parallel: Forzar (True) o evitar (False) el pool; None decide según
+            PARALLEL_MIN_CELLS
+        max_workers: Procesos del pool (por defecto, uno por núcleo)
+    """
+    if total_levels < 1:
+        raise ValueError("La mazmorra necesita al menos un nivel")
+    if seed is None:
+        seed = random.SystemRandom().getrandbits(64)
+
+    tasks = plan_levels(total_levels, seed, width, height)
+    if parallel is None:
+        total_cells = sum(task[2] * task[3] for task in tasks)
+        parallel = total_levels > 1 and total_cells >= PARALLEL_MIN_CELLS
+
+    if parallel:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            levels = list(executor.map(_build_level, tasks))
+    else:
+        levels = [_build_level(task) for task in tasks]
+
+    return Dungeon(
+        total_levels=total_levels,
+        current_level=1,
+        levels={level.id: level for level in levels},
+        seed=seed,
+    )
+
+
+def plan_levels(
+    total_levels: int, seed: int, width: Optional[int], height: Optional[int]
+) -> List[LevelTask]:
+    """Calcula dimensiones, semilla, inicio y salida de cada nivel."""
+    rng = random.Random(seed)
+    sizes = [
+        (
+            rng.randint(3, 5) if width is None else width,
+            rng.randint(3, 5) if height is None else height,
+        )
+        for _ in range(total_levels)
+    ]
+    if any(w * h < 2 for w, h in sizes):
+        raise ValueError("Cada nivel necesita al menos dos celdas")
+
+    tasks: List[LevelTask] = []
+    start = (rng.randrange(sizes[0][0]), rng.randrange(sizes[0][1]))
+    for index, (level_width, level_height) in enumerate(sizes):
+        next_size = sizes[index + 1] if index + 1 < total_levels else None
+        exit_coords = _choose_stairs(rng, start, (level_width, level_height), next_size)
+        level_id = index + 1
+        tasks.append((
+            level_id,
+            derive_level_seed(seed, level_id),
+            level_width,
+            level_height,
+            start,
+            exit_coords,
+        ))
+        if next_size is not None:
+            start = _start_below(rng, exit_coords, next_size)
+    return tasks
+
+
+def _choose_stairs(
+    rng: random.Random, start: tuple, size: tuple, next_size: Optional[tuple]
+) -> tuple:
+    """Elige la salida, preferiblemente en una celda que también exista abajo."""
+    width, height = size
+    if next_size is not None:
+        width = min(width, next_size[0])
+        height = min(height, next_size[1])
+    candidates = [
+        (x, y) for x in range(width) for y in range(height) if (x, y) != start
+    ]
+    if not candidates:
+        candidates = [
+            (x, y) for x in range(size[0]) for y in range(size[1]) if (x, y) != start
+        ]
+    return rng.choice(candidates)
+
+
+def _start_below(rng: random.Random, exit_coords: tuple, next_size: tuple) -> tuple:
+    """Inicio del nivel siguiente: bajo la salida si cabe, si no aleatorio."""
+    if exit_coords[0] < next_size[0] and exit_coords[1] < next_size[1]:
+        return exit_coords
+    return (rng.randrange(next_size[0]), rng.randrange(next_size[1]))
+
+
+def _build_level(task: LevelTask) -> Level:
+    """Genera un nivel a partir de su tarea planificada (ejecutable en otro proceso)."""
+    level_id, level_seed, width, height, start, exit_coords = task
+    rng = random.Random(level_seed)
+    return generate_level(level_id, width, height, start, exit_coords, rng)
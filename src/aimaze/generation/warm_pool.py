@@ -0,0 +1,184 @@
+import os
+import threading
+import uuid
+from collections import deque
+from typing import Callable, Deque, Dict, Optional, Tuple
+
+from aimaze.dungeon import Dungeon
+from aimaze.generation.dungeon_generator import generate_dungeon_layout
+from aimaze.level_grid import compact_large_levels
+from aimaze.schemas import dump_model_json, load_model_json
+
+# Perfiles de tamaño por defecto: parámetros que se pasan al generador
+DEFAULT_PROFILES: Dict[str, dict] = {
+    "default": {},
+}
+
+PooledDungeon = Tuple[Dungeon, Optional[str]]
+
+
+class DungeonPool:
+    """
+    Reserva de mazmorras ya generadas, una cola acotada por perfil de tamaño.
+
+    Un hilo productor en segundo plano mantiene cada cola llena hasta capacity y
+    la rellena a medida que se consumen mazmorras con take(). Si se indica
+    directory, cada mazmorra se guarda también como JSON en
+    <directory>/<perfil>/ y se recupera al crear un nuevo pool, de modo que la
+    reserva sobrevive a los reinicios del proceso.
+    """
+
+    def __init__(
+        self,
+        profiles: Optional[Dict[str, dict]] = None,
+        capacity: int = 3,
+        directory: Optional[str] = None,
+        generator: Callable[..., Dungeon] = generate_dungeon_layout,
+    ):
+        self.profiles = dict(DEFAULT_PROFILES if profiles is None else profiles)
+        self.capacity = capacity
+        self.directory = directory
+        self._generator = generator
+        self._queues: Dict[str, Deque[PooledDungeon]] = {
+            name: deque() for name in self.profiles
+        }
+        self._condition = threading.Condition()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        if directory:
+            self._load_from_disk()
+
+    def size(self, profile: str = "default") -> int:
+        with self._condition:
+            return len(self._queues[profile])
+
+    def start(self) -> None:
+        """Arranca el hilo productor (idempotente)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="aimaze-dungeon-pool", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Detiene el productor; las mazmorras persistidas se conservan en disco."""
+        self._stopped.set()
+        with self._condition:
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def take(self, profile: str = "default") -> Dungeon:
+        """
+        Devuelve una mazmorra lista del perfil indicado.
+
+        Si la reserva está vacía se genera una en el momento, así que take()
+        nunca falla por falta de existencias.
+        """
+        if profile not in self.profiles:
+            raise KeyError(f"Perfil de mazmorra desconocido: {profile}")
+        with self._condition:
+            queue = self._queues[profile]
+            entry = queue.popleft() if queue else None
+            self._condition.notify_all()
+        if entry is None:
+            return self._generator(**self.profiles[profile])
+        dungeon, path = entry
+        if path:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        return dungeon
+
+    def wait_until_full(self, timeout: Optional[float] = None) -> bool:
+        """Espera a que todas las colas estén llenas; False si vence el timeout."""
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: self._next_profile_to_fill() is None, timeout
+            )
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                self._condition.wait_for(
+                    lambda: self._stopped.is_set()
+                    or self._next_profile_to_fill() is not None
+                )
+                if self._stopped.is_set():
+                    return
+                profile = self._next_profile_to_fill()
+            try:
+                dungeon = self._generator(**self.profiles[profile])
+            except Exception as e:
+                print(f"Warning: Error generando mazmorra para la reserva: {e}")
+                self._stopped.wait(1.0)
+                continue
+            path = self._save_to_disk(profile, dungeon)
+            with self._condition:
+                self._queues[profile].append((dungeon, path))
+                self._condition.notify_all()
+
+    def _next_profile_to_fill(self) -> Optional[str]:
+        for name, queue in self._queues.items():
+            if len(queue) < self.capacity:
+                return name
+        return None
+
+    def _profile_dir(self, profile: str) -> str:
+        return os.path.join(self.directory, profile)
+
+    def _save_to_disk(self, profile: str, dungeon: Dungeon) -> Optional[str]:
+        if not self.directory:
+            return None
+        path = os.path.join(self._profile_dir(profile), f"{uuid.uuid4().hex}.json")
+        try:
+            os.makedirs(self._profile_dir(profile), exist_ok=True)
+            with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+                f.write(dump_model_json(dungeon))
+            os.replace(f"{path}.tmp", path)
+        except OSError as e:
+            print(f"Warning: No se pudo persistir la mazmorra de la reserva: {e}")
+            return None
+        return path
+
+    def _load_from_disk(self) -> None:
+        for profile, queue in self._queues.items():
+            directory = self._profile_dir(profile)
+            if not os.path.isdir(directory):
+                continue
+            for name in sorted(os.listdir(directory)):
+                if not name.endswith(".json"):
+                    continue
+                path = os.path.join(directory, name)
+                try:
+                    with open(path, "r", encoding="utf-8") as f:
+                        dungeon = load_model_json(Dungeon, f.read())
+                except (OSError, ValueError) as e:
+                    print(f"Warning: Mazmorra ilegible en la reserva, se descarta: {e}")
+                    os.remove(path)
+                    continue
+                queue.append((compact_large_levels(dungeon), path))
+
+
+_dungeon_pool: Optional[DungeonPool] = None
+_dungeon_pool_lock = threading.Lock()
+
+
+def get_dungeon_pool() -> DungeonPool:
+    """
+    Reserva de mazmorras global del proceso.
+
+    Se crea la primera vez que se usa; si AIMAZE_DUNGEON_POOL_DIR está definida,
+    la reserva se persiste en ese directorio.
+    """
+    global _dungeon_pool
+    with _dungeon_pool_lock:
+        if _dungeon_pool is None:
+            _dungeon_pool = DungeonPool(
+                directory=os.getenv("AIMAZE_DUNGEON_POOL_DIR") or None
+            )
+        return _dungeon_pool
@@ -0,0 +1,253 @@
+# src/aimaze/level_analysis.py
+
+from array import array
+from collections import OrderedDict, deque
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from aimaze.dungeon import Level
+from aimaze.generation.chunked import ChunkedGrid
+from aimaze.level_grid import NO_ROOM as GRID_NO_ROOM, LevelGrid
+
+UNREACHABLE = -1
+
+# Clasificación topológica de cada celda según su número de conexiones
+NO_ROOM = 0
+ISOLATED = 1
+DEAD_END = 2
+CORRIDOR = 3
+JUNCTION = 4
+
+ROOM_CLASS_NAMES = {
+    NO_ROOM: "none",
+    ISOLATED: "isolated",
+    DEAD_END: "dead_end",
+    CORRIDOR: "corridor",
+    JUNCTION: "junction",
+}
+
+
+class LevelAnalysis:
+    """
+    Análisis topológico precalculado de un Level, en arrays planos por celda
+    (índice y * width + x):
+
+    - distance_to_exit / distance_from_start: pasos BFS (UNREACHABLE si no hay camino)
+    - room_class: NO_ROOM, ISOLATED, DEAD_END, CORRIDOR o JUNCTION
+    - component: id de componente conexa (-1 si no hay sala)
+
+    Se obtiene con get_level_analysis(), que lo cachea en el propio Level. Los
+    niveles por chunks no se admiten (ver supports_level_analysis).
+    """
+
+    def __init__(self, level: Level):
+        if not supports_level_analysis(level):
+            raise ValueError(
+                f"El nivel {level.id} se genera por chunks bajo demanda; "
+                f"analizarlo entero obligaría a generarlos todos"
+            )
+        self.width = level.width
+        self.height = level.height
+        self.start_coords = tuple(level.start_coords)
+        self.exit_coords = tuple(level.exit_coords)
+
+        cells = level.width * level.height
+        neighbors, room_indices = _neighbor_source(level)
+        # Se conservan para consultas posteriores (p. ej. aimaze.pathfinding)
+        self.neighbors = neighbors
+        self.path_trees: "OrderedDict[int, array]" = OrderedDict()
+        self.room_class = array("B", bytes(cells))
+        for index in room_indices:
+            degree = sum(1 for _ in neighbors(index))
+            self.room_class[index] = _classify(degree)
+
+        self.distance_to_exit = self._bfs(neighbors, self.index(*self.exit_coords))
+        self.distance_from_start = self._bfs(
+            neighbors, self.index(*self.start_coords)
+        )
+        self.component, self.component_count = _label_components(
+            neighbors, cells, room_indices
+        )
+
+    def _bfs(self, neighbors: Callable[[int], Iterable[int]], source: int) -> array:
+        distances = array("i", [UNREACHABLE]) * (self.width * self.height)
+        if source < 0 or self.room_class[source] == NO_ROOM:
+            return distances
+        distances[source] = 0
+        queue = deque([source])
+        while queue:
+            current = queue.popleft()
+            next_distance = distances[current] + 1
+            for target in neighbors(current):
+                if distances[target] == UNREACHABLE:
+                    distances[target] = next_distance
+                    queue.append(target)
+        return distances
+
+    def index(self, x: int, y: int) -> int:
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return y * self.width + x
+        return -1
+
+    def coords(self, index: int) -> Tuple[int, int]:
+        return index % self.width, index // self.width
+
+    def distance_to_exit_at(self, x: int, y: int) -> int:
+        index = self.index(x, y)
+        return UNREACHABLE if index < 0 else self.distance_to_exit[index]
+
+    def distance_from_start_at(self, x: int, y: int) -> int:
+        index = self.index(x, y)
+        return UNREACHABLE if index < 0 else self.distance_from_start[index]
+
+    def classify(self, x: int, y: int) -> str:
+        """Devuelve 'dead_end', 'corridor', 'junction', 'isolated' o 'none'."""
+        index = self.index(x, y)
+        return ROOM_CLASS_NAMES[NO_ROOM if index < 0 else self.room_class[index]]
+
+    @property
+    def is_fully_connected(self) -> bool:
+        return self.component_count <= 1
+
+    @property
+    def exit_reachable(self) -> bool:
+        return self.distance_to_exit_at(*self.start_coords) != UNREACHABLE
+
+    def cells_of_class(self, room_class: int) -> List[Tuple[int, int]]:
+        return [
+            self.coords(index)
+            for index, value in enumerate(self.room_class)
+            if value == room_class
+        ]
+
+    def summary(self) -> Dict[str, int]:
+        """Resumen para validación y puntuación de dificultad."""
+        counts = {name: 0 for name in ROOM_CLASS_NAMES.values()}
+        for value in self.room_class:
+            counts[ROOM_CLASS_NAMES[value]] += 1
+        return {
+            "rooms": self.width * self.height - counts["none"],
+            "dead_ends": counts["dead_end"],
+            "corridors": counts["corridor"],
+            "junctions": counts["junction"],
+            "components": self.component_count,
+            "start_to_exit": self.distance_to_exit_at(*self.start_coords),
+            "max_distance_to_exit": max(self.distance_to_exit, default=UNREACHABLE),
+        }
+
+
+def supports_level_analysis(level: Level) -> bool:
+    """
+    Indica si se puede analizar el nivel entero. No en los niveles por chunks
+    (aimaze.generation.chunked): el análisis necesita todas las salas y
+    generarlas rompería su coste proporcional a lo explorado.
+    """
+    return not isinstance(level._grid, ChunkedGrid)
+
+
+def get_level_analysis(level: Level) -> LevelAnalysis:
+    """
+    Devuelve el análisis cacheado del nivel, recalculándolo solo si el nivel cambió.
+
+    Los cambios se detectan por la versión de la rejilla compacta o, en niveles
+    con dict, por la identidad y el tamaño de level.rooms. Si se editan en sitio
+    las conexiones de una Room existente hay que llamar a
+    invalidate_level_analysis().
+    """
+    fingerprint = level_fingerprint(level)
+    cached = level._analysis
+    if cached is not None and cached[0] == fingerprint:
+        return cached[1]
+    analysis = LevelAnalysis(level)
+    level._analysis = (fingerprint, analysis)
+    return analysis
+
+
+def peek_level_analysis(level: Level) -> Optional[LevelAnalysis]:
+    """Análisis cacheado del nivel si sigue vigente; nunca lo calcula."""
+    cached = level._analysis
+    if cached is not None and cached[0] == level_fingerprint(level):
+        return cached[1]
+    return None
+
+
+def invalidate_level_analysis(level: Level) -> None:
+    """
+    Descarta el análisis y las tablas de opciones por sala (aimaze.room_options)
+    cacheados en el nivel; necesario tras editar en sitio un nivel con dict.
+    """
+    level._analysis = None
+    level._options = None
+
+
+def level_fingerprint(level: Level) -> tuple:
+    """Huella barata que cambia cuando se añaden salas o se modifica la rejilla."""
+    grid = level._grid
+    return (
+        id(level.rooms),
+        len(level.rooms),
+        getattr(grid, "version", None),
+        tuple(level.start_coords),
+        tuple(level.exit_coords),
+    )
+
+
+def _neighbor_source(level: Level) -> Tuple[Callable[[int], Iterable[int]], List[int]]:
+    """Función índice -> índices vecinos con sala, y lista de celdas con sala."""
+    grid = level._grid
+    if isinstance(grid, LevelGrid):
+        cells = grid.width * grid.height
+        kinds = grid.kinds
+
+        def grid_neighbors(index: int) -> List[int]:
+            return [
+                target
+                for target in grid.neighbors(index)
+                if 0 <= target < cells and kinds[target] != GRID_NO_ROOM
+            ]
+
+        room_indices = [grid.index(x, y) for x, y in grid.iter_coords()]
+        return grid_neighbors, room_indices
+
+    width, height = level.width, level.height
+    adjacency: Dict[int, List[int]] = {}
+    for room in level.rooms.values():
+        x, y = room.coordinates
+        adjacency[y * width + x] = [
+            ty * width + tx
+            for tx, ty in room.connections.values()
+            if 0 <= tx < width and 0 <= ty < height
+        ]
+    # Ignorar conexiones hacia celdas sin sala
+    for index, targets in adjacency.items():
+        adjacency[index] = [target for target in targets if target in adjacency]
+    return (lambda index: adjacency.get(index, ())), list(adjacency)
+
+
+def _classify(degree: int) -> int:
+    if degree == 0:
+        return ISOLATED
+    if degree == 1:
+        return DEAD_END
+    if degree == 2:
+        return CORRIDOR
+    return JUNCTION
+
+
+def _label_components(
+    neighbors: Callable[[int], Iterable[int]], cells: int, room_indices: List[int]
+) -> Tuple[array, int]:
+    component = array("i", [-1]) * cells
+    count = 0
+    for root in room_indices:
+        if component[root] != -1:
+            continue
+        component[root] = count
+        stack = [root]
+        while stack:
+            current = stack.pop()
+            for target in neighbors(current):
+                if component[target] == -1:
+                    component[target] = count
+                    stack.append(target)
+        count += 1
+    return component, count
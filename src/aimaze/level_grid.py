@@ -0,0 +1,308 @@
+# src/aimaze/level_grid.py
+
+from array import array
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from aimaze.dungeon import (
+    Dungeon,
+    Level,
+    Room,
+    parse_legacy_room_key,
+    room_key,
+    room_key_coords,
+)
+
+NORTH = 1
+SOUTH = 2
+EAST = 4
+WEST = 8
+
+DIRECTION_BITS: Dict[str, int] = {
+    "north": NORTH,
+    "south": SOUTH,
+    "east": EAST,
+    "west": WEST,
+}
+DIRECTION_OFFSETS: Dict[str, Tuple[int, int]] = {
+    "north": (0, -1),
+    "south": (0, 1),
+    "east": (1, 0),
+    "west": (-1, 0),
+}
+
+# Valor de kinds para celdas sin habitación
+NO_ROOM = 0xFF
+
+# A partir de este número de celdas los niveles se guardan en una LevelGrid compacta
+COMPACT_LEVEL_MIN_CELLS = 4096
+
+
+class LevelGrid:
+    """
+    Almacén compacto de un nivel usando arrays planos indexados por y * width + x.
+
+    - masks: máscara de conexiones de 4 bits por celda (NORTH | SOUTH | EAST | WEST)
+    - kinds: índice en kind_names del prefijo del id de la sala (NO_ROOM si vacía)
+    - ordinals: sufijo numérico del id ('main_path_3' -> kind 'main_path', 3)
+
+    Ocupa 6 bytes por celda, así que un nivel de 1M de celdas cabe en ~6 MB.
+    """
+
+    __slots__ = (
+        "width",
+        "height",
+        "masks",
+        "kinds",
+        "ordinals",
+        "kind_names",
+        "room_count",
+        "version",
+    )
+
+    def __init__(self, width: int, height: int):
+        cells = width * height
+        self.width = width
+        self.height = height
+        self.masks = array("B", [0]) * cells
+        self.kinds = array("B", [NO_ROOM]) * cells
+        self.ordinals = array("I", [0]) * cells
+        self.kind_names: List[str] = []
+        self.room_count = 0
+        # Se incrementa en cada modificación para invalidar cachés derivadas
+        self.version = 0
+
+    @classmethod
+    def from_rooms(cls, rooms: Dict[int, Room], width: int, height: int) -> "LevelGrid":
+        """Construye la rejilla compacta a partir de un diccionario room_key -> Room."""
+        grid = cls(width, height)
+        for room in rooms.values():
+            grid.set_room(room)
+        return grid
+
+    @classmethod
+    def from_masks(
+        cls, masks: bytes, width: int, height: int, kind: str = "room"
+    ) -> "LevelGrid":
+        """
+        Construye una rejilla con una sala en cada celda a partir de máscaras ya
+        calculadas (una por celda, en orden y * width + x). Los ids son kind_1..N.
+        """
+        cells = width * height
+        if len(masks) != cells:
+            raise ValueError(f"Se esperaban {cells} máscaras y hay {len(masks)}")
+        grid = cls(width, height)
+        grid.masks = array("B", masks)
+        grid.kinds = array("B", bytes(cells))
+        grid.ordinals = array("I", range(1, cells + 1))
+        grid.kind_names = [kind]
+        grid.room_count = cells
+        return grid
+
+    @property
+    def nbytes(self) -> int:
+        """Memoria aproximada ocupada por los arrays de la rejilla."""
+        return (
+            self.masks.itemsize * len(self.masks)
+            + self.kinds.itemsize * len(self.kinds)
+            + self.ordinals.itemsize * len(self.ordinals)
+        )
+
+    def index(self, x: int, y: int) -> int:
+        """Índice plano de la celda (x, y), o -1 si está fuera de límites."""
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return y * self.width + x
+        return -1
+
+    def has_room(self, x: int, y: int) -> bool:
+        index = self.index(x, y)
+        return index >= 0 and self.kinds[index] != NO_ROOM
+
+    def set_room(self, room: Room) -> None:
+        """Guarda (o sobrescribe) una sala en la rejilla."""
+        x, y = room.coordinates
+        index = self.index(x, y)
+        if index < 0:
+            raise ValueError(f"Coordenadas ({x}, {y}) fuera de los límites del nivel")
+
+        mask = 0
+        for direction, target in room.connections.items():
+            dx, dy = DIRECTION_OFFSETS.get(direction, (0, 0))
+            if (x + dx, y + dy) != tuple(target) or (dx, dy) == (0, 0):
+                raise ValueError(
+                    f"Conexión {direction} de la sala {room.id} no adyacente: {target}"
+                )
+            mask |= DIRECTION_BITS[direction]
+
+        kind, ordinal = _split_room_id(room.id)
+        if self.kinds[index] == NO_ROOM:
+            self.room_count += 1
+        self.kinds[index] = self._kind_index(kind)
+        self.ordinals[index] = ordinal
+        self.masks[index] = mask
+        self.version += 1
+
+    def neighbors(self, index: int) -> Iterator[int]:
+        """Índices de las celdas conectadas con index (solo aritmética entera)."""
+        mask = self.masks[index]
+        if mask & NORTH:
+            yield index - self.width
+        if mask & SOUTH:
+            yield index + self.width
+        if mask & EAST:
+            yield index + 1
+        if mask & WEST:
+            yield index - 1
+
+    def room_id(self, index: int) -> str:
+        kind = self.kind_names[self.kinds[index]]
+        ordinal = self.ordinals[index]
+        return f"{kind}_{ordinal}" if ordinal else kind
+
+    def room_at(self, x: int, y: int) -> Optional[Room]:
+        """
+        Devuelve una vista Room de la sala en (x, y), o None si no existe.
+
+        La vista es una copia: modificar sus conexiones no altera la rejilla.
+        Para cambiar una sala hay que volver a guardarla con set_room().
+        """
+        index = self.index(x, y)
+        if index < 0 or self.kinds[index] == NO_ROOM:
+            return None
+        mask = self.masks[index]
+        connections = {}
+        for direction, bit in DIRECTION_BITS.items():
+            if mask & bit:
+                dx, dy = DIRECTION_OFFSETS[direction]
+                connections[direction] = (x + dx, y + dy)
+        return Room(
+            id=self.room_id(index), coordinates=(x, y), connections=connections
+        )
+
+    def iter_coords(self) -> Iterator[Tuple[int, int]]:
+        """Recorre las coordenadas de todas las celdas con habitación."""
+        width = self.width
+        for index, kind in enumerate(self.kinds):
+            if kind != NO_ROOM:
+                yield index % width, index // width
+
+    def to_level(self, level_id: int, start_coords: tuple, exit_coords: tuple) -> Level:
+        """Crea un Level respaldado por esta rejilla."""
+        level = Level(
+            id=level_id,
+            width=self.width,
+            height=self.height,
+            start_coords=start_coords,
+            exit_coords=exit_coords,
+        )
+        level.rooms = GridRooms(self)
+        level._grid = self
+        return level
+
+    def _kind_index(self, kind: str) -> int:
+        try:
+            return self.kind_names.index(kind)
+        except ValueError:
+            if len(self.kind_names) >= NO_ROOM:
+                raise ValueError("Demasiados tipos de id de sala para la rejilla")
+            self.kind_names.append(kind)
+            return len(self.kind_names) - 1
+
+
+class GridRooms(dict):
+    """
+    Vista compatible con Dict[int, Room] (claves room_key) sobre una LevelGrid.
+
+    Hereda de dict para que el código existente (isinstance, .get, .items) siga
+    funcionando, pero no almacena nada: cada acceso se resuelve contra la rejilla.
+    """
+
+    def __init__(self, grid: LevelGrid):
+        super().__init__()
+        self.grid = grid
+
+    def __reduce__(self):
+        # dict.__reduce_ex__ volvería a insertar cada sala antes de restaurar grid
+        return (GridRooms, (self.grid,))
+
+    def _coords(self, key) -> Optional[Tuple[int, int]]:
+        if isinstance(key, str):
+            key = parse_legacy_room_key(key)
+        if not isinstance(key, int) or key < 0:
+            return None
+        return room_key_coords(key)
+
+    def __getitem__(self, key: int) -> Room:
+        room = self.get(key)
+        if room is None:
+            raise KeyError(key)
+        return room
+
+    def __setitem__(self, key: int, room: Room) -> None:
+        if self._coords(key) != tuple(room.coordinates):
+            raise KeyError(f"La clave {key} no coincide con {room.coordinates}")
+        self.grid.set_room(room)
+
+    def get(self, key: int, default=None):
+        coords = self._coords(key)
+        if coords is None:
+            return default
+        room = self.grid.room_at(*coords)
+        return default if room is None else room
+
+    def __contains__(self, key) -> bool:
+        coords = self._coords(key)
+        return coords is not None and self.grid.has_room(*coords)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.keys())
+
+    def __len__(self) -> int:
+        return self.grid.room_count
+
+    def __bool__(self) -> bool:
+        return self.grid.room_count > 0
+
+    def __eq__(self, other) -> bool:
+        return dict(self.items()) == other
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"GridRooms({self.grid.width}x{self.grid.height}, rooms={len(self)})"
+
+    # keys/values/items son generadores: en niveles grandes no se crean de
+    # golpe todas las Room (room_at construye una vista por sala)
+    def keys(self) -> Iterator[int]:
+        return (room_key(x, y) for x, y in self.grid.iter_coords())
+
+    def values(self) -> Iterator[Room]:
+        grid = self.grid
+        return (grid.room_at(x, y) for x, y in grid.iter_coords())
+
+    def items(self) -> Iterator[Tuple[int, Room]]:
+        grid = self.grid
+        return ((room_key(x, y), grid.room_at(x, y)) for x, y in grid.iter_coords())
+
+
+def compact_level(level: Level) -> Level:
+    """Devuelve una copia de level respaldada por una LevelGrid."""
+    if getattr(level, "_grid", None) is not None:
+        return level
+    grid = LevelGrid.from_rooms(level.rooms, level.width, level.height)
+    return grid.to_level(level.id, level.start_coords, level.exit_coords)
+
+
+def compact_large_levels(dungeon: Dungeon) -> Dungeon:
+    """Compacta in situ los niveles con al menos COMPACT_LEVEL_MIN_CELLS celdas."""
+    for level_id, level in dungeon.levels.items():
+        if level.width * level.height >= COMPACT_LEVEL_MIN_CELLS:
+            dungeon.levels[level_id] = compact_level(level)
+    return dungeon
+
+
+def _split_room_id(room_id: str) -> Tuple[str, int]:
+    """Separa 'main_path_12' en ('main_path', 12); sin sufijo numérico -> (id, 0)."""
+    kind, _, suffix = room_id.rpartition("_")
+    if kind and suffix.isdigit() and not suffix.startswith("0"):
+        return kind, int(suffix)
+    return room_id, 0
@@ -1,23 +1,101 @@
 # src/aimaze/main.py
 
-from aimaze.game_state import initialize_game_state
-from aimaze.display import display_scenario
+import asyncio
+import os
+import threading
+
+from aimaze.ai.client import get_llm_registry
+from aimaze.ai.level_descriptions import (
+    agenerate_level_descriptions,
+    configured_batch_size,
+)
+from aimaze.ai.narration import get_narration_provider
+from aimaze.ai.prefetch import create_async_description_prefetcher
+from aimaze.config import load_config
+from aimaze.dungeon import PlayerLocation, get_room_at_coords
+from aimaze.game_state import (
+    get_location_description,
+    initialize_game_state,
+    set_location_description,
+)
+from aimaze.display import adisplay_scenario, prefetch_neighbours
 from aimaze.input import get_player_input
 from aimaze.actions import process_player_action
+from aimaze.generation.warm_pool import get_dungeon_pool
+
+# Distancia Manhattan máxima a la sala actual de las salas que se describen por
+# lotes al entrar en un nivel: cubre entero un nivel 5x5 y limita a 145 salas
+# los niveles grandes (el resto lo cubre el prefetch al moverse)
+LEVEL_BATCH_RADIUS = 8
 
 
 def game_loop():
     """
-    Main game loop. Orchestrates calls to other modules.
+    Main game loop (synchronous entry point).
+    Thin wrapper that runs async_game_loop in its own event loop.
+    """
+    asyncio.run(async_game_loop())
+
+
+async def async_game_loop():
+    """
+    Main game loop on asyncio. Orchestrates calls to other modules.
+
+    Room descriptions are generated with the async LLM API and streamed to the
+    terminal as they arrive (AIMAZE_STREAM_DESCRIPTIONS=0 waits for the whole
+    description instead). On entering a level the rooms around the player are
+    requested in batches in the background (aimaze.ai.level_descriptions), and
+    once that is done the neighbouring rooms of each new room are prefetched
+    (aimaze.ai.prefetch). Batching and prefetching are only used with a
+    remote narration provider (aimaze.ai.narration). Input reading
+    and action processing (events, saving) run in worker threads so the event
+    loop keeps serving the LLM calls in the meantime.
     """
-    game_state_data = initialize_game_state()
+    # La configuración puede definir AIMAZE_DUNGEON_POOL_DIR para la reserva
+    load_config()
+    dungeon_pool = get_dungeon_pool()
+    game_state_data = initialize_game_state(dungeon_pool=dungeon_pool)
+    # Reponer la reserva en segundo plano mientras se juega
+    dungeon_pool.start()
+    # Lotes y prefetch solo compensan si la narración viene de un servicio
+    # remoto; la procedural es instantánea
+    remote = get_narration_provider().remote
+    # Descripciones de las salas vecinas generadas mientras el jugador decide
+    prefetcher = create_async_description_prefetcher() if remote else None
+    # Nivel -> tarea que describe por lotes el resto de sus salas (None una vez
+    # copiado su resultado a game_state)
+    batch_size = configured_batch_size() if remote else 0
+    level_batches = {}
+    stream = os.getenv("AIMAZE_STREAM_DESCRIPTIONS", "1") != "0"
 
     print("\n--- ¡COMIENZA LA AVENTURA! ---")
 
-    while not game_state_data["game_over"]:
-        display_scenario(game_state_data)
-        player_choice = get_player_input(game_state_data)
-        game_state_data = process_player_action(game_state_data, player_choice)
+    try:
+        while not game_state_data["game_over"]:
+            if batch_size:
+                _start_level_batch(game_state_data, level_batches, batch_size)
+                _apply_level_batches(game_state_data, level_batches)
+            await adisplay_scenario(game_state_data, prefetcher, stream=stream)
+            # Las salas que ya trae el lote no necesitan prefetch
+            _apply_level_batches(game_state_data, level_batches)
+            if (
+                prefetcher is not None
+                and not game_state_data["game_over"]
+                and not _level_batch_running(game_state_data, level_batches)
+            ):
+                prefetch_neighbours(game_state_data, prefetcher)
+            player_choice = await run_blocking(get_player_input, game_state_data)
+            game_state_data = await run_blocking(
+                process_player_action, game_state_data, player_choice)
+    finally:
+        for task in level_batches.values():
+            if task is not None:
+                task.cancel()
+        dungeon_pool.stop(timeout=1.0)
+        if prefetcher is not None:
+            await prefetcher.stop()
+        # El pool HTTP asíncrono pertenece a este bucle de eventos
+        await get_llm_registry().aclose()
 
     print("\n--- FIN DEL JUEGO ---")
     if game_state_data["objective_achieved"]:
@@ -27,6 +105,113 @@ def game_loop():
         print("Aquí se mostrarían mensajes de derrota si el juego terminara por otras causas.")
 
 
+def _start_level_batch(game_state, level_batches, batch_size):
+    """
+    Lanza, la primera vez que se entra en un nivel, la descripción por lotes de
+    las salas sin descripción a menos de LEVEL_BATCH_RADIUS de la actual, salvo
+    ella misma (que se describe en primer plano).
+    """
+    player_location = game_state["player_location"]
+    if player_location.level in level_batches:
+        return
+    dungeon = game_state["dungeon"]
+    level = dungeon.levels[player_location.level]
+    current = (player_location.x, player_location.y)
+    rooms = [
+        (x, y)
+        for x, y in _rooms_near(level, current, LEVEL_BATCH_RADIUS)
+        if (x, y) != current
+        and get_location_description(
+            game_state, PlayerLocation(level=player_location.level, x=x, y=y)
+        ) is None
+    ]
+    level_batches[player_location.level] = asyncio.get_running_loop().create_task(
+        agenerate_level_descriptions(
+            level, rooms, seed=dungeon.seed, batch_size=batch_size
+        ),
+        name=f"aimaze-level-batch-{player_location.level}",
+    )
+
+
+def _rooms_near(level, center, radius):
+    """
+    Coordenadas de las salas de level a distancia Manhattan <= radius de
+    center, de la más cercana a la más lejana.
+
+    Solo se recorre el rombo alrededor de center: en niveles grandes no se
+    visitan todas las salas.
+    """
+    cx, cy = center
+    for distance in range(radius + 1):
+        for dx in range(-distance, distance + 1):
+            dy = distance - abs(dx)
+            for y in ((cy - dy, cy + dy) if dy else (cy,)):
+                x = cx + dx
+                if (
+                    0 <= x < level.width
+                    and 0 <= y < level.height
+                    and get_room_at_coords(level, x, y) is not None
+                ):
+                    yield x, y
+
+
+def _apply_level_batches(game_state, level_batches):
+    """Copia a game_state las descripciones de los lotes ya terminados."""
+    for level_id, task in list(level_batches.items()):
+        if task is None or not task.done():
+            continue
+        level_batches[level_id] = None
+        if task.cancelled():
+            continue
+        if task.exception() is not None:
+            print(f"Warning: Error describiendo el nivel {level_id}: {task.exception()}")
+            continue
+        for (x, y), description in task.result().descriptions.items():
+            location = PlayerLocation(level=level_id, x=x, y=y)
+            if get_location_description(game_state, location) is None:
+                set_location_description(game_state, location, description)
+
+
+def _level_batch_running(game_state, level_batches):
+    task = level_batches.get(game_state["player_location"].level)
+    return task is not None and not task.done()
+
+
+async def run_blocking(func, *args):
+    """
+    Ejecuta func(*args) en un hilo daemon y espera su resultado sin bloquear el
+    bucle de eventos.
+
+    No se usa asyncio.to_thread: un input() pendiente en el ejecutor por
+    defecto retrasaría el cierre de asyncio.run (p. ej. tras Ctrl+C), mientras
+    que un hilo daemon no impide terminar el proceso.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def deliver(result, error):
+        if future.done():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def worker():
+        try:
+            outcome = (func(*args), None)
+        except BaseException as e:
+            outcome = (None, e)
+        try:
+            loop.call_soon_threadsafe(deliver, *outcome)
+        except RuntimeError:
+            # El bucle ya terminó (p. ej. se interrumpió la partida)
+            pass
+
+    threading.Thread(target=worker, name="aimaze-blocking", daemon=True).start()
+    return await future
+
+
 # Entry point of the game
 if __name__ == "__main__":
     game_loop()
@@ -0,0 +1,152 @@
+# src/aimaze/pathfinding.py
+
+from array import array
+from collections import deque
+from typing import Callable, List, Optional, Tuple
+
+from aimaze.dungeon import Level, get_room_at_coords
+from aimaze.level_analysis import (
+    NO_ROOM,
+    LevelAnalysis,
+    get_level_analysis,
+    supports_level_analysis,
+)
+
+NO_PARENT = -1
+
+# Árboles de padres que se conservan por nivel (uno por destino)
+MAX_CACHED_TARGETS = 16
+
+
+def get_parent_tree(level: Level, target: Tuple[int, int]) -> Optional[array]:
+    """
+    Árbol BFS hacia target: para cada celda, el índice de la siguiente celda en
+    el camino más corto hacia target (NO_PARENT si no hay camino).
+
+    Los árboles se cachean en el análisis del nivel, así que se invalidan junto
+    con él cuando el nivel cambia. Devuelve None si target no tiene sala o si
+    el nivel no admite análisis (niveles por chunks).
+    """
+    if not supports_level_analysis(level):
+        return None
+    analysis = get_level_analysis(level)
+    target_index = analysis.index(*target)
+    if target_index < 0 or analysis.room_class[target_index] == NO_ROOM:
+        return None
+
+    trees = analysis.path_trees
+    tree = trees.get(target_index)
+    if tree is not None:
+        trees.move_to_end(target_index)
+        return tree
+
+    tree = _build_parent_tree(analysis, target_index)
+    trees[target_index] = tree
+    while len(trees) > MAX_CACHED_TARGETS:
+        trees.popitem(last=False)
+    return tree
+
+
+def find_path(
+    level: Level,
+    start: Tuple[int, int],
+    target: Tuple[int, int],
+    allowed: Optional[Callable[[int, int], bool]] = None,
+) -> Optional[List[Tuple[int, int]]]:
+    """
+    Camino más corto de start a target (ambos incluidos) siguiendo las conexiones.
+
+    allowed(x, y), si se indica, limita las celdas por las que puede pasar el
+    camino (start no se comprueba). Devuelve None si alguna de las dos celdas
+    no tiene sala o si no hay camino.
+
+    Se usa el árbol de padres cacheado por destino; con allowed, su camino se
+    acepta si todas sus celdas están permitidas (entonces también es el más
+    corto entre ellas) y si no se busca sala a sala (ver _search_path). En los
+    niveles por chunks, que no tienen árboles, se busca siempre sala a sala,
+    generando los chunks que atraviese la búsqueda.
+    """
+    start, target = tuple(start), tuple(target)
+    if not supports_level_analysis(level):
+        return _search_path(level, start, target, allowed)
+    path = _cached_path(level, start, target)
+    if path is None or allowed is None:
+        # Sin camino en el nivel entero tampoco lo hay por las celdas permitidas
+        return path
+    if all(allowed(x, y) for x, y in path[1:]):
+        return path
+    return _search_path(level, start, target, allowed)
+
+
+def _cached_path(
+    level: Level, start: Tuple[int, int], target: Tuple[int, int]
+) -> Optional[List[Tuple[int, int]]]:
+    """Camino más corto sin restricciones, siguiendo el árbol de padres cacheado."""
+    tree = get_parent_tree(level, target)
+    if tree is None:
+        return None
+    analysis = get_level_analysis(level)
+    current = analysis.index(*start)
+    target_index = analysis.index(*target)
+    if current < 0 or (current != target_index and tree[current] == NO_PARENT):
+        return None
+
+    path = [analysis.coords(current)]
+    while current != target_index:
+        current = tree[current]
+        path.append(analysis.coords(current))
+    return path
+
+
+def _search_path(
+    level: Level,
+    start: Tuple[int, int],
+    target: Tuple[int, int],
+    allowed: Optional[Callable[[int, int], bool]] = None,
+) -> Optional[List[Tuple[int, int]]]:
+    """
+    BFS de start a target sobre Room.connections, con los padres en un dict.
+
+    Solo toca las salas que alcanza antes de llegar a target, así que su coste
+    es proporcional a la zona recorrida y no al tamaño del nivel.
+    """
+    if get_room_at_coords(level, *start) is None:
+        return None
+    if get_room_at_coords(level, *target) is None:
+        return None
+    parents = {start: start}
+    queue = deque([start])
+    while queue and target not in parents:
+        current = queue.popleft()
+        room = get_room_at_coords(level, *current)
+        if room is None:
+            continue
+        for neighbour in room.connections.values():
+            neighbour = tuple(neighbour)
+            if neighbour in parents:
+                continue
+            if allowed is None or allowed(*neighbour):
+                parents[neighbour] = current
+                queue.append(neighbour)
+    if target not in parents:
+        return None
+
+    path = [target]
+    while path[-1] != start:
+        path.append(parents[path[-1]])
+    path.reverse()
+    return path
+
+
+def _build_parent_tree(analysis: LevelAnalysis, target_index: int) -> array:
+    tree = array("i", [NO_PARENT]) * (analysis.width * analysis.height)
+    tree[target_index] = target_index
+    queue = deque([target_index])
+    neighbors = analysis.neighbors
+    while queue:
+        current = queue.popleft()
+        for source in neighbors(current):
+            if tree[source] == NO_PARENT:
+                tree[source] = current
+                queue.append(source)
+    return tree
@@ -1,11 +1,16 @@
 # quest_manager.py characters.py localization.py save_load.py
 
-from pydantic import BaseModel, Field
+from dataclasses import dataclass, field
 from typing import List
 
 
-class Player(BaseModel):
-    """Modelo del jugador usando Pydantic BaseModel."""
+@dataclass(slots=True)
+class Player:
+    """
+    Modelo del jugador en tiempo de ejecución (dataclass con __slots__).
+
+    Su esquema pydantic para guardar/cargar es aimaze.schemas.PlayerSchema.
+    """
 
     strength: int = 10
     dexterity: int = 10
@@ -14,7 +19,7 @@ class Player(BaseModel):
     health: int = 100
     max_health: int = 100
     experience: int = 0
-    inventory: List[str] = Field(default_factory=list)
+    inventory: List[str] = field(default_factory=list)
 
     def gain_xp(self, amount: int) -> None:
         """Aumenta la experiencia del jugador."""
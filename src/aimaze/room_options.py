@@ -0,0 +1,119 @@
+# src/aimaze/room_options.py
+
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from aimaze.dungeon import Level, Room, get_room_at_coords, room_key
+from aimaze.level_analysis import level_fingerprint
+
+# Traducción de las direcciones cardinales a texto para el jugador
+DIRECTION_NAMES = {
+    'north': 'Norte',
+    'south': 'Sur',
+    'east': 'Este',
+    'west': 'Oeste',
+}
+
+
+def direction_name(direction: str) -> str:
+    return DIRECTION_NAMES.get(direction, direction.capitalize())
+
+
+@dataclass(slots=True)
+class RoomOptions:
+    """
+    Tabla de opciones de una sala, calculada una vez por nivel.
+
+    - lines: líneas del menú ya formateadas ("1) Ir al Este", ...)
+    - options_map: número de opción -> (acción, destino), el formato de
+      game_state["current_options_map"]; se comparte entre turnos, no modificar
+    - targets: dirección -> coordenadas de destino ya validadas (dentro del
+      nivel y con sala)
+    - move_errors: dirección de room.connections no transitable -> motivo
+    """
+    room: Room
+    is_exit: bool
+    lines: Tuple[str, ...]
+    options_map: Dict[str, tuple]
+    targets: Dict[str, Tuple[int, int]]
+    move_errors: Dict[str, str]
+
+
+def get_room_options(level: Level, x: int, y: int) -> Optional[RoomOptions]:
+    """
+    Devuelve la tabla de opciones de la sala (x, y), o None si no hay sala.
+
+    Las tablas se memorizan en el propio Level y se descartan cuando cambia
+    su huella (ver aimaze.level_analysis.get_level_analysis). Tras editar en
+    sitio las conexiones de una Room hay que llamar a
+    invalidate_level_analysis().
+    """
+    cached = level._options
+    fingerprint = level_fingerprint(level)
+    if cached is None or cached[0] != fingerprint:
+        cached = (fingerprint, {})
+        level._options = cached
+
+    key = room_key(x, y)
+    options = cached[1].get(key)
+    if options is not None:
+        return options
+
+    room = get_room_at_coords(level, x, y)
+    if room is None:
+        return None
+    options = _build_room_options(level, room)
+    # Validar los destinos puede generar chunks pendientes (niveles por chunks),
+    # lo que cambia la huella sin alterar las salas ya existentes
+    fingerprint = level_fingerprint(level)
+    if fingerprint != cached[0]:
+        cached = (fingerprint, cached[1])
+        level._options = cached
+    cached[1][key] = options
+    return options
+
+
+def _build_room_options(level: Level, room: Room) -> RoomOptions:
+    x, y = room.coordinates
+    is_exit = (x, y) == tuple(level.exit_coords)
+    lines = []
+    options_map: Dict[str, tuple] = {}
+    targets: Dict[str, Tuple[int, int]] = {}
+    move_errors: Dict[str, str] = {}
+
+    # Las opciones se derivan de room.connections (direcciones cardinales)
+    for direction, target_coords in room.connections.items():
+        number = str(len(options_map) + 1)
+        lines.append(f"{number}) Ir al {direction_name(direction)}")
+        options_map[number] = (direction, target_coords)
+
+        new_x, new_y = target_coords
+        if not (0 <= new_x < level.width and 0 <= new_y < level.height):
+            move_errors[direction] = (
+                f"Coordenadas ({new_x}, {new_y}) fuera de los límites del nivel "
+                f"({level.width}x{level.height})."
+            )
+        elif get_room_at_coords(level, new_x, new_y) is None:
+            move_errors[direction] = (
+                f"No hay habitación en las coordenadas ({new_x}, {new_y})."
+            )
+        else:
+            targets[direction] = (new_x, new_y)
+
+    if is_exit:
+        number = str(len(options_map) + 1)
+        lines.append(f"{number}) ¡INTENTAR SALIR DEL NIVEL!")
+        options_map[number] = ("exit", None)
+
+    number = str(len(options_map) + 1)
+    lines.append(f"{number}) Guardar partida")
+    options_map[number] = ("save", None)
+
+    return RoomOptions(
+        room=room,
+        is_exit=is_exit,
+        lines=tuple(lines),
+        options_map=options_map,
+        targets=targets,
+        move_errors=move_errors,
+    )
@@ -5,6 +5,8 @@ import os
 from typing import Dict, Any
 from aimaze.player import Player
 from aimaze.dungeon import Dungeon, PlayerLocation
+from aimaze.game_state import GameState
+from aimaze.schemas import load_model
 
 
 def save_game(game_state: Dict[str, Any], filename: str = 'savegame.json') -> None:
@@ -12,25 +14,13 @@ def save_game(game_state: Dict[str, Any], filename: str = 'savegame.json') -> No
     Saves the current game state to a JSON file.
 
     Args:
-        game_state: The current game state dictionary
+        game_state: The current GameState (a flat dict is converted first)
         filename: Name of the file to save to (default: 'savegame.json')
     """
-    # Preparar el estado para serialización
-    serializable_state = {}
-
-    for key, value in game_state.items():
-        if hasattr(value, 'model_dump'):
-            # Es un modelo Pydantic, convertir a dict
-            serializable_state[key] = value.model_dump()
-        elif key.startswith('location_description_'):
-            # Descripción de ubicación, también puede ser un modelo Pydantic
-            if hasattr(value, 'model_dump'):
-                serializable_state[key] = value.model_dump()
-            else:
-                serializable_state[key] = value
-        else:
-            # Tipos básicos (str, int, bool, dict, list)
-            serializable_state[key] = value
+    # Formato estructurado de GameState: sin recorrer ni filtrar claves sueltas
+    if not isinstance(game_state, GameState):
+        game_state = GameState.from_mapping(game_state)
+    serializable_state = game_state.to_dict()
 
     # Guardar en archivo JSON
     try:
@@ -41,7 +31,7 @@ def save_game(game_state: Dict[str, Any], filename: str = 'savegame.json') -> No
         raise Exception(f"Error al guardar partida: {e}")
 
 
-def load_game(filename: str = 'savegame.json') -> Dict[str, Any]:
+def load_game(filename: str = 'savegame.json') -> GameState:
     """
     Loads game state from a JSON file.
 
@@ -49,7 +39,7 @@ def load_game(filename: str = 'savegame.json') -> Dict[str, Any]:
         filename: Name of the file to load from (default: 'savegame.json')
 
     Returns:
-        Dict containing the loaded game state
+        GameState with the loaded game (also usable as a dict)
 
     Raises:
         FileNotFoundError: If the save file doesn't exist
@@ -62,26 +52,10 @@ def load_game(filename: str = 'savegame.json') -> Dict[str, Any]:
         with open(filename, 'r', encoding='utf-8') as f:
             raw_state = json.load(f)
 
-        # Reconstruir objetos Pydantic desde los dicts
-        game_state = {}
-
-        for key, value in raw_state.items():
-            if key == 'player' and isinstance(value, dict):
-                # Reconstruir Player
-                game_state[key] = Player(**value)
-            elif key == 'player_location' and isinstance(value, dict):
-                # Reconstruir PlayerLocation
-                game_state[key] = PlayerLocation(**value)
-            elif key == 'dungeon' and isinstance(value, dict):
-                # Reconstruir Dungeon
-                game_state[key] = Dungeon(**value)
-            elif key.startswith('location_description_') and isinstance(value, dict):
-                # Reconstruir LocationDescription
-                from aimaze.ai_connector import LocationDescription
-                game_state[key] = LocationDescription(**value)
-            else:
-                # Tipos básicos
-                game_state[key] = value
+        if "format" in raw_state:
+            game_state = GameState.from_dict(raw_state)
+        else:
+            game_state = _load_flat_game_state(raw_state)
 
         print(f"Partida cargada desde {filename}")
         return game_state
@@ -92,6 +66,35 @@ def load_game(filename: str = 'savegame.json') -> Dict[str, Any]:
         raise Exception(f"Error al cargar partida: {e}")
 
 
+def _load_flat_game_state(raw_state: Dict[str, Any]) -> GameState:
+    """Carga una partida guardada con el antiguo game_state plano."""
+    game_state = GameState()
+
+    for key, value in raw_state.items():
+        if key == 'player' and isinstance(value, dict):
+            # Reconstruir Player
+            game_state[key] = load_model(Player, value)
+        elif key == 'player_location' and isinstance(value, dict):
+            # Reconstruir PlayerLocation
+            game_state[key] = load_model(PlayerLocation, value)
+        elif key == 'dungeon' and isinstance(value, dict):
+            # Reconstruir Dungeon; LevelSchema convierte las claves 'x,y' de
+            # las partidas antiguas a room_key y json deja las nuevas como texto
+            game_state[key] = load_model(Dungeon, value)
+        elif key == 'current_options_map':
+            # Se recalcula al mostrar el escenario
+            continue
+        elif key.startswith('location_description_') and isinstance(value, dict):
+            # Reconstruir LocationDescription
+            from aimaze.ai_connector import LocationDescription
+            game_state[key] = LocationDescription(**value)
+        else:
+            # Tipos básicos
+            game_state[key] = value
+
+    return game_state
+
+
 def save_exists(filename: str = 'savegame.json') -> bool:
     """
     Check if a save file exists.
@@ -0,0 +1,295 @@
+# src/aimaze/schemas.py
+
+"""
+Esquemas pydantic de los modelos del juego, usados solo en las fronteras.
+
+En ejecución el juego trabaja con las dataclasses de aimaze.dungeon,
+aimaze.player y aimaze.events. Estos esquemas validan lo que entra desde fuera
+(partidas guardadas, cachés en disco, la futura API) y los conversores de este
+módulo pasan de un mundo al otro:
+
+- dump_model(obj) / dump_model_json(obj): tipo de ejecución -> dict / JSON, sin
+  pasar por pydantic.
+- load_model(cls, data) / load_model_json(cls, text): valida con el esquema y
+  devuelve el tipo de ejecución cls.
+- to_schema(obj) / from_schema(schema): conversión directa entre ambos tipos.
+"""
+
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel, Field, field_validator
+
+from aimaze.dungeon import (
+    Dungeon,
+    Level,
+    PlayerLocation,
+    Room,
+    upgrade_legacy_room_keys,
+)
+from aimaze.events import EventType, GameEvent
+from aimaze.player import Player
+
+
+class PlayerLocationSchema(BaseModel):
+    level: int
+    x: int
+    y: int
+
+
+class RoomSchema(BaseModel):
+    id: str
+    coordinates: Tuple[int, int]
+    connections: Dict[str, Tuple[int, int]] = Field(
+        default_factory=dict,
+        description=(
+            "Dictionary where keys are directions ('north', 'south', 'east', "
+            "'west') and values are coordinates (x, y) of adjacent rooms within "
+            "the same level"
+        ),
+    )
+
+
+class ChunkedLevelSchema(BaseModel):
+    seed: int
+    chunk_size: int
+
+
+class LevelSchema(BaseModel):
+    id: int
+    width: int
+    height: int
+    start_coords: Tuple[int, int]
+    exit_coords: Tuple[int, int]
+    rooms: Dict[int, RoomSchema] = Field(
+        default_factory=dict,
+        description=(
+            "Dictionary where key is room_key(x, y) and value is the Room object"
+        ),
+    )
+    chunked: Optional[ChunkedLevelSchema] = Field(
+        default=None,
+        description=(
+            "Parámetros de los niveles generados por chunks; sus salas no se "
+            "guardan, se regeneran bajo demanda al cargar"
+        ),
+    )
+
+    @field_validator("rooms", mode="before")
+    @classmethod
+    def _upgrade_legacy_keys(cls, rooms: Any) -> Any:
+        # Partidas, cachés y reservas antiguas usan claves 'x,y'
+        if type(rooms) is not dict:
+            return rooms
+        return upgrade_legacy_room_keys(rooms)
+
+
+class DungeonSchema(BaseModel):
+    total_levels: int
+    current_level: int = 1
+    levels: Dict[int, LevelSchema] = Field(default_factory=dict)
+    seed: Optional[int] = None
+
+
+class PlayerSchema(BaseModel):
+    strength: int = 10
+    dexterity: int = 10
+    intelligence: int = 10
+    perception: int = 10
+    health: int = 100
+    max_health: int = 100
+    experience: int = 0
+    inventory: List[str] = Field(default_factory=list)
+
+
+class GameEventSchema(BaseModel):
+    event_type: EventType
+    description: str
+    ascii_art: Optional[str] = Field(
+        default=None,
+        description=(
+            "Arte ASCII para el evento (onomatopeyas, dibujos, texto misterioso)"
+        ),
+    )
+    puzzle_solution: Optional[str] = Field(
+        default=None, description="Solución esperada para eventos de rompecabezas"
+    )
+    alternative_solutions: List[str] = Field(
+        default_factory=list, description="Soluciones alternativas válidas"
+    )
+    success_text: str
+    failure_text: str
+    xp_reward: int = 0
+    item_reward: Optional[str] = Field(
+        default=None, description="ID del objeto otorgado en caso de éxito"
+    )
+    clue_reward: Optional[str] = Field(
+        default=None, description="Texto de pista otorgado en caso de éxito"
+    )
+    damage_on_failure: int = 0
+    event_size: int = Field(1, description="Número de habitaciones clave involucradas")
+    related_locations: List[str] = Field(
+        default_factory=list,
+        description="Otras coordenadas de habitaciones involucradas",
+    )
+
+
+# Tipo de ejecución -> dict con la forma de su esquema (sin validar)
+
+def _room_to_dict(room: Room) -> Dict[str, Any]:
+    return {
+        "id": room.id,
+        "coordinates": room.coordinates,
+        "connections": dict(room.connections),
+    }
+
+
+def _level_to_dict(level: Level) -> Dict[str, Any]:
+    from aimaze.generation.chunked import ChunkedGrid
+
+    grid = level._grid
+    if isinstance(grid, ChunkedGrid):
+        # Las salas de los chunks generados dependen solo de la semilla: se
+        # guardan los parámetros para que las costuras sigan llevando a algún sitio
+        return {
+            "id": level.id,
+            "width": level.width,
+            "height": level.height,
+            "start_coords": level.start_coords,
+            "exit_coords": level.exit_coords,
+            "rooms": {},
+            "chunked": {"seed": grid.seed, "chunk_size": grid.chunk_size},
+        }
+    return {
+        "id": level.id,
+        "width": level.width,
+        "height": level.height,
+        "start_coords": level.start_coords,
+        "exit_coords": level.exit_coords,
+        # Las vistas compactas (GridRooms) resuelven items() contra la rejilla
+        "rooms": {key: _room_to_dict(room) for key, room in level.rooms.items()},
+    }
+
+
+def _dungeon_to_dict(dungeon: Dungeon) -> Dict[str, Any]:
+    return {
+        "total_levels": dungeon.total_levels,
+        "current_level": dungeon.current_level,
+        "levels": {
+            level_id: _level_to_dict(level)
+            for level_id, level in dungeon.levels.items()
+        },
+        "seed": dungeon.seed,
+    }
+
+
+def _slots_to_dict(obj: Any) -> Dict[str, Any]:
+    data = {name: getattr(obj, name) for name in obj.__slots__}
+    for name, value in data.items():
+        if isinstance(value, list):
+            data[name] = list(value)
+        elif isinstance(value, EventType):
+            data[name] = value.value
+    return data
+
+
+# Esquema validado -> tipo de ejecución
+
+def _room_from_schema(schema: RoomSchema) -> Room:
+    return Room(
+        id=schema.id,
+        coordinates=schema.coordinates,
+        connections=dict(schema.connections),
+    )
+
+
+def _level_from_schema(schema: LevelSchema) -> Level:
+    if schema.chunked is not None:
+        from aimaze.generation.chunked import create_chunked_level
+
+        return create_chunked_level(
+            schema.id,
+            schema.width,
+            schema.height,
+            schema.chunked.seed,
+            schema.chunked.chunk_size,
+            start_coords=schema.start_coords,
+            exit_coords=schema.exit_coords,
+        )
+    return Level(
+        id=schema.id,
+        width=schema.width,
+        height=schema.height,
+        start_coords=schema.start_coords,
+        exit_coords=schema.exit_coords,
+        rooms={key: _room_from_schema(room) for key, room in schema.rooms.items()},
+    )
+
+
+def _dungeon_from_schema(schema: DungeonSchema) -> Dungeon:
+    return Dungeon(
+        total_levels=schema.total_levels,
+        current_level=schema.current_level,
+        levels={
+            level_id: _level_from_schema(level)
+            for level_id, level in schema.levels.items()
+        },
+        seed=schema.seed,
+    )
+
+
+def _fields_from_schema(cls):
+    def convert(schema: BaseModel):
+        return cls(**{name: getattr(schema, name) for name in cls.__slots__})
+    return convert
+
+
+# Tipo de ejecución -> (esquema, volcado a dict, conversión desde esquema)
+_CONVERTERS = {
+    Room: (RoomSchema, _room_to_dict, _room_from_schema),
+    Level: (LevelSchema, _level_to_dict, _level_from_schema),
+    Dungeon: (DungeonSchema, _dungeon_to_dict, _dungeon_from_schema),
+    PlayerLocation: (
+        PlayerLocationSchema, _slots_to_dict, _fields_from_schema(PlayerLocation)
+    ),
+    Player: (PlayerSchema, _slots_to_dict, _fields_from_schema(Player)),
+    GameEvent: (GameEventSchema, _slots_to_dict, _fields_from_schema(GameEvent)),
+}
+_RUNTIME_TYPES = {schema: runtime for runtime, (schema, _, _) in _CONVERTERS.items()}
+
+
+def is_runtime_model(obj: Any) -> bool:
+    """Indica si obj es uno de los tipos de ejecución con esquema en este módulo."""
+    return type(obj) in _CONVERTERS
+
+
+def dump_model(obj: Any) -> Dict[str, Any]:
+    """Vuelca un tipo de ejecución a un dict serializable con json."""
+    return _CONVERTERS[type(obj)][1](obj)
+
+
+def dump_model_json(obj: Any) -> str:
+    return json.dumps(dump_model(obj), ensure_ascii=False)
+
+
+def load_model(cls: type, data: Dict[str, Any]) -> Any:
+    """Valida data con el esquema de cls y devuelve una instancia de cls."""
+    schema_cls, _, from_schema_fn = _CONVERTERS[cls]
+    return from_schema_fn(schema_cls.model_validate(data))
+
+
+def load_model_json(cls: type, text: str) -> Any:
+    schema_cls, _, from_schema_fn = _CONVERTERS[cls]
+    return from_schema_fn(schema_cls.model_validate_json(text))
+
+
+def to_schema(obj: Any) -> BaseModel:
+    """Convierte un tipo de ejecución en su esquema pydantic (validado)."""
+    schema_cls, to_dict, _ = _CONVERTERS[type(obj)]
+    return schema_cls.model_validate(to_dict(obj))
+
+
+def from_schema(schema: BaseModel) -> Any:
+    """Convierte un esquema pydantic en su tipo de ejecución."""
+    runtime_cls = _RUNTIME_TYPES[type(schema)]
+    return _CONVERTERS[runtime_cls][2](schema)
@@ -7,7 +7,7 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from aimaze.actions import process_player_action, validate_player_input, get_action_description
-from aimaze.dungeon import PlayerLocation, Dungeon, Level, Room
+from aimaze.dungeon import PlayerLocation, Dungeon, Level, Room, room_key
 from aimaze.player import Player
 
 
@@ -119,7 +119,7 @@ class TestActionsCoordinates(unittest.TestCase):
     def test_process_player_action_coordinates_out_of_bounds(self, mock_print):
         """Test que process_player_action maneja coordenadas fuera de límites"""
         # Modificar las conexiones para apuntar fuera de límites
-        room_start = self.mock_game_state["dungeon"].levels[1].rooms["0,0"]
+        room_start = self.mock_game_state["dungeon"].levels[1].rooms[room_key(0, 0)]
         room_start.connections["north"] = (0, -1)  # Fuera de límites
         
         # Añadir la opción al mapa
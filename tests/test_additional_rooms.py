@@ -0,0 +1,82 @@
+import unittest
+import random
+import sys
+import os
+
+# Añadir el directorio src al path para los imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from aimaze.dungeon import room_key
+from aimaze.generation.dungeon_generator import (
+    add_connected_additional_rooms,
+    generate_advanced_main_path,
+)
+
+
+def reachable_from(rooms, start):
+    """BFS sobre las conexiones de las salas desde start."""
+    visited = {start}
+    queue = [start]
+    while queue:
+        x, y = queue.pop()
+        for target in rooms[room_key(x, y)].connections.values():
+            if target not in visited:
+                visited.add(target)
+                queue.append(target)
+    return visited
+
+
+class TestAdditionalRooms(unittest.TestCase):
+    """
+    Tests para el crecimiento por frontera de add_connected_additional_rooms.
+    """
+
+    def setUp(self):
+        random.seed(3)
+        self.width, self.height = 12, 9
+        self.path = generate_advanced_main_path((0, 0), (11, 8), 12, 9, 30)
+
+    def test_fills_every_cell_with_default_knobs(self):
+        """Con los valores por defecto todas las celdas reciben una sala"""
+        rooms = add_connected_additional_rooms(self.path, self.width, self.height)
+        self.assertEqual(len(rooms), self.width * self.height)
+        self.assertEqual(len(reachable_from(rooms, self.path[0])), len(rooms))
+
+    def test_connections_are_bidirectional(self):
+        """Las conexiones parcheadas en las vecinas son recíprocas"""
+        rooms = add_connected_additional_rooms(
+            self.path, self.width, self.height, loop_density=0.5
+        )
+        for room in rooms.values():
+            for target in room.connections.values():
+                target_room = rooms[room_key(*target)]
+                self.assertIn(room.coordinates, target_room.connections.values())
+
+    def test_zero_loop_density_builds_tree_of_additional_rooms(self):
+        """Con loop_density=0 cada sala adicional tiene un único enlace al crearse"""
+        rooms = add_connected_additional_rooms(
+            self.path, self.width, self.height, loop_density=0.0
+        )
+        edges = sum(len(room.connections) for room in rooms.values()) // 2
+        # Un grafo conexo sin ciclos tiene exactamente n - 1 aristas
+        self.assertEqual(edges, len(rooms) - 1)
+
+    def test_branching_factor_limits_children(self):
+        """Un branching_factor bajo deja salas conectadas pero menos densas"""
+        rooms = add_connected_additional_rooms(
+            self.path, self.width, self.height, branching_factor=1
+        )
+        self.assertLessEqual(len(rooms), self.width * self.height)
+        self.assertEqual(len(reachable_from(rooms, self.path[0])), len(rooms))
+        for coords in self.path:
+            self.assertIn(room_key(*coords), rooms)
+
+    def test_main_path_rooms_keep_their_ids(self):
+        """Las salas del camino principal conservan sus identificadores ordenados"""
+        rooms = add_connected_additional_rooms(self.path, self.width, self.height)
+        for i, (x, y) in enumerate(self.path):
+            self.assertEqual(rooms[room_key(x, y)].id, f"main_path_{i + 1}")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+
+# Añadir el directorio src al path para los imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from aimaze.generation.dungeon_generator import generate_dungeon_layout
+from aimaze.generation.layout_cache import LayoutCache
+from aimaze.level_analysis import get_level_analysis
+
+
+class FakeClock:
+    """Reloj que avanza un paso fijo en cada consulta."""
+
+    def __init__(self, step):
+        self.now = 0.0
+        self.step = step
+
+    def __call__(self):
+        self.now += self.step
+        return self.now
+
+
+class TestAnytimeGeneration(unittest.TestCase):
+    """
+    Tests para generate_dungeon_layout con presupuesto de tiempo (deadline_ms).
+    """
+
+    def test_generous_budget_matches_unbounded_layout(self):
+        bounded = generate_dungeon_layout(seed=12, width=20, height=15,
+                                          cache=LayoutCache(), deadline_ms=10_000)
+        unbounded = generate_dungeon_layout(seed=12, width=20, height=15,
+                                            cache=LayoutCache())
+
+        quality = bounded._quality
+        self.assertTrue(quality.complete)
+        self.assertEqual(quality.phase, "complete")
+        self.assertEqual(bounded.levels[1].rooms, unbounded.levels[1].rooms)
+        self.assertGreaterEqual(quality.path_fidelity, 0.9)
+        self.assertIsNone(unbounded._quality)
+
+    def test_exhausted_budget_returns_quick_valid_layout(self):
+        cache = LayoutCache()
+        dungeon = generate_dungeon_layout(seed=5, width=30, height=30, cache=cache,
+                                          deadline_ms=0)
+        level = dungeon.levels[1]
+        quality = dungeon._quality
+
+        self.assertEqual(quality.phase, "quick")
+        self.assertFalse(quality.complete)
+        self.assertEqual(quality.room_count, quality.path_length)
+        self.assertTrue(get_level_analysis(level).exit_reachable)
+        # Los layouts incompletos no se cachean
+        self.assertEqual(len(cache), 0)
+
+    def test_budget_expiring_during_refinement(self):
+        # Cada consulta al reloj avanza 1 ms: el plazo de 4 ms vence a mitad
+        clock = FakeClock(0.001)
+        with patch('aimaze.generation.dungeon_generator.time.perf_counter', clock):
+            dungeon = generate_dungeon_layout(seed=9, width=60, height=60,
+                                              cache=LayoutCache(), deadline_ms=4)
+        quality = dungeon._quality
+        self.assertIn(quality.phase, ("main_path", "branching"))
+        self.assertLess(quality.coverage, 1.0)
+        self.assertTrue(get_level_analysis(dungeon.levels[1]).exit_reachable)
+
+    def test_large_grid_stays_close_to_the_deadline(self):
+        """La creación del nivel y la medida de calidad caben en el presupuesto"""
+        dungeon = generate_dungeon_layout(seed=4, width=1000, height=1000,
+                                          cache=LayoutCache(), deadline_ms=50)
+        quality = dungeon._quality
+        self.assertFalse(quality.complete)
+        self.assertLess(quality.elapsed_ms, 50 * 1.5)
+        self.assertEqual(quality.room_count, len(dungeon.levels[1].rooms))
+
+    def test_cache_hit_reports_complete_quality(self):
+        cache = LayoutCache()
+        first = generate_dungeon_layout(seed=3, width=12, height=9, cache=cache,
+                                        deadline_ms=10_000)
+        again = generate_dungeon_layout(seed=3, width=12, height=9, cache=cache,
+                                        deadline_ms=0)
+        self.assertEqual(cache.hits, 1)
+        self.assertTrue(again._quality.complete)
+        self.assertEqual(again._quality.target_length, first._quality.target_length)
+        self.assertEqual(again._quality.path_length, first._quality.path_length)
+
+    def test_deadline_requires_classic_generator(self):
+        with self.assertRaises(ValueError):
+            generate_dungeon_layout(seed=1, width=5, height=5, cache=LayoutCache(),
+                                    algorithm="prim", deadline_ms=10)
+
+
+if __name__ == '__main__':
+    unittest.main()
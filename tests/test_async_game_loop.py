@@ -0,0 +1,329 @@
+import unittest
+import asyncio
+import sys
+import os
+import threading
+from unittest.mock import AsyncMock, MagicMock, patch
+
+# Añadir el directorio src y el de benchmarks al path para los imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+from bench_llm_client import FakeOpenAIServer
+from langchain_openai import ChatOpenAI
+
+from aimaze import main
+from aimaze.ai.client import LLMRegistry, LLMSettings
+from aimaze.ai.description_cache import DescriptionCache
+from aimaze.ai.descriptions import LocationDescription, agenerate_location_description
+from aimaze.ai.level_descriptions import LevelDescriptionBatch
+from aimaze.ai.prefetch import AsyncDescriptionPrefetcher, PrefetchRequest
+from aimaze.display import aprepare_location_description
+from aimaze.dungeon import PlayerLocation
+from aimaze.events import GameEvent
+from aimaze.events_generator import agenerate_random_event
+from aimaze.game_state import GameState, get_location_description
+from aimaze.generation.dungeon_generator import generate_dungeon_layout
+
+
+def _request(name, priority):
+    return PrefetchRequest(key=name, priority=(priority,), context=name)
+
+
+@patch.dict(os.environ, {"OPENAI_API_KEY": "test"})
+@patch('aimaze.ai.client._create_callbacks', return_value=[])
+@patch('builtins.print')
+class TestAsyncDescriptions(unittest.TestCase):
+    """
+    Tests para la API asíncrona de descripciones (ainvoke).
+    """
+
+    def setUp(self):
+        self.server = FakeOpenAIServer()
+        self.registry = LLMRegistry(LLMSettings(base_url=self.server.base_url))
+        self.cache = DescriptionCache()
+        self.patches = [
+            patch('aimaze.ai.descriptions.get_llm_registry',
+                  return_value=self.registry),
+            patch('aimaze.ai.descriptions.get_description_cache',
+                  return_value=self.cache),
+        ]
+        for active in self.patches:
+            active.start()
+
+    def tearDown(self):
+        for active in self.patches:
+            active.stop()
+        self.registry.close()
+        self.server.close()
+        self.cache.close()
+
+    def test_concurrent_calls_and_persistent_cache(self, mock_print, mock_callbacks):
+        async def scenario():
+            results = await asyncio.gather(*(
+                agenerate_location_description(
+                    f"Level 1 at ({x},0)", cache_location=(3, 1, x, 0))
+                for x in range(4)
+            ))
+            again = await agenerate_location_description(
+                "Level 1 at (0,0)", cache_location=(3, 1, 0, 0))
+            await self.registry.aclose()
+            return results, again
+
+        results, again = asyncio.run(scenario())
+        self.assertEqual(
+            {result.description for result in results},
+            {"Una sala húmeda y silenciosa."},
+        )
+        self.assertEqual(again, results[0])
+        self.assertEqual(self.server.requests, 4)
+        self.assertEqual(self.cache.stats()["hits"], 1)
+
+    def test_fallback_is_not_cached(self, mock_print, mock_callbacks):
+        with patch.object(ChatOpenAI, 'ainvoke', side_effect=Exception("caído")):
+            result = asyncio.run(agenerate_location_description(
+                "Level 2 at (1,1)", cache_location=(3, 2, 1, 1)))
+        self.assertIn("Level 2 at (1,1)", result.description)
+        self.assertEqual(len(self.cache), 0)
+
+    def test_async_random_event(self, mock_print, mock_callbacks):
+        with patch('aimaze.events_generator.random.random', return_value=0.5):
+            event = asyncio.run(agenerate_random_event("Level 1 at (0,0)"))
+        self.assertIsInstance(event, GameEvent)
+
+
+class TestAsyncDescriptionPrefetcher(unittest.TestCase):
+    """
+    Tests para el prefetcher sobre tareas asyncio.
+    """
+
+    def test_priority_cancellation_and_take(self):
+        calls = []
+
+        async def scenario():
+            gate = asyncio.Event()
+
+            async def generator(context, cache_location=None):
+                calls.append(context)
+                await gate.wait()
+                return LocationDescription(description=context)
+
+            prefetcher = AsyncDescriptionPrefetcher(
+                max_concurrency=1, generator=generator)
+            prefetcher.prefetch([_request("a", 0)])
+            await asyncio.sleep(0)
+            prefetcher.prefetch([
+                _request("a", 0), _request("b", 2), _request("c", 1),
+                _request("d", 3),
+            ])
+            # Nueva ronda: "d" deja de interesar antes de empezar
+            prefetcher.prefetch([_request("a", 0), _request("b", 2), _request("c", 1)])
+            gate.set()
+            taken = [await prefetcher.take(name) for name in "acb"]
+            missing = await prefetcher.take("d")
+            await prefetcher.stop()
+            return taken, missing, prefetcher.stats()
+
+        taken, missing, stats = asyncio.run(scenario())
+        self.assertEqual([result.description for result in taken], ["a", "c", "b"])
+        self.assertIsNone(missing)
+        self.assertEqual(calls, ["a", "c", "b"])
+        self.assertEqual((stats["cancelled"], stats["hits"]), (1, 3))
+
+    def test_stop_cancels_running_generations(self):
+        async def scenario():
+            started = asyncio.Event()
+
+            async def generator(context, cache_location=None):
+                started.set()
+                await asyncio.sleep(10)
+
+            prefetcher = AsyncDescriptionPrefetcher(generator=generator)
+            prefetcher.prefetch([_request("a", 0)])
+            await started.wait()
+            await asyncio.wait_for(prefetcher.stop(), 1)
+            prefetcher.prefetch([_request("b", 0)])
+            return await prefetcher.take("b")
+
+        self.assertIsNone(asyncio.run(scenario()))
+
+
+class TestAsyncGameLoop(unittest.TestCase):
+    """
+    Tests del bucle de juego asyncio y de su envoltorio síncrono.
+    """
+
+    def test_run_blocking_uses_a_worker_thread(self):
+        async def scenario():
+            ticks = 0
+            done = threading.Event()
+
+            def blocking():
+                done.wait(5)
+                return threading.current_thread().name
+
+            async def ticker():
+                nonlocal ticks
+                while not done.is_set():
+                    ticks += 1
+                    if ticks == 3:
+                        done.set()
+                    await asyncio.sleep(0.01)
+
+            name, _ = await asyncio.gather(main.run_blocking(blocking), ticker())
+            with self.assertRaises(ValueError):
+                await main.run_blocking(int, "no es un número")
+            return name, ticks
+
+        name, ticks = asyncio.run(scenario())
+        self.assertEqual(name, "aimaze-blocking")
+        self.assertGreaterEqual(ticks, 3)
+
+    @patch('builtins.print')
+    def test_aprepare_location_description(self, mock_print):
+        dungeon = generate_dungeon_layout(seed=4, width=5, height=5)
+        x, y = dungeon.levels[1].start_coords
+        game_state = GameState(
+            dungeon=dungeon, player_location=PlayerLocation(level=1, x=x, y=y))
+        description = LocationDescription(description="Niebla espesa.")
+        with patch('aimaze.display.agenerate_location_description',
+                   new=AsyncMock(return_value=description)) as mock_generate:
+            asyncio.run(aprepare_location_description(game_state))
+            asyncio.run(aprepare_location_description(game_state))
+        mock_generate.assert_awaited_once_with(
+            f"Level 1 at ({x},{y})", cache_location=(4, 1, x, y))
+        self.assertEqual(
+            get_location_description(game_state, game_state.player_location),
+            description,
+        )
+
+    @patch.dict(os.environ, {
+        "AIMAZE_PREFETCH_WORKERS": "2", "AIMAZE_LEVEL_BATCH_SIZE": "0",
+        "AIMAZE_STREAM_DESCRIPTIONS": "0"})
+    @patch('builtins.print')
+    def test_game_loop_turns(self, mock_print):
+        dungeon = generate_dungeon_layout(seed=9, width=5, height=5)
+        pool = MagicMock()
+        pool.take.return_value = dungeon
+        inputs = iter(["1", "opción inválida"])
+
+        def fake_input(game_state):
+            choice = next(inputs, None)
+            if choice is None:
+                game_state["game_over"] = True
+                return ""
+            return choice
+
+        async def fake_describe(context, cache_location=None):
+            return LocationDescription(description=f"Descripción de {context}")
+
+        with patch('aimaze.main.get_dungeon_pool', return_value=pool), \
+                patch('aimaze.main.load_config'), \
+                patch('aimaze.game_state.load_config'), \
+                patch('aimaze.main.get_player_input', side_effect=fake_input), \
+                patch('aimaze.main.get_llm_registry') as mock_registry, \
+                patch('aimaze.display.agenerate_location_description',
+                      side_effect=fake_describe) as mock_generate, \
+                patch('aimaze.ai.prefetch.agenerate_location_description',
+                      side_effect=fake_describe) as mock_prefetch:
+            mock_registry.return_value.aclose = AsyncMock()
+            main.game_loop()
+
+        pool.start.assert_called_once()
+        pool.stop.assert_called_once()
+        mock_registry.return_value.aclose.assert_awaited_once()
+        # Solo la sala inicial se describe en primer plano; la vecina a la que
+        # se movió el jugador ya estaba preparada por el prefetcher
+        mock_generate.assert_called_once()
+        self.assertGreaterEqual(mock_prefetch.call_count, 1)
+
+    @patch.dict(os.environ, {
+        "AIMAZE_PREFETCH_WORKERS": "2", "AIMAZE_LEVEL_BATCH_SIZE": "25",
+        "AIMAZE_STREAM_DESCRIPTIONS": "0"})
+    @patch('builtins.print')
+    def test_game_loop_describes_the_level_in_a_batch(self, mock_print):
+        dungeon = generate_dungeon_layout(seed=9, width=5, height=5)
+        level = dungeon.levels[1]
+        start = tuple(level.start_coords)
+        pool = MagicMock()
+        pool.take.return_value = dungeon
+        inputs = iter(["1"])
+        batch_calls = []
+
+        def fake_input(game_state):
+            choice = next(inputs, None)
+            if choice is None:
+                game_state["game_over"] = True
+                return ""
+            return choice
+
+        async def fake_describe(context, cache_location=None):
+            await asyncio.sleep(0)
+            return LocationDescription(description=f"Suelta {context}")
+
+        async def fake_batch(batch_level, rooms, seed=None, batch_size=25):
+            batch_calls.append((rooms, seed, batch_size))
+            return LevelDescriptionBatch(descriptions={
+                coords: LocationDescription(description=f"Lote {coords}")
+                for coords in rooms
+            })
+
+        with patch('aimaze.main.get_dungeon_pool', return_value=pool), \
+                patch('aimaze.main.load_config'), \
+                patch('aimaze.game_state.load_config'), \
+                patch('aimaze.main.get_player_input', side_effect=fake_input), \
+                patch('aimaze.main.get_llm_registry') as mock_registry, \
+                patch('aimaze.main.agenerate_level_descriptions',
+                      side_effect=fake_batch), \
+                patch('aimaze.main.run_blocking',
+                      side_effect=self._run_inline), \
+                patch('aimaze.display.agenerate_location_description',
+                      side_effect=fake_describe) as mock_generate, \
+                patch('aimaze.ai.prefetch.agenerate_location_description',
+                      side_effect=fake_describe) as mock_prefetch:
+            mock_registry.return_value.aclose = AsyncMock()
+            main.game_loop()
+
+        (rooms, seed, batch_size), = batch_calls
+        self.assertNotIn(start, rooms)
+        self.assertEqual(len(rooms), len(level.rooms) - 1)
+        self.assertEqual((seed, batch_size), (9, 25))
+        # La sala inicial se describe sola; la siguiente ya venía del lote
+        mock_generate.assert_called_once()
+        mock_prefetch.assert_not_called()
+
+    def test_level_batch_is_limited_to_nearby_rooms(self):
+        dungeon = generate_dungeon_layout(seed=5, width=60, height=60)
+        level = dungeon.levels[1]
+        x, y = level.start_coords
+        game_state = GameState(
+            dungeon=dungeon, player_location=PlayerLocation(level=1, x=x, y=y))
+        batch = AsyncMock(return_value=LevelDescriptionBatch())
+
+        async def scenario():
+            level_batches = {}
+            main._start_level_batch(game_state, level_batches, 25)
+            await level_batches[1]
+
+        with patch('aimaze.main.agenerate_level_descriptions', new=batch):
+            asyncio.run(scenario())
+        rooms = batch.await_args.args[1]
+        self.assertTrue(rooms)
+        self.assertNotIn((x, y), rooms)
+        self.assertLess(len(rooms), len(level.rooms))
+        for rx, ry in rooms:
+            self.assertLessEqual(abs(rx - x) + abs(ry - y), main.LEVEL_BATCH_RADIUS)
+        # De la sala más cercana a la más lejana
+        distances = [abs(rx - x) + abs(ry - y) for rx, ry in rooms]
+        self.assertEqual(distances, sorted(distances))
+
+    @staticmethod
+    async def _run_inline(func, *args):
+        # Deja correr al lote antes de cada entrada del jugador
+        for _ in range(3):
+            await asyncio.sleep(0)
+        return func(*args)
+
+
+if __name__ == '__main__':
+    unittest.main()
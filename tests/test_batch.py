@@ -0,0 +1,62 @@
+import unittest
+import sys
+import os
+
+import numpy as np
+
+# Añadir el directorio src al path para los imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from aimaze.dungeon import Dungeon, get_room_at_coords
+from aimaze.generation.batch import generate_dungeon_batch
+from aimaze.level_grid import EAST, WEST
+
+
+class TestDungeonBatch(unittest.TestCase):
+    """
+    Tests para la generación vectorizada de lotes de layouts.
+    """
+
+    def setUp(self):
+        self.batch = generate_dungeon_batch(200, 7, 5, seed=12)
+
+    def test_batch_shapes(self):
+        self.assertEqual(len(self.batch), 200)
+        self.assertEqual(self.batch.masks.shape, (200, 5, 7))
+        self.assertEqual(self.batch.starts.shape, (200, 2))
+        self.assertTrue((self.batch.starts != self.batch.exits).any(axis=1).all())
+
+    def test_every_layout_is_a_connected_spanning_tree(self):
+        """Sin bucles cada layout es un árbol: conexo y con celdas - 1 pasos"""
+        self.assertTrue(self.batch.connected().all())
+        edges = np.unpackbits(self.batch.masks[..., None], axis=-1).sum(axis=(1, 2, 3)) // 2
+        self.assertTrue((edges == 7 * 5 - 1).all())
+        self.assertTrue((self.batch.exit_distances() > 0).all())
+
+    def test_loops_add_edges_and_stay_reciprocal(self):
+        batch = generate_dungeon_batch(50, 6, 6, seed=1, loop_density=0.3)
+        self.assertTrue(batch.connected().all())
+        east = (batch.masks[:, :, :-1] & EAST) != 0
+        west = (batch.masks[:, :, 1:] & WEST) != 0
+        self.assertTrue((east == west).all())
+
+    def test_same_seed_is_reproducible(self):
+        again = generate_dungeon_batch(200, 7, 5, seed=12)
+        self.assertTrue(np.array_equal(again.masks, self.batch.masks))
+        self.assertTrue(np.array_equal(again.exits, self.batch.exits))
+
+    def test_to_dungeon_on_demand(self):
+        """Un layout del lote se convierte en un Dungeon jugable"""
+        dungeon = self.batch.to_dungeon(3)
+        self.assertIsInstance(dungeon, Dungeon)
+        level = dungeon.levels[1]
+        self.assertEqual(len(level.rooms), 35)
+        start = get_room_at_coords(level, *level.start_coords)
+        self.assertTrue(start.connections)
+        for target in start.connections.values():
+            neighbor = get_room_at_coords(level, *target)
+            self.assertIn(start.coordinates, neighbor.connections.values())
+
+
+if __name__ == '__main__':
+    unittest.main()
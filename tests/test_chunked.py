@@ -0,0 +1,62 @@
+import unittest
+import sys
+import os
+
+# Añadir el directorio src al path para los imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from aimaze.dungeon import get_room_at_coords
+from aimaze.generation.chunked import create_chunked_level, generate_chunked_dungeon
+
+
+class TestChunkedLevel(unittest.TestCase):
+    """
+    Tests para los niveles generados por chunks bajo demanda.
+    """
+
+    def test_no_chunk_is_generated_until_touched(self):
+        """Crear un nivel enorme no genera ninguna sala"""
+        level = create_chunked_level(1, 100000, 100000, seed=1)
+        self.assertEqual(level._grid.chunks, {})
+        room = get_room_at_coords(level, *level.start_coords)
+        self.assertIsNotNone(room)
+        self.assertEqual(len(level._grid.chunks), 1)
+        self.assertEqual(len(level.rooms), 32 * 32)
+
+    def test_seams_are_consistent_regardless_of_order(self):
+        """Las puertas entre chunks coinciden y no dependen del orden de exploración"""
+        forward = create_chunked_level(1, 40, 30, seed=4, chunk_size=10)
+        backward = create_chunked_level(1, 40, 30, seed=4, chunk_size=10)
+        coords = [(x, y) for y in range(30) for x in range(40)]
+        rooms_forward = {c: get_room_at_coords(forward, *c) for c in coords}
+        rooms_backward = {c: get_room_at_coords(backward, *c) for c in reversed(coords)}
+        for c in coords:
+            self.assertEqual(rooms_forward[c].connections, rooms_backward[c].connections)
+        for room in rooms_forward.values():
+            for target in room.connections.values():
+                self.assertIn(room.coordinates, rooms_forward[target].connections.values())
+
+    def test_whole_level_is_connected(self):
+        """Todas las salas son alcanzables desde el inicio y la salida también"""
+        level = create_chunked_level(1, 37, 23, seed=9, chunk_size=8)
+        visited = {level.start_coords}
+        stack = [level.start_coords]
+        while stack:
+            room = get_room_at_coords(level, *stack.pop())
+            for target in room.connections.values():
+                if target not in visited:
+                    visited.add(target)
+                    stack.append(target)
+        self.assertEqual(len(visited), 37 * 23)
+        self.assertIn(level.exit_coords, visited)
+
+    def test_generate_chunked_dungeon(self):
+        dungeon = generate_chunked_dungeon(500, 500, seed=3)
+        level = dungeon.levels[1]
+        self.assertEqual((level.width, level.height), (500, 500))
+        self.assertNotEqual(level.start_coords, level.exit_coords)
+        self.assertIsNone(get_room_at_coords(level, 500, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
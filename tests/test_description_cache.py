@@ -0,0 +1,203 @@
+import unittest
+import sys
+import os
+import sqlite3
+import tempfile
+import threading
+from unittest.mock import patch
+
+# Añadir el directorio src y el de benchmarks al path para los imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+from bench_llm_client import FakeOpenAIServer
+
+from aimaze.ai import description_cache
+from aimaze.ai.client import LLMRegistry, LLMSettings
+from aimaze.ai.description_cache import DescriptionCache, DescriptionKey
+from aimaze.ai.descriptions import generate_location_description
+from aimaze.dungeon import Dungeon
+from aimaze.generation.dungeon_generator import generate_dungeon_layout
+from aimaze.generation.layout_cache import LayoutCache
+from aimaze.schemas import dump_model, load_model
+
+
+def _key(x=0, y=0, prompt_version="1", model="gpt-4o-mini"):
+    return DescriptionKey(7, 1, x, y, prompt_version, model)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestDescriptionCache(unittest.TestCase):
+    """
+    Tests para la caché persistente de descripciones en SQLite.
+    """
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = DescriptionCache(max_entries=3, ttl_seconds=60, clock=self.clock)
+
+    def tearDown(self):
+        self.cache.close()
+
+    def test_get_put_and_counters(self):
+        self.assertIsNone(self.cache.get(_key()))
+        self.cache.put(_key(), '{"description": "Polvo"}')
+        self.assertEqual(self.cache.get(_key()), '{"description": "Polvo"}')
+        self.assertEqual(self.cache.stats(), {
+            "entries": 1, "hits": 1, "misses": 1,
+            "evictions": 0, "expirations": 0, "errors": 0,
+        })
+
+    def test_prompt_version_and_model_are_part_of_the_key(self):
+        self.cache.put(_key(), "a")
+        self.assertIsNone(self.cache.get(_key(prompt_version="2")))
+        self.assertIsNone(self.cache.get(_key(model="otro")))
+        self.assertIsNone(self.cache.get(_key(x=1)))
+
+    def test_least_recently_used_entry_is_evicted(self):
+        for x in range(3):
+            self.clock.now += 1
+            self.cache.put(_key(x=x), str(x))
+        self.clock.now += 1
+        self.cache.get(_key(x=0))
+        self.clock.now += 1
+        self.cache.put(_key(x=3), "3")
+
+        self.assertEqual(len(self.cache), 3)
+        self.assertIsNone(self.cache.get(_key(x=1)))
+        self.assertEqual(self.cache.get(_key(x=0)), "0")
+        self.assertEqual(self.cache.stats()["evictions"], 1)
+
+    def test_entries_expire(self):
+        self.cache.put(_key(x=0), "0")
+        self.clock.now += 30
+        self.cache.put(_key(x=1), "1")
+        self.clock.now += 31
+        self.assertIsNone(self.cache.get(_key(x=0)))
+        self.assertEqual(self.cache.get(_key(x=1)), "1")
+        self.clock.now += 30
+        self.assertEqual(self.cache.purge_expired(), 1)
+        self.assertEqual(self.cache.stats()["expirations"], 2)
+        self.assertEqual(len(self.cache), 0)
+
+    def test_seeds_beyond_64_bits_are_cached(self):
+        big = DescriptionKey(2**63 + 5, 1, 0, 0, "1", "m")
+        self.assertIsNone(self.cache.get(big))
+        self.cache.put(big, "enorme")
+        self.assertEqual(self.cache.get(big), "enorme")
+        # No colisiona con la semilla que resultaría de truncarla
+        self.assertIsNone(self.cache.get(big._replace(seed=5)))
+        self.assertEqual(self.cache.stats()["errors"], 0)
+
+    def test_old_schema_is_discarded(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "descriptions.sqlite3")
+            conn = sqlite3.connect(path)
+            conn.execute("CREATE TABLE descriptions (seed INTEGER, payload TEXT)")
+            conn.execute("INSERT INTO descriptions VALUES (7, 'vieja')")
+            conn.commit()
+            conn.close()
+            cache = DescriptionCache(path)
+            self.assertEqual(len(cache), 0)
+            cache.put(_key(), "nueva")
+            self.assertEqual(cache.get(_key()), "nueva")
+            cache.close()
+
+    def test_persists_across_instances(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "sub", "descriptions.sqlite3")
+            first = DescriptionCache(path)
+            first.put(_key(), "guardada")
+            first.close()
+            second = DescriptionCache(path)
+            self.assertEqual(second.get(_key()), "guardada")
+            second.close()
+
+    def test_concurrent_writers(self):
+        cache = DescriptionCache(max_entries=1000)
+        threads = [
+            threading.Thread(
+                target=lambda i=i: [cache.put(_key(x=i, y=y), "d") for y in range(20)]
+            )
+            for i in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(cache), 160)
+        cache.close()
+
+    def test_global_cache_can_be_disabled(self):
+        description_cache.reset_description_cache()
+        try:
+            with patch.dict(os.environ, {"AIMAZE_DESCRIPTION_CACHE": "off"}):
+                self.assertIsNone(description_cache.get_description_cache())
+        finally:
+            description_cache.reset_description_cache()
+
+
+@patch.dict(os.environ, {"OPENAI_API_KEY": "test"})
+class TestCachedDescriptions(unittest.TestCase):
+    """
+    Tests de generate_location_description con la caché persistente.
+    """
+
+    @patch('aimaze.ai.client._create_callbacks', return_value=[])
+    @patch('builtins.print')
+    def test_replayed_location_skips_the_llm(self, mock_print, mock_callbacks):
+        server = FakeOpenAIServer()
+        registry = LLMRegistry(LLMSettings(base_url=server.base_url))
+        cache = DescriptionCache()
+        try:
+            with patch('aimaze.ai.descriptions.get_llm_registry',
+                       return_value=registry), \
+                    patch('aimaze.ai.descriptions.get_description_cache',
+                          return_value=cache):
+                first = generate_location_description(
+                    "Level 1 at (2,3)", cache_location=(7, 1, 2, 3))
+                again = generate_location_description(
+                    "Level 1 at (2,3)", cache_location=(7, 1, 2, 3))
+                other_seed = generate_location_description(
+                    "Level 1 at (2,3)", cache_location=(8, 1, 2, 3))
+        finally:
+            registry.close()
+            server.close()
+        self.assertEqual(again, first)
+        self.assertEqual(other_seed, first)
+        self.assertEqual(server.requests, 2)
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(len(cache), 2)
+        cache.close()
+
+    def test_dungeon_seed_is_recorded_and_saved(self):
+        dungeon = generate_dungeon_layout(seed=11, width=4, height=4,
+                                          cache=LayoutCache())
+        self.assertEqual(dungeon.seed, 11)
+        self.assertEqual(load_model(Dungeon, dump_model(dungeon)).seed, 11)
+        cached = generate_dungeon_layout(seed=11, width=4, height=4,
+                                         cache=LayoutCache())
+        self.assertEqual(cached.seed, 11)
+
+    def test_unseeded_dungeon_gets_a_seed(self):
+        layout_cache = LayoutCache()
+        first = generate_dungeon_layout(width=4, height=4, cache=layout_cache)
+        second = generate_dungeon_layout(width=4, height=4, cache=layout_cache)
+        self.assertIsInstance(first.seed, int)
+        self.assertNotEqual(first.seed, second.seed)
+        # La semilla sorteada reproduce el layout, pero no se cachea
+        self.assertEqual(len(layout_cache), 0)
+        replay = generate_dungeon_layout(seed=first.seed, width=4, height=4,
+                                         cache=layout_cache)
+        self.assertEqual(dump_model(replay), dump_model(first))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,7 +6,9 @@ import os
 # Añadir el directorio src al path para los imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from aimaze.dungeon import PlayerLocation, Room, Level, Dungeon, get_room_at_coords
+from aimaze.dungeon import (
+    PlayerLocation, Room, Level, Dungeon, get_room_at_coords, room_key, room_key_coords
+)
 from aimaze.ai_connector import generate_dungeon_layout
 from typing import Dict, Tuple
 
@@ -107,8 +109,8 @@ class TestDungeonCoordinates(unittest.TestCase):
         """Test que Level tiene la estructura correcta"""
         # Crear habitaciones de prueba
         test_rooms = {
-            "0,0": Room(id="0,0", coordinates=(0, 0), connections={'east': (1, 0)}),
-            "1,0": Room(id="1,0", coordinates=(1, 0), connections={'west': (0, 0)})
+            room_key(0, 0): Room(id="0,0", coordinates=(0, 0), connections={'east': (1, 0)}),
+            room_key(1, 0): Room(id="1,0", coordinates=(1, 0), connections={'west': (0, 0)})
         }
         
         level = Level(
@@ -237,12 +239,12 @@ class TestDungeonCoordinates(unittest.TestCase):
                 self.assertIsInstance(current_level, Level)
                 
                 # Verificar consistencia de coordenadas en todas las habitaciones
-                for room_key, room in current_level.rooms.items():
+                for key, room in current_level.rooms.items():
                     self.assertIsInstance(room, Room)
                     
                     # Verificar que la clave coincide con las coordenadas
-                    expected_key = f"{room.coordinates[0]},{room.coordinates[1]}"
-                    self.assertEqual(room_key, expected_key)
+                    expected_key = room_key(*room.coordinates)
+                    self.assertEqual(key, expected_key)
                     
                     # Verificar que get_room_at_coords puede encontrar esta habitación
                     found_room = get_room_at_coords(current_level, room.coordinates[0], room.coordinates[1])
@@ -309,17 +311,17 @@ class TestDungeonCoordinates(unittest.TestCase):
         dungeon = generate_dungeon_layout()
         level = dungeon.levels[1]
         
-        for room_key, room in level.rooms.items():
-            # Verificar que room_key coincide con el formato de coordenadas
-            expected_key = f"{room.coordinates[0]},{room.coordinates[1]}"
-            self.assertEqual(room_key, expected_key)
+        for key, room in level.rooms.items():
+            # Verificar que la clave coincide con room_key de las coordenadas
+            expected_key = room_key(*room.coordinates)
+            self.assertEqual(key, expected_key)
             
             # Verificar que room.id es un string válido (puede ser descriptivo)
             self.assertIsInstance(room.id, str)
             self.assertGreater(len(room.id), 0)
             
             # Verificar que las coordenadas de la habitación coinciden con su posición en el diccionario
-            self.assertEqual(room.coordinates, (int(room_key.split(',')[0]), int(room_key.split(',')[1])))
+            self.assertEqual(room.coordinates, room_key_coords(key))
 
 
 if __name__ == '__main__':
@@ -7,7 +7,7 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from aimaze.ai_connector import generate_dungeon_layout
-from aimaze.dungeon import Dungeon, Level, Room, PlayerLocation
+from aimaze.dungeon import Dungeon, Level, Room, PlayerLocation, room_key
 
 
 class TestDungeonDeterministic(unittest.TestCase):
@@ -67,7 +67,7 @@ class TestDungeonDeterministic(unittest.TestCase):
                 self.assertLess(exit_y, level.height)
                 
                 # Verificar que todas las habitaciones tienen coordenadas válidas
-                for room_key, room in level.rooms.items():
+                for key, room in level.rooms.items():
                     room_x, room_y = room.coordinates
                     self.assertGreaterEqual(room_x, 0, f"Habitación {room.id} X fuera de límites")
                     self.assertLess(room_x, level.width, f"Habitación {room.id} X fuera de límites")
@@ -75,8 +75,8 @@ class TestDungeonDeterministic(unittest.TestCase):
                     self.assertLess(room_y, level.height, f"Habitación {room.id} Y fuera de límites")
                     
                     # Verificar que la clave coincide con las coordenadas
-                    expected_key = f"{room_x},{room_y}"
-                    self.assertEqual(room_key, expected_key)
+                    expected_key = room_key(room_x, room_y)
+                    self.assertEqual(key, expected_key)
                     
                     # Verificar que todas las conexiones apuntan a coordenadas válidas
                     for direction, target_coords in room.connections.items():
@@ -107,8 +107,8 @@ class TestDungeonDeterministic(unittest.TestCase):
                 self.assertNotEqual(level.start_coords, level.exit_coords)
                 
                 # Verificar que existen habitaciones en start_coords y exit_coords
-                start_key = f"{level.start_coords[0]},{level.start_coords[1]}"
-                exit_key = f"{level.exit_coords[0]},{level.exit_coords[1]}"
+                start_key = room_key(*level.start_coords)
+                exit_key = room_key(*level.exit_coords)
                 
                 self.assertIn(start_key, level.rooms, "No existe habitación en start_coords")
                 self.assertIn(exit_key, level.rooms, "No existe habitación en exit_coords")
@@ -131,7 +131,7 @@ class TestDungeonDeterministic(unittest.TestCase):
                         continue
                     
                     visited.add(current_coords)
-                    current_key = f"{current_coords[0]},{current_coords[1]}"
+                    current_key = room_key(*current_coords)
                     
                     if current_key in level.rooms:
                         room = level.rooms[current_key]
@@ -181,7 +181,7 @@ class TestDungeonDeterministic(unittest.TestCase):
                         continue
                     
                     visited.add(current_coords)
-                    current_key = f"{current_coords[0]},{current_coords[1]}"
+                    current_key = room_key(*current_coords)
                     
                     if current_key in level.rooms:
                         room = level.rooms[current_key]
@@ -200,7 +200,7 @@ class TestDungeonDeterministic(unittest.TestCase):
                 for j in range(len(path_found) - 1):
                     current = path_found[j]
                     next_room = path_found[j + 1]
-                    current_key = f"{current[0]},{current[1]}"
+                    current_key = room_key(*current)
                     
                     self.assertIn(current_key, level.rooms)
                     room = level.rooms[current_key]
@@ -218,9 +218,9 @@ class TestDungeonDeterministic(unittest.TestCase):
                 level = dungeon.levels[1]
                 
                 # Verificar bidireccionalidad de conexiones
-                for room_key, room in level.rooms.items():
+                for key, room in level.rooms.items():
                     for direction, target_coords in room.connections.items():
-                        target_key = f"{target_coords[0]},{target_coords[1]}"
+                        target_key = room_key(*target_coords)
                         
                         # Verificar que la habitación objetivo existe
                         self.assertIn(target_key, level.rooms, 
@@ -1,6 +1,19 @@
+import json
 import unittest
 from unittest.mock import patch, MagicMock
-from aimaze.game_state import initialize_game_state
+from aimaze.ai_connector import LocationDescription
+from aimaze.game_state import (
+    GameState,
+    get_location_description,
+    initialize_game_state,
+    is_event_resolved,
+    is_location_visited,
+    location_key,
+    location_key_coords,
+    mark_event_resolved,
+    mark_location_visited,
+    set_location_description,
+)
 from aimaze.player import Player
 from aimaze.dungeon import PlayerLocation, Dungeon, Level, Room
 
@@ -79,5 +92,91 @@ class TestGameState(unittest.TestCase):
         self.assertEqual(player.experience, 0)
         self.assertEqual(player.inventory, [])
 
+
+class TestGameStateObject(unittest.TestCase):
+    """
+    Tests para GameState: almacenes por ubicación, compatibilidad con dict y
+    serialización estructurada.
+    """
+
+    def test_location_keys_round_trip(self):
+        for coords in [(1, 0, 0), (2, 5, 3), (999, 100, 200)]:
+            self.assertEqual(location_key_coords(location_key(*coords)), coords)
+        self.assertNotEqual(location_key(1, 2, 3), location_key(2, 2, 3))
+
+    def test_legacy_keys_are_routed_to_stores(self):
+        state = GameState()
+        description = LocationDescription(description="Una sala húmeda.")
+        state["location_description_1:2:3"] = description
+        state["event_resolved_1:2:3"] = True
+        state["visited_2:0:1"] = True
+        state["otra_clave"] = 7
+
+        self.assertEqual(state.descriptions, {location_key(1, 2, 3): description})
+        self.assertEqual(state.resolved_events, {location_key(1, 2, 3)})
+        self.assertEqual(state.visited, {location_key(2, 0, 1)})
+        self.assertEqual(state.extras, {"otra_clave": 7})
+
+        self.assertIs(state["location_description_1:2:3"], description)
+        self.assertIn("visited_2:0:1", state)
+        self.assertNotIn("visited_1:0:1", state)
+        self.assertIsNone(state.get("event_resolved_9:9:9"))
+        self.assertIn("event_resolved_1:2:3", list(state))
+
+        state["visited_2:0:1"] = False
+        self.assertEqual(state.visited, set())
+        with self.assertRaises(TypeError):
+            del state["player"]
+
+    def test_core_fields_are_dict_compatible(self):
+        state = GameState(player_location=PlayerLocation(level=1, x=2, y=3))
+        state["game_over"] = True
+        self.assertTrue(state.game_over)
+        self.assertIs(state["player_location"], state.player_location)
+        self.assertFalse(state.get("enable_events", True))
+        self.assertFalse(hasattr(state, "__dict__"))
+
+    def test_helpers_work_with_game_state_and_plain_dicts(self):
+        location = PlayerLocation(level=1, x=4, y=5)
+        description = LocationDescription(description="Eco lejano.")
+        for state in (GameState(), {}):
+            with self.subTest(type=type(state).__name__):
+                self.assertIsNone(get_location_description(state, location))
+                self.assertFalse(is_location_visited(state, 1, 4, 5))
+                self.assertFalse(is_event_resolved(state, location))
+
+                set_location_description(state, location, description)
+                mark_location_visited(state, location)
+                mark_event_resolved(state, location)
+
+                self.assertIs(get_location_description(state, location), description)
+                self.assertTrue(is_location_visited(state, 1, 4, 5))
+                self.assertTrue(is_event_resolved(state, location))
+                self.assertIn("location_description_1:4:5", state)
+
+    def test_to_dict_round_trip(self):
+        room = Room(id="start_room", coordinates=(0, 0), connections={})
+        level = Level(id=1, width=1, height=1, start_coords=(0, 0),
+                      exit_coords=(0, 0), rooms={"0,0": room})
+        state = GameState(
+            player_location=PlayerLocation(level=1, x=0, y=0),
+            dungeon=Dungeon(total_levels=1, levels={1: level}),
+            player=Player(health=40, inventory=["llave"]),
+            enable_events=True,
+            current_options_map={"1": ("save", None)},
+        )
+        state["location_description_1:0:0"] = LocationDescription(description="Polvo.")
+        state["event_resolved_1:0:0"] = True
+        state["visited_1:0:0"] = True
+        state["turnos"] = 3
+
+        data = json.loads(json.dumps(state.to_dict()))
+        loaded = GameState.from_dict(data)
+
+        self.assertEqual(loaded.current_options_map, {})
+        loaded.current_options_map = state.current_options_map
+        self.assertEqual(loaded, state)
+
+
 if __name__ == '__main__':
-    unittest.main() 
\ No newline at end of file
+    unittest.main()
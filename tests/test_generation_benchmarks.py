@@ -0,0 +1,80 @@
+import unittest
+import sys
+import os
+import tempfile
+
+# Añadir el directorio src y el de benchmarks al path para los imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+from bench_generation import (
+    CASES,
+    DEFAULT_BASELINE,
+    compare_to_baseline,
+    load_baseline,
+    run_suite,
+    save_baseline,
+)
+
+
+class TestGenerationBenchmarks(unittest.TestCase):
+    """
+    Tests para la suite de benchmarks de generación y su comparación con baselines.
+    """
+
+    def test_suite_reports_all_metrics(self):
+        results = run_suite(sizes=[5], seeds=[1, 2, 3])
+        self.assertEqual([r["function"] for r in results], list(CASES))
+        for result in results:
+            self.assertEqual(result["runs"], 3)
+            self.assertLessEqual(result["p50_ms"], result["p95_ms"])
+            self.assertGreater(result["peak_kb"], 0)
+        main_path = results[0]
+        self.assertIsNotNone(main_path["max_deviation"])
+        self.assertLessEqual(main_path["max_deviation"], 1)
+
+    def test_baseline_round_trip_without_regressions(self):
+        results = run_suite(sizes=[5], seeds=[1], functions=["generate_dungeon_layout"])
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "baseline.json")
+            save_baseline(results, path)
+            self.assertEqual(compare_to_baseline(results, load_baseline(path)), [])
+
+    def test_regressions_are_detected(self):
+        base = {
+            "function": "generate_advanced_main_path", "size": 100, "runs": 5,
+            "p50_ms": 10.0, "p95_ms": 20.0, "peak_kb": 1000.0, "max_deviation": 1,
+        }
+        baseline = {"results": {"generate_advanced_main_path@100": base}}
+
+        slower = dict(base, p95_ms=35.0)
+        fatter = dict(base, peak_kb=1500.0)
+        sloppier = dict(base, max_deviation=5)
+        noisy = dict(base, p50_ms=12.0, peak_kb=1100.0, max_deviation=2)
+
+        self.assertEqual(len(compare_to_baseline([slower], baseline)), 1)
+        self.assertEqual(len(compare_to_baseline([fatter], baseline)), 1)
+        self.assertEqual(len(compare_to_baseline([sloppier], baseline)), 1)
+        self.assertEqual(compare_to_baseline([noisy], baseline), [])
+
+    def test_time_floor_ignores_tiny_cases(self):
+        base = {
+            "function": "generate_dungeon_layout", "size": 5, "runs": 5,
+            "p50_ms": 0.1, "p95_ms": 0.2, "peak_kb": 10.0, "max_deviation": None,
+        }
+        baseline = {"results": {"generate_dungeon_layout@5": base}}
+        jitter = dict(base, p50_ms=0.5, p95_ms=0.9, peak_kb=40.0)
+        self.assertEqual(compare_to_baseline([jitter], baseline), [])
+
+    @unittest.skipUnless(
+        os.getenv("AIMAZE_RUN_BENCHMARKS"),
+        "Define AIMAZE_RUN_BENCHMARKS=1 para comparar con la baseline guardada",
+    )
+    def test_no_regressions_against_stored_baseline(self):
+        baseline = load_baseline(DEFAULT_BASELINE)
+        regressions = compare_to_baseline(run_suite(), baseline)
+        self.assertEqual(regressions, [], "\n".join(regressions))
+
+
+if __name__ == '__main__':
+    unittest.main()
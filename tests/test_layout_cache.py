@@ -0,0 +1,85 @@
+import unittest
+import tempfile
+import sys
+import os
+from unittest.mock import patch
+
+# Añadir el directorio src al path para los imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from aimaze.generation.dungeon_generator import GENERATOR_VERSION, generate_dungeon_layout
+from aimaze.generation.layout_cache import LayoutCache, layout_cache_key
+from aimaze.schemas import dump_model
+
+
+class TestSeededGeneration(unittest.TestCase):
+    """
+    Tests para la generación con semilla y la caché de layouts.
+    """
+
+    def test_same_seed_produces_same_layout(self):
+        """La misma semilla produce el mismo layout aunque no haya caché compartida"""
+        first = generate_dungeon_layout(seed=99, cache=LayoutCache())
+        second = generate_dungeon_layout(seed=99, cache=LayoutCache())
+        self.assertEqual(dump_model(first), dump_model(second))
+
+    def test_seed_does_not_touch_global_random(self):
+        """La generación con semilla no consume el generador global"""
+        import random
+        random.seed(5)
+        expected = random.random()
+        random.seed(5)
+        generate_dungeon_layout(seed=1, cache=LayoutCache())
+        self.assertEqual(random.random(), expected)
+
+    def test_explicit_dimensions_are_respected(self):
+        """width y height explícitos sustituyen a las dimensiones aleatorias"""
+        level = generate_dungeon_layout(seed=3, width=20, height=12, cache=LayoutCache()).levels[1]
+        self.assertEqual((level.width, level.height), (20, 12))
+        self.assertEqual(len(level.rooms), 240)
+
+    def test_repeated_seed_skips_generation(self):
+        """Una semilla repetida se sirve desde la caché sin volver a generar"""
+        cache = LayoutCache()
+        generate_dungeon_layout(seed=7, cache=cache)
+        with patch('aimaze.generation.dungeon_generator._generate_layout') as mock_generate:
+            dungeon = generate_dungeon_layout(seed=7, cache=cache)
+            mock_generate.assert_not_called()
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(dungeon.total_levels, 1)
+
+    def test_lru_eviction(self):
+        """La caché expulsa la entrada menos usada al superar max_entries"""
+        cache = LayoutCache(max_entries=2)
+        for seed in (1, 2):
+            generate_dungeon_layout(seed=seed, cache=cache)
+        key_1 = layout_cache_key(1, {"width": None, "height": None}, GENERATOR_VERSION)
+        key_2 = layout_cache_key(2, {"width": None, "height": None}, GENERATOR_VERSION)
+        self.assertIsNotNone(cache.get(key_1))
+        generate_dungeon_layout(seed=3, cache=cache)
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get(key_2))
+        self.assertIsNotNone(cache.get(key_1))
+
+    def test_disk_persistence_survives_restart(self):
+        """Con directorio, un layout se recupera desde disco en una caché nueva"""
+        with tempfile.TemporaryDirectory() as directory:
+            original = generate_dungeon_layout(seed=11, width=70, height=70,
+                                               cache=LayoutCache(directory=directory))
+            restarted = LayoutCache(directory=directory)
+            with patch('aimaze.generation.dungeon_generator._generate_layout') as mock_generate:
+                restored = generate_dungeon_layout(seed=11, width=70, height=70,
+                                                   cache=restarted)
+                mock_generate.assert_not_called()
+        self.assertEqual(dump_model(restored), dump_model(original))
+        # Los niveles grandes vuelven a cargarse en formato compacto
+        self.assertIsNotNone(restored.levels[1]._grid)
+
+    def test_key_depends_on_version(self):
+        """La clave cambia con la versión del generador"""
+        params = {"width": 4, "height": 4}
+        self.assertNotEqual(layout_cache_key(1, params, "1"), layout_cache_key(1, params, "2"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import unittest
+import sys
+import os
+
+# Añadir el directorio src al path para los imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from aimaze.dungeon import Level, Room, room_key
+from aimaze.generation.chunked import create_chunked_level
+from aimaze.generation.dungeon_generator import generate_dungeon_layout
+from aimaze.level_analysis import (
+    UNREACHABLE,
+    get_level_analysis,
+    invalidate_level_analysis,
+    supports_level_analysis,
+)
+from aimaze.level_grid import compact_level
+
+
+def build_t_level():
+    """
+    Nivel 3x2 en forma de T:
+        (0,0) - (1,0) - (2,0)
+                  |
+                (1,1)          (0,1) sala aislada
+    """
+    rooms = {
+        "0,0": Room(id="a", coordinates=(0, 0), connections={"east": (1, 0)}),
+        "1,0": Room(id="b", coordinates=(1, 0),
+                    connections={"west": (0, 0), "east": (2, 0), "south": (1, 1)}),
+        "2,0": Room(id="c", coordinates=(2, 0), connections={"west": (1, 0)}),
+        "1,1": Room(id="d", coordinates=(1, 1), connections={"north": (1, 0)}),
+        "0,1": Room(id="e", coordinates=(0, 1), connections={}),
+    }
+    return Level(id=1, width=3, height=2, start_coords=(0, 0), exit_coords=(1, 1),
+                 rooms=rooms)
+
+
+class TestLevelAnalysis(unittest.TestCase):
+    """
+    Tests para el análisis topológico precalculado de niveles.
+    """
+
+    def test_distance_fields(self):
+        analysis = get_level_analysis(build_t_level())
+        self.assertEqual(analysis.distance_to_exit_at(0, 0), 2)
+        self.assertEqual(analysis.distance_to_exit_at(1, 1), 0)
+        self.assertEqual(analysis.distance_from_start_at(2, 0), 2)
+        self.assertEqual(analysis.distance_to_exit_at(0, 1), UNREACHABLE)
+        self.assertEqual(analysis.distance_to_exit_at(5, 5), UNREACHABLE)
+        self.assertTrue(analysis.exit_reachable)
+
+    def test_classification_and_components(self):
+        analysis = get_level_analysis(build_t_level())
+        self.assertEqual(analysis.classify(0, 0), "dead_end")
+        self.assertEqual(analysis.classify(1, 0), "junction")
+        self.assertEqual(analysis.classify(0, 1), "isolated")
+        self.assertEqual(analysis.component_count, 2)
+        self.assertFalse(analysis.is_fully_connected)
+        summary = analysis.summary()
+        self.assertEqual(summary["rooms"], 5)
+        self.assertEqual(summary["dead_ends"], 3)
+        self.assertEqual(summary["start_to_exit"], 2)
+
+    def test_analysis_is_cached_until_level_changes(self):
+        level = build_t_level()
+        first = get_level_analysis(level)
+        self.assertIs(get_level_analysis(level), first)
+
+        level.rooms[room_key(2, 1)] = Room(id="f", coordinates=(2, 1), connections={})
+        self.assertIsNot(get_level_analysis(level), first)
+
+        second = get_level_analysis(level)
+        invalidate_level_analysis(level)
+        self.assertIsNot(get_level_analysis(level), second)
+
+    def test_compact_and_dict_levels_agree(self):
+        level = generate_dungeon_layout(seed=31, width=15, height=11).levels[1]
+        compact = compact_level(level)
+        plain = get_level_analysis(level)
+        grid = get_level_analysis(compact)
+        self.assertEqual(plain.distance_to_exit, grid.distance_to_exit)
+        self.assertEqual(plain.room_class, grid.room_class)
+        self.assertTrue(grid.is_fully_connected)
+
+        cached = get_level_analysis(compact)
+        compact.rooms[room_key(0, 0)] = compact.rooms[room_key(0, 0)]
+        self.assertIsNot(get_level_analysis(compact), cached)
+
+    def test_chunked_levels_are_refused(self):
+        """Analizar un nivel por chunks obligaría a generarlo entero"""
+        level = create_chunked_level(1, 3000, 3000, seed=2)
+        self.assertTrue(supports_level_analysis(build_t_level()))
+        self.assertFalse(supports_level_analysis(level))
+        with self.assertRaises(ValueError):
+            get_level_analysis(level)
+        self.assertEqual(level._grid.chunks, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
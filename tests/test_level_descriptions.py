@@ -0,0 +1,202 @@
+import unittest
+import asyncio
+import json
+import re
+import sys
+import os
+import threading
+from unittest.mock import patch
+
+# Añadir el directorio src y el de benchmarks al path para los imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+from bench_llm_client import FakeOpenAIServer
+
+from aimaze.ai.client import LLMRegistry, LLMSettings
+from aimaze.ai.description_cache import DescriptionCache
+from aimaze.ai.descriptions import LocationDescription
+from aimaze.ai.level_descriptions import (
+    _rooms_context,
+    agenerate_level_descriptions,
+    configured_batch_size,
+    generate_level_descriptions,
+)
+from aimaze.generation.dungeon_generator import generate_dungeon_layout
+
+ROOM_LINE = re.compile(r"^- \((\d+),(\d+)\):", re.MULTILINE)
+
+
+def batch_responder(drop=(), duplicate=(), extra=(), garbage=False):
+    """Responde a los lotes con una descripción por sala pedida (con defectos)."""
+    def respond(prompt):
+        if "Salas a describir" not in prompt:
+            return json.dumps({"description": "Descripción suelta."})
+        if garbage:
+            return "Lo siento, no puedo."
+        rooms = [(int(x), int(y)) for x, y in ROOM_LINE.findall(prompt)]
+        items = [
+            {"x": x, "y": y, "description": f"Sala {x},{y} del lote."}
+            for x, y in rooms if (x, y) not in drop
+        ]
+        items += [{"x": x, "y": y, "description": "Copia."} for x, y in duplicate]
+        items += [{"x": x, "y": y, "description": "Intrusa."} for x, y in extra]
+        items.append({"x": 0, "description": "sin y"})
+        return "```json\n" + json.dumps({"rooms": items}) + "\n```"
+    return respond
+
+
+@patch.dict(os.environ, {"OPENAI_API_KEY": "test"})
+@patch('aimaze.ai.client._create_callbacks', return_value=[])
+@patch('builtins.print')
+class TestLevelDescriptions(unittest.TestCase):
+    """
+    Tests para la generación por lotes de las descripciones de un nivel.
+    """
+
+    def setUp(self):
+        self.dungeon = generate_dungeon_layout(seed=21, width=4, height=4)
+        self.level = self.dungeon.levels[1]
+        self.coords = [tuple(room.coordinates) for room in self.level.rooms.values()]
+        self.cache = DescriptionCache()
+        self.server = None
+        self.registry = None
+
+    def tearDown(self):
+        if self.registry is not None:
+            self.registry.close()
+        if self.server is not None:
+            self.server.close()
+        self.cache.close()
+
+    def _serve(self, responder):
+        self.server = FakeOpenAIServer(responder=responder)
+        self.registry = LLMRegistry(LLMSettings(base_url=self.server.base_url))
+        patches = [
+            patch(f'aimaze.ai.{module}.get_llm_registry', return_value=self.registry)
+            for module in ("descriptions", "level_descriptions")
+        ] + [
+            patch(f'aimaze.ai.{module}.get_description_cache', return_value=self.cache)
+            for module in ("descriptions", "level_descriptions")
+        ]
+        for active in patches:
+            active.start()
+            self.addCleanup(active.stop)
+
+    def test_whole_level_in_one_request(self, mock_print, mock_callbacks):
+        self._serve(batch_responder())
+        result = generate_level_descriptions(self.level, seed=21)
+
+        self.assertEqual(self.server.requests, 1)
+        self.assertEqual(set(result.descriptions), set(self.coords))
+        self.assertEqual((result.batched, result.fallback), (len(self.coords), 0))
+        x, y = self.coords[0]
+        self.assertEqual(
+            result.descriptions[(x, y)].description, f"Sala {x},{y} del lote.")
+        # Las descripciones quedan en la caché que usa la partida
+        self.assertEqual(len(self.cache), len(self.coords))
+        again = generate_level_descriptions(self.level, seed=21)
+        self.assertEqual(self.server.requests, 1)
+        self.assertEqual(again.cached, len(self.coords))
+
+    def test_invalid_items_fall_back_to_single_rooms(self, mock_print, mock_callbacks):
+        dropped, duplicated = self.coords[0], self.coords[1]
+        self._serve(batch_responder(
+            drop=[dropped], duplicate=[duplicated], extra=[(99, 99)]))
+        result = generate_level_descriptions(self.level, seed=21)
+
+        self.assertEqual(result.fallback, 2)
+        self.assertEqual(result.batched, len(self.coords) - 2)
+        self.assertEqual(self.server.requests, 3)
+        for coords in (dropped, duplicated):
+            self.assertEqual(
+                result.descriptions[coords].description, "Descripción suelta.")
+        self.assertNotIn((99, 99), result.descriptions)
+
+    def test_unreadable_batch_falls_back(self, mock_print, mock_callbacks):
+        self._serve(batch_responder(garbage=True))
+        rooms = self.coords[:3]
+        result = generate_level_descriptions(self.level, rooms=rooms)
+        self.assertEqual(result.fallback, 3)
+        self.assertEqual(self.server.requests, 4)
+        # Sin semilla no se usa la caché persistente
+        self.assertEqual(len(self.cache), 0)
+
+    def test_batches_are_split_and_run_concurrently(self, mock_print, mock_callbacks):
+        self._serve(batch_responder())
+
+        async def scenario():
+            result = await agenerate_level_descriptions(
+                self.level, seed=21, batch_size=4)
+            await self.registry.aclose()
+            return result
+
+        result = asyncio.run(scenario())
+        expected_batches = -(-len(self.coords) // 4)
+        self.assertEqual(result.batch_requests, expected_batches)
+        self.assertEqual(self.server.requests, expected_batches)
+        self.assertEqual(result.batched, len(self.coords))
+
+    def test_concurrency_is_bounded_and_cache_runs_off_the_loop(
+        self, mock_print, mock_callbacks
+    ):
+        in_flight = peak = 0
+        cache_threads = []
+
+        async def fake_request(level, chunk):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            # Las salas con x + y impar faltan y se piden sala a sala
+            return {coords: "Del lote." for coords in chunk if sum(coords) % 2 == 0}
+
+        async def fake_single(context, cache_location=None):
+            await fake_request(None, [])
+            return LocationDescription(description="Suelta.")
+
+        def record_thread(*args):
+            cache_threads.append(threading.current_thread())
+            return self.cache
+
+        async def scenario():
+            result = await agenerate_level_descriptions(
+                self.level, seed=21, batch_size=1, max_concurrency=2)
+            return result, threading.current_thread()
+
+        with patch('aimaze.ai.level_descriptions._arequest_batch',
+                   side_effect=fake_request), \
+                patch('aimaze.ai.level_descriptions.agenerate_location_description',
+                      side_effect=fake_single), \
+                patch('aimaze.ai.level_descriptions.get_description_cache',
+                      side_effect=record_thread), \
+                patch('aimaze.ai.level_descriptions.get_llm_registry'):
+            result, loop_thread = asyncio.run(scenario())
+
+        self.assertEqual(result.batch_requests, len(self.coords))
+        self.assertEqual(len(result.descriptions), len(self.coords))
+        self.assertGreater(result.fallback, 0)
+        self.assertEqual(peak, 2)
+        self.assertTrue(cache_threads)
+        self.assertNotIn(loop_thread, cache_threads)
+        with self.assertRaises(ValueError):
+            asyncio.run(agenerate_level_descriptions(self.level, max_concurrency=0))
+
+    def test_rooms_context(self, mock_print, mock_callbacks):
+        start = tuple(self.level.start_coords)
+        exit_coords = tuple(self.level.exit_coords)
+        context = _rooms_context(self.level, [start, exit_coords])
+        self.assertIn("[entrada del nivel]", context)
+        self.assertIn("[SALIDA del nivel]", context)
+        self.assertIn(" -> (", context)
+
+    def test_configured_batch_size(self, mock_print, mock_callbacks):
+        with patch.dict(os.environ, {"AIMAZE_LEVEL_BATCH_SIZE": "0"}):
+            self.assertEqual(configured_batch_size(), 0)
+        with patch.dict(os.environ, {"AIMAZE_LEVEL_BATCH_SIZE": ""}):
+            self.assertEqual(configured_batch_size(), 25)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+
+# Añadir el directorio src al path para los imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from aimaze.actions import process_player_action
+from aimaze.display import display_scenario
+from aimaze.ai_connector import LocationDescription, generate_dungeon_layout
+from aimaze.dungeon import Dungeon, PlayerLocation, Room, get_room_at_coords
+from aimaze.level_grid import LevelGrid, GridRooms, compact_level, EAST, SOUTH
+from aimaze.player import Player
+from aimaze.schemas import dump_model, load_model
+
+
+class TestLevelGrid(unittest.TestCase):
+    """
+    Tests para el almacenamiento compacto de niveles con máscaras de conexión.
+    """
+
+    def setUp(self):
+        self.level = generate_dungeon_layout().levels[1]
+        self.compact = compact_level(self.level)
+
+    def test_compact_level_preserves_rooms(self):
+        """La vista compacta expone exactamente las mismas salas y conexiones"""
+        self.assertIsInstance(self.compact.rooms, GridRooms)
+        self.assertIsInstance(self.compact.rooms, dict)
+        self.assertEqual(len(self.compact.rooms), len(self.level.rooms))
+        for key, room in self.level.rooms.items():
+            with self.subTest(key=key):
+                self.assertIn(key, self.compact.rooms)
+                view = self.compact.rooms[key]
+                self.assertEqual(view.id, room.id)
+                self.assertEqual(view.coordinates, room.coordinates)
+                self.assertEqual(view.connections, room.connections)
+
+    def test_get_room_at_coords_uses_grid(self):
+        """get_room_at_coords resuelve contra la rejilla y devuelve None fuera de ella"""
+        x, y = self.level.start_coords
+        self.assertEqual(get_room_at_coords(self.compact, x, y).id, "main_path_1")
+        self.assertIsNone(get_room_at_coords(self.compact, -1, 0))
+        self.assertIsNone(get_room_at_coords(self.compact, self.level.width, 0))
+
+    def test_model_dump_round_trip(self):
+        """Un nivel compacto se serializa igual que el nivel original"""
+        dungeon = Dungeon(total_levels=1, levels={1: self.compact})
+        dumped = dump_model(dungeon)
+        self.assertEqual(dumped["levels"][1], dump_model(self.level))
+        self.assertEqual(load_model(Dungeon, dumped).levels[1].rooms, self.level.rooms)
+
+    def test_masks_and_integer_neighbors(self):
+        """Las máscaras codifican las direcciones y neighbors devuelve índices planos"""
+        grid = LevelGrid(3, 2)
+        grid.set_room(Room(id="a_1", coordinates=(0, 0),
+                           connections={"east": (1, 0), "south": (0, 1)}))
+        self.assertEqual(grid.masks[0], EAST | SOUTH)
+        self.assertEqual(sorted(grid.neighbors(0)), [1, 3])
+        self.assertEqual(grid.room_id(0), "a_1")
+
+    def test_rejects_non_adjacent_connections(self):
+        """Las conexiones que no son adyacentes no se pueden codificar en la máscara"""
+        grid = LevelGrid(3, 3)
+        with self.assertRaises(ValueError):
+            grid.set_room(Room(id="x", coordinates=(0, 0), connections={"east": (2, 0)}))
+
+    def test_million_cell_grid_fits_in_a_few_megabytes(self):
+        """Un nivel de 1M de celdas ocupa unos pocos MB"""
+        grid = LevelGrid(1000, 1000)
+        self.assertLessEqual(grid.nbytes, 8 * 1024 * 1024)
+
+    def test_room_views_are_built_lazily(self):
+        """keys/values/items no crean todas las Room de golpe"""
+        grid = LevelGrid.from_masks(bytes(1000 * 1000), 1000, 1000)
+        level = grid.to_level(1, (0, 0), (999, 999))
+        with patch.object(LevelGrid, "room_at", autospec=True,
+                          side_effect=LevelGrid.room_at) as mock_room_at:
+            first = next(iter(level.rooms.values()))
+            key, room = next(iter(level.rooms.items()))
+        self.assertEqual(first.coordinates, (0, 0))
+        self.assertEqual((key, room), (0, first))
+        self.assertEqual(mock_room_at.call_count, 2)
+        self.assertEqual(next(iter(level.rooms.keys())), 0)
+
+    @patch('aimaze.display.generate_location_description')
+    @patch('builtins.print')
+    def test_display_and_actions_work_on_compact_level(self, mock_print, mock_generate):
+        """display_scenario y process_player_action funcionan sobre un nivel compacto"""
+        mock_generate.return_value = LocationDescription(description="Sala")
+        x, y = self.compact.start_coords
+        game_state = {
+            "player_location": PlayerLocation(level=1, x=x, y=y),
+            "dungeon": Dungeon(total_levels=1, levels={1: self.compact}),
+            "player": Player(),
+            "game_over": False,
+            "objective_achieved": False,
+        }
+        display_scenario(game_state)
+        self.assertEqual(game_state["current_options_map"]["1"][0],
+                         next(iter(get_room_at_coords(self.compact, x, y).connections)))
+
+        process_player_action(game_state, "1")
+        location = game_state["player_location"]
+        self.assertNotEqual((location.x, location.y), (x, y))
+
+
+if __name__ == '__main__':
+    unittest.main()
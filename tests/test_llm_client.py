@@ -0,0 +1,107 @@
+import unittest
+import sys
+import os
+import threading
+from unittest.mock import patch
+
+# Añadir el directorio src y el de benchmarks al path para los imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+from bench_llm_client import FakeOpenAIServer
+
+from aimaze.ai import client
+from aimaze.ai.client import LLMRegistry, LLMSettings, get_llm_registry
+from aimaze.ai.descriptions import LocationDescription, generate_location_description
+
+
+@patch.dict(os.environ, {"OPENAI_API_KEY": "test"})
+class TestLLMRegistry(unittest.TestCase):
+    """
+    Tests para el registro compartido de cliente, parsers y prompts LLM.
+    """
+
+    def setUp(self):
+        self.registry = LLMRegistry(LLMSettings(base_url="http://127.0.0.1:9/v1"))
+
+    def tearDown(self):
+        self.registry.close()
+
+    def test_objects_are_created_once(self):
+        llm = self.registry.llm()
+        self.assertIs(self.registry.llm(), llm)
+        self.assertIsNot(self.registry.llm(temperature=0.0), llm)
+        self.assertIs(llm.http_client, self.registry.http_client())
+
+        parsers = self.registry.parsers(LocationDescription, llm)
+        self.assertIs(self.registry.parsers(LocationDescription, llm), parsers)
+        # El parser de corrección repara con el llm que se pidió
+        cold = self.registry.llm(temperature=0.0)
+        cold_parsers = self.registry.parsers(LocationDescription, cold)
+        self.assertIsNot(cold_parsers, parsers)
+        self.assertIs(cold_parsers.fixing_parser.retry_chain.steps[1], cold)
+        self.assertIs(parsers.fixing_parser.retry_chain.steps[1], llm)
+        self.assertIn("description", parsers.format_instructions)
+
+        prompt = self.registry.prompt("p", "{x} {format_instructions}", ["x"], "fmt")
+        self.assertIs(self.registry.prompt("p", "otra", ["x"]), prompt)
+        self.assertEqual(prompt.format(x="hola"), "hola fmt")
+
+    def test_concurrent_first_use_shares_one_client(self):
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(self.registry.llm()))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len({id(llm) for llm in results}), 1)
+
+    def test_settings_from_env(self):
+        env = {
+            "AIMAZE_LLM_MODEL": "modelo-local",
+            "AIMAZE_LLM_MAX_CONNECTIONS": "3",
+            "AIMAZE_LLM_MAX_KEEPALIVE": "2",
+            "AIMAZE_LLM_KEEPALIVE_EXPIRY": "12.5",
+        }
+        with patch.dict(os.environ, env):
+            settings = LLMSettings.from_env()
+        self.assertEqual(settings.model, "modelo-local")
+        self.assertEqual(settings.max_connections, 3)
+        self.assertEqual(settings.max_keepalive_connections, 2)
+        self.assertEqual(settings.keepalive_expiry, 12.5)
+
+    def test_close_forgets_objects(self):
+        llm = self.registry.llm()
+        self.registry.close()
+        self.assertIsNot(self.registry.llm(), llm)
+
+    def test_global_registry(self):
+        client.reset_llm_registry()
+        try:
+            self.assertIs(get_llm_registry(), get_llm_registry())
+        finally:
+            client.reset_llm_registry()
+
+    @patch('aimaze.ai.client._create_callbacks', return_value=[])
+    @patch('builtins.print')
+    def test_descriptions_reuse_one_connection(self, mock_print, mock_callbacks):
+        server = FakeOpenAIServer()
+        registry = LLMRegistry(LLMSettings(base_url=server.base_url))
+        try:
+            with patch('aimaze.ai.descriptions.get_llm_registry',
+                       return_value=registry):
+                first = generate_location_description("Level 1 at (0,0)")
+                second = generate_location_description("Level 1 at (1,0)")
+        finally:
+            registry.close()
+            server.close()
+        self.assertEqual(first.description, "Una sala húmeda y silenciosa.")
+        self.assertEqual(second, first)
+        self.assertEqual(server.connections, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+import random
+import sys
+import os
+
+# Añadir el directorio src al path para los imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from aimaze.generation.dungeon_generator import (
+    generate_advanced_main_path,
+    calculate_minimum_distance,
+)
+
+
+class TestAdvancedMainPath(unittest.TestCase):
+    """
+    Tests para el constructor iterativo del camino principal.
+    Verifica validez del camino y fidelidad a target_length en rejillas grandes.
+    """
+
+    def assert_valid_path(self, path, start, end, width, height):
+        self.assertEqual(path[0], start)
+        self.assertEqual(path[-1], end)
+        self.assertEqual(len(set(path)), len(path), "El camino repite habitaciones")
+        for x, y in path:
+            self.assertTrue(0 <= x < width and 0 <= y < height)
+        for a, b in zip(path, path[1:]):
+            self.assertEqual(abs(a[0] - b[0]) + abs(a[1] - b[1]), 1,
+                             f"Paso no adyacente: {a} -> {b}")
+
+    def test_small_grid_reaches_target_length(self):
+        """En rejillas pequeñas el camino alcanza la longitud objetivo o difiere por paridad"""
+        random.seed(7)
+        start, end = (0, 0), (4, 4)
+        for target in range(calculate_minimum_distance(start, end), 20):
+            with self.subTest(target=target):
+                path = generate_advanced_main_path(start, end, 5, 5, target)
+                self.assert_valid_path(path, start, end, 5, 5)
+                self.assertLessEqual(len(path), target)
+                self.assertGreaterEqual(len(path), target - 1)
+
+    def test_minimum_target_returns_shortest_path(self):
+        """Con target igual a la distancia mínima se devuelve un camino mínimo"""
+        start, end = (1, 3), (6, 0)
+        target = calculate_minimum_distance(start, end)
+        path = generate_advanced_main_path(start, end, 8, 8, target)
+        self.assert_valid_path(path, start, end, 8, 8)
+        self.assertEqual(len(path), target)
+
+    def test_large_grid_without_recursion_limit(self):
+        """En una rejilla de 200x200 se respeta target_length sin recursión"""
+        random.seed(42)
+        width = height = 200
+        start, end = (0, 0), (199, 199)
+        target = 20000
+        path = generate_advanced_main_path(start, end, width, height, target)
+        self.assert_valid_path(path, start, end, width, height)
+        self.assertGreaterEqual(len(path), target - 1)
+        self.assertLessEqual(len(path), target)
+
+    def test_single_row_grid(self):
+        """En una rejilla de una fila solo existe el camino directo"""
+        path = generate_advanced_main_path((0, 0), (4, 0), 5, 1, 5)
+        self.assertEqual(path, [(0, 0), (1, 0), (2, 0), (3, 0), (4, 0)])
+
+
+if __name__ == '__main__':
+    unittest.main()
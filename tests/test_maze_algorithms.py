@@ -0,0 +1,97 @@
+import unittest
+import random
+import sys
+import os
+
+# Añadir el directorio src al path para los imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from aimaze.dungeon import Level, get_room_at_coords
+from aimaze.generation.dungeon_generator import generate_dungeon_layout, get_direction
+from aimaze.generation.layout_cache import LayoutCache
+from aimaze.generation.maze_algorithms import (
+    MAZE_ALGORITHMS,
+    BraidedMaze,
+    PrimMaze,
+    get_maze_algorithm,
+)
+from aimaze.level_analysis import DEAD_END, get_level_analysis
+
+
+class TestMazeAlgorithms(unittest.TestCase):
+    """
+    Tests para las estrategias de laberinto intercambiables.
+    """
+
+    def test_every_algorithm_builds_a_connected_level(self):
+        for name, algorithm in MAZE_ALGORITHMS.items():
+            for width, height in [(1, 2), (4, 3), (17, 11)]:
+                with self.subTest(algorithm=name, width=width, height=height):
+                    level = algorithm.generate_level(
+                        1, width, height, (0, 0), (width - 1, height - 1),
+                        random.Random(7),
+                    )
+                    self.assertIsInstance(level, Level)
+                    self.assertEqual(len(level.rooms), width * height)
+                    analysis = get_level_analysis(level)
+                    self.assertTrue(analysis.is_fully_connected)
+                    self.assertTrue(analysis.exit_reachable)
+
+    def test_connections_are_reciprocal(self):
+        for name, algorithm in MAZE_ALGORITHMS.items():
+            with self.subTest(algorithm=name):
+                level = algorithm.generate_level(1, 9, 6, (0, 0), (8, 5),
+                                                 random.Random(3))
+                for room in level.rooms.values():
+                    for direction, target in room.connections.items():
+                        self.assertEqual(get_direction(room.coordinates, target),
+                                         direction)
+                        neighbor = get_room_at_coords(level, *target)
+                        self.assertIn(tuple(room.coordinates),
+                                      [tuple(c) for c in neighbor.connections.values()])
+
+    def test_perfect_mazes_are_trees(self):
+        for name in ("backtracker", "prim", "wilson"):
+            with self.subTest(algorithm=name):
+                masks = MAZE_ALGORITHMS[name].carve(12, 8, random.Random(5))
+                doors = sum(bin(mask).count("1") for mask in masks)
+                self.assertEqual(doors // 2, 12 * 8 - 1)
+
+    def test_braided_maze_removes_dead_ends(self):
+        level = BraidedMaze(braid=1.0).generate_level(1, 15, 15, (0, 0), (14, 14),
+                                                     random.Random(11))
+        self.assertEqual(get_level_analysis(level).cells_of_class(DEAD_END), [])
+
+        partial = BraidedMaze(braid=0.0, base=PrimMaze())
+        masks = partial.carve(15, 15, random.Random(11))
+        self.assertEqual(masks, PrimMaze().carve(15, 15, random.Random(11)))
+
+    def test_large_grid_without_recursion_limits(self):
+        level = MAZE_ALGORITHMS["backtracker"].generate_level(
+            1, 200, 200, (0, 0), (199, 199), random.Random(1)
+        )
+        self.assertIsNotNone(level._grid)
+        self.assertTrue(get_level_analysis(level).is_fully_connected)
+
+    def test_generate_dungeon_layout_with_algorithm(self):
+        cache = LayoutCache()
+        first = generate_dungeon_layout(seed=4, width=8, height=8, cache=cache,
+                                        algorithm="wilson")
+        again = generate_dungeon_layout(seed=4, width=8, height=8,
+                                        cache=LayoutCache(), algorithm="wilson")
+        classic = generate_dungeon_layout(seed=4, width=8, height=8, cache=cache)
+
+        self.assertEqual(first.levels[1].rooms, again.levels[1].rooms)
+        self.assertEqual(len(first.levels[1].rooms), 64)
+        self.assertEqual(len(cache), 2)
+        self.assertNotEqual(first.levels[1].rooms, classic.levels[1].rooms)
+
+    def test_unknown_algorithm(self):
+        with self.assertRaises(ValueError):
+            get_maze_algorithm("kruskal")
+        with self.assertRaises(ValueError):
+            BraidedMaze(braid=1.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+import sys
+import os
+
+# Añadir el directorio src al path para los imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from aimaze.dungeon import room_key
+from aimaze.schemas import dump_model
+from aimaze.generation.multilevel import (
+    derive_level_seed,
+    generate_multilevel_dungeon,
+    plan_levels,
+)
+
+
+class TestMultilevelGeneration(unittest.TestCase):
+    """
+    Tests para la generación de mazmorras de varios niveles.
+    """
+
+    def test_levels_are_linked_by_stairs(self):
+        """La salida de cada nivel coincide con el inicio del siguiente"""
+        dungeon = generate_multilevel_dungeon(6, seed=21, parallel=False)
+        self.assertEqual(dungeon.total_levels, 6)
+        self.assertEqual(sorted(dungeon.levels), [1, 2, 3, 4, 5, 6])
+        for level_id in range(1, 6):
+            with self.subTest(level=level_id):
+                level = dungeon.levels[level_id]
+                below = dungeon.levels[level_id + 1]
+                self.assertNotEqual(level.start_coords, level.exit_coords)
+                self.assertEqual(below.start_coords, level.exit_coords)
+                self.assertIn(room_key(*level.exit_coords), level.rooms)
+
+    def test_serial_and_parallel_output_is_identical(self):
+        """El resultado no depende de si se genera en serie o en el pool"""
+        serial = generate_multilevel_dungeon(4, seed=5, width=30, height=20, parallel=False)
+        parallel = generate_multilevel_dungeon(
+            4, seed=5, width=30, height=20, parallel=True, max_workers=2
+        )
+        self.assertEqual(dump_model(serial), dump_model(parallel))
+
+    def test_compact_levels_survive_the_process_pool(self):
+        """Los niveles compactos se transfieren entre procesos sin perder salas"""
+        dungeon = generate_multilevel_dungeon(
+            2, seed=8, width=80, height=60, parallel=True, max_workers=2
+        )
+        for level in dungeon.levels.values():
+            self.assertIsNotNone(level._grid)
+            self.assertEqual(len(level.rooms), 80 * 60)
+
+    def test_level_seeds_are_derived_and_distinct(self):
+        """Cada nivel recibe una semilla distinta y reproducible"""
+        tasks = plan_levels(5, 99, None, None)
+        seeds = [task[1] for task in tasks]
+        self.assertEqual(len(set(seeds)), 5)
+        self.assertEqual(seeds[2], derive_level_seed(99, 3))
+
+    def test_requires_at_least_one_level(self):
+        with self.assertRaises(ValueError):
+            generate_multilevel_dungeon(0, seed=1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,196 @@
+import unittest
+import asyncio
+import sys
+import os
+from unittest.mock import AsyncMock, MagicMock, patch
+
+# Añadir el directorio src al path para los imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from aimaze import ai_connector, main
+from aimaze.ai import narration
+from aimaze.ai.descriptions import LocationDescription
+from aimaze.ai.narration import (
+    LLMNarrationProvider,
+    ProceduralNarrationProvider,
+    create_narration_provider,
+    get_narration_provider,
+    set_narration_provider,
+)
+from aimaze.events import GameEvent
+from aimaze.generation.dungeon_generator import generate_dungeon_layout
+
+
+def _no_llm():
+    raise AssertionError("el proveedor procedural no debe usar el LLM")
+
+
+@patch('aimaze.ai.descriptions.get_llm_registry', side_effect=_no_llm)
+class TestProceduralNarrationProvider(unittest.TestCase):
+    """
+    Tests para la narración procedural sin LLM.
+    """
+
+    def setUp(self):
+        self.provider = ProceduralNarrationProvider()
+
+    def test_same_room_same_description(self, mock_registry):
+        first = self.provider.describe_location("Level 1 at (2,3)")
+        again = self.provider.describe_location("Level 1 at (2,3)")
+        self.assertIsInstance(first, LocationDescription)
+        self.assertEqual(first, again)
+        self.assertEqual(first.description.count(". "), 2)
+        self.assertTrue(first.description.endswith("."))
+
+    def test_descriptions_vary_between_rooms_and_seeds(self, mock_registry):
+        texts = {
+            self.provider.describe_location(f"Level {level} at ({x},{y})").description
+            for level in (1, 2) for x in range(5) for y in range(5)
+        }
+        self.assertGreater(len(texts), 45)
+
+        seeded = [
+            self.provider.describe_location(
+                "Level 1 at (0,0)", cache_location=(seed, 1, 0, 0)).description
+            for seed in range(10)
+        ]
+        self.assertGreater(len(set(seeded)), 5)
+        self.assertNotEqual(
+            ProceduralNarrationProvider(seed=1).describe_location(
+                "Level 1 at (0,0)"),
+            ProceduralNarrationProvider(seed=2).describe_location(
+                "Level 1 at (0,0)"),
+        )
+
+    def test_context_without_coordinates(self, mock_registry):
+        description = self.provider.describe_location("inicio - entrada")
+        self.assertTrue(description.description)
+        self.assertEqual(description, self.provider.describe_location("inicio - entrada"))
+
+    def test_events_are_repeatable_per_room(self, mock_registry):
+        events = [
+            self.provider.random_event(f"Level 1 at ({x},0)") for x in range(30)
+        ]
+        self.assertEqual(events, [
+            self.provider.random_event(f"Level 1 at ({x},0)") for x in range(30)
+        ])
+        self.assertTrue(any(isinstance(event, GameEvent) for event in events))
+        self.assertIn(None, events)
+
+    def test_stream_and_async_variants(self, mock_registry):
+        expected = self.provider.describe_location("Level 1 at (1,1)")
+        pieces = []
+        self.assertEqual(
+            self.provider.stream_location("Level 1 at (1,1)", pieces.append), expected)
+        self.assertEqual(pieces, [expected.description])
+
+        async def run():
+            return (
+                await self.provider.adescribe_location("Level 1 at (1,1)"),
+                await self.provider.astream_location("Level 1 at (1,1)", pieces.append),
+                await self.provider.arandom_event("Level 1 at (1,1)"),
+            )
+
+        described, streamed, event = asyncio.run(run())
+        self.assertEqual((described, streamed), (expected, expected))
+        self.assertEqual(event, self.provider.random_event("Level 1 at (1,1)"))
+
+
+class TestNarrationProviderSelection(unittest.TestCase):
+    """
+    Tests para la elección del proveedor y la fachada ai_connector.
+    """
+
+    def tearDown(self):
+        set_narration_provider(None)
+
+    def test_create_by_name(self):
+        self.assertIsInstance(create_narration_provider("llm"), LLMNarrationProvider)
+        provider = ProceduralNarrationProvider()
+        self.assertIs(create_narration_provider(provider), provider)
+        with self.assertRaises(ValueError):
+            create_narration_provider("telepatía")
+
+    def test_global_provider_from_environment(self):
+        set_narration_provider(None)
+        with patch.dict(os.environ, {"AIMAZE_NARRATION_PROVIDER": "procedural"}):
+            self.assertIsInstance(get_narration_provider(), ProceduralNarrationProvider)
+        set_narration_provider(None)
+        with patch.dict(os.environ, {"AIMAZE_NARRATION_PROVIDER": ""}):
+            self.assertIsInstance(get_narration_provider(), LLMNarrationProvider)
+
+    @patch('builtins.print')
+    def test_unknown_name_falls_back_to_llm(self, mock_print):
+        set_narration_provider(None)
+        with patch.dict(os.environ, {"AIMAZE_NARRATION_PROVIDER": "telepatía"}):
+            self.assertIsInstance(get_narration_provider(), LLMNarrationProvider)
+        self.assertIn("telepatía", mock_print.call_args[0][0])
+
+    def test_facade_uses_the_configured_provider(self):
+        set_narration_provider("procedural")
+        expected = ProceduralNarrationProvider().describe_location("Level 1 at (0,0)")
+        with patch('aimaze.ai.descriptions.get_llm_registry', side_effect=_no_llm):
+            self.assertEqual(
+                ai_connector.generate_location_description("Level 1 at (0,0)"),
+                expected,
+            )
+            self.assertEqual(
+                asyncio.run(ai_connector.agenerate_location_description(
+                    "Level 1 at (0,0)")),
+                expected,
+            )
+            pieces = []
+            ai_connector.stream_location_description("Level 1 at (0,0)", pieces.append)
+            self.assertEqual(pieces, [expected.description])
+
+    def test_llm_provider_delegates(self):
+        set_narration_provider("llm")
+        description = LocationDescription(description="Del LLM")
+        with patch.object(narration, 'generate_location_description',
+                          return_value=description) as mock_generate:
+            self.assertIs(
+                ai_connector.generate_location_description("ctx", (1, 1, 0, 0)),
+                description,
+            )
+        mock_generate.assert_called_once_with("ctx", (1, 1, 0, 0))
+
+    @patch.dict(os.environ, {
+        "AIMAZE_PREFETCH_WORKERS": "2", "AIMAZE_LEVEL_BATCH_SIZE": "25"})
+    @patch('builtins.print')
+    def test_game_loop_runs_offline(self, mock_print):
+        set_narration_provider("procedural")
+        dungeon = generate_dungeon_layout(seed=4, width=4, height=4)
+        pool = MagicMock()
+        pool.take.return_value = dungeon
+        inputs = iter(["1"])
+
+        def fake_input(game_state):
+            choice = next(inputs, None)
+            if choice is None:
+                game_state["game_over"] = True
+                return ""
+            return choice
+
+        with patch('aimaze.main.get_dungeon_pool', return_value=pool), \
+                patch('aimaze.main.load_config'), \
+                patch('aimaze.game_state.load_config'), \
+                patch('aimaze.main.get_player_input', side_effect=fake_input), \
+                patch('aimaze.main.get_llm_registry') as mock_registry, \
+                patch('aimaze.main.agenerate_level_descriptions') as mock_batch, \
+                patch('aimaze.main.create_async_description_prefetcher') \
+                as mock_prefetcher, \
+                patch('aimaze.ai.descriptions.get_llm_registry', side_effect=_no_llm):
+            mock_registry.return_value.aclose = AsyncMock()
+            main.game_loop()
+
+        mock_batch.assert_not_called()
+        mock_prefetcher.assert_not_called()
+        printed = [call[0][0] for call in mock_print.call_args_list if call[0]]
+        start = dungeon.levels[1].start_coords
+        expected = ProceduralNarrationProvider().describe_location(
+            f"Level 1 at ({start[0]},{start[1]})", cache_location=(4, 1, *start))
+        self.assertIn(expected.description, printed)
+
+
+if __name__ == '__main__':
+    unittest.main()
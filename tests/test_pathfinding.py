@@ -0,0 +1,253 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+
+# Añadir el directorio src al path para los imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from aimaze.actions import parse_travel_command, process_player_action
+from aimaze.dungeon import Dungeon, Level, PlayerLocation, Room, room_key
+from aimaze.game_state import is_location_visited, visited_location_key
+from aimaze.generation.chunked import create_chunked_level
+from aimaze.level_analysis import get_level_analysis
+from aimaze.level_grid import compact_level
+from aimaze.pathfinding import MAX_CACHED_TARGETS, find_path, get_parent_tree
+from aimaze.player import Player
+
+
+def build_corridor_level():
+    """
+    Nivel 3x2 con un pasillo en forma de U y una sala aislada:
+        (0,0) - (1,0) - (2,0)
+                          |
+        (0,1)   (1,1) - (2,1)
+    """
+    rooms = {
+        "0,0": Room(id="a", coordinates=(0, 0), connections={"east": (1, 0)}),
+        "1,0": Room(id="b", coordinates=(1, 0),
+                    connections={"west": (0, 0), "east": (2, 0)}),
+        "2,0": Room(id="c", coordinates=(2, 0),
+                    connections={"west": (1, 0), "south": (2, 1)}),
+        "2,1": Room(id="d", coordinates=(2, 1),
+                    connections={"north": (2, 0), "west": (1, 1)}),
+        "1,1": Room(id="e", coordinates=(1, 1), connections={"east": (2, 1)}),
+        "0,1": Room(id="f", coordinates=(0, 1), connections={}),
+    }
+    return Level(id=1, width=3, height=2, start_coords=(0, 0), exit_coords=(1, 1),
+                 rooms=rooms)
+
+
+class TestFindPath(unittest.TestCase):
+    """
+    Tests para la búsqueda de caminos sobre el análisis del nivel.
+    """
+
+    def setUp(self):
+        self.level = build_corridor_level()
+
+    def test_shortest_path_follows_connections(self):
+        path = find_path(self.level, (0, 0), (1, 1))
+        self.assertEqual(path, [(0, 0), (1, 0), (2, 0), (2, 1), (1, 1)])
+
+    def test_path_to_itself(self):
+        self.assertEqual(find_path(self.level, (2, 0), (2, 0)), [(2, 0)])
+
+    def test_unreachable_or_missing_rooms(self):
+        self.assertIsNone(find_path(self.level, (0, 0), (0, 1)))
+        self.assertIsNone(find_path(self.level, (0, 0), (5, 5)))
+
+    def test_parent_trees_are_cached_per_target(self):
+        tree = get_parent_tree(self.level, (1, 1))
+        self.assertIs(get_parent_tree(self.level, (1, 1)), tree)
+
+        analysis = get_level_analysis(self.level)
+        for x, y in [(0, 0), (1, 0), (2, 0), (2, 1), (1, 1)] * 4:
+            get_parent_tree(self.level, (x, y))
+        self.assertLessEqual(len(analysis.path_trees), MAX_CACHED_TARGETS)
+
+    def test_cache_invalidated_when_level_changes(self):
+        self.level = compact_level(self.level)
+        self.assertIsNone(find_path(self.level, (0, 0), (0, 1)))
+        self.level.rooms[room_key(0, 1)] = Room(
+            id="f", coordinates=(0, 1), connections={"north": (0, 0)}
+        )
+        self.level.rooms[room_key(0, 0)] = Room(
+            id="a", coordinates=(0, 0), connections={"east": (1, 0), "south": (0, 1)}
+        )
+        self.assertEqual(find_path(self.level, (0, 0), (0, 1)), [(0, 0), (0, 1)])
+
+
+class TestChunkedPaths(unittest.TestCase):
+    """
+    Tests de caminos en niveles por chunks, que se generan al buscar.
+    """
+
+    def setUp(self):
+        self.level = create_chunked_level(1, 8, 4, seed=5, chunk_size=4)
+        # Puerta de la costura entre los chunks (0, 0) y (1, 0)
+        self.seam_y = self.level._grid._seam_offset("v", 0, 0, 4)
+
+    def test_path_across_seam(self):
+        west, east = (3, self.seam_y), (4, self.seam_y)
+        self.assertEqual(find_path(self.level, west, east), [west, east])
+        self.assertEqual(sorted(self.level._grid.chunks), [(0, 0), (1, 0)])
+
+    def test_long_path_follows_connections(self):
+        path = find_path(self.level, (0, 0), (7, 3))
+        self.assertEqual((path[0], path[-1]), ((0, 0), (7, 3)))
+        self.assertIn((4, self.seam_y), path)
+        for current, following in zip(path, path[1:]):
+            room = self.level.rooms[room_key(*current)]
+            self.assertIn(following, room.connections.values())
+        self.assertIsNone(find_path(self.level, (0, 0), (8, 0)))
+
+    @patch('builtins.print')
+    def test_travel_across_seam(self, mock_print):
+        west, east = (3, self.seam_y), (4, self.seam_y)
+        game_state = {
+            "player_location": PlayerLocation(level=1, x=west[0], y=west[1]),
+            "dungeon": Dungeon(total_levels=1, current_level=1,
+                               levels={1: self.level}),
+            "player": Player(),
+            "game_over": False,
+            "current_options_map": {},
+        }
+        for x, y in (west, east):
+            game_state[visited_location_key(1, x, y)] = True
+        process_player_action(game_state, "ir a ({},{})".format(*east))
+
+        location = game_state["player_location"]
+        self.assertEqual((location.x, location.y), east)
+        self.assertFalse(game_state["game_over"])
+
+
+class TestTravelCommands(unittest.TestCase):
+    """
+    Tests para los comandos 'ir a (x,y)' y 'volver a la salida'.
+    """
+
+    def setUp(self):
+        self.level = build_corridor_level()
+        self.game_state = {
+            "player_location": PlayerLocation(level=1, x=0, y=0),
+            "dungeon": Dungeon(total_levels=1, current_level=1,
+                               levels={1: self.level}),
+            "player": Player(),
+            "game_over": False,
+            "objective_achieved": False,
+            "current_options_map": {},
+        }
+
+    def visit(self, *coords):
+        for x, y in coords:
+            self.game_state[visited_location_key(1, x, y)] = True
+
+    def test_parse_travel_command(self):
+        self.assertEqual(parse_travel_command("ir a (2,1)", self.level), (2, 1))
+        self.assertEqual(parse_travel_command("  IR A 2, 1 ", self.level), (2, 1))
+        self.assertEqual(parse_travel_command("volver a la salida", self.level),
+                         (1, 1))
+        self.assertIsNone(parse_travel_command("ir al norte", self.level))
+
+    @patch('builtins.print')
+    def test_travel_to_visited_room(self, mock_print):
+        self.visit((0, 0), (1, 0), (2, 0), (2, 1))
+        process_player_action(self.game_state, "ir a (2,1)")
+
+        location = self.game_state["player_location"]
+        self.assertEqual((location.x, location.y), (2, 1))
+        mock_print.assert_any_call("\nViajas 3 salas hasta la posición (2, 1).")
+
+    @patch('builtins.print')
+    def test_travel_reuses_cached_parent_trees(self, mock_print):
+        self.visit((0, 0), (1, 0), (2, 0), (2, 1))
+        with patch('aimaze.pathfinding._search_path') as mock_search:
+            process_player_action(self.game_state, "ir a (2,1)")
+        mock_search.assert_not_called()
+        analysis = get_level_analysis(self.level)
+        self.assertIn(analysis.index(2, 1), analysis.path_trees)
+
+    @patch('builtins.print')
+    def test_travel_rejects_unvisited_room(self, mock_print):
+        self.visit((0, 0))
+        process_player_action(self.game_state, "ir a (2,1)")
+
+        location = self.game_state["player_location"]
+        self.assertEqual((location.x, location.y), (0, 0))
+        self.assertFalse(is_location_visited(self.game_state, 1, 2, 1))
+
+    @patch('builtins.print')
+    def test_return_to_exit(self, mock_print):
+        self.visit((0, 0), (1, 0), (2, 0), (2, 1), (1, 1))
+        process_player_action(self.game_state, "volver a la salida")
+
+        location = self.game_state["player_location"]
+        self.assertEqual((location.x, location.y), (1, 1))
+        mock_print.assert_any_call("¡Has llegado a la salida del nivel!")
+        # Llegar a la salida no termina el nivel: hay que elegir 'INTENTAR SALIR'
+        self.assertFalse(self.game_state["objective_achieved"])
+
+    @patch('builtins.print')
+    def test_travel_stops_when_event_happens(self, mock_print):
+        self.visit((0, 0), (1, 0), (2, 0), (2, 1), (1, 1))
+        with patch('aimaze.actions._trigger_room_event',
+                   side_effect=[False, True]) as mock_event:
+            process_player_action(self.game_state, "volver a la salida")
+
+        location = self.game_state["player_location"]
+        self.assertEqual((location.x, location.y), (2, 0))
+        self.assertEqual(mock_event.call_count, 2)
+
+    @patch('builtins.print')
+    def test_exit_without_a_visited_route(self, mock_print):
+        self.visit((0, 0), (1, 1))
+        process_player_action(self.game_state, "volver a la salida")
+
+        location = self.game_state["player_location"]
+        self.assertEqual((location.x, location.y), (0, 0))
+        self.assertFalse(is_location_visited(self.game_state, 1, 2, 0))
+        mock_print.assert_any_call(
+            "\nNo hay camino conocido hasta la posición (1, 1).")
+
+    @patch('builtins.print')
+    def test_travel_avoids_unexplored_shortcuts(self, mock_print):
+        """
+        Nivel 3x2 en anillo; el atajo por (1,0) no se ha visitado:
+            (0,0) - (1,0) - (2,0)
+              |               |
+            (0,1) - (1,1) - (2,1)
+        """
+        connections = {
+            (0, 0): {"east": (1, 0), "south": (0, 1)},
+            (1, 0): {"west": (0, 0), "east": (2, 0)},
+            (2, 0): {"west": (1, 0), "south": (2, 1)},
+            (0, 1): {"north": (0, 0), "east": (1, 1)},
+            (1, 1): {"west": (0, 1), "east": (2, 1)},
+            (2, 1): {"west": (1, 1), "north": (2, 0)},
+        }
+        rooms = {
+            room_key(*coords): Room(id=f"r{x}", coordinates=coords, connections=doors)
+            for x, (coords, doors) in enumerate(connections.items())
+        }
+        ring = Level(id=1, width=3, height=2, start_coords=(0, 0), exit_coords=(2, 0),
+                     rooms=rooms)
+        self.game_state["dungeon"].levels[1] = ring
+        self.visit((0, 0), (0, 1), (1, 1), (2, 1), (2, 0))
+
+        def visited(x, y):
+            return is_location_visited(self.game_state, 1, x, y)
+
+        self.assertEqual(find_path(ring, (0, 0), (2, 0)), [(0, 0), (1, 0), (2, 0)])
+        self.assertEqual(find_path(ring, (0, 0), (2, 0), allowed=visited),
+                         [(0, 0), (0, 1), (1, 1), (2, 1), (2, 0)])
+        process_player_action(self.game_state, "ir a (2,0)")
+
+        location = self.game_state["player_location"]
+        self.assertEqual((location.x, location.y), (2, 0))
+        self.assertFalse(is_location_visited(self.game_state, 1, 1, 0))
+        mock_print.assert_any_call("\nViajas 4 salas hasta la posición (2, 0).")
+
+
+if __name__ == '__main__':
+    unittest.main()
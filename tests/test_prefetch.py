@@ -0,0 +1,229 @@
+import unittest
+import sys
+import os
+import threading
+from unittest.mock import MagicMock, patch
+
+# Añadir el directorio src al path para los imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from aimaze.ai.descriptions import LocationDescription
+from aimaze.ai.prefetch import (
+    DescriptionPrefetcher,
+    PrefetchRequest,
+    create_description_prefetcher,
+)
+from aimaze.display import display_scenario, prefetch_neighbours
+from aimaze.dungeon import Dungeon, PlayerLocation
+from aimaze.game_state import (
+    GameState,
+    get_location_description,
+    visited_location_key,
+)
+from aimaze.generation.chunked import create_chunked_level
+from aimaze.generation.dungeon_generator import generate_dungeon_layout
+from aimaze.level_analysis import get_level_analysis
+from aimaze.room_options import get_room_options
+
+
+def _request(name, priority):
+    return PrefetchRequest(key=name, priority=(priority,), context=name)
+
+
+class GatedGenerator:
+    """Generador falso que registra las llamadas y espera a que se le deje seguir."""
+
+    def __init__(self, gated=False):
+        self.calls = []
+        self.gate = threading.Event()
+        if not gated:
+            self.gate.set()
+        self.started = threading.Event()
+        self.lock = threading.Lock()
+        self.running = 0
+        self.max_running = 0
+
+    def __call__(self, context, cache_location=None):
+        with self.lock:
+            self.calls.append(context)
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        self.started.set()
+        self.gate.wait(5)
+        with self.lock:
+            self.running -= 1
+        return LocationDescription(description=f"Descripción de {context}")
+
+
+class TestDescriptionPrefetcher(unittest.TestCase):
+    """
+    Tests para la generación anticipada de descripciones.
+    """
+
+    def setUp(self):
+        self.generator = GatedGenerator(gated=True)
+        self.prefetcher = DescriptionPrefetcher(max_workers=1, generator=self.generator)
+
+    def tearDown(self):
+        self.generator.gate.set()
+        self.prefetcher.stop(timeout=5)
+
+    def test_requests_run_by_priority(self):
+        self.prefetcher.prefetch([_request("a", 0)])
+        self.assertTrue(self.generator.started.wait(5))
+        self.prefetcher.prefetch([
+            _request("a", 0), _request("b", 3), _request("c", 1), _request("d", 2),
+        ])
+        self.generator.gate.set()
+        for name in "abcd":
+            self.assertIsNotNone(self.prefetcher.take(name))
+        self.assertEqual(self.generator.calls, ["a", "c", "d", "b"])
+
+    def test_new_round_cancels_stale_requests(self):
+        self.prefetcher.prefetch([_request("a", 0), _request("b", 1)])
+        self.assertTrue(self.generator.started.wait(5))
+        self.prefetcher.prefetch([_request("c", 0)])
+        self.generator.gate.set()
+        self.assertTrue(self.prefetcher.wait_until_idle(5))
+        self.assertIsNotNone(self.prefetcher.take("c"))
+        # "a" ya estaba en curso: su resultado se conserva
+        self.assertIsNotNone(self.prefetcher.take("a"))
+        self.assertIsNone(self.prefetcher.take("b"))
+        self.assertEqual(self.generator.calls, ["a", "c"])
+        self.assertEqual(self.prefetcher.stats()["cancelled"], 1)
+
+    def test_take_waits_for_running_and_skips_pending(self):
+        self.prefetcher.prefetch([_request("a", 0), _request("b", 1)])
+        self.assertTrue(self.generator.started.wait(5))
+        # "b" sigue pendiente: take la cancela para generarla en el momento
+        self.assertIsNone(self.prefetcher.take("b"))
+        threading.Timer(0.05, self.generator.gate.set).start()
+        result = self.prefetcher.take("a")
+        self.assertEqual(result.description, "Descripción de a")
+        self.assertIsNone(self.prefetcher.take("a"))
+        self.assertIsNone(self.prefetcher.take("desconocida"))
+        stats = self.prefetcher.stats()
+        self.assertEqual((stats["hits"], stats["waits"]), (1, 1))
+
+    def test_concurrency_is_bounded(self):
+        generator = GatedGenerator(gated=True)
+        prefetcher = DescriptionPrefetcher(max_workers=2, generator=generator)
+        prefetcher.prefetch([_request(str(i), i) for i in range(6)])
+        threading.Timer(0.1, generator.gate.set).start()
+        for i in range(6):
+            self.assertIsNotNone(prefetcher.take(str(i)))
+        prefetcher.stop(timeout=5)
+        self.assertEqual(generator.max_running, 2)
+
+    def test_prefetch_after_stop_is_ignored(self):
+        self.prefetcher.stop(timeout=5)
+        self.prefetcher.prefetch([_request("a", 0)])
+        self.assertIsNone(self.prefetcher.take("a"))
+        self.assertEqual(self.generator.calls, [])
+
+    def test_create_from_env(self):
+        with patch.dict(os.environ, {"AIMAZE_PREFETCH_WORKERS": "0"}):
+            self.assertIsNone(create_description_prefetcher())
+        with patch.dict(os.environ, {"AIMAZE_PREFETCH_WORKERS": "3"}):
+            self.assertEqual(create_description_prefetcher().max_workers, 3)
+
+
+class TestDisplayPrefetch(unittest.TestCase):
+    """
+    Tests de display_scenario con prefetch de las salas vecinas.
+    """
+
+    @patch('aimaze.display.generate_location_description')
+    @patch('builtins.print')
+    def test_moving_to_a_neighbour_uses_the_prefetched_description(
+        self, mock_print, mock_generate
+    ):
+        mock_generate.side_effect = lambda context, **kwargs: LocationDescription(
+            description=f"Síncrona {context}")
+        dungeon = generate_dungeon_layout(seed=5, width=6, height=6)
+        level = dungeon.levels[1]
+        start_x, start_y = level.start_coords
+        start = PlayerLocation(level=1, x=start_x, y=start_y)
+        game_state = GameState(dungeon=dungeon, player_location=start)
+        generator = GatedGenerator()
+        prefetcher = DescriptionPrefetcher(generator=generator)
+        try:
+            display_scenario(game_state, prefetcher=prefetcher)
+            mock_generate.assert_called_once()
+            self.assertTrue(prefetcher.wait_until_idle(5))
+
+            targets = get_room_options(level, start.x, start.y).targets
+            x, y = next(iter(targets.values()))
+            game_state.player_location = PlayerLocation(level=1, x=x, y=y)
+            display_scenario(game_state, prefetcher=prefetcher)
+        finally:
+            prefetcher.stop(timeout=5)
+
+        mock_generate.assert_called_once()
+        description = get_location_description(game_state, game_state.player_location)
+        self.assertEqual(
+            description.description,
+            f"Descripción de Level 1 at ({x},{y})",
+        )
+        self.assertCountEqual(
+            generator.calls[:len(targets)],
+            [f"Level 1 at ({tx},{ty})" for tx, ty in targets.values()],
+        )
+        # La sala de partida ya tiene descripción: no se vuelve a pedir
+        self.assertNotIn(f"Level 1 at ({start.x},{start.y})", generator.calls)
+
+
+class TestPrefetchNeighbours(unittest.TestCase):
+    """
+    Tests del orden de las peticiones de prefetch y de su coste por turno.
+    """
+
+    def _requests(self, level, x, y, visited=()):
+        dungeon = Dungeon(total_levels=1, current_level=1, levels={1: level})
+        game_state = GameState(
+            dungeon=dungeon, player_location=PlayerLocation(level=1, x=x, y=y))
+        for vx, vy in visited:
+            game_state[visited_location_key(1, vx, vy)] = True
+        prefetcher = MagicMock()
+        prefetch_neighbours(game_state, prefetcher)
+        (requests,), _ = prefetcher.prefetch.call_args
+        return requests
+
+    def test_small_levels_are_ordered_by_distance_to_exit(self):
+        level = generate_dungeon_layout(seed=5, width=6, height=6).levels[1]
+        x, y = level.start_coords
+        requests = self._requests(level, x, y)
+        analysis = get_level_analysis(level)
+        self.assertEqual(
+            [r.priority[1] for r in requests],
+            [analysis.distance_to_exit_at(*r.key[1:]) for r in requests])
+
+    def test_large_levels_are_not_analysed_per_turn(self):
+        level = generate_dungeon_layout(seed=5, width=70, height=70).levels[1]
+        x, y = level.start_coords
+        requests = self._requests(level, x, y)
+        self.assertIsNone(level._analysis)
+        self.assertEqual([r.priority[2] for r in requests], list(range(len(requests))))
+
+        # Si el análisis ya está cacheado, se aprovecha
+        analysis = get_level_analysis(level)
+        requests = self._requests(level, x, y)
+        self.assertEqual(
+            [r.priority[1] for r in requests],
+            [analysis.distance_to_exit_at(*r.key[1:]) for r in requests])
+
+    def test_chunked_levels_fall_back_to_visited_then_order(self):
+        level = create_chunked_level(1, 3000, 3000, seed=2)
+        x, y = level.start_coords
+        first = self._requests(level, x, y)
+        visited = first[0].key[1:]
+        requests = self._requests(level, x, y, visited=[visited])
+        self.assertLessEqual(len(level._grid.chunks), 4)
+        self.assertIsNone(level._analysis)
+        self.assertEqual(
+            [r.priority[:2] for r in requests],
+            [(r.key[1:] == visited, 3000 * 3000) for r in requests])
+
+
+if __name__ == '__main__':
+    unittest.main()
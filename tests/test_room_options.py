@@ -0,0 +1,95 @@
+import unittest
+import sys
+import os
+
+# Añadir el directorio src al path para los imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from aimaze.dungeon import Level, Room, room_key
+from aimaze.generation.chunked import create_chunked_level
+from aimaze.level_analysis import invalidate_level_analysis
+from aimaze.level_grid import compact_level
+from aimaze.room_options import get_room_options
+
+
+def _level():
+    rooms = {
+        room_key(0, 0): Room(id="start", coordinates=(0, 0),
+                             connections={"east": (1, 0), "south": (0, 1)}),
+        room_key(1, 0): Room(id="exit", coordinates=(1, 0),
+                             connections={"west": (0, 0)}),
+    }
+    return Level(id=1, width=2, height=2, start_coords=(0, 0),
+                 exit_coords=(1, 0), rooms=rooms)
+
+
+class TestRoomOptions(unittest.TestCase):
+    """
+    Tests para las tablas de opciones precalculadas por sala.
+    """
+
+    def test_options_follow_connections(self):
+        options = get_room_options(_level(), 0, 0)
+        self.assertEqual(options.lines, ("1) Ir al Este", "2) Ir al Sur",
+                                         "3) Guardar partida"))
+        self.assertEqual(options.options_map, {
+            "1": ("east", (1, 0)),
+            "2": ("south", (0, 1)),
+            "3": ("save", None),
+        })
+        self.assertFalse(options.is_exit)
+
+    def test_exit_room_offers_exit(self):
+        options = get_room_options(_level(), 1, 0)
+        self.assertTrue(options.is_exit)
+        self.assertEqual(options.options_map["2"], ("exit", None))
+        self.assertEqual(options.options_map["3"], ("save", None))
+
+    def test_moves_are_validated_once(self):
+        options = get_room_options(_level(), 0, 0)
+        self.assertEqual(options.targets, {"east": (1, 0)})
+        self.assertIn("No hay habitación", options.move_errors["south"])
+        self.assertIsNone(get_room_options(_level(), 1, 1))
+
+    def test_tables_are_memoized_per_level(self):
+        level = _level()
+        self.assertIs(get_room_options(level, 0, 0), get_room_options(level, 0, 0))
+
+    def test_added_rooms_invalidate_tables(self):
+        level = _level()
+        before = get_room_options(level, 0, 0)
+        level.rooms[room_key(0, 1)] = Room(id="south", coordinates=(0, 1),
+                                           connections={"north": (0, 0)})
+        after = get_room_options(level, 0, 0)
+        self.assertIsNot(before, after)
+        self.assertEqual(after.targets, {"east": (1, 0), "south": (0, 1)})
+
+    def test_in_place_edits_need_explicit_invalidation(self):
+        level = _level()
+        get_room_options(level, 1, 0)
+        level.rooms[room_key(1, 0)].connections["south"] = (1, 1)
+        self.assertNotIn("south", get_room_options(level, 1, 0).move_errors)
+
+        invalidate_level_analysis(level)
+        self.assertIn("south", get_room_options(level, 1, 0).move_errors)
+
+    def test_compact_grid_changes_invalidate_tables(self):
+        level = compact_level(_level())
+        before = get_room_options(level, 0, 0)
+        level._grid.set_room(Room(id="south", coordinates=(0, 1),
+                                  connections={"north": (0, 0)}))
+        self.assertIsNot(before, get_room_options(level, 0, 0))
+        self.assertIn("south", get_room_options(level, 0, 0).targets)
+
+    def test_chunked_levels(self):
+        level = create_chunked_level(1, 40, 30, seed=4, chunk_size=10)
+        x, y = level.start_coords
+        options = get_room_options(level, x, y)
+        self.assertIs(options, get_room_options(level, x, y))
+        for target in options.targets.values():
+            self.assertIsNotNone(get_room_options(level, *target))
+        self.assertEqual(options.move_errors, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
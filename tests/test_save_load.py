@@ -0,0 +1,146 @@
+import unittest
+import sys
+import os
+import json
+import tempfile
+from unittest.mock import patch
+
+# Añadir el directorio src al path para los imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from aimaze.ai_connector import LocationDescription
+from aimaze.dungeon import Dungeon, PlayerLocation, get_room_at_coords, room_key
+from aimaze.game_state import GameState, location_key
+from aimaze.generation.chunked import ChunkedGrid, create_chunked_level
+from aimaze.generation.dungeon_generator import generate_dungeon_layout
+from aimaze.generation.layout_cache import LayoutCache
+from aimaze.level_grid import compact_level
+from aimaze.player import Player
+from aimaze.save_load import load_game, save_game
+from aimaze.schemas import dump_model
+
+
+class TestSaveLoadRoomKeys(unittest.TestCase):
+    """
+    Tests de guardado y carga con claves de sala room_key y partidas antiguas 'x,y'.
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.tmp.name, "savegame.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def game_state(self, dungeon):
+        return {
+            "player_location": PlayerLocation(level=1, x=0, y=0),
+            "dungeon": dungeon,
+            "player": Player(),
+            "game_over": False,
+        }
+
+    @patch('builtins.print')
+    def test_round_trip_keeps_integer_keys(self, mock_print):
+        dungeon = generate_dungeon_layout(seed=8, width=6, height=4, cache=LayoutCache())
+        save_game(self.game_state(dungeon), self.filename)
+
+        loaded = load_game(self.filename)["dungeon"]
+        self.assertEqual(loaded.levels[1].rooms, dungeon.levels[1].rooms)
+        self.assertTrue(all(isinstance(key, int) for key in loaded.levels[1].rooms))
+
+    @patch('builtins.print')
+    def test_compact_level_round_trip(self, mock_print):
+        dungeon = generate_dungeon_layout(seed=8, width=6, height=4, cache=LayoutCache())
+        dungeon.levels[1] = compact_level(dungeon.levels[1])
+        save_game(self.game_state(dungeon), self.filename)
+
+        loaded = load_game(self.filename)["dungeon"]
+        self.assertEqual(dict(loaded.levels[1].rooms.items()),
+                         dict(dungeon.levels[1].rooms.items()))
+
+    @patch('builtins.print')
+    def test_chunked_level_round_trip_across_seam(self, mock_print):
+        level = create_chunked_level(1, 8, 4, seed=5, chunk_size=4)
+        dungeon = Dungeon(total_levels=1, current_level=1, levels={1: level}, seed=5)
+        # Solo se ha generado el chunk de la izquierda, con su puerta al este
+        seam_y = level._grid._seam_offset("v", 0, 0, 4)
+        seam_room = get_room_at_coords(level, 3, seam_y)
+        self.assertEqual(seam_room.connections["east"], (4, seam_y))
+        self.assertEqual(list(level._grid.chunks), [(0, 0)])
+        save_game(self.game_state(dungeon), self.filename)
+
+        loaded = load_game(self.filename)["dungeon"].levels[1]
+        self.assertIsInstance(loaded._grid, ChunkedGrid)
+        self.assertEqual((loaded._grid.seed, loaded._grid.chunk_size), (5, 4))
+        self.assertEqual(
+            (loaded.start_coords, loaded.exit_coords),
+            (level.start_coords, level.exit_coords))
+        self.assertEqual(get_room_at_coords(loaded, 3, seam_y), seam_room)
+        # Al cruzar la costura se genera el chunk que no llegó a guardarse
+        self.assertEqual(
+            get_room_at_coords(loaded, 4, seam_y), get_room_at_coords(level, 4, seam_y))
+
+    @patch('builtins.print')
+    def test_legacy_save_with_string_keys(self, mock_print):
+        dungeon = generate_dungeon_layout(seed=2, width=5, height=5, cache=LayoutCache())
+        state = json.loads(json.dumps(
+            {"dungeon": dump_model(dungeon), "game_over": False}
+        ))
+        # Reescribir las claves al formato antiguo 'x,y'
+        legacy_rooms = {
+            f"{room['coordinates'][0]},{room['coordinates'][1]}": room
+            for room in state["dungeon"]["levels"]["1"]["rooms"].values()
+        }
+        state["dungeon"]["levels"]["1"]["rooms"] = legacy_rooms
+        with open(self.filename, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+
+        loaded = load_game(self.filename)["dungeon"]
+        self.assertIsInstance(loaded, Dungeon)
+        level = loaded.levels[1]
+        self.assertEqual(level.rooms, dungeon.levels[1].rooms)
+        x, y = level.start_coords
+        self.assertIsNotNone(get_room_at_coords(level, x, y))
+        self.assertIn(room_key(x, y), level.rooms)
+
+    @patch('builtins.print')
+    def test_legacy_flat_save_fills_location_stores(self, mock_print):
+        dungeon = generate_dungeon_layout(seed=2, width=5, height=5, cache=LayoutCache())
+        flat = {
+            "player_location": {"level": 1, "x": 1, "y": 2},
+            "dungeon": dump_model(dungeon),
+            "game_over": False,
+            "current_options_map": {"1": ["east", [2, 2]]},
+            "location_description_1:1:2": {"description": "Goteras."},
+            "event_resolved_1:1:2": True,
+            "visited_1:1:2": True,
+        }
+        with open(self.filename, "w", encoding="utf-8") as f:
+            json.dump(flat, f)
+
+        loaded = load_game(self.filename)
+        self.assertIsInstance(loaded, GameState)
+        key = location_key(1, 1, 2)
+        self.assertEqual(loaded.descriptions[key].description, "Goteras.")
+        self.assertEqual(loaded.resolved_events, {key})
+        self.assertEqual(loaded.visited, {key})
+        self.assertEqual(loaded.current_options_map, {})
+        self.assertEqual(loaded.extras, {})
+
+    @patch('builtins.print')
+    def test_game_state_round_trip(self, mock_print):
+        dungeon = generate_dungeon_layout(seed=8, width=6, height=4, cache=LayoutCache())
+        state = GameState.from_mapping(self.game_state(dungeon))
+        state["location_description_1:0:0"] = LocationDescription(description="Eco.")
+        state["visited_1:0:0"] = True
+        save_game(state, self.filename)
+
+        with open(self.filename, encoding="utf-8") as f:
+            self.assertEqual(json.load(f)["visited"], [[1, 0, 0]])
+        loaded = load_game(self.filename)
+        self.assertEqual(loaded, state)
+
+
+if __name__ == '__main__':
+    unittest.main()
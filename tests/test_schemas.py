@@ -0,0 +1,92 @@
+import unittest
+import sys
+import os
+
+# Añadir el directorio src al path para los imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from pydantic import ValidationError
+
+from aimaze.dungeon import Dungeon, Level, PlayerLocation, Room, room_key
+from aimaze.events import EventType, GameEvent
+from aimaze.player import Player
+from aimaze.schemas import (
+    DungeonSchema,
+    RoomSchema,
+    dump_model,
+    dump_model_json,
+    from_schema,
+    is_runtime_model,
+    load_model,
+    load_model_json,
+    to_schema,
+)
+
+
+def _dungeon():
+    rooms = {
+        room_key(0, 0): Room(id="start", coordinates=(0, 0),
+                             connections={"east": (1, 0)}),
+        room_key(1, 0): Room(id="exit", coordinates=(1, 0),
+                             connections={"west": (0, 0)}),
+    }
+    level = Level(id=1, width=2, height=1, start_coords=(0, 0),
+                  exit_coords=(1, 0), rooms=rooms)
+    return Dungeon(total_levels=1, levels={1: level})
+
+
+class TestSchemas(unittest.TestCase):
+    """
+    Tests para los tipos de ejecución con __slots__ y sus esquemas pydantic.
+    """
+
+    def test_runtime_models_have_no_instance_dict(self):
+        for obj in (PlayerLocation(level=1, x=0, y=0), Player(),
+                    Room(id="r", coordinates=(0, 0)), _dungeon()):
+            with self.subTest(type=type(obj).__name__):
+                self.assertFalse(hasattr(obj, "__dict__"))
+                self.assertTrue(is_runtime_model(obj))
+
+    def test_round_trip_through_schemas(self):
+        event = GameEvent(event_type=EventType.PUZZLE_RIDDLE, description="d",
+                          success_text="s", failure_text="f",
+                          alternative_solutions=["eco"])
+        player = Player(health=42, inventory=["llave"])
+        for obj in (_dungeon(), player, event, PlayerLocation(level=2, x=3, y=4)):
+            with self.subTest(type=type(obj).__name__):
+                self.assertEqual(from_schema(to_schema(obj)), obj)
+                self.assertEqual(load_model(type(obj), dump_model(obj)), obj)
+                self.assertEqual(load_model_json(type(obj), dump_model_json(obj)), obj)
+
+    def test_schemas_convert_to_runtime_types(self):
+        schema = to_schema(_dungeon())
+        self.assertIsInstance(schema, DungeonSchema)
+        self.assertIsInstance(schema.levels[1].rooms[room_key(1, 0)], RoomSchema)
+        dungeon = from_schema(schema)
+        self.assertIsInstance(dungeon.levels[1].rooms[room_key(1, 0)], Room)
+
+    def test_load_validates_and_coerces(self):
+        data = dump_model(GameEvent(event_type=EventType.PUZZLE_LOGIC,
+                                    description="d", success_text="s",
+                                    failure_text="f"))
+        self.assertEqual(data["event_type"], "PUZZLE_LOGIC")
+        self.assertIs(load_model(GameEvent, data).event_type, EventType.PUZZLE_LOGIC)
+
+        with self.assertRaises(ValidationError):
+            load_model(PlayerLocation, {"level": 1, "x": "oeste", "y": 0})
+        with self.assertRaises(ValidationError):
+            load_model(GameEvent, dict(data, event_type="NO_EXISTE"))
+
+    def test_legacy_room_keys_are_upgraded(self):
+        data = dump_model(_dungeon())
+        level = data["levels"][1]
+        level["rooms"] = {
+            f"{x},{y}": room
+            for room in level["rooms"].values()
+            for x, y in [room["coordinates"]]
+        }
+        self.assertEqual(load_model(Dungeon, data), _dungeon())
+
+
+if __name__ == '__main__':
+    unittest.main()
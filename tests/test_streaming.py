@@ -0,0 +1,241 @@
+import unittest
+import asyncio
+import json
+import sys
+import os
+from unittest.mock import MagicMock, patch
+
+# Añadir el directorio src y el de benchmarks al path para los imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+from bench_llm_client import FakeOpenAIServer
+
+from aimaze.ai.client import LLMRegistry, LLMSettings
+from aimaze.ai.description_cache import DescriptionCache
+from aimaze.ai.descriptions import (
+    LocationDescription,
+    astream_location_description,
+    stream_location_description,
+)
+from aimaze.ai.streaming import JsonStringFieldExtractor
+from aimaze.display import adisplay_scenario, display_scenario
+from aimaze.dungeon import Dungeon, Level, PlayerLocation, Room
+
+
+def _feed_all(extractor, chunks):
+    return [extractor.feed(chunk) for chunk in chunks]
+
+
+def _pieces(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+class TestJsonStringFieldExtractor(unittest.TestCase):
+    """
+    Tests para la extracción incremental del campo description.
+    """
+
+    def test_text_arrives_in_pieces(self):
+        extractor = JsonStringFieldExtractor()
+        deltas = _feed_all(extractor, ['{"desc', 'ription": "Una ', 'sala', ' fría"}'])
+        self.assertEqual(deltas, ["", "Una ", "sala", " fría"])
+        self.assertEqual(extractor.text, "Una sala fría")
+        self.assertTrue(extractor.complete)
+        self.assertEqual(extractor.feed("más"), "")
+
+    def test_escapes_split_between_chunks(self):
+        value = 'Dijo "hola"\ny se fue. Café é \U0001F600 \\ fin'
+        raw = json.dumps({"description": value}, ensure_ascii=True)
+        for size in range(1, 8):
+            with self.subTest(size=size):
+                extractor = JsonStringFieldExtractor()
+                deltas = _feed_all(extractor, _pieces(raw, size))
+                self.assertEqual("".join(deltas), value)
+                self.assertEqual(extractor.text, value)
+                self.assertTrue(extractor.complete)
+
+    def test_surrogate_pair_is_held_back(self):
+        extractor = JsonStringFieldExtractor()
+        self.assertEqual(extractor.feed('{"description": "a\\ud83d'), "a")
+        self.assertEqual(extractor.feed('\\ude00b"}'), "\U0001F600b")
+
+    def test_code_fence_and_other_fields(self):
+        extractor = JsonStringFieldExtractor()
+        raw = '```json\n{"title": "x", "description": "Polvo y eco"}\n```'
+        self.assertEqual("".join(_feed_all(extractor, _pieces(raw, 3))), "Polvo y eco")
+
+    def test_missing_field(self):
+        extractor = JsonStringFieldExtractor()
+        self.assertEqual(_feed_all(extractor, ['{"otro": ', '"valor"}']), ["", ""])
+        self.assertEqual(extractor.text, "")
+        self.assertFalse(extractor.complete)
+
+    def test_unescaped_newline_is_tolerated(self):
+        extractor = JsonStringFieldExtractor()
+        deltas = _feed_all(extractor, ['{"description": "uno\n', 'dos\\t"}'])
+        self.assertEqual("".join(deltas), "uno\ndos\t")
+
+
+@patch.dict(os.environ, {"OPENAI_API_KEY": "test"})
+@patch('aimaze.ai.client._create_callbacks', return_value=[])
+@patch('builtins.print')
+class TestStreamLocationDescription(unittest.TestCase):
+    """
+    Tests de stream_location_description contra un servidor que responde en SSE.
+    """
+
+    TEXT = "Una sala húmeda donde gotea el techo y resuenan tus pasos."
+
+    def setUp(self):
+        self.server = FakeOpenAIServer(
+            responder=lambda prompt: json.dumps({"description": self.TEXT}),
+            chunk_chars=5,
+        )
+        self.registry = LLMRegistry(LLMSettings(base_url=self.server.base_url))
+        self.cache = DescriptionCache()
+        for active in (
+            patch('aimaze.ai.descriptions.get_llm_registry', return_value=self.registry),
+            patch('aimaze.ai.descriptions.get_description_cache', return_value=self.cache),
+        ):
+            active.start()
+            self.addCleanup(active.stop)
+
+    def tearDown(self):
+        self.registry.close()
+        self.server.close()
+        self.cache.close()
+
+    def test_text_is_delivered_in_pieces_and_cached(self, mock_print, mock_callbacks):
+        deltas = []
+        result = stream_location_description(
+            "Level 1 at (0,0)", deltas.append, cache_location=(3, 1, 0, 0))
+
+        self.assertEqual(result.description, self.TEXT)
+        self.assertGreater(len(deltas), 1)
+        self.assertEqual("".join(deltas), self.TEXT)
+        self.assertEqual(len(self.cache), 1)
+
+        # Segunda vez: de la caché, entera y sin petición
+        requests = self.server.requests
+        cached = []
+        result = stream_location_description(
+            "Level 1 at (0,0)", cached.append, cache_location=(3, 1, 0, 0))
+        self.assertEqual(cached, [self.TEXT])
+        self.assertEqual(self.server.requests, requests)
+
+    def test_async_stream(self, mock_print, mock_callbacks):
+        deltas = []
+
+        async def run():
+            try:
+                return await astream_location_description(
+                    "Level 1 at (0,0)", deltas.append)
+            finally:
+                await self.registry.aclose()
+
+        result = asyncio.run(run())
+        self.assertEqual(result.description, self.TEXT)
+        self.assertGreater(len(deltas), 1)
+        self.assertEqual("".join(deltas), self.TEXT)
+
+    def test_error_returns_fallback(self, mock_print, mock_callbacks):
+        deltas = []
+        llm = MagicMock()
+        llm.stream.side_effect = ConnectionError("sin conexión")
+        with patch.object(self.registry, "structured_llm", return_value=llm):
+            result = stream_location_description("Level 1 at (0,0)", deltas.append)
+        self.assertIn("Level 1 at (0,0)", result.description)
+        self.assertEqual(deltas, [])
+
+
+def _game_state():
+    room = Room(id="room", coordinates=(0, 0), connections={'east': (1, 0)})
+    level = Level(
+        id=1, width=2, height=1, start_coords=(0, 0), exit_coords=(1, 0),
+        rooms={"0,0": room, "1,0": Room(
+            id="exit", coordinates=(1, 0), connections={'west': (0, 0)})},
+    )
+    dungeon = Dungeon(total_levels=1, current_level=1, levels={1: level})
+    return {
+        "player_location": PlayerLocation(level=1, x=0, y=0),
+        "dungeon": dungeon,
+        "game_over": False,
+    }
+
+
+def _fake_stream(*pieces, final=None):
+    def stream(context, on_text, cache_location=None):
+        for piece in pieces:
+            on_text(piece)
+        return LocationDescription(description=final or "".join(pieces))
+    return stream
+
+
+@patch('builtins.print')
+class TestStreamingDisplay(unittest.TestCase):
+    """
+    Tests de display_scenario/adisplay_scenario con stream=True.
+    """
+
+    def _printed(self, mock_print):
+        return [call[0][0] if call[0] else "" for call in mock_print.call_args_list]
+
+    def test_display_prints_pieces_as_they_arrive(self, mock_print):
+        game_state = _game_state()
+        with patch('aimaze.display.stream_location_description',
+                   side_effect=_fake_stream("Polvo ", "y eco.")) as mock_stream, \
+                patch('aimaze.display.generate_location_description') as mock_generate:
+            display_scenario(game_state, stream=True)
+
+        mock_stream.assert_called_once()
+        mock_generate.assert_not_called()
+        printed = self._printed(mock_print)
+        self.assertIn("Polvo ", printed)
+        self.assertIn("y eco.", printed)
+        # Ya mostrado en streaming: no se repite entero
+        self.assertNotIn("Polvo y eco.", printed)
+        streamed = [
+            call for call in mock_print.call_args_list if call[1].get("end") == ""]
+        self.assertEqual(len(streamed), 2)
+        self.assertEqual(
+            game_state["location_description_1:0:0"].description, "Polvo y eco.")
+
+    def test_corrected_result_is_printed(self, mock_print):
+        game_state = _game_state()
+        with patch('aimaze.display.stream_location_description',
+                   side_effect=_fake_stream("Pol", final="Texto corregido.")):
+            display_scenario(game_state, stream=True)
+        self.assertIn("Texto corregido.", self._printed(mock_print))
+
+    def test_stored_description_is_not_streamed(self, mock_print):
+        game_state = _game_state()
+        game_state["location_description_1:0:0"] = LocationDescription(
+            description="Ya visitada.")
+        with patch('aimaze.display.stream_location_description') as mock_stream:
+            display_scenario(game_state, stream=True)
+        mock_stream.assert_not_called()
+        self.assertIn("Ya visitada.", self._printed(mock_print))
+
+    def test_async_display_streams(self, mock_print):
+        game_state = _game_state()
+
+        async def fake_astream(context, on_text, cache_location=None):
+            return _fake_stream("Goteo ", "lejano.")(context, on_text, cache_location)
+
+        with patch('aimaze.display.astream_location_description',
+                   side_effect=fake_astream) as mock_astream, \
+                patch('aimaze.display.agenerate_location_description') as mock_agenerate:
+            asyncio.run(adisplay_scenario(game_state, stream=True))
+
+        mock_astream.assert_called_once()
+        mock_agenerate.assert_not_called()
+        printed = self._printed(mock_print)
+        self.assertIn("Goteo ", printed)
+        self.assertIn("lejano.", printed)
+        self.assertIn("\nOpciones:", printed)
+        self.assertIn("current_options_map", game_state)
+
+
+if __name__ == '__main__':
+    unittest.main()
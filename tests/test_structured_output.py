@@ -0,0 +1,315 @@
+import unittest
+import asyncio
+import json
+import sys
+import os
+from unittest.mock import AsyncMock, MagicMock, patch
+
+# Añadir el directorio src y el de benchmarks al path para los imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+from bench_llm_client import FakeOpenAIServer
+
+from aimaze.ai.client import LLMRegistry, LLMSettings
+from aimaze.ai.description_cache import DescriptionCache
+from aimaze.ai.descriptions import (
+    LocationDescription,
+    generate_location_description,
+    stream_location_description,
+)
+from aimaze.ai.level_descriptions import LevelDescriptions, generate_level_descriptions
+from aimaze.ai.structured_output import (
+    LLM_FIXED,
+    PARTIAL,
+    REPAIRED,
+    VALID,
+    StructuredOutputStats,
+    aparse_structured,
+    get_structured_output_stats,
+    json_schema_response_format,
+    parse_structured,
+    repair_structured_output,
+)
+from aimaze.generation.dungeon_generator import generate_dungeon_layout
+
+
+class TestRepairStructuredOutput(unittest.TestCase):
+    """
+    Tests para la reparación local de respuestas mal formadas.
+    """
+
+    def test_repairable_outputs(self):
+        cases = {
+            '```json\n{"description": "Vallas"}\n```': "Vallas",
+            'Aquí tienes: {"description": "Texto alrededor"} ¡Suerte!':
+                "Texto alrededor",
+            '{"description": "Coma final",}': "Coma final",
+            '{"description": "Truncada': "Truncada",
+            '{"description": "Salto\nsin escapar"}': "Salto\nsin escapar",
+            '{"LocationDescription": {"description": "Envuelta"}}': "Envuelta",
+            '[{"description": "En lista"}]': "En lista",
+            'Una sala sin JSON.': "Una sala sin JSON.",
+            '```\nSin JSON en vallas\n```': "Sin JSON en vallas",
+        }
+        for content, expected in cases.items():
+            with self.subTest(content=content):
+                result = repair_structured_output(content, LocationDescription)
+                self.assertEqual(result, LocationDescription(description=expected))
+
+    def test_unrepairable_outputs(self):
+        for content in ('{"otro": 1}', '', 'null', '"solo"', '[1, 2]',
+                        'Claro! {no es json'):
+            with self.subTest(content=content):
+                self.assertIsNone(
+                    repair_structured_output(content, LocationDescription))
+        # Los modelos de varios campos no aceptan texto plano
+        self.assertIsNone(repair_structured_output("Texto", LevelDescriptions))
+
+    def test_response_format_is_strict_json_schema(self):
+        response_format = json_schema_response_format(LevelDescriptions)
+        self.assertEqual(response_format["type"], "json_schema")
+        json_schema = response_format["json_schema"]
+        self.assertEqual(json_schema["name"], "LevelDescriptions")
+        self.assertTrue(json_schema["strict"])
+        item = json_schema["schema"]["properties"]["rooms"]["items"]
+        self.assertFalse(item["additionalProperties"])
+        self.assertEqual(item["required"], ["x", "y", "description"])
+        # minLength no está admitido en modo estricto; se valida en local
+        self.assertNotIn("minLength", json.dumps(response_format))
+
+
+@patch('builtins.print')
+class TestParseStructured(unittest.TestCase):
+    """
+    Tests para la validación local con corrección por LLM como último recurso.
+    """
+
+    def setUp(self):
+        self.stats = StructuredOutputStats()
+        self.fixer = MagicMock()
+        self.fixer.parse.return_value = LocationDescription(description="Corregida")
+        self.fixer.aparse = AsyncMock(
+            return_value=LocationDescription(description="Corregida"))
+
+    def _parse(self, content):
+        return parse_structured(content, LocationDescription, self.fixer, self.stats)
+
+    def test_outcomes_are_counted(self, mock_print):
+        self.assertEqual(
+            self._parse('{"description": "Válida"}'),
+            (LocationDescription(description="Válida"), VALID))
+        self.assertEqual(
+            self._parse('{"description": "Reparada",}'),
+            (LocationDescription(description="Reparada"), REPAIRED))
+        self.assertEqual(
+            self._parse('{"description": "Cortada a med'),
+            (LocationDescription(description="Cortada a med"), PARTIAL))
+        self.fixer.parse.assert_not_called()
+
+        self.assertEqual(
+            self._parse('{"otro": 1}'),
+            (LocationDescription(description="Corregida"), LLM_FIXED))
+        self.fixer.parse.assert_called_once_with('{"otro": 1}')
+
+        self.fixer.parse.side_effect = ValueError("sin arreglo")
+        with self.assertRaises(ValueError):
+            self._parse('{"otro": 2}')
+
+        self.assertEqual(self.stats.stats(), {"LocationDescription": {
+            "valid": 1, "repaired": 1, "partial": 1, "llm_fixed": 1, "failed": 1,
+            "total": 5, "retry_rate": 0.2,
+        }})
+        warnings = [call[0][0] for call in mock_print.call_args_list]
+        self.assertEqual(
+            sum("se pide la corrección al LLM" in text for text in warnings), 2)
+
+    def test_incomplete_repairs_are_partial(self, mock_print):
+        cases = {
+            '```json\n{"description": "Vallas"}\n```': REPAIRED,
+            'Aquí tienes: {"description": "Texto alrededor"}': REPAIRED,
+            '{"description": "Salto\nsin escapar"}': REPAIRED,
+            '{"description": "Truncada': PARTIAL,
+            '```json\n{"description": "Truncada en vallas': PARTIAL,
+            'Una sala sin JSON.': PARTIAL,
+        }
+        for content, expected in cases.items():
+            with self.subTest(content=content):
+                self.assertEqual(self._parse(content)[1], expected)
+
+    def test_async_parse(self, mock_print):
+        async def run():
+            return (
+                await aparse_structured(
+                    '{"description": "Bien"}', LocationDescription, self.fixer,
+                    self.stats),
+                await aparse_structured(
+                    '{"otro": 1}', LocationDescription, self.fixer, self.stats),
+            )
+
+        valid, fixed = asyncio.run(run())
+        self.assertEqual(valid, (LocationDescription(description="Bien"), VALID))
+        self.assertEqual(
+            fixed, (LocationDescription(description="Corregida"), LLM_FIXED))
+        self.fixer.aparse.assert_awaited_once()
+        self.assertEqual(
+            self.stats.stats()["LocationDescription"]["retry_rate"], 0.5)
+
+    def test_reset(self, mock_print):
+        self._parse('{"description": "x"}')
+        self.stats.reset()
+        self.assertEqual(self.stats.stats(), {})
+
+
+@patch.dict(os.environ, {"OPENAI_API_KEY": "test"})
+@patch('aimaze.ai.client._create_callbacks', return_value=[])
+@patch('builtins.print')
+class TestStructuredRequests(unittest.TestCase):
+    """
+    Tests de las peticiones con salida estructurada contra un servidor local.
+    """
+
+    def setUp(self):
+        self.server = None
+        self.registry = None
+        get_structured_output_stats().reset()
+        self.addCleanup(get_structured_output_stats().reset)
+
+    def tearDown(self):
+        if self.registry is not None:
+            self.registry.close()
+        if self.server is not None:
+            self.server.close()
+
+    def _serve(self, responder, structured_output=True):
+        self.server = FakeOpenAIServer(responder=responder)
+        self.registry = LLMRegistry(LLMSettings(
+            base_url=self.server.base_url, structured_output=structured_output))
+        for module in ("descriptions", "level_descriptions"):
+            active = patch(
+                f'aimaze.ai.{module}.get_llm_registry', return_value=self.registry)
+            active.start()
+            self.addCleanup(active.stop)
+
+    def test_request_uses_json_schema(self, mock_print, mock_callbacks):
+        self._serve(lambda prompt: json.dumps({"description": "Piedra"}))
+        result = generate_location_description("Level 1 at (0,0)")
+
+        self.assertEqual(result.description, "Piedra")
+        self.assertEqual(
+            self.server.last_request["response_format"],
+            json_schema_response_format(LocationDescription),
+        )
+        self.assertEqual(
+            get_structured_output_stats().stats()["LocationDescription"]["valid"], 1)
+
+    def test_malformed_json_is_repaired_without_a_second_call(
+            self, mock_print, mock_callbacks):
+        self._serve(lambda prompt: '```json\n{"description": "Musgo",}\n```')
+        result = generate_location_description("Level 1 at (0,0)")
+
+        self.assertEqual(result.description, "Musgo")
+        self.assertEqual(self.server.requests, 1)
+        stats = get_structured_output_stats().stats()["LocationDescription"]
+        self.assertEqual((stats["repaired"], stats["llm_fixed"]), (1, 0))
+
+    def test_truncated_response_is_not_cached(self, mock_print, mock_callbacks):
+        responses = iter([
+            '{"description": "La sala es osc',
+            'Una sala sin JSON.',
+            json.dumps({"description": "Completa"}),
+        ])
+        self._serve(lambda prompt: next(responses))
+        cache = DescriptionCache()
+        self.addCleanup(cache.close)
+        active = patch(
+            'aimaze.ai.descriptions.get_description_cache', return_value=cache)
+        active.start()
+        self.addCleanup(active.stop)
+
+        # Se usa en la partida, pero no se guarda en la caché persistente
+        result = generate_location_description(
+            "Level 1 at (0,0)", cache_location=(3, 1, 0, 0))
+        self.assertEqual(result.description, "La sala es osc")
+        self.assertEqual(len(cache), 0)
+        result = stream_location_description(
+            "Level 1 at (0,0)", lambda text: None, cache_location=(3, 1, 0, 0))
+        self.assertEqual(result.description, "Una sala sin JSON.")
+        self.assertEqual(len(cache), 0)
+
+        result = generate_location_description(
+            "Level 1 at (0,0)", cache_location=(3, 1, 0, 0))
+        self.assertEqual(result.description, "Completa")
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(self.server.requests, 3)
+        stats = get_structured_output_stats().stats()["LocationDescription"]
+        self.assertEqual((stats["partial"], stats["valid"]), (2, 1))
+
+    def test_truncated_batch_drops_its_last_room(self, mock_print, mock_callbacks):
+        level = generate_dungeon_layout(seed=3, width=3, height=3).levels[1]
+        coords = sorted(room.coordinates for room in level.rooms.values())
+        complete = json.dumps({"rooms": [
+            {"x": x, "y": y, "description": f"Lote {x},{y}"} for x, y in coords
+        ]})
+        cut = complete[:complete.rindex("Lote") + 3]
+
+        self._serve(lambda prompt: cut if "Salas a describir" in prompt else
+                    json.dumps({"description": "Suelta"}))
+        result = generate_level_descriptions(level)
+
+        self.assertEqual(result.batched, len(coords) - 1)
+        self.assertEqual(result.fallback, 1)
+        self.assertEqual(
+            get_structured_output_stats().stats()["LevelDescriptions"]["repaired"], 1)
+
+    def test_llm_fix_is_the_last_resort(self, mock_print, mock_callbacks):
+        responses = iter(['{"otro": "nada"}', json.dumps({"description": "Arreglo"})])
+        self._serve(lambda prompt: next(responses))
+        result = generate_location_description("Level 1 at (0,0)")
+
+        self.assertEqual(result.description, "Arreglo")
+        self.assertEqual(self.server.requests, 2)
+        # La petición de corrección no va restringida al esquema
+        self.assertNotIn("response_format", self.server.last_request)
+        stats = get_structured_output_stats().stats()["LocationDescription"]
+        self.assertEqual((stats["llm_fixed"], stats["retry_rate"]), (1, 1.0))
+
+    def test_structured_output_can_be_disabled(self, mock_print, mock_callbacks):
+        self._serve(lambda prompt: json.dumps({"description": "Sin esquema"}),
+                    structured_output=False)
+        self.assertIs(
+            self.registry.structured_llm(LocationDescription), self.registry.llm())
+        self.assertEqual(
+            generate_location_description("Level 1 at (0,0)").description,
+            "Sin esquema")
+        self.assertNotIn("response_format", self.server.last_request)
+
+    def test_structured_llm_is_shared(self, mock_print, mock_callbacks):
+        self._serve(lambda prompt: "{}")
+        structured = self.registry.structured_llm(LocationDescription)
+        self.assertIs(self.registry.structured_llm(LocationDescription), structured)
+        self.assertIsNot(self.registry.structured_llm(LevelDescriptions), structured)
+
+    def test_level_batches_are_counted(self, mock_print, mock_callbacks):
+        level = generate_dungeon_layout(seed=3, width=3, height=3).levels[1]
+
+        def respond(prompt):
+            return json.dumps({"rooms": [
+                {"x": room.coordinates[0], "y": room.coordinates[1],
+                 "description": "Lote"}
+                for room in level.rooms.values()
+            ]})
+
+        self._serve(respond)
+        result = generate_level_descriptions(level)
+
+        self.assertEqual(result.batched, len(level.rooms))
+        self.assertEqual(
+            self.server.last_request["response_format"]["json_schema"]["name"],
+            "LevelDescriptions")
+        self.assertEqual(
+            get_structured_output_stats().stats()["LevelDescriptions"]["valid"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+import tempfile
+import sys
+import os
+from unittest.mock import MagicMock, patch
+
+# Añadir el directorio src al path para los imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from aimaze.dungeon import Dungeon
+from aimaze.game_state import initialize_game_state
+from aimaze.generation.dungeon_generator import generate_dungeon_layout
+from aimaze.generation.warm_pool import DungeonPool
+
+
+class TestDungeonPool(unittest.TestCase):
+    """
+    Tests para la reserva de mazmorras pre-generadas.
+    """
+
+    def test_producer_fills_every_profile(self):
+        pool = DungeonPool(
+            profiles={"small": {"width": 3, "height": 3}, "big": {"width": 12, "height": 9}},
+            capacity=2,
+        )
+        pool.start()
+        try:
+            self.assertTrue(pool.wait_until_full(timeout=10))
+            self.assertEqual(pool.size("small"), 2)
+            dungeon = pool.take("big")
+            self.assertEqual(dungeon.levels[1].width, 12)
+            # El productor repone la mazmorra consumida
+            self.assertTrue(pool.wait_until_full(timeout=10))
+            self.assertEqual(pool.size("big"), 2)
+        finally:
+            pool.stop(timeout=5)
+
+    def test_take_from_empty_pool_generates_synchronously(self):
+        generator = MagicMock(side_effect=generate_dungeon_layout)
+        pool = DungeonPool(capacity=1, generator=generator)
+        self.assertIsInstance(pool.take(), Dungeon)
+        generator.assert_called_once_with()
+
+    def test_unknown_profile(self):
+        with self.assertRaises(KeyError):
+            DungeonPool().take("inexistente")
+
+    def test_pool_survives_restart(self):
+        """Las mazmorras persistidas se recuperan sin volver a generarlas"""
+        with tempfile.TemporaryDirectory() as directory:
+            pool = DungeonPool(capacity=2, directory=directory)
+            pool.start()
+            self.assertTrue(pool.wait_until_full(timeout=10))
+            pool.stop(timeout=5)
+
+            generator = MagicMock(side_effect=generate_dungeon_layout)
+            restarted = DungeonPool(capacity=2, directory=directory, generator=generator)
+            self.assertEqual(restarted.size(), 2)
+            restarted.take()
+            generator.assert_not_called()
+            self.assertEqual(len(os.listdir(os.path.join(directory, "default"))), 1)
+
+    @patch('aimaze.game_state.load_config')
+    @patch('aimaze.game_state.generate_dungeon_layout')
+    def test_initialize_game_state_uses_pool(self, mock_generate, mock_load_config):
+        pool = MagicMock()
+        pool.take.return_value = generate_dungeon_layout()
+        game_state = initialize_game_state(dungeon_pool=pool)
+        pool.take.assert_called_once_with()
+        mock_generate.assert_not_called()
+        self.assertIs(game_state["dungeon"], pool.take.return_value)
+
+
+if __name__ == '__main__':
+    unittest.main()